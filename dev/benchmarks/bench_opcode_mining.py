@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Opcode mining benchmark.
+
+Times OpcodeMiner on a BHAV corpus: ingesting instruction streams, building
+BHAV- and object-level pair counts, and the "which opcodes always appear
+together" and successor n-gram queries. Reports whether scipy.sparse or the
+pure-array pair counting was used.
+
+USAGE:
+  python bench_opcode_mining.py                  # Synthetic ~100k BHAVs
+  python bench_opcode_mining.py PATH [...]       # FAR/IFF files or game directory
+  python bench_opcode_mining.py --db STORE.db    # Existing forensic store
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+sys.path.insert(0, str(SRC_DIR / "Tools"))
+
+from core import opcode_mining
+from core.forensic_store import ForensicStore
+from core.opcode_mining import OpcodeMiner
+
+
+def synthetic_corpus(bhavs: int = 100_000, objects: int = 2_500):
+    """Yield (object, opcodes, true pointers, false pointers) resembling game BHAVs."""
+    rng = random.Random(1234)
+    primitives = list(range(0x00, 0x70))
+    globals_ = list(range(0x0100, 0x0400))
+    locals_ = list(range(0x1000, 0x1040))
+    for n in range(bhavs):
+        length = min(250, int(rng.expovariate(1 / 14)) + 2)
+        opcodes = []
+        for _ in range(length):
+            roll = rng.random()
+            pool = primitives if roll < 0.7 else globals_ if roll < 0.9 else locals_
+            # Skewed toward the start of each pool, like real usage
+            opcodes.append(pool[min(len(pool) - 1, int(rng.expovariate(6 / len(pool))))])
+        true_ptrs = [i + 1 if i + 1 < length else 0xFE for i in range(length)]
+        false_ptrs = [rng.choice((0xFE, 0xFF, rng.randrange(length))) for _ in range(length)]
+        yield n % objects, opcodes, true_ptrs, false_ptrs
+
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"  {label:<36}{time.perf_counter() - start:>8.2f}s")
+    return result
+
+
+def main():
+    print(f"pair counting: {'scipy.sparse' if opcode_mining.sparse is not None else 'pure-array fallback'}")
+    miner = OpcodeMiner()
+    args = sys.argv[1:]
+
+    if args[:1] == ["--db"]:
+        with ForensicStore(args[1]) as store:
+            timed("add_store", lambda: miner.add_store(store))
+    elif args:
+        with tempfile.TemporaryDirectory() as tmp, ForensicStore(Path(tmp) / "bench.db") as store:
+            for i, path in enumerate(args):
+                timed(f"ingest {Path(path).name}", lambda: store.ingest(f"PACK_{i}", path))
+            timed("add_store", lambda: miner.add_store(store))
+    else:
+        corpus = list(synthetic_corpus())
+        def add_all():
+            for obj, opcodes, true_ptrs, false_ptrs in corpus:
+                miner.add_bhav(opcodes, true_ptrs, false_ptrs, obj)
+        timed("add_bhav (synthetic)", add_all)
+
+    print(f"  {miner.bhav_count:,} BHAVs, {miner.instruction_count:,} instructions, "
+          f"{len(miner.opcodes):,} distinct opcodes")
+
+    bhav_pairs = timed("pairs('bhav')", lambda: miner.pairs("bhav"))
+    object_pairs = timed("pairs('object')", lambda: miner.pairs("object"))
+    together = timed("always_together('bhav')", lambda: miner.always_together("bhav", min_support=5))
+    timed("always_together('object')", lambda: miner.always_together("object", min_support=5))
+    top = timed("top_pairs('bhav')", lambda: miner.top_pairs("bhav", limit=20))
+    trigrams = timed("top_ngrams(3)", lambda: miner.top_ngrams(3, limit=20))
+
+    print(f"\n  {len(bhav_pairs):,} BHAV-level pairs, {len(object_pairs):,} object-level pairs")
+    print(f"  {len(together):,} pairs always together (5+ BHAVs)")
+    for a, b, count in top[:5]:
+        print(f"    0x{a:04X} + 0x{b:04X}: {count:,} BHAVs")
+    for ngram, count in trigrams[:5]:
+        print(f"    {' -> '.join(f'0x{op:04X}' for op in ngram)}: {count:,} paths")
+
+
+if __name__ == "__main__":
+    main()
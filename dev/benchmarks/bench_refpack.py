@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+RefPack decompression micro-benchmark.
+
+Compares utils.refpack.decompress against the previous per-byte decoding
+style (one read_byte() per literal, one append per copied byte) on the same
+streams, and reports MB/s of decompressed output.
+
+USAGE:
+  python bench_refpack.py              # Synthetic corpus
+  python bench_refpack.py FILE [...]   # Compress and benchmark real files
+"""
+
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from utils import refpack
+from utils.binary import IoBuffer
+
+
+def legacy_decompress(data: bytes) -> bytes:
+    """Per-byte decoder in the style of the old FAR3Decompresser loop."""
+    size, header_len = refpack.parse_header(data)
+    io = IoBuffer.from_bytes(data)
+    io.seek(header_len)
+    output = bytearray()
+
+    while io.position < len(data) and len(output) < size:
+        cc = io.read_byte()
+        if cc < 0x80:
+            b1 = io.read_byte()
+            literals = cc & 0x03
+            length = ((cc & 0x1C) >> 2) + 3
+            offset = ((cc & 0x60) << 3) + b1 + 1
+        elif cc < 0xC0:
+            b1 = io.read_byte()
+            b2 = io.read_byte()
+            literals = b1 >> 6
+            length = (cc & 0x3F) + 4
+            offset = ((b1 & 0x3F) << 8) + b2 + 1
+        elif cc < 0xE0:
+            b1 = io.read_byte()
+            b2 = io.read_byte()
+            b3 = io.read_byte()
+            literals = cc & 0x03
+            length = ((cc & 0x0C) << 6) + b3 + 5
+            offset = ((cc & 0x10) << 12) + (b1 << 8) + b2 + 1
+        elif cc < 0xFC:
+            literals = ((cc & 0x1F) << 2) + 4
+            length = 0
+        else:
+            literals = cc & 0x03
+            length = 0
+
+        for _ in range(literals):
+            output.append(io.read_byte())
+
+        src_pos = len(output) - offset if length else 0
+        for _ in range(length):
+            output.append(output[src_pos])
+            src_pos += 1
+
+        if cc >= 0xFC:
+            break
+
+    return bytes(output)
+
+
+def synthetic_corpus() -> list[tuple[str, bytes]]:
+    """Build inputs resembling IFF payloads: text, runs and noisy sprites."""
+    rng = random.Random(1234)
+    text = (Path(SRC_DIR) / "formats" / "far" / "far3.py").read_bytes() * 8
+    runs = b"".join(bytes([rng.randrange(8)]) * rng.randrange(1, 64) for _ in range(20000))
+    sprite = bytes(rng.choice(b"\x00\x00\x00\x01\x02\x03\x10\x11") for _ in range(300000))
+    return [("text", text), ("runs", runs), ("sprite", sprite)]
+
+
+def bench(fn, data: bytes, out_size: int, min_time: float = 0.5) -> float:
+    """Return throughput in MB/s of decompressed output."""
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        fn(data)
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return out_size * runs / elapsed / 1e6
+
+
+def main():
+    if len(sys.argv) > 1:
+        corpus = [(Path(p).name, Path(p).read_bytes()) for p in sys.argv[1:]]
+    else:
+        corpus = synthetic_corpus()
+
+    print(f"{'input':<16}{'size':>10}{'ratio':>8}{'legacy MB/s':>14}{'new MB/s':>12}{'speedup':>10}")
+    for name, raw in corpus:
+        stream = refpack.compress(raw)
+        assert refpack.decompress(stream) == raw
+        assert legacy_decompress(stream) == raw
+
+        old = bench(legacy_decompress, stream, len(raw))
+        new = bench(refpack.decompress, stream, len(raw))
+        ratio = len(stream) / max(len(raw), 1)
+        print(f"{name:<16}{len(raw):>10,}{ratio:>8.2f}{old:>14.2f}{new:>12.2f}{new / old:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
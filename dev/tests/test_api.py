@@ -8,6 +8,7 @@ Can be run standalone: python test_api.py
 Or via main runner: python tests.py --module api
 """
 
+import struct
 import sys
 from pathlib import Path
 from datetime import datetime
@@ -65,6 +66,83 @@ class TestResults:
 results = TestResults()
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# FIXTURES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# 60-byte IFF signature plus the (unused) resource map offset
+IFF_HEADER = b'IFF FILE 2.5:TYPE FOLLOWED BY SIZE\0 JAMIE DOORNBOS & MAXIS 1'.ljust(60, b'\0') + bytes(4)
+
+
+def iff_chunk(type_code: bytes, chunk_id: int, payload: bytes, label: bytes = b'') -> bytes:
+    """One IFF chunk: big-endian 76-byte header followed by its payload."""
+    return struct.pack('>4sIHH64s', type_code, 76 + len(payload), chunk_id, 0, label) + payload
+
+
+def iff_bytes(*chunks: bytes) -> bytes:
+    """A complete IFF file holding the given chunks."""
+    return IFF_HEADER + b''.join(chunks)
+
+
+def bhav_chunk(chunk_id: int, opcodes, true_target: int = 0xFE, false_target: int = 0xFF,
+               operand=bytes(8)) -> bytes:
+    """
+    BHAV chunk (format 0x8002) running opcodes in order.
+    
+    operand is the 8 operand bytes of every instruction, or a function of
+    the opcode returning them.
+    """
+    payload = struct.pack('<HHBBHHH', 0x8002, len(opcodes), 0, 0, 0, 0, 0)
+    payload += b''.join(struct.pack('<HBB', op, true_target, false_target)
+                        + (operand(op) if callable(operand) else operand) for op in opcodes)
+    return iff_chunk(b'BHAV', chunk_id, payload)
+
+
+def objd_chunk(chunk_id: int, guid: int, name: str) -> bytes:
+    """Minimal OBJD chunk (14 fields) with a GUID, labelled with the object name."""
+    fields = [0] * 14
+    fields[12], fields[13] = guid & 0xFFFF, guid >> 16
+    return iff_chunk(b'OBJD', chunk_id, struct.pack('<I14H', 28, *fields), name.encode('latin-1'))
+
+
+def str_chunk(chunk_id: int, strings) -> bytes:
+    """STR# chunk in format 0xFFFD (language code, value, empty description)."""
+    payload = struct.pack('<HH', 0xFFFD, len(strings))
+    payload += b''.join(b'\x01' + pascal(text) + b'\x00' for text in strings)
+    return iff_chunk(b'STR#', chunk_id, payload)
+
+
+def write_asset_tree(root: Path, far_objects: int = 40):
+    """
+    Small game-like tree for AssetScanner: a loose object IFF, a FAR of
+    object IFFs and a ZIP holding a neighbour IFF with body strings.
+    """
+    import zipfile
+    (root / "GameData").mkdir(parents=True, exist_ok=True)
+    (root / "GameData" / "Chair.iff").write_bytes(iff_bytes(objd_chunk(128, 0x00C0FFEE, "Chair")))
+    (root / "GameData" / "Objects.far").write_bytes(far_bytes(
+        [(f"Obj{i:02d}.iff", iff_bytes(objd_chunk(128, 0x1000 + i, f"Obj{i:02d}"))) for i in range(far_objects)]))
+    with zipfile.ZipFile(root / "Neighbors.zip", 'w') as zf:
+        zf.writestr("Family/Bob.iff", iff_bytes(str_chunk(200, [
+            "Adult", "b001mafit_01,BODY=b001mafitlgt_01", "c001ma_lgt,HEAD-HEAD=c001malgt"])))
+
+
+def far_bytes(entries) -> bytes:
+    """FAR1 (version 1) archive from (name, data) pairs, data stored in order."""
+    data, manifest, offset = b'', b'', 16
+    for name, payload in entries:
+        name = name.encode('latin-1')
+        manifest += struct.pack('<iiii', len(payload), len(payload), offset, len(name)) + name
+        data += payload
+        offset += len(payload)
+    return b'FAR!byAZ' + struct.pack('<II', 1, offset) + data + struct.pack('<I', len(entries)) + manifest
+
+
+def pascal(text: str) -> bytes:
+    """Length-prefixed (1 byte) latin-1 string."""
+    return bytes([len(text)]) + text.encode('latin-1')
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # CORE SYSTEMS
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -222,7 +300,61 @@ def test_bhav_executor():
         summary = trace.format_summary()
         results.record("format_summary works", "BHAV" in summary, f"Got: {summary[:50]}")
         results.record("BHAVExecutor class exists", BHAVExecutor is not None, "")
-        
+
+        import struct
+        from formats.iff.chunks.bhav import BHAV, BHAVInstruction
+        from core.bhav_executor import VMContext
+
+        def expr(lhs_scope, lhs, op, rhs_scope, rhs, t, f):
+            return BHAVInstruction(2, t, f, struct.pack('<hhBBBB', lhs, rhs, 0, op, lhs_scope, rhs_scope))
+
+        # local0 := 0; while (++local0 < 10); return local0 == 10
+        loop = BHAV(chunk_id=0x1000, instructions=[
+            expr(6, 0, 5, 5, 0, 1, 0xFD),
+            expr(6, 0, 11, 5, 10, 1, 2),
+            expr(6, 0, 2, 5, 10, 0xFF, 0xFE),
+        ])
+        executor = BHAVExecutor()
+        trace = executor.execute(loop)
+        results.record("Expression loop returns true", trace.exit_code == VMPrimitiveExitCode.RETURN_TRUE, f"Got {trace.exit_code}")
+        results.record("Expression loop steps", trace.step_count == 12, f"Got {trace.step_count}")
+        results.record("Loop edge detected", trace.loops_detected == [(1, 1)], f"Got {trace.loops_detected}")
+        results.record("Locals snapshot", trace.steps[-1].locals_snapshot == (10,), f"Got {trace.steps[-1].locals_snapshot}")
+        results.record("Compiled once", executor.compile(loop) is executor.compile(loop), "")
+        untraced = executor.execute(loop, trace=False)
+        results.record("Untraced run keeps counts", not untraced.steps and untraced.step_count == 12, "")
+
+        # Subroutine 0x1100 returns param0 > 5; the caller calls it with 7, then with temps
+        callee = BHAV(chunk_id=0x1100, args=1, instructions=[expr(8, 0, 0, 5, 5, 0xFF, 0xFE)])
+        caller = BHAV(chunk_id=0x1001, instructions=[
+            BHAVInstruction(0x1100, 1, 0xFD, struct.pack('<hhhh', 7, 0, 0, 0)),
+            expr(7, 0, 5, 5, 3, 2, 0xFD),
+            BHAVInstruction(0x1100, 0xFF, 0xFE, struct.pack('<hhhh', -1, -1, -1, -1)),
+        ])
+        context = VMContext()
+        trace = BHAVExecutor(resolver={0x1100: callee}.get).execute(caller, context=context)
+        results.record("Subroutine result branches", trace.exit_code == VMPrimitiveExitCode.RETURN_FALSE, f"Got {trace.exit_code}")
+        results.record("Subroutine steps traced", [s.depth for s in trace.steps] == [0, 1, 0, 0, 1], f"Got {[s.depth for s in trace.steps]}")
+        results.record("Temps written", context.temps[0] == 3, f"Got {context.temps[0]}")
+
+        div_zero = BHAV(chunk_id=1, instructions=[expr(6, 0, 7, 5, 0, 0xFF, 0xFE)])
+        results.record("Divide by zero errors", executor.execute(div_zero).exit_code == VMPrimitiveExitCode.ERROR, "")
+        flag_zero = BHAV(chunk_id=2, instructions=[expr(6, 0, 8, 5, 0, 0xFF, 0xFE)])
+        results.record("Flag 0 test errors", executor.execute(flag_zero).exit_code == VMPrimitiveExitCode.ERROR, "")
+
+        # Edited BHAVs (and subroutines) are recompiled, not served from the cache
+        compiled = executor.compile(loop)
+        loop.instructions[2] = expr(6, 0, 2, 5, 11, 0xFF, 0xFE)
+        results.record("Edited BHAV recompiled", executor.compile(loop) is not compiled
+                       and executor.execute(loop).exit_code == VMPrimitiveExitCode.RETURN_FALSE, "")
+        sub_executor = BHAVExecutor(resolver={0x1100: callee}.get)
+        sub_executor.execute(caller)
+        callee.instructions[0] = expr(8, 0, 0, 5, 10, 0xFF, 0xFE)
+        results.record("Edited subroutine recompiled", sub_executor.execute(caller, context=VMContext()).steps[1].next_pointer == 0xFE, "")
+        for i in range(BHAVExecutor.MAX_COMPILED + 5):
+            executor.compile(BHAV(chunk_id=i, instructions=[expr(6, 0, 5, 5, 1, 0xFF, 0xFE)]))
+        results.record("Compiled cache bounded", len(executor._compiled) == BHAVExecutor.MAX_COMPILED, "")
+
         print(f"\n  -- Exit codes: {len(VMPrimitiveExitCode)}")
         
     except ImportError as e:
@@ -231,6 +363,257 @@ def test_bhav_executor():
         results.record("BHAV Executor load", False, str(e))
 
 
+def test_corpus_call_graph():
+    """Test corpus-wide BHAV call graph resolution and persistence."""
+    print("\n" + "="*60)
+    print("CORPUS CALL GRAPH")
+    print("="*60)
+
+    try:
+        import tempfile
+        from core.corpus_call_graph import CorpusCallGraphBuilder, CorpusCallGraph
+
+        def bhav(chunk_id, calls):
+            return bhav_chunk(chunk_id, calls, 0xFF, 0xFE)
+
+        builder = CorpusCallGraphBuilder()
+        builder.add_iff_bytes(iff_bytes(bhav(0x0118, [])), "Global.iff")
+        builder.add_iff_bytes(iff_bytes(bhav(0x2000, [0x0118])), "ChairGlobals.iff")
+        builder.add_iff_bytes(iff_bytes(iff_chunk(b'GLOB', 128, b'\x0cChairGlobals'),
+                                        bhav(0x1000, [0x1001, 0x2000, 0x0555]), bhav(0x1001, [0x0118])),
+                              "Chair.iff", "Objects.far")
+        graph = builder.build()
+
+        callers = [(ref.file, ref.bhav_id) for ref in graph.callers_of_global(0x0118)]
+        results.record("Global callers across files", callers == [("ChairGlobals.iff", 0x2000), ("Chair.iff", 0x1001)], str(callers))
+        callees = [(ref.file, ref.bhav_id) for ref in graph.callees("chair.iff", 0x1000)]
+        results.record("Local and semi-global calls resolved",
+                       callees == [("ChairGlobals.iff", 0x2000), ("Chair.iff", 0x1001), ("<unresolved>", 0x0555)], str(callees))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "call_graph.bin"
+            graph.save(path)
+            loaded = CorpusCallGraph.load(path)
+            results.record("Call graph save/load round-trip",
+                           loaded.callers_of_global(0x0118) == graph.callers_of_global(0x0118)
+                           and list(loaded.out_targets) == list(graph.out_targets), "")
+
+    except ImportError as e:
+        results.skip("Corpus Call Graph", f"Import failed: {e}")
+    except Exception as e:
+        results.record("Corpus Call Graph", False, str(e))
+
+
+def test_bhav_reachability():
+    """Test SCC/bitset reachability index and incremental call updates."""
+    print("\n" + "="*60)
+    print("BHAV REACHABILITY")
+    print("="*60)
+
+    try:
+        from formats.iff.chunks.bhav_reachability import ReachabilityIndex
+
+        # 1 -> 2 <-> 3 -> 4, 5 -> 5
+        index = ReachabilityIndex({1: [2], 2: [3], 3: [2, 4], 4: [], 5: [5]})
+        results.record("Descendants through cycle", index.descendants(1) == {2, 3, 4}, str(index.descendants(1)))
+        results.record("Ancestors include cycle mates", index.ancestors(3) == {1, 2}, str(index.ancestors(3)))
+        results.record("Recursion detection",
+                       index.is_recursive(2) and index.is_recursive(5) and not index.is_recursive(1), "")
+        results.record("Path queries", index.has_path(1, 4) and not index.has_path(4, 1), "")
+
+        index.set_callees(4, [6])
+        results.record("Incremental edge added", index.has_path(1, 6) and index.ancestors(6) == {1, 2, 3, 4}, "")
+        index.set_callees(4, [1])
+        results.record("New cycle triggers rebuild", index.is_recursive(1) and index.has_path(4, 3), "")
+        index.set_callees(3, [])
+        results.record("Removed call drops paths", not index.has_path(1, 4) and not index.is_recursive(2), "")
+
+    except ImportError as e:
+        results.skip("BHAV Reachability", f"Import failed: {e}")
+    except Exception as e:
+        results.record("BHAV Reachability", False, str(e))
+
+
+def test_compact_resource_graph():
+    """Test that the array-backed graph answers like ResourceGraph."""
+    print("\n" + "="*60)
+    print("COMPACT RESOURCE GRAPH")
+    print("="*60)
+
+    try:
+        import graph.compact
+        from graph.core import ResourceGraph, ResourceNode, Reference, ReferenceKind, ChunkScope, TGI
+        from graph import CompactResourceGraph
+
+        def node(type_code, chunk_id, scope=ChunkScope.OBJECT):
+            return ResourceNode(TGI(type_code, 1, chunk_id), type_code, "Chair.iff", scope)
+
+        def build(g):
+            objd, a, b = node("OBJD", 1), node("BHAV", 0x1000), node("BHAV", 0x1001)
+            for n in (objd, a, b):
+                g.add_node(n)
+            g.add_reference(Reference(objd, a, ReferenceKind.HARD, "bhav_init_id", edge_kind="behavioral"))
+            g.add_reference(Reference(a, b, ReferenceKind.HARD, "instruction_0", edge_kind="behavioral"))
+            g.add_reference(Reference(b, a, ReferenceKind.HARD, "instruction_3", edge_kind="behavioral"))
+            g.add_reference(Reference(b, node("BHAV", 0x2000, ChunkScope.SEMI_GLOBAL), ReferenceKind.SOFT,
+                                      "instruction_5", confidence=0.7, edge_kind="behavioral"))
+            return g
+
+        def edges(refs):
+            return [(str(r.source), str(r.target), r.target.scope, r.kind, r.source_field, r.confidence) for r in refs]
+
+        old_tail = graph.compact._MIN_TAIL
+        graph.compact._MIN_TAIL = 1  # force CSR rebuilds between additions
+        try:
+            plain, compact = build(ResourceGraph()), build(CompactResourceGraph())
+        finally:
+            graph.compact._MIN_TAIL = old_tail
+
+        same_queries = all(
+            edges(plain.who_references(tgi)) == edges(compact.who_references(tgi))
+            and edges(plain.what_references(tgi)) == edges(compact.what_references(tgi))
+            for tgi in plain.nodes)
+        results.record("Compact graph queries match", same_queries and edges(plain.edges) == edges(compact.edges), "")
+        results.record("Compact graph phantom target", compact.get_node(TGI("BHAV", 1, 0x2000)).is_phantom, "")
+        results.record("Compact graph statistics", plain.statistics() == compact.statistics(), str(compact.statistics()))
+        results.record("Compact graph orphans", [n.tgi for n in compact.find_orphans()] == [TGI("OBJD", 1, 1)], "")
+        results.record("Compact graph cycle detection", len(compact.detect_cycles().cycles) == 1, "")
+
+        # Sofa.iff keeps BHAV 0x1000 alive (as a phantom) when Chair.iff goes
+        removals = []
+        for g in (build(ResourceGraph()), build(CompactResourceGraph())):
+            sofa = ResourceNode(TGI("OBJD", 1, 2), "OBJD", "Sofa.iff", ChunkScope.OBJECT)
+            g.add_node(sofa)
+            g.add_reference(Reference(sofa, node("BHAV", 0x1000), ReferenceKind.HARD, "bhav_init_id"))
+            changed = g.remove_file("Chair.iff")
+            removals.append((sorted(map(str, changed)), sorted(map(str, g.nodes)), edges(g.edges),
+                             g.get_node(TGI("BHAV", 1, 0x1000)).is_phantom, g.statistics(),
+                             edges(g.who_references(TGI("BHAV", 1, 0x1000)))))
+        results.record("Compact graph remove_file matches", removals[0] == removals[1]
+                       and removals[1][3] and len(removals[1][1]) == 2, str(removals[1][:3]))
+
+    except ImportError as e:
+        results.skip("Compact Resource Graph", f"Import failed: {e}")
+    except Exception as e:
+        results.record("Compact Resource Graph", False, str(e))
+
+
+def test_graph_loader_streaming():
+    """Test that the streaming GraphLoader matches load_iff + extract_references."""
+    print("\n" + "="*60)
+    print("GRAPH LOADER STREAMING")
+    print("="*60)
+
+    try:
+        import tempfile
+        from graph.loader import GraphLoader
+
+        def signature(graph):
+            nodes = sorted((repr(n.tgi), n.owner_iff, n.label, n.size, n.is_phantom) for n in graph.nodes.values())
+            edges = sorted((repr(r.source.tgi), r.source.owner_iff, repr(r.target.tgi), r.kind.value,
+                            r.source_field, r.edge_kind) for r in graph.edges)
+            return nodes, edges
+
+        def objd(chunk_id, label, graphic, tree_table, slot):
+            # Field layout read by the graph's minimal OBJD parser (uint16 fields)
+            fields = [0] * 64
+            fields[0], fields[2], fields[3], fields[7], fields[20] = 138, graphic, 1, tree_table, slot
+            return iff_chunk(b'OBJD', chunk_id, struct.pack('<64H', *fields), label)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            # Sofa.iff redefines OBJD 128, so only Chair's copy (and its references)
+            # are kept; Sofa's DGRP 100 replaces the phantom Chair's OBJD points at
+            files = {
+                "Chair.iff": iff_bytes(objd(128, b'Chair', 100, 128, 5), bhav_chunk(0x1000, [0x0118])),
+                "Sofa.iff": iff_bytes(objd(128, b'Sofa', 200, 129, 6), iff_chunk(b'DGRP', 100, b''),
+                                      objd(130, b'Lamp', 300, 129, 0)),
+                "Global.iff": iff_bytes(bhav_chunk(0x0118, [0x0002])),
+            }
+            paths = []
+            for name, data in files.items():
+                (tmp / name).write_bytes(data)
+                paths.append(str(tmp / name))
+
+            eager = GraphLoader()
+            for path in paths:
+                eager.load_iff(path)
+            eager.extract_references()
+            expected = signature(eager.graph)
+
+            streamed = {}
+            for workers in (1, 2):
+                loader = GraphLoader()
+                loaded = loader.load_files_streaming(paths, workers=workers)
+                streamed[workers] = (loaded, signature(loader.graph))
+
+            phantoms = sorted(node[0] for node in expected[0] if node[4])
+            results.record("Eager fixture graph", len(expected[1]) == 5
+                           and phantoms == ["TGI(DGRP, 1, 300)", "TGI(SLOT, 1, 5)", "TGI(TTAB, 1, 128)", "TGI(TTAB, 1, 129)"],
+                           f"{len(expected[0])} nodes, {len(expected[1])} edges, phantoms {phantoms}")
+            results.record("Streaming matches eager load", streamed[1] == (paths, expected), "")
+            results.record("Parallel streaming matches eager load", streamed[2] == (paths, expected), "")
+
+    except ImportError as e:
+        results.skip("Graph Loader Streaming", f"Import failed: {e}")
+    except Exception as e:
+        results.record("Graph Loader Streaming", False, str(e))
+
+
+def test_incremental_graph_analysis():
+    """Test iterative cycle detection and incremental re-validation after edits."""
+    print("\n" + "="*60)
+    print("INCREMENTAL GRAPH ANALYSIS")
+    print("="*60)
+
+    try:
+        from graph.core import ResourceGraph, ResourceNode, Reference, ReferenceKind, ChunkScope, TGI
+
+        def bhav(chunk_id, owner, scope=ChunkScope.OBJECT):
+            return ResourceNode(TGI("BHAV", 1, chunk_id), "BHAV", owner, scope)
+
+        # Deep call chain ending in a loop back to the start
+        chain = ResourceGraph()
+        nodes = [bhav(i, "Chain.iff") for i in range(3000)]
+        for a, b in zip(nodes, nodes[1:] + nodes[:1]):
+            chain.add_reference(Reference(a, b, ReferenceKind.HARD, edge_kind="behavioral"))
+        cycles = chain.detect_cycles().cycles
+        results.record("Iterative Tarjan on deep chain", len(cycles) == 1 and cycles[0].size == 3000, "")
+
+        # Chair.iff: 0x1000 <-> 0x1001, 0x1001 calls semi-global 0x2000 with no GLOB
+        graph = ResourceGraph()
+        a, b = bhav(0x1000, "Chair.iff"), bhav(0x1001, "Chair.iff")
+        graph.add_reference(Reference(a, b, ReferenceKind.HARD, edge_kind="behavioral"))
+        graph.add_reference(Reference(b, a, ReferenceKind.HARD, edge_kind="behavioral"))
+        graph.add_reference(Reference(b, bhav(0x2000, "Chair.iff", ChunkScope.SEMI_GLOBAL),
+                                      ReferenceKind.HARD, edge_kind="behavioral"))
+        detector, validator = graph.detect_cycles(), graph.validate_scope()
+        scope_issues = validator.get_issues_by_category("scope")
+
+        # Edit: 0x1001 no longer calls back into 0x1000 or the semi-global
+        changed = graph.remove_file("Chair.iff")
+        b = bhav(0x1001, "Chair.iff")
+        graph.add_node(bhav(0x1000, "Chair.iff"))
+        graph.add_node(b)
+        graph.add_reference(Reference(graph.get_node(TGI("BHAV", 1, 0x1000)), b, ReferenceKind.HARD,
+                                      edge_kind="behavioral"))
+        changed |= {TGI("BHAV", 1, 0x1000), TGI("BHAV", 1, 0x1001)}
+
+        cycle_diff = detector.update(changed)
+        results.record("Incremental cycle removal", len(cycle_diff.removed) == 1 and not detector.cycles, "")
+        issue_diff = validator.update(changed)
+        resolved = {i.category for i in issue_diff.resolved}
+        results.record("Incremental validation diff", bool(scope_issues) and "scope" in resolved
+                       and not validator.get_issues_by_category("scope"), str(resolved))
+        full = [i.message for i in graph.validate_scope().issues]
+        results.record("Incremental issues match full run", sorted(full) == sorted(i.message for i in validator.issues), "")
+
+    except ImportError as e:
+        results.skip("Incremental Graph Analysis", f"Import failed: {e}")
+    except Exception as e:
+        results.record("Incremental Graph Analysis", False, str(e))
+
+
 def test_bhav_operations():
     """Test BHAV Operations - editing, validation, serialization."""
     print("\n" + "="*60)
@@ -300,6 +683,44 @@ def test_bhav_patching():
 # FORMAT PARSERS
 # ═══════════════════════════════════════════════════════════════════════════════
 
+def test_binary_io():
+    """Test IoBuffer zero-copy reader."""
+    print("\n" + "="*60)
+    print("BINARY IO")
+    print("="*60)
+    
+    try:
+        import struct
+        from utils.binary import IoBuffer, ByteOrder
+        
+        data = struct.pack('<5H', 1, 2, 3, 4, 5) + struct.pack('>I', 0xDEADBEEF) + b'abc\0'
+        io = IoBuffer.from_bytes(data)
+        
+        results.record("read_array bulk read", io.read_array('<H', 5) == (1, 2, 3, 4, 5), "")
+        io.byte_order = ByteOrder.BIG_ENDIAN
+        results.record("Byte order switch", io.read_uint32() == 0xDEADBEEF, "")
+        results.record("has_bytes uses integer position", io.has_bytes(4) and not io.has_bytes(5), "")
+        
+        view = io.read_view(3)
+        results.record("read_view is zero-copy", isinstance(view, memoryview) and view.obj is not None, "")
+        results.record("Position tracks reads", io.position == len(data) - 1, f"Got {io.position}")
+        
+        faces = list(IoBuffer.from_bytes(struct.pack('<6i', *range(6))).iter_records('<iii', 2))
+        results.record("iter_records", faces == [(0, 1, 2), (3, 4, 5)], f"Got {faces}")
+
+        records = IoBuffer.from_bytes(struct.pack('<iHiH', 1, 2, 3, 4) + struct.pack('<4f', 0, 1, 2, 3))
+        results.record("read_array multi-field records", records.read_array('<iH', 2) == (1, 2, 3, 4)
+                       and records.read_array('<ff', 2) == (0.0, 1.0, 2.0, 3.0)
+                       and records.position == len(records), "")
+        
+        print(f"\n  -- IoBuffer bulk reads available")
+        
+    except ImportError as e:
+        results.skip("Binary IO", f"Import failed: {e}")
+    except Exception as e:
+        results.record("Binary IO load", False, str(e))
+
+
 def test_iff_parser():
     """Test IFF file parser."""
     print("\n" + "="*60)
@@ -315,6 +736,51 @@ def test_iff_parser():
         iff = IffFile(filename="test.iff")
         results.record("IffFile instantiation", iff.filename == "test.iff", "")
         
+        # Lazy load: headers indexed, payloads parsed on first access
+        from formats.iff.chunks.bcon import BCON
+        data = iff_bytes(iff_chunk(b'BCON', 2, b'\x01\x00' + struct.pack('<h', 5), b'test'))
+        
+        lazy = IffFile.from_bytes(data, "test.iff", lazy=True)
+        results.record("Lazy IFF indexes headers", len(lazy) == 1 and lazy._index[0].chunk is None, "")
+        bcon = lazy.get(BCON, 2)
+        results.record("Lazy IFF parses on get()", bcon is not None and bcon.constants == [5], "")
+        results.record("Lazy IFF caches parsed chunk", lazy.get(BCON, 2) is bcon, "")
+        
+        # Concurrent materialization must not share a read cursor
+        from concurrent.futures import ThreadPoolExecutor
+        many = iff_bytes(*(iff_chunk(b'BCON', i, b'\x01\x00' + struct.pack('<h', i)) for i in range(200)))
+        with IffFile.from_bytes(many, "many.iff", lazy=True) as shared:
+            with ThreadPoolExecutor(8) as pool:
+                values = list(pool.map(lambda i: shared.get(BCON, i).constants, range(200)))
+        results.record("Lazy IFF threaded materialize", values == [[i] for i in range(200)]
+                       and shared._source is None, "")
+        results.record("Closed lazy IFF keeps parsed chunks", len(shared) == 200
+                       and shared.get(BCON, 7).constants == [7], f"{len(shared)} chunks")
+        
+        with IffFile.from_bytes(many, "many.iff", lazy=True) as partial:
+            first = partial.get(BCON, 3)
+        results.record("close() moves parsed chunks to eager storage", partial.get(BCON, 3) is first
+                       and len(partial) == 1 and list(partial) == [first] and partial.get(BCON, 4) is None, "")
+        
+        racing = IffFile.from_bytes(many, "many.iff", lazy=True)
+        with ThreadPoolExecutor(8) as pool:
+            totals = list(pool.map(lambda _: len(racing.chunks), range(8)))
+        results.record("Concurrent .chunks materializes once", totals == [200] * 8
+                       and len(racing._all_chunks) == 200, str(totals))
+        
+        closing = IffFile.from_bytes(many, "many.iff", lazy=True)
+        def lookup(i):
+            if i == 100:
+                closing.close()
+            chunk = closing.get(BCON, i % 200)
+            return chunk is None or chunk.constants == [i % 200]
+        with ThreadPoolExecutor(8) as pool:
+            consistent = all(pool.map(lookup, range(400)))
+        results.record("get() racing close()", consistent and closing._source is None, "")
+        
+        filtered = IffFile.from_bytes(data, "test.iff", only_types={'OBJD'})
+        results.record("only_types skips other chunks", len(filtered) == 0, f"Got {len(filtered)}")
+        
         print(f"\n  -- IFF parser available")
         
     except ImportError as e:
@@ -338,6 +804,24 @@ def test_far_parser():
         entry = FarEntry(filename="test.dat", data_length=1024)
         results.record("FarEntry instantiation", entry.data_length == 1024, "")
         
+        import tempfile, os
+        far_data = far_bytes([('A.iff', b'hello'), ('b.iff', b'world')])
+        with tempfile.NamedTemporaryFile(suffix='.far', delete=False) as f:
+            f.write(far_data)
+        try:
+            with FAR1Archive(f.name) as far:
+                results.record("FAR1 indexed lookup", far.get_entry('b.iff') == b'world', "")
+                results.record("FAR1 case-insensitive lookup", far.get_entry('a.IFF', ignore_case=True) == b'hello', "")
+                results.record("FAR1 iter_entries", [bytes(v) for _, v in far.iter_entries()] == [b'hello', b'world'], "")
+        finally:
+            os.unlink(f.name)
+        
+        from utils import refpack
+        sample = b'FAR3 RefPack ' * 200 + bytes(range(256))
+        packed = refpack.compress(sample)
+        results.record("RefPack round-trip", refpack.decompress(packed) == sample, "")
+        results.record("RefPack compresses", len(packed) < len(sample) // 4, f"Got {len(packed)} bytes")
+        
         print(f"\n  -- FAR parser available")
         
     except ImportError as e:
@@ -359,6 +843,30 @@ def test_dbpf_parser():
         results.record("OBJD type ID", DBPFTypeID.OBJD == 0xC0C0C001, f"Got {hex(DBPFTypeID.OBJD)}")
         results.record("BHAV type ID", DBPFTypeID.BHAV == 0xC0C0C002, f"Got {hex(DBPFTypeID.BHAV)}")
         
+        from io import BytesIO
+        from formats.dbpf.dbpf import DBPFFile
+        payload = b"BHAV payload " * 20
+        packed = DBPFFile.compress_entry(payload)
+        lookalike = b"\x00\x00\x00\x00\x10\xfb raw resource"   # Uncompressed, RefPack-like at [4:]
+        directory = struct.pack('<IIII', DBPFTypeID.BHAV, 1, 2, len(payload))
+        header_size = 88
+        blobs = [(DBPFTypeID.BHAV, 1, 2, packed), (DBPFTypeID.BCON, 1, 3, lookalike),
+                 (DBPFTypeID.DIR, 0, 0, directory)]
+        index, offset = b'', header_size
+        for type_id, group, instance, blob in blobs:
+            index += struct.pack('<IIIII', type_id, group, instance, offset, len(blob))
+            offset += len(blob)
+        header = (b'DBPF' + struct.pack('<II', 1, 1) + bytes(12)
+                  + struct.pack('<8I', 7, len(blobs), offset, len(index), 0, 0, 0, 0) + bytes(32))
+        dbpf = DBPFFile()
+        dbpf.read(BytesIO(header + b''.join(b[3] for b in blobs) + index))
+        compressed, raw = dbpf.entries[0], dbpf.entries[1]
+        results.record("DBPF get_entry raw by default", dbpf.get_entry(compressed) == packed
+                       and dbpf.get_entry(raw) == lookalike, "")
+        results.record("DBPF decompress uses DIR", dbpf.is_compressed(compressed) and not dbpf.is_compressed(raw)
+                       and dbpf.get_entry(compressed, decompress=True) == payload
+                       and dbpf.get_entry(raw, decompress=True) == lookalike, "")
+        
         print(f"\n  -- DBPF parser available, {len(list(DBPFTypeID))} type IDs defined")
         
     except ImportError as e:
@@ -385,6 +893,37 @@ def test_chunk_parsers():
     
     print(f"\n  -- Total chunk parsers: {len(chunk_names)}")
 
+    try:
+        import struct
+        from formats.iff.chunks.spr import SPR2Frame
+        from formats.iff.chunks.palt import PALT
+        from formats.iff.chunks.sprite_export import SPR2Decoder
+
+        palt = PALT()
+        palt.colors = [(i, 255 - i, 7) for i in range(256)]
+        # Row 0: 2x (z, index), skip 1, 1x (z, index, alpha); then end
+        row = (struct.pack('<H', (1 << 13) | 2) + bytes([10, 1, 20, 2]) +
+               struct.pack('<H', (3 << 13) | 1) +
+               struct.pack('<H', (2 << 13) | 1) + bytes([30, 3, 128]) + b'\x00')
+        raw = struct.pack('<H', len(row) + 2) + row + struct.pack('<H', 5 << 13)
+        frame = SPR2Frame(width=4, height=2, flags=0x07, transparent_index=2, raw_data=raw)
+
+        decoder = SPR2Decoder(palt)
+        sprite = decoder.decode_frame(frame)
+        results.record("SPR2 decode pixels", sprite.rgba_data[:16] ==
+                       bytes([1, 254, 7, 255, 2, 253, 7, 0, 0, 0, 0, 0, 3, 252, 7, 128]), "")
+        results.record("SPR2 decode zbuffer", sprite.zbuffer_data == bytes([10, 20, 255, 30, 255, 255, 255, 255]), "")
+        results.record("SPR2 palette tables cached",
+                       decoder.palette_tables(palt, 2) is decoder.palette_tables(palt, 2), "")
+        palt.colors[1] = (9, 9, 9)
+        results.record("SPR2 palette tables follow edits", decoder.palette_tables(palt, 2)[0][1] == 9, "")
+        from formats.iff.chunks.sprite_export import PALETTE_CACHE_SIZE
+        for i in range(PALETTE_CACHE_SIZE + 10):
+            decoder.palette_tables(PALT.from_color((i, 0, 0)), 0)
+        results.record("SPR2 palette cache bounded", len(decoder._tables) == PALETTE_CACHE_SIZE, "")
+    except Exception as e:
+        results.record("SPR2 decode", False, str(e))
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # ENTITIES
@@ -616,6 +1155,331 @@ def test_mesh_export():
         results.record("Mesh Export", False, str(e))
 
 
+def test_gltf_export():
+    """Test glTF/GLB mesh export."""
+    print("\n" + "="*60)
+    print("GLTF EXPORT")
+    print("="*60)
+
+    try:
+        import json
+        import struct
+        import tempfile
+        from formats.mesh.bmf import BMFMesh, Vertex, TextureVertex, BoneBinding, BlendData
+        from formats.mesh.bcf import Skeleton, Bone, Vector3, Quaternion
+        from formats.mesh.gltf_export import GLTFExporter
+
+        mesh = BMFMesh(mesh_name="Tri", texture_name="tri.bmp")
+        mesh.vertices = [Vertex(0.1, 0, 0), Vertex(1, 0, 0), Vertex(0.5, 1, 0, 0, 0, 1)]
+        mesh.texture_coords = [TextureVertex(0, 0), TextureVertex(1, 0), TextureVertex(0.5, 1)]
+        mesh.faces = [(0, 1, 2)]
+        mesh.bone_names = ["ROOT", "SPINE"]
+        mesh.bone_bindings = [BoneBinding(0, 0, 2), BoneBinding(1, 2, 1)]
+        mesh.blend_data = [BlendData(0.75, 2)]
+        skeleton = Skeleton(name="adult", bones=[
+            Bone(name="ROOT", translation=Vector3(1, 2, 3), rotation=Quaternion(0, 0, 0.6, 0.8)),
+            Bone(name="SPINE", parent_name="ROOT", translation=Vector3(0, 1, 0), rotation=Quaternion(0.6, 0, 0, 0.8)),
+        ])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            GLTFExporter().export(mesh, skeleton, f"{tmp}/tri.glb")
+            with open(f"{tmp}/tri.glb", 'rb') as f:
+                data = f.read()
+
+        magic, version, length = struct.unpack_from('<4sII', data)
+        json_len, json_type = struct.unpack_from('<I4s', data, 12)
+        bin_len, bin_type = struct.unpack_from('<I4s', data, 20 + json_len)
+        gltf = json.loads(data[20:20 + json_len])
+        results.record("GLB header and chunks", magic == b'glTF' and version == 2 and length == len(data)
+                       and json_type == b'JSON' and bin_type == b'BIN\0'
+                       and json_len % 4 == 0 and bin_len % 4 == 0
+                       and 'uri' not in gltf['buffers'][0], f"{len(data)} bytes")
+
+        binary = data[28 + json_len:]
+        def read(index):
+            accessor = gltf['accessors'][index]
+            view = gltf['bufferViews'][accessor['bufferView']]
+            width = {'SCALAR': 1, 'VEC2': 2, 'VEC3': 3, 'VEC4': 4, 'MAT4': 16}[accessor['type']]
+            code = {5121: 'B', 5123: 'H', 5125: 'I', 5126: 'f'}[accessor['componentType']]
+            return struct.unpack_from(f"<{accessor['count'] * width}{code}", binary, view['byteOffset'])
+
+        attributes = gltf['meshes'][0]['primitives'][0]['attributes']
+        positions = read(attributes['POSITION'])
+        bounds = gltf['accessors'][attributes['POSITION']]
+        results.record("GLB positions and bounds", positions[:3] == (struct.unpack('<f', struct.pack('<f', -0.1))[0], 0, 0)
+                       and bounds['min'] == [min(positions[0::3]), 0.0, 0.0]
+                       and bounds['max'] == [max(positions[0::3]), 1.0, 0.0], str(bounds))
+        results.record("GLB skin data", read(attributes['JOINTS_0']) == (0, 1, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0)
+                       and read(attributes['WEIGHTS_0'])[:2] == (0.75, 0.25), "")
+
+        # Joint indices past 255 switch JOINTS_0 to UNSIGNED_SHORT
+        large = Skeleton(name="large", bones=[Bone(name=f"EXTRA{i}") for i in range(300)] + skeleton.bones)
+        with tempfile.TemporaryDirectory() as tmp:
+            GLTFExporter().export(mesh, large, f"{tmp}/large.glb")
+            with open(f"{tmp}/large.glb", 'rb') as f:
+                large_data = f.read()
+        large_json_len = struct.unpack_from('<I', large_data, 12)[0]
+        large_gltf = json.loads(large_data[20:20 + large_json_len])
+        joints = large_gltf['accessors'][large_gltf['meshes'][0]['primitives'][0]['attributes']['JOINTS_0']]
+        view = large_gltf['bufferViews'][joints['bufferView']]
+        results.record("GLB joints past 255", joints['componentType'] == 5123
+                       and struct.unpack_from('<12H', large_data, 28 + large_json_len + view['byteOffset'])
+                       == (300, 301, 0, 0, 300, 0, 0, 0, 301, 0, 0, 0), str(joints))
+
+        # SPINE's inverse bind matrix undoes ROOT * SPINE
+        exporter = GLTFExporter()
+        skeleton.build_hierarchy()
+        world = exporter._world_matrices(skeleton)
+        spine = skeleton.bones[1]
+        expected = exporter._mat4_multiply(exporter._bone_to_matrix(skeleton.bones[0]),
+                                           exporter._bone_to_matrix(spine))
+        ibm = read(gltf['skins'][0]['inverseBindMatrices'])[16:32]
+        identity = exporter._mat4_multiply(list(ibm), expected)
+        results.record("Bone world transforms", world[id(spine)] == expected
+                       and all(abs(a - b) < 1e-5 for a, b in zip(identity, [1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1])), "")
+
+    except ImportError as e:
+        results.skip("glTF Export", f"Import failed: {e}")
+    except Exception as e:
+        results.record("glTF Export", False, str(e))
+
+
+def test_mesh_arrays():
+    """Test struct-of-arrays mesh decoding for BMF/SKN."""
+    print("\n" + "="*60)
+    print("MESH ARRAYS")
+    print("="*60)
+
+    try:
+        from formats.mesh.bmf import BMFReader, Vertex, BlendData, BoneBinding
+        from formats.mesh.skn import SKNReader
+        from formats.mesh.mesh_arrays import mesh_arrays, iter_rows, to_list
+
+        data = (pascal("Tri") + pascal("tri") + struct.pack('<i', 1) + pascal("ROOT")
+                + struct.pack('<i', 1) + struct.pack('<iii', 0, 1, 2)
+                + struct.pack('<i', 1) + struct.pack('<iiiii', 0, 0, 3, 0, 1)
+                + struct.pack('<i', 3) + struct.pack('<6f', 0, 0, 1, 0, 0.5, 1)
+                + struct.pack('<i', 1) + struct.pack('<ii', 0x4000, 2)
+                + struct.pack('<i', 3) + struct.pack('<18f', *range(18))
+                + struct.pack('<6f', 1, 2, 3, 0, 0, 1))
+        mesh = BMFReader().read_bytes(data)
+        arrays = mesh_arrays(mesh)
+        results.record("BMF decoded to arrays", arrays is mesh.arrays and arrays.vertex_count == 3
+                       and arrays.blend_vertex_count == 1 and arrays.face_count == 1
+                       and list(iter_rows(arrays.normals, 3))[1] == (9.0, 10.0, 11.0)
+                       and to_list(arrays.blend_weights) == [0.5]
+                       and len(mesh.vertices) == 3 and not mesh.vertices.materialized, "")
+
+        results.record("BMF object views", mesh.vertices[1] == Vertex(6, 7, 8, 9, 10, 11)
+                       and mesh.blend_vertices == [Vertex(1, 2, 3, 0, 0, 1)]
+                       and mesh.faces == [(0, 1, 2)] and mesh.blend_data == [BlendData(0.5, 2)]
+                       and mesh.bone_bindings == [BoneBinding(0, 0, 3, 0, 1)]
+                       and mesh.texture_coords[2].v == 1.0, "")
+
+        # Once the objects are built, edits to them are what gets exported
+        mesh.vertices[0].x = 5.0
+        results.record("Edited objects repacked", mesh.to_arrays() is not mesh.arrays
+                       and list(iter_rows(mesh.to_arrays().positions, 3))[0] == (5.0, 1.0, 2.0), "")
+
+        skn = SKNReader().read_string("\n".join([
+            "Tri", "tri", "1", "ROOT", "1", "0 1 2", "1", "0 0 3 0 0",
+            "3", "0 0", "1 0", "0.5 1", "1", "0.25 2",
+            "3", "0 0 0 0 0 1", "1 0 0 0 0 1", "0.5 1 0 0 0 1"]))
+        arrays = skn.to_arrays()
+        results.record("SKN parsed to arrays", arrays is skn.arrays and arrays.vertex_count == 3
+                       and arrays.uv_count == 3 and to_list(arrays.blend_others) == [2]
+                       and skn.vertices[2].x == 0.5 and skn.blend_data[0].weight == 0.25
+                       and skn.faces == [(0, 1, 2)], f"{arrays.vertex_count} vertices")
+
+        import copy
+        import pickle
+        fresh = BMFReader().read_bytes(data)
+        restored = pickle.loads(pickle.dumps(fresh))
+        results.record("Unbuilt mesh pickles", restored.vertices == fresh.vertices
+                       and type(restored.vertices) is list, "")
+
+        views = BMFReader().read_bytes(data)
+        ops = [views.faces.copy(), copy.copy(views.faces), copy.deepcopy(views.faces),
+               views.faces * 2, 2 * views.faces, views.faces[:], views.faces + [(2, 1, 0)]]
+        results.record("LazyList list operations", all(type(op) is list for op in ops)
+                       and ops[0] == ops[1] == ops[2] == ops[5] == [(0, 1, 2)]
+                       and ops[3] == ops[4] == [(0, 1, 2)] * 2 and len(ops[6]) == 2
+                       and ops[0] is not views.faces.data, str(ops))
+
+    except ImportError as e:
+        results.skip("Mesh Arrays", f"Import failed: {e}")
+    except Exception as e:
+        results.record("Mesh Arrays", False, str(e))
+
+
+def test_asset_scanner():
+    """Test that parallel asset scans match a serial scan."""
+    print("\n" + "="*60)
+    print("ASSET SCANNER")
+    print("="*60)
+    
+    try:
+        import tempfile, sqlite3
+        from core.asset_scanner import AssetScanner, ScannerConfig, ScanPath
+        
+        def rows(db_path):
+            conn = sqlite3.connect(str(db_path))
+            tables = {table: conn.execute(f'SELECT * FROM {table} ORDER BY id').fetchall()
+                      for table in ('objects', 'meshes', 'characters')}
+            conn.close()
+            return tables
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            write_asset_tree(tmp / "game")
+            config = ScannerConfig()
+            config.paths = [ScanPath(str(tmp / "game"), "Fixture")]
+            
+            scans = {}
+            for workers in (1, 2):
+                scanner = AssetScanner(config)
+                scanner.scan_all(progress_callback=lambda progress: None, workers=workers)
+                scanner.save_database(tmp / f"assets_{workers}.sqlite")
+                scans[workers] = (rows(tmp / f"assets_{workers}.sqlite"), scanner.progress)
+            
+            serial, parallel = scans[1][0], scans[2][0]
+            results.record("Serial scan finds fixture assets", len(serial['objects']) == 41
+                           and len(serial['meshes']) == 2 and len(serial['characters']) == 1,
+                           str({table: len(found) for table, found in serial.items()}))
+            results.record("Parallel scan rows match serial", parallel == serial, "")
+            results.record("Parallel scan progress", scans[2][1].processed_files == 42
+                           and scans[2][1].objects_found == 41 and not scans[2][1].errors,
+                           str(scans[2][1].errors))
+        
+    except ImportError as e:
+        results.skip("Asset Scanner", f"Import failed: {e}")
+    except Exception as e:
+        results.record("Asset Scanner", False, str(e))
+
+
+def test_asset_refresh():
+    """Test incremental database refresh against source fingerprints."""
+    print("\n" + "="*60)
+    print("ASSET REFRESH")
+    print("="*60)
+    
+    try:
+        import os, tempfile, sqlite3, zipfile
+        from core.asset_scanner import AssetScanner, ScannerConfig, ScanPath
+        
+        def table(db_path, query):
+            conn = sqlite3.connect(str(db_path))
+            found = conn.execute(query).fetchall()
+            conn.close()
+            return found
+        
+        quiet = lambda progress: None
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            game = tmp / "game"
+            write_asset_tree(game, far_objects=4)
+            # A ZIP member whose data no longer matches its CRC fails to extract
+            with zipfile.ZipFile(game / "Broken.zip", 'w') as zf:
+                zf.writestr("Bad.iff", iff_bytes(objd_chunk(128, 0xBAD, "Corrupted")))
+            raw = (game / "Broken.zip").read_bytes()
+            (game / "Broken.zip").write_bytes(raw.replace(b'Corrupted', b'Corrupteb'))
+            
+            config = ScannerConfig()
+            config.paths = [ScanPath(str(game), "Fixture")]
+            db_path = tmp / "assets.sqlite"
+            
+            scanner = AssetScanner(config)
+            counts = scanner.refresh_database(db_path, progress_callback=quiet)
+            sources = {row[0] for row in table(db_path, 'SELECT member FROM sources')}
+            results.record("Refresh adds every source", counts['added'] == 7 and len(sources) == 6
+                           and 'Bad.iff' not in sources and 'CRC' in str(scanner.progress.errors),
+                           f"{counts} {sorted(sources)} {scanner.progress.errors}")
+            
+            counts = AssetScanner(config).refresh_database(db_path, progress_callback=quiet)
+            results.record("Unchanged skipped, failed retried",
+                           counts == {'added': 1, 'changed': 0, 'removed': 0, 'unchanged': 6}, str(counts))
+            
+            chair = game / "GameData" / "Chair.iff"
+            mtime = chair.stat().st_mtime_ns
+            chair.write_bytes(iff_bytes(objd_chunk(128, 0x00BEEF00, "Chair")))
+            os.utime(chair, ns=(mtime + 10**9, mtime + 10**9))
+            (game / "Neighbors.zip").unlink()
+            (game / "GameData" / "Table.iff").write_bytes(iff_bytes(objd_chunk(128, 0x7AB1E, "Table")))
+            counts = AssetScanner(config).refresh_database(db_path, progress_callback=quiet)
+            guids = {row[0] for row in table(db_path, 'SELECT guid FROM objects')}
+            results.record("Refresh counts add/change/remove",
+                           counts == {'added': 2, 'changed': 1, 'removed': 1, 'unchanged': 4}, str(counts))
+            results.record("Refresh replaces changed and removed rows", 0x00BEEF00 in guids and 0x7AB1E in guids
+                           and 0x00C0FFEE not in guids and len(guids) == 6
+                           and table(db_path, 'SELECT COUNT(*) FROM characters') == [(0,)], str(guids))
+            
+            # A refresh that fails part-way leaves the database as it was
+            before = table(db_path, 'SELECT source_key, hash FROM sources ORDER BY source_key')
+            (game / "GameData" / "Table.iff").unlink()
+            def fail(progress):
+                if progress.processed_files:
+                    raise RuntimeError("interrupted")
+            try:
+                AssetScanner(config).refresh_database(db_path, progress_callback=fail)
+                interrupted = False
+            except RuntimeError:
+                interrupted = True
+            results.record("Failed refresh rolled back", interrupted
+                           and table(db_path, 'SELECT source_key, hash FROM sources ORDER BY source_key') == before
+                           and 0x7AB1E in {row[0] for row in table(db_path, 'SELECT guid FROM objects')}, "")
+        
+    except ImportError as e:
+        results.skip("Asset Refresh", f"Import failed: {e}")
+    except Exception as e:
+        results.record("Asset Refresh", False, str(e))
+
+
+def test_asset_database():
+    """Test asset database writes and indexed queries."""
+    print("\n" + "="*60)
+    print("ASSET DATABASE")
+    print("="*60)
+    
+    try:
+        import tempfile, sqlite3
+        from core.asset_scanner import AssetScanner, ObjectRecord, MeshRecord
+        from core.asset_index import AssetIndex
+        
+        scanner = AssetScanner()
+        scanner.objects = [ObjectRecord(0x1000 + i, f"Obj{i}", f"obj{i % 3}.iff") for i in range(10)]
+        scanner.meshes = [MeshRecord("b001mafit_01", "body", "a.iff", age="adult", gender="male", body_type="fit"),
+                          MeshRecord("B002FAFAT_01", "body", "b.iff", age="adult", gender="female", body_type="fat"),
+                          MeshRecord("c001ma_head", "head", "a.iff", age="adult", gender="male"),
+                          MeshRecord("b001mafit_01", "body", "c.iff")]
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = Path(tmp) / "assets.sqlite"
+            scanner.save_database(db_path)
+            
+            conn = sqlite3.connect(str(db_path))
+            indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+            plan = conn.execute("EXPLAIN QUERY PLAN SELECT * FROM objects WHERE guid = 1").fetchall()
+            conn.close()
+            results.record("Asset DB lookup indexes",
+                           {'idx_objects_guid', 'idx_meshes_name', 'idx_meshes_skin'} <= indexes, str(indexes))
+            results.record("GUID lookup uses index", 'idx_objects_guid' in str(plan), str(plan))
+            
+            with AssetIndex(db_path) as index:
+                found = index.find_by_guid(0x1004)
+                results.record("AssetIndex.find_by_guid", [o.name for o in found] == ["Obj4"], str(found))
+                results.record("AssetIndex.find_meshes(prefix)",
+                               [m.mesh_name for m in index.find_meshes(prefix="b00")] == ["b001mafit_01", "B002FAFAT_01"], "")
+                results.record("AssetIndex.find_meshes(filters)",
+                               [m.mesh_name for m in index.find_meshes(age="adult", gender="male", mesh_type="head")] == ["c001ma_head"], "")
+                results.record("AssetIndex.find_objects paging",
+                               len(index.find_objects(source_file="obj1.iff")) == 3 and len(index.find_objects(limit=4, offset=8)) == 2, "")
+        
+    except ImportError as e:
+        results.skip("Asset Database", f"Import failed: {e}")
+    except Exception as e:
+        results.record("Asset Database", False, str(e))
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # GUI
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -842,7 +1706,149 @@ def test_webviewer():
         results.record("export_server.py syntax", True, "Valid Python")
     except SyntaxError as e:
         results.record("export_server.py syntax", False, str(e))
-    
+
+    try:
+        from webviewer.sprite_cache import SpriteCache, content_hash
+        from formats.iff.chunks.sprite_export import DecodedSprite
+
+        cache = SpriteCache(max_bytes=100)
+        sprite = DecodedSprite(width=4, height=4, rgba_data=bytes(64))
+        src = content_hash(b"IFF")
+        cache.put((src, 1, 0, -1), sprite, b"p" * 10)
+        hit = cache.get_or_decode((src, 1, 0, -1), lambda: None, lambda s: b"")
+        results.record("SpriteCache hit", hit is not None and hit.png == b"p" * 10, "")
+        cache.put((src, 2, 0, -1), sprite, b"p" * 10)
+        results.record("SpriteCache evicts by size",
+                       len(cache) == 1 and (src, 2, 0, -1) in cache and cache.total_bytes == 74, "")
+        stats = cache.stats()
+        results.record("SpriteCache stats", stats['hits'] == 1 and stats['evictions'] == 1, str(stats))
+    except Exception as e:
+        results.record("SpriteCache", False, str(e))
+
+    try:
+        import tempfile
+        from webviewer.asset_name_index import AssetNameIndex
+
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            skins = tmp / "Skins"
+            skins.mkdir()
+            for name in ("xskin-B001FAFit_01-PELVIS-BODY.skn", "B001FAFit_01.bmf", "adult-skeleton.cmx.bcf"):
+                (skins / name).write_bytes(b"loose")
+            far_path = tmp / "Skins.far"
+            far_path.write_bytes(far_bytes([("xskin-C002MA-HEAD-HEAD.skn", b"head"),
+                                            ("C002MAlgt.bmp", b"texr")]))
+
+            cache_path = tmp / "names.json"
+            index = AssetNameIndex(cache_path)
+            index.configure([skins], [far_path], skeleton_dirs=[skins])
+            body = index.find_mesh("B001FAFit_01")
+            head = index.find_mesh("xskin-c002ma-HEAD-HEAD.skn")
+            tex = index.find_texture("c002malgt")
+            results.record("Name index exact stem first", body is not None and body.name == "B001FAFit_01.bmf", "")
+            results.record("Name index FAR mesh range", head is not None and head.in_far
+                           and (head.offset, head.length) == (16, 4), str(head))
+            results.record("Name index texture and skeleton", tex is not None and tex.offset == 20
+                           and index.find_skeleton().name == "adult-skeleton.cmx.bcf", "")
+
+            reloaded = AssetNameIndex(cache_path)
+            rescans = reloaded.configure([skins], [far_path], skeleton_dirs=[skins])
+            results.record("Name index persisted", rescans == 0 and reloaded.scans == 0
+                           and reloaded.find_mesh("C002MA").in_far, str(reloaded.stats()))
+
+            # A worker started earlier picks up the server's rescan from disk
+            worker = AssetNameIndex(cache_path)
+            extra = tmp / "Downloads"
+            extra.mkdir()
+            (extra / "D003.bmf").write_bytes(b"loose")
+            index.configure([skins, extra], [far_path], skeleton_dirs=[skins])
+            worker.configure([skins, extra], [far_path], skeleton_dirs=[skins], scan=False)
+            results.record("Name index workers reload saved scans", worker.scans == 0
+                           and worker.find_mesh("D003") is not None and worker.scans == 0
+                           and not list(tmp.glob("*.tmp")), str(worker.stats()))
+    except Exception as e:
+        results.record("AssetNameIndex", False, str(e))
+
+    try:
+        import threading
+        from webviewer.export_jobs import ExportJobPool, EndpointLatencies, PoolBusy
+
+        release = threading.Event()
+        pool = ExportJobPool(max_workers=2, processes=False, max_pending=2)
+        done = []
+        first = pool.submit(("mesh", "B001"), lambda: release.wait(5) and ("body", 200), on_done=done.append)
+        second = pool.submit(("mesh", "B001"), lambda: ("other", 200), on_done=done.append)
+        pool.submit(("mesh", "C002"), release.wait, 5)
+        try:
+            pool.submit(("mesh", "D003"), lambda: None)
+            busy = False
+        except PoolBusy:
+            busy = True
+        release.set()
+        results.record("Export jobs coalesce in-flight requests", second is first
+                       and first.result(5) == ("body", 200), str(pool.stats()))
+        results.record("Export pool bounded", busy and pool.stats()['rejected'] == 1, "")
+        pool.shutdown()
+        results.record("Export job on_done runs once", done == [first], str(done))
+
+        import multiprocessing
+        before = len(multiprocessing.active_children())
+        processes = ExportJobPool(max_workers=2).start()
+        results.record("Export pool started warm", len(multiprocessing.active_children()) - before == 2, "")
+        results.record("Export jobs in worker process", processes.submit(("pow",), pow, 2, 10).result(30) == 1024, "")
+        processes.shutdown()
+
+        latencies = EndpointLatencies()
+        for ms in (3, 4, 40, 900):
+            latencies.observe("export_mesh", ms / 1000)
+        snap = latencies.snapshot()["export_mesh"]
+        results.record("Latency histogram", snap['count'] == 4 and snap['p50_ms'] == 5.0
+                       and snap['p99_ms'] == 1000.0 and snap['buckets']['<=50ms'] == 1, str(snap))
+    except Exception as e:
+        results.record("ExportJobPool", False, str(e))
+
+    try:
+        import os
+        import tempfile
+        from webviewer.export_cache import ExportCache, export_key
+
+        key = export_key(b"mesh", b"skel", b"", {'format': 'bmf'}, 1)
+        results.record("Export cache key covers inputs", key == export_key(b"mesh", b"skel", b"", {'format': 'bmf'}, 1)
+                       and key != export_key(b"mesh", b"skel", b"", {'format': 'bmf'}, 2)
+                       and key != export_key(b"mesh", b"", b"skel", {'format': 'bmf'}, 1), key)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ExportCache(tmp, max_bytes=250)
+            miss = cache.get(key)
+            src = cache.temp_path('.gltf')
+            src.write_bytes(b"x" * 100)
+            entry = cache.put(key, src, {'has_skeleton': True})
+            hit = cache.get(key)
+            results.record("Export cache put/get", miss is None and hit is not None
+                           and hit.path.read_bytes() == b"x" * 100 and hit.meta == {'has_skeleton': True}
+                           and hit.path == entry.path and not src.exists(), str(cache.stats()))
+
+            others = []
+            for i in range(2):
+                other = export_key(b"mesh%d" % i)
+                src = cache.temp_path('.gltf')
+                src.write_bytes(b"y" * 100)
+                others.append(cache.put(other, src))
+                os.utime(others[-1].path, (1000 + i, 1000 + i))
+            # Two older entries plus key's exceed the cap; the oldest goes
+            results.record("Export cache LRU cap", cache.get(key) is not None
+                           and not others[0].path.exists() and others[1].path.exists()
+                           and cache.stats()['evictions'] == 1, str(cache.stats()))
+            hits, misses, _ = cache.counts()
+            cache.add_counts(2, 1, 0)
+            results.record("Export cache adds worker counts", cache.counts()[:2] == (hits + 2, misses + 1)
+                           and cache.stats()['hits'] == hits + 2, str(cache.stats()))
+            result = cache.gc(0)
+            results.record("Export cache gc", result['removed'] == 2 and result['remaining'] == 0
+                           and cache.get(key) is None, str(result))
+    except Exception as e:
+        results.record("ExportCache", False, str(e))
+
     print(f"\n  -- Webviewer directory: {webviewer_dir}")
 
 
@@ -912,6 +1918,228 @@ def test_semantic_globals():
     print(f"\n  -- Semantic globals provides expansion-aware BHAV labeling")
 
 
+def test_forensic_store():
+    """Test the per-instruction forensic store and its cross-pack queries."""
+    print("\n" + "="*60)
+    print("FORENSIC STORE")
+    print("="*60)
+
+    try:
+        import tempfile
+        from core.forensic_store import ForensicStore
+
+        def bhav_iff(*opcodes):
+            return iff_bytes(bhav_chunk(0x1000, opcodes, operand=lambda op: bytes([op & 0xFF]) * 8))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            for pack in ("base", "ep1"):
+                (tmp / pack).mkdir()
+                (tmp / pack / "Stoves.iff").write_bytes(bhav_iff(0x0157, 0x0002, 0x0157))
+                (tmp / pack / "StovesGas.iff").write_bytes(bhav_iff(0x0157, 0x0002))
+                (tmp / pack / "TubC.iff").write_bytes(bhav_iff(0x0002, 0x0200))
+
+            with ForensicStore(tmp / "forensic.db") as store:
+                store.ingest("BASE", tmp / "base")
+                store.ingest("EP1", tmp / "ep1")
+                results.record("Instructions stored per pack",
+                               store.instruction_count("BASE") == 7 and store.instruction_count() == 14, "")
+
+                rows = store.instructions(0x0157, "BASE")
+                results.record("Instruction facts kept", rows[0] == ("BASE", "Stoves", 0x1000, 0, 0xFE, 0xFF, b'\x57' * 8)
+                               and len(rows) == 3, str(rows[:1]))
+
+                by_opcode = store.objects_by_opcode("BASE")
+                results.record("Objects by opcode", by_opcode[0x0157] == ["Stoves", "StovesGas"]
+                               and by_opcode[0x0002] == ["Stoves", "StovesGas", "TubC"], str(by_opcode))
+
+                profile = store.profiles("BASE")[0x0157]
+                results.record("Confidence from store", profile.confidence_level == "HIGH", profile.confidence_level)
+                results.record("Profile counts occurrences", profile.total_occurrences == 3
+                               and profile.unique_object_count == 2,
+                               f"{profile.total_occurrences}/{profile.unique_object_count}")
+                results.record("Cross-pack HIGH validation",
+                               store.opcode_packs("HIGH", min_packs=2) == {0x0157: ["BASE", "EP1"]},
+                               str(store.opcode_packs("HIGH")))
+
+                pairs = store.cooccurrence("BASE")
+                results.record("Co-occurrence self-join",
+                               pairs[0] == (0x0002, 0x0157, 2) and (0x0002, 0x0200, 1) in pairs
+                               and store.cooccurrence("BASE", min_shared=2) == [(0x0002, 0x0157, 2)], str(pairs))
+                results.record("Shared objects", store.shared_objects("EP1", [0x0002, 0x0157]) == ["Stoves", "StovesGas"], "")
+
+                (tmp / "ep1" / "TubC.iff").unlink()
+                store.ingest("EP1", tmp / "ep1")
+                results.record("Re-ingest replaces pack", store.instruction_count("EP1") == 5
+                               and store.instruction_count() == 12, str(store.instruction_count("EP1")))
+
+    except ImportError as e:
+        results.skip("Forensic Store", f"Import failed: {e}")
+    except Exception as e:
+        results.record("Forensic Store", False, str(e))
+
+
+def test_opcode_mining():
+    """Test opcode co-occurrence and control-flow n-gram mining."""
+    print("\n" + "="*60)
+    print("OPCODE MINING")
+    print("="*60)
+
+    try:
+        from core.opcode_mining import OpcodeMiner
+
+        miner = OpcodeMiner(ngram_sizes=(2, 3))
+        # 0: 0x0002 -> 0x0157 (true) / 0x0158 (false); 1: 0x0157 -> 0x0158 -> exit
+        miner.add_bhav([0x0002, 0x0157, 0x0158], [1, 2, 0xFE], [2, 0xFF, 0xFF], "Stoves")
+        miner.add_bhav([0x0157, 0x0158], [1, 0xFE], [0xFD, 0xFF], "Stoves")
+        miner.add_bhav([0x0002, 0x0300], [1, 0xFE], [1, 0xFF], "TrashCan")
+
+        results.record("Support per BHAV and object",
+                       miner.support(0x0002) == 2 and miner.support(0x0157, "object") == 1, "")
+        results.record("Pair counts", miner.pair_count(0x0158, 0x0157) == 2
+                       and miner.pair_count(0x0002, 0x0157) == 1 and miner.pair_count(0x0300, 0x0157) == 0, "")
+        results.record("Always together", miner.always_together("bhav") == [(0x0157, 0x0158, 2)],
+                       str(miner.always_together("bhav")))
+        results.record("Implied opcodes", miner.implied_by(0x0300) == [0x0002], str(miner.implied_by(0x0300)))
+        results.record("Top pairs", miner.top_pairs(limit=1) == [(0x0157, 0x0158, 2)], str(miner.top_pairs(limit=1)))
+
+        results.record("Successor bigrams", miner.ngram_count([0x0157, 0x0158]) == 2
+                       and miner.ngram_count([0x0002, 0x0300]) == 1, "")
+        results.record("Successor trigrams", miner.top_ngrams(3) == [((0x0002, 0x0157, 0x0158), 1)],
+                       str(miner.top_ngrams(3)))
+        results.record("Direct successors", miner.successors(0x0002) == [(0x0157, 1), (0x0158, 1), (0x0300, 1)],
+                       str(miner.successors(0x0002)))
+
+    except ImportError as e:
+        results.skip("Opcode Mining", f"Import failed: {e}")
+    except Exception as e:
+        results.record("Opcode Mining", False, str(e))
+
+
+def test_bhav_index():
+    """Test content-addressed BHAV deduplication and MinHash similarity lookup."""
+    print("\n" + "="*60)
+    print("BHAV INDEX")
+    print("="*60)
+
+    try:
+        from core.bhav_index import BhavIndex, content_id
+        from formats.iff.chunks.bhav import BHAV, BHAVInstruction
+        from graph.core import ResourceGraph, ResourceNode, Reference, ReferenceKind, TGI
+        from graph.analysis_tools import OrphanExplainer
+
+        def make_bhav(chunk_id, opcodes, operand=bytes(8)):
+            bhav = BHAV(instructions=[BHAVInstruction(op, i + 1, 0xFE, operand)
+                                      for i, op in enumerate(opcodes)])
+            bhav.chunk_id = chunk_id
+            return bhav
+
+        helper = list(range(0x0100, 0x0114))
+        index = BhavIndex()
+        index.add(make_bhav(0x1000, helper), ("Chair.iff", 0x1000))
+        index.add(make_bhav(0x1001, [0x0002, 0x0157]), ("Chair.iff", 0x1001))
+        index.add(make_bhav(0x1003, helper), ("Chair.iff", 0x1003))
+        index.add(make_bhav(0x1000, helper), ("Sofa.iff", 0x1000))
+        index.add(make_bhav(0x1004, helper[:-1] + [0x0200]), ("Sofa.iff", 0x1004))
+        index.add(make_bhav(0x1005, helper, operand=b'\x01' * 8), ("Sofa.iff", 0x1005))
+
+        results.record("Content ID ignores chunk ID", content_id(make_bhav(1, helper)) == content_id(make_bhav(2, helper)), "")
+        results.record("Exact duplicates", sorted(index.duplicates(("Chair.iff", 0x1000)))
+                       == [("Chair.iff", 0x1003), ("Sofa.iff", 0x1000)], "")
+        stats = index.statistics()
+        results.record("Dedup statistics", stats['bhavs'] == 6 and stats['unique_bodies'] == 4, str(stats))
+
+        similar = index.similar(("Chair.iff", 0x1000), threshold=0.5)
+        near = index.content_id_of(("Sofa.iff", 0x1004))
+        results.record("Near-duplicate lookup", near in dict(similar)
+                       and index.content_id_of(("Chair.iff", 0x1001)) not in dict(similar), str(similar))
+
+        calls = []
+        analyzed = index.analyze(lambda bhav: calls.append(bhav) or len(bhav.instructions))
+        results.record("Analyze once per unique body", len(calls) == 4 and len(analyzed) == 6
+                       and analyzed[("Sofa.iff", 0x1000)] == 20, "")
+
+        # Orphan 0x1000's referenced copy is 0x1003, not its first referenced neighbour 0x1001
+        graph = ResourceGraph()
+        nodes = {i: ResourceNode(TGI("BHAV", 1, i), "BHAV", "Chair.iff") for i in range(0x1000, 0x1004)}
+        graph.add_node(nodes[0x1000])
+        graph.add_reference(Reference(nodes[0x1002], nodes[0x1001], ReferenceKind.HARD, edge_kind="behavioral"))
+        graph.add_reference(Reference(nodes[0x1002], nodes[0x1003], ReferenceKind.HARD, edge_kind="behavioral"))
+        plain = OrphanExplainer(graph).explain(TGI("BHAV", 1, 0x1000))
+        indexed = OrphanExplainer(graph, index).explain(TGI("BHAV", 1, 0x1000))
+        results.record("Orphan explainer uses index", plain.similar_nodes[0] == TGI("BHAV", 1, 0x1001)
+                       and indexed.similar_nodes == [TGI("BHAV", 1, 0x1003)], str(indexed.similar_nodes))
+
+    except ImportError as e:
+        results.skip("BHAV Index", f"Import failed: {e}")
+    except Exception as e:
+        results.record("BHAV Index", False, str(e))
+
+
+def test_bhav_decompilation_cache():
+    """Test the memoized, optionally persistent BHAV decompilation cache."""
+    print("\n" + "="*60)
+    print("BHAV DECOMPILATION CACHE")
+    print("="*60)
+
+    old_cache = None
+    try:
+        import struct
+        import tempfile
+        from formats.iff.chunks.bhav_cache import DecompilationCache, get_cache, set_cache
+        from formats.iff.chunks.bhav_decompiler import BHAVDecompiler
+        from formats.iff.chunks.bhav_operands import decode_operand
+        from formats.iff.chunks.bhav import BHAV, BHAVInstruction
+        from core.bhav_disassembler import BHAVDisassembler
+
+        def bhav_bytes(*opcodes):
+            return struct.pack('<III', 0, 1, 2) + b''.join(
+                struct.pack('<H8sHHH', op, bytes(8), i + 1, 0xFE, 0) for i, op in enumerate(opcodes))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = Path(tmp) / "bhav_cache.db"
+            cache = DecompilationCache(max_entries=2, path=db_path)
+            old_cache = set_cache(cache)
+
+            decompiler = BHAVDecompiler()
+            first = decompiler.decompile(bhav_bytes(0x0002, 0x0157), 1, 0x1000)
+            second = decompiler.decompile(bhav_bytes(0x0002, 0x0157), 1, 0x1001)
+            results.record("Repeat decompile is a cache hit", cache.hits == 1 and cache.misses == 1
+                           and second.instructions is not first.instructions, str(cache.stats()))
+            first.instructions.clear()
+            third = decompiler.decompile(bhav_bytes(0x0002, 0x0157), 1, 0x1000)
+            results.record("Cached AST copied per caller", len(third.instructions) == 2, "")
+            results.record("Operands decoded per caller",
+                           decode_operand(0x0002, bytes(8)) is not decode_operand(0x0002, bytes(8)), "")
+            results.record("Cached AST keeps caller's source", first.source_bhav == "0001:1000"
+                           and second.source_bhav == "0001:1001" and len(second.instructions) == 2, "")
+
+            bhavs = [BHAV(instructions=[BHAVInstruction(0x0002, 1, 0xFE), BHAVInstruction(0x0157, 0xFF, 0xFE)])
+                     for _ in range(2)]
+            listings = [BHAVDisassembler().disassemble(bhav) for bhav in bhavs]
+            results.record("Disassembly cached across copies", cache.hits == 3
+                           and [i.opcode_name for i in listings[0]] == [i.opcode_name for i in listings[1]], "")
+
+            decompiler.decompile(bhav_bytes(0x0003), 1, 0x1002)
+            results.record("LRU bound", len(cache) == 2 and cache.evictions == 1, str(cache.stats()))
+
+            cache.close()
+            warm = DecompilationCache(path=db_path)
+            set_cache(warm)
+            ast = BHAVDecompiler().decompile(bhav_bytes(0x0002, 0x0157), 1, 0x1000)
+            results.record("Persisted across runs", warm.disk_hits == 1 and ast is not None
+                           and [i.opcode for i in ast.instructions] == [0x0002, 0x0157], str(warm.stats()))
+            warm.close()
+
+    except ImportError as e:
+        results.skip("BHAV Decompilation Cache", f"Import failed: {e}")
+    except Exception as e:
+        results.record("BHAV Decompilation Cache", False, str(e))
+    finally:
+        if old_cache is not None:
+            set_cache(old_cache)
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # RUN ALL
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -932,10 +2160,16 @@ def run_all_tests(results_obj=None):
     
     # BHAV
     test_bhav_executor()
+    test_corpus_call_graph()
+    test_bhav_reachability()
+    test_compact_resource_graph()
+    test_graph_loader_streaming()
+    test_incremental_graph_analysis()
     test_bhav_operations()
     test_bhav_patching()
     
     # Parsers
+    test_binary_io()
     test_iff_parser()
     test_far_parser()
     test_dbpf_parser()
@@ -950,6 +2184,11 @@ def run_all_tests(results_obj=None):
     test_container_operations()
     test_save_mutations()
     test_mesh_export()
+    test_gltf_export()
+    test_mesh_arrays()
+    test_asset_scanner()
+    test_asset_refresh()
+    test_asset_database()
     
     # GUI
     test_focus_coordinator()
@@ -962,7 +2201,11 @@ def run_all_tests(results_obj=None):
     test_webviewer()
     test_freeso_gap_analyzer()
     test_semantic_globals()
-    
+    test_forensic_store()
+    test_opcode_mining()
+    test_bhav_index()
+    test_bhav_decompilation_cache()
+
     return results.passed, results.failed, results.skipped
 
 
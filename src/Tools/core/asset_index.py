@@ -0,0 +1,161 @@
+"""
+AssetIndex - Read-only query API over the AssetScanner SQLite database.
+
+Lookups go through the indexes created by AssetScanner (guid, mesh_name,
+source_file, (age, gender, body_type)) instead of scanning the flat JSON
+exports.
+
+Usage:
+    index = AssetIndex("data/asset_database.sqlite")
+    objects = index.find_by_guid(0x7FD4A3C2)
+    heads = index.find_meshes(prefix="c0", mesh_type="head", gender="female")
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional, Union
+
+from .asset_scanner import ObjectRecord, MeshRecord, CharacterRecord
+
+
+_OBJECT_COLUMNS = "guid, name, source_file, source_archive, catalog_id, price"
+_MESH_COLUMNS = ("mesh_name, mesh_type, source_file, source_archive, texture_name, "
+                 "age, gender, body_type, skin_tone")
+_CHARACTER_COLUMNS = "name, source_file, body_mesh, head_mesh, skin_tone, age, gender, body_type"
+
+
+class AssetIndex:
+    """
+    Query interface for an asset database.
+
+    Each thread gets its own connection, so one instance can be shared by
+    a threaded web server.
+    """
+
+    def __init__(self, db_path: Union[str, Path]):
+        self.db_path = Path(db_path)
+        if not self.db_path.exists():
+            raise FileNotFoundError(f"Asset database not found: {self.db_path}")
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(str(self.db_path))
+        return conn
+
+    def close(self):
+        """Close this thread's connection."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def __enter__(self) -> 'AssetIndex':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Objects
+    # ------------------------------------------------------------------
+
+    def find_by_guid(self, guid: int) -> list[ObjectRecord]:
+        """All objects with this GUID (one per file that defines it)."""
+        rows = self._conn().execute(
+            f'SELECT {_OBJECT_COLUMNS} FROM objects WHERE guid = ? ORDER BY id', (guid,))
+        return [self._object(row) for row in rows]
+
+    def find_objects(self, source_file: Optional[str] = None,
+                     name_contains: Optional[str] = None,
+                     limit: Optional[int] = None, offset: int = 0) -> list[ObjectRecord]:
+        """
+        Objects filtered by source file and/or a case-insensitive name
+        substring, in scan order.
+        """
+        where, params = [], []
+        if source_file is not None:
+            where.append('source_file = ?')
+            params.append(source_file)
+        if name_contains:
+            where.append("name LIKE ? ESCAPE '\\'")
+            params.append(f"%{_escape_like(name_contains)}%")
+        sql = f'SELECT {_OBJECT_COLUMNS} FROM objects'
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += ' ORDER BY id' + _limit_clause(limit, offset, params)
+        return [self._object(row) for row in self._conn().execute(sql, params)]
+
+    def count_objects(self) -> int:
+        return self._conn().execute('SELECT COUNT(*) FROM objects').fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Meshes
+    # ------------------------------------------------------------------
+
+    def find_meshes(self, prefix: Optional[str] = None, mesh_type: Optional[str] = None,
+                    age: Optional[str] = None, gender: Optional[str] = None,
+                    body_type: Optional[str] = None, source_file: Optional[str] = None,
+                    limit: Optional[int] = None, offset: int = 0) -> list[MeshRecord]:
+        """
+        Meshes matching all given filters, ordered by name.
+
+        Args:
+            prefix: Case-insensitive mesh name prefix (e.g. "b001", "c0")
+            mesh_type: body, head or hand
+            age, gender, body_type: Skin code fields as stored by the scanner
+        """
+        where, params = [], []
+        if prefix:
+            # Range scan on the NOCASE name index
+            where.append('mesh_name >= ? COLLATE NOCASE AND mesh_name < ? COLLATE NOCASE')
+            params += [prefix, prefix + '\U0010FFFF']
+        for column, value in (('mesh_type', mesh_type), ('age', age), ('gender', gender),
+                              ('body_type', body_type), ('source_file', source_file)):
+            if value is not None:
+                where.append(f'{column} = ?')
+                params.append(value)
+        sql = f'SELECT {_MESH_COLUMNS} FROM meshes'
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += ' ORDER BY mesh_name COLLATE NOCASE, id' + _limit_clause(limit, offset, params)
+        return [MeshRecord(*row) for row in self._conn().execute(sql, params)]
+
+    def count_meshes(self) -> int:
+        return self._conn().execute('SELECT COUNT(*) FROM meshes').fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Characters
+    # ------------------------------------------------------------------
+
+    def find_characters(self, source_file: Optional[str] = None,
+                        limit: Optional[int] = None, offset: int = 0) -> list[CharacterRecord]:
+        """Characters, optionally from one source file, in scan order."""
+        params: list = []
+        sql = f'SELECT {_CHARACTER_COLUMNS} FROM characters'
+        if source_file is not None:
+            sql += ' WHERE source_file = ?'
+            params.append(source_file)
+        sql += ' ORDER BY id' + _limit_clause(limit, offset, params)
+        return [CharacterRecord(*row) for row in self._conn().execute(sql, params)]
+
+    @staticmethod
+    def _object(row: tuple) -> ObjectRecord:
+        guid, name, source_file, source_archive, catalog_id, price = row
+        return ObjectRecord(guid, name, source_file, source_archive or "",
+                            catalog_id or 0, price or 0)
+
+
+def _escape_like(text: str) -> str:
+    """Escape LIKE wildcards so text matches literally."""
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def _limit_clause(limit: Optional[int], offset: int, params: list) -> str:
+    """LIMIT/OFFSET SQL for optional paging; appends the values to params."""
+    if limit is None and not offset:
+        return ''
+    params += [-1 if limit is None else limit, offset]
+    return ' LIMIT ? OFFSET ?'
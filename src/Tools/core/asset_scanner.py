@@ -16,8 +16,10 @@ Extracted data:
 import os
 import struct
 import json
+import hashlib
 import zipfile
 import sqlite3
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from dataclasses import dataclass, field, asdict
 from typing import Optional, Iterator, Callable
@@ -28,6 +30,12 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from formats.far.far1 import FAR1Archive
+from formats.iff.iff_file import IffFile
+
+try:
+    import xxhash
+except ImportError:  # Optional: faster content fingerprints
+    xxhash = None
 
 
 # ============================================================================
@@ -98,6 +106,48 @@ class ScanProgress:
     errors: list = field(default_factory=list)
 
 
+@dataclass
+class ScanBatch:
+    """Records extracted from one or more IFFs (returned by scan workers)."""
+    objects: list = field(default_factory=list)
+    meshes: list = field(default_factory=list)
+    characters: list = field(default_factory=list)
+    errors: list = field(default_factory=list)
+    units: int = 0  # Work units processed
+    # (objects, meshes, characters) counts after each unit, for attributing
+    # records to their source
+    unit_ends: list = field(default_factory=list)
+    failed: list = field(default_factory=list)  # Positions of units that raised
+
+
+@dataclass
+class WorkUnit:
+    """
+    One independently scannable IFF: a loose file, a FAR entry (byte range
+    of the archive) or a ZIP member.
+    """
+    kind: str               # 'file', 'far' or 'zip'
+    path: str               # File or archive on disk
+    name: str               # Reported as source_file
+    offset: int = 0         # FAR entry data range
+    size: int = 0
+    is_fam: bool = False
+    is_user_iff: bool = False
+    
+    @property
+    def source_archive(self) -> str:
+        return "" if self.kind == 'file' else self.path
+    
+    @property
+    def source_key(self) -> str:
+        """Identity of this source in the database's sources table."""
+        if self.kind == 'file':
+            return self.path
+        if self.kind == 'far':
+            return f"{self.path}|{self.offset}|{self.size}"
+        return f"{self.path}|{self.name}"
+
+
 # ============================================================================
 # SCANNER CONFIGURATION
 # ============================================================================
@@ -185,40 +235,21 @@ def extract_objd_from_iff(data: bytes, source_file: str, source_archive: str = "
     if len(data) < 64:
         return objects
     
-    pos = 64  # Skip IFF header
-    while pos < len(data) - 76:
-        try:
-            type_code = data[pos:pos+4].decode('ascii', errors='ignore')
-            chunk_size = struct.unpack('>I', data[pos+4:pos+8])[0]
-            
-            if chunk_size < 76 or chunk_size > len(data) - pos:
-                break
-                
-            if type_code == 'OBJD' and chunk_size > 100:
-                chunk_data = data[pos+76:pos+chunk_size]
-                if len(chunk_data) >= 30:
-                    # GUID at offset 26-30
-                    guid = struct.unpack('<I', chunk_data[26:30])[0]
-                    # Try to get name from chunk header
-                    name = ""
-                    try:
-                        # Chunk label is at pos+12 (64 bytes max)
-                        raw_name = data[pos+12:pos+76]
-                        name = raw_name.split(b'\x00')[0].decode('ascii', errors='ignore')
-                    except:
-                        pass
-                    
-                    if guid != 0:
-                        objects.append(ObjectRecord(
-                            guid=guid,
-                            name=name or f"Object_{guid:08X}",
-                            source_file=source_file,
-                            source_archive=source_archive
-                        ))
-            
-            pos += chunk_size
-        except:
-            break
+    # Only OBJD chunks are parsed; every other payload is skipped unread
+    try:
+        iff = IffFile.from_bytes(data, source_file, only_types={'OBJD'})
+    except Exception:
+        return objects
+    
+    for objd in iff.get_by_type_code('OBJD'):
+        guid = getattr(objd, 'guid', 0)
+        if guid != 0:
+            objects.append(ObjectRecord(
+                guid=guid,
+                name=objd.chunk_label or f"Object_{guid:08X}",
+                source_file=source_file,
+                source_archive=source_archive
+            ))
     
     return objects
 
@@ -383,6 +414,190 @@ def extract_uchr_skins(data: bytes) -> list[str]:
     return list(set(skins))
 
 
+def process_iff_data(data: bytes, source_file: str, source_archive: str = "",
+                     is_fam: bool = False, is_user_iff: bool = False,
+                     batch: Optional['ScanBatch'] = None) -> 'ScanBatch':
+    """
+    Extract all asset information from IFF data.
+    
+    Records are appended to batch (a new ScanBatch if None), which is
+    returned. Pure function of its inputs, so it runs unchanged in
+    worker processes.
+    """
+    batch = batch if batch is not None else ScanBatch()
+    
+    # Extract objects
+    batch.objects.extend(extract_objd_from_iff(data, source_file, source_archive))
+    
+    # Extract STR# 200 (Body Strings) for skin info
+    # User IFFs use STR# 51200 instead - extract_str_chunk handles both
+    body_strings = extract_str_chunk(data, 200)
+    
+    # For User IFFs, we need to parse the format differently
+    # The first string often contains combined data
+    if is_user_iff and body_strings:
+        # User IFF format: strings contain embedded mesh refs
+        char = CharacterRecord(
+            name=source_file.replace('.iff', '').replace('.IFF', ''),
+            source_file=source_file
+        )
+        
+        # Parse each string for mesh references
+        import re
+        for s in body_strings:
+            # Look for body mesh patterns
+            body_match = re.search(r'([bc]\d{3}[mfu][ac][a-z_0-9]+),BODY=', s, re.IGNORECASE)
+            if body_match and not char.body_mesh:
+                mesh_name = body_match.group(1)
+                char.body_mesh = mesh_name
+                meta = decode_mesh_name(mesh_name)
+                batch.meshes.append(MeshRecord(
+                    mesh_name=mesh_name,
+                    mesh_type="body",
+                    source_file=source_file,
+                    source_archive=source_archive,
+                    **{k: v for k, v in meta.items() if k != "mesh_type"}
+                ))
+            
+            # Look for head mesh patterns
+            head_match = re.search(r'([c]\d{3}[mfu][ac][a-z_0-9]+),HEAD-HEAD=', s, re.IGNORECASE)
+            if head_match and not char.head_mesh:
+                mesh_name = head_match.group(1)
+                char.head_mesh = mesh_name
+                meta = decode_mesh_name(mesh_name)
+                batch.meshes.append(MeshRecord(
+                    mesh_name=mesh_name,
+                    mesh_type="head",
+                    source_file=source_file,
+                    source_archive=source_archive,
+                    **{k: v for k, v in meta.items() if k != "mesh_type"}
+                ))
+        
+        if char.body_mesh or char.head_mesh:
+            batch.characters.append(char)
+            
+    elif body_strings:
+        char = CharacterRecord(
+            name=source_file.replace('.iff', '').replace('.IFF', ''),
+            source_file=source_file
+        )
+        
+        # Parse body strings
+        for i, s in enumerate(body_strings):
+            if i == 0:  # Age
+                char.age = s.lower() if s else ""
+            elif i == 1 and ',' in s:  # Body mesh
+                mesh_name = s.split(',')[0]
+                char.body_mesh = mesh_name
+                meta = decode_mesh_name(mesh_name)
+                batch.meshes.append(MeshRecord(
+                    mesh_name=mesh_name,
+                    mesh_type="body",
+                    source_file=source_file,
+                    source_archive=source_archive,
+                    **{k: v for k, v in meta.items() if k != "mesh_type"}
+                ))
+            elif i == 2 and ',' in s:  # Head mesh
+                mesh_name = s.split(',')[0]
+                char.head_mesh = mesh_name
+                meta = decode_mesh_name(mesh_name)
+                batch.meshes.append(MeshRecord(
+                    mesh_name=mesh_name,
+                    mesh_type="head",
+                    source_file=source_file,
+                    source_archive=source_archive,
+                    **{k: v for k, v in meta.items() if k != "mesh_type"}
+                ))
+            elif i == 12:  # Gender
+                char.gender = s.lower() if s else ""
+            elif i == 14:  # Skin tone
+                char.skin_tone = s.lower() if s else ""
+        
+        if char.body_mesh or char.head_mesh:
+            batch.characters.append(char)
+    
+    # For FAM files, also check uChr chunks
+    if is_fam:
+        skins = extract_uchr_skins(data)
+        for skin in skins:
+            meta = decode_mesh_name(skin)
+            if meta["mesh_type"]:
+                batch.meshes.append(MeshRecord(
+                    mesh_name=skin,
+                    mesh_type=meta["mesh_type"],
+                    source_file=source_file,
+                    source_archive=source_archive,
+                    **{k: v for k, v in meta.items() if k != "mesh_type"}
+                ))
+    
+    return batch
+
+
+# ============================================================================
+# PARALLEL SCANNING
+# ============================================================================
+
+# Work units handed to a worker per task; large enough to amortise IPC and
+# archive opens, small enough that idle workers keep pulling new tasks
+WORK_UNITS_PER_TASK = 32
+
+
+def _read_work_unit(unit: WorkUnit, files: dict, zips: dict) -> bytes:
+    """Read the IFF bytes for a work unit, reusing handles opened earlier in the task."""
+    if unit.kind == 'file':
+        with open(unit.path, 'rb') as f:
+            return f.read()
+    if unit.kind == 'far':
+        f = files.get(unit.path)
+        if f is None:
+            f = files[unit.path] = open(unit.path, 'rb')
+        f.seek(unit.offset)
+        return f.read(unit.size)
+    zf = zips.get(unit.path)
+    if zf is None:
+        zf = zips[unit.path] = zipfile.ZipFile(unit.path, 'r')
+    return zf.read(unit.name)
+
+
+def fingerprint_hash(data: bytes) -> str:
+    """Content hash for source fingerprints (xxHash if installed, else BLAKE2)."""
+    if xxhash is not None:
+        return xxhash.xxh64(data).hexdigest()
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def scan_work_units(units: list[WorkUnit]) -> ScanBatch:
+    """
+    Scan a list of work units and return the extracted records.
+    
+    Process pool entry point; must stay a module-level function.
+    """
+    batch = ScanBatch()
+    files: dict = {}
+    zips: dict = {}
+    try:
+        for unit in units:
+            try:
+                data = _read_work_unit(unit, files, zips)
+                process_iff_data(data, unit.name, unit.source_archive,
+                                 is_fam=unit.is_fam, is_user_iff=unit.is_user_iff,
+                                 batch=batch)
+            except Exception as e:
+                batch.failed.append(batch.units)
+                if unit.kind == 'file':
+                    batch.errors.append(f"IFF error {unit.path}: {e}")
+                else:
+                    batch.errors.append(f"{unit.kind.upper()} error {unit.path} [{unit.name}]: {e}")
+            batch.units += 1
+            batch.unit_ends.append((len(batch.objects), len(batch.meshes), len(batch.characters)))
+    finally:
+        for f in files.values():
+            f.close()
+        for zf in zips.values():
+            zf.close()
+    return batch
+
+
 # ============================================================================
 # MAIN SCANNER CLASS
 # ============================================================================
@@ -395,6 +610,9 @@ class AssetScanner:
         scanner = AssetScanner()
         scanner.scan_all(progress_callback=my_callback)
         scanner.save_database()
+        
+        # Spread the work over all cores
+        scanner.scan_all(workers=None)
     """
     
     def __init__(self, config: Optional[ScannerConfig] = None):
@@ -406,8 +624,20 @@ class AssetScanner:
         self.progress = ScanProgress()
         self._progress_callback: Optional[Callable[[ScanProgress], None]] = None
     
-    def scan_all(self, progress_callback: Optional[Callable[[ScanProgress], None]] = None):
-        """Scan all configured paths."""
+    def scan_all(self, progress_callback: Optional[Callable[[ScanProgress], None]] = None,
+                 workers: Optional[int] = 1):
+        """
+        Scan all configured paths.
+        
+        Args:
+            progress_callback: Called with ScanProgress as the scan advances
+            workers: Worker processes; 1 scans serially in this process,
+                     None uses one per CPU. See scan_parallel().
+        """
+        if workers is None or workers > 1:
+            self.scan_parallel(progress_callback, workers)
+            return
+        
         self._progress_callback = progress_callback
         self.progress = ScanProgress()
         
@@ -428,6 +658,125 @@ class AssetScanner:
                 self._scan_path(Path(scan_path.path), scan_path)
         
         self._update_progress()
+        self._print_summary()
+    
+    def scan_parallel(self, progress_callback: Optional[Callable[[ScanProgress], None]] = None,
+                      workers: Optional[int] = None):
+        """
+        Scan all configured paths with a process pool.
+        
+        The paths are walked once to enumerate work units (loose IFFs, FAR
+        entries, ZIP members), which are split into small tasks; idle
+        workers pull the next task from the pool's queue. Progress is
+        aggregated here as tasks finish, with total_files/processed_files
+        counting work units. Records are merged in enumeration order, so
+        results match a serial scan.
+        """
+        self._progress_callback = progress_callback
+        self.progress = ScanProgress()
+        
+        units = self._enumerate_all()
+        self.progress.total_files = len(units)
+        self._update_progress()
+        
+        # Merge in enumeration order; found counters were advanced as tasks finished
+        for _, batch in self._run_work_units(units, workers):
+            self._merge_batch(batch, count=False)
+        
+        self._update_progress()
+        self._print_summary()
+    
+    def _run_work_units(self, units: list[WorkUnit],
+                        workers: Optional[int]) -> list[tuple[list[WorkUnit], ScanBatch]]:
+        """
+        Scan work units in tasks of WORK_UNITS_PER_TASK, in a process pool
+        unless workers is 1. Progress is updated as each task finishes.
+        
+        Returns (task units, batch) pairs in enumeration order.
+        """
+        tasks = [units[i:i + WORK_UNITS_PER_TASK]
+                 for i in range(0, len(units), WORK_UNITS_PER_TASK)]
+        batches: list[Optional[ScanBatch]] = [None] * len(tasks)
+        
+        def finished(i: int, batch: ScanBatch):
+            batches[i] = batch
+            self.progress.processed_files += batch.units
+            self.progress.current_file = tasks[i][-1].path
+            self.progress.objects_found += len(batch.objects)
+            self.progress.meshes_found += len(batch.meshes)
+            self.progress.characters_found += len(batch.characters)
+            self._update_progress()
+        
+        if workers == 1:
+            for i, task in enumerate(tasks):
+                finished(i, scan_work_units(task))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(scan_work_units, task): i for i, task in enumerate(tasks)}
+                for future in as_completed(futures):
+                    i = futures[future]
+                    try:
+                        batch = future.result()
+                    except Exception as e:
+                        batch = ScanBatch(errors=[f"Worker error: {e}"], units=len(tasks[i]),
+                                          unit_ends=[(0, 0, 0)] * len(tasks[i]),
+                                          failed=list(range(len(tasks[i]))))
+                    finished(i, batch)
+        
+        return list(zip(tasks, batches))
+    
+    def _enumerate_all(self) -> list[WorkUnit]:
+        """Collect the work units of all enabled scan paths."""
+        units: list[WorkUnit] = []
+        for scan_path in self.config.paths:
+            if scan_path.enabled and scan_path.path and Path(scan_path.path).exists():
+                self._enumerate_path(Path(scan_path.path), scan_path, units)
+        return units
+    
+    def _enumerate_path(self, path: Path, scan_path: ScanPath, units: list[WorkUnit]):
+        """Recursively collect work units under a path (same order as _scan_path)."""
+        try:
+            for item in path.iterdir():
+                if item.is_file():
+                    self._enumerate_file(item, scan_path, units)
+                elif item.is_dir() and scan_path.recursive:
+                    self._enumerate_path(item, scan_path, units)
+        except PermissionError:
+            self.progress.errors.append(f"Permission denied: {path}")
+    
+    def _enumerate_file(self, file_path: Path, scan_path: ScanPath, units: list[WorkUnit]):
+        """Collect the work units of a single file."""
+        ext = file_path.suffix.lower()
+        path_str = str(file_path)
+        
+        if ext == '.far' and scan_path.scan_fars:
+            try:
+                with FAR1Archive(path_str) as far:
+                    for entry in far.entries:
+                        if entry.filename.upper().endswith('.IFF') and entry.data_length:
+                            units.append(WorkUnit('far', path_str, entry.filename,
+                                                  entry.data_offset, entry.data_length))
+            except Exception as e:
+                self.progress.errors.append(f"FAR error {file_path}: {e}")
+        elif ext == '.iff':
+            units.append(WorkUnit('file', path_str, file_path.name,
+                                  is_user_iff=file_path.name.upper().startswith('USER')))
+        elif ext == '.zip' and scan_path.scan_zips:
+            try:
+                with zipfile.ZipFile(file_path, 'r') as zf:
+                    for name in zf.namelist():
+                        upper = name.upper()
+                        if upper.endswith('.IFF') or upper.endswith('.FAM'):
+                            units.append(WorkUnit('zip', path_str, name,
+                                                  is_fam=upper.endswith('.FAM'),
+                                                  is_user_iff=Path(name).name.upper().startswith('USER')))
+            except Exception as e:
+                self.progress.errors.append(f"ZIP error {file_path}: {e}")
+        elif ext == '.fam':
+            units.append(WorkUnit('file', path_str, file_path.name, is_fam=True))
+    
+    def _print_summary(self):
+        """Print the end-of-scan summary."""
         print(f"\n{'='*60}")
         print("SCAN COMPLETE")
         print(f"Objects: {len(self.objects)}")
@@ -494,11 +843,10 @@ class AssetScanner:
             far = FAR1Archive(str(far_path))
             print(f"  FAR: {far_path.name} ({len(far.entries)} entries)")
             
-            for entry in far.entries:
-                if entry.filename.upper().endswith('.IFF'):
-                    data = far.get_entry(entry.filename)
-                    if data:
-                        self._process_iff_data(data, entry.filename, str(far_path))
+            with far:
+                for entry, view in far.iter_entries():
+                    if entry.filename.upper().endswith('.IFF') and len(view):
+                        self._process_iff_data(view.tobytes(), entry.filename, str(far_path))
         except Exception as e:
             self.progress.errors.append(f"FAR error {far_path}: {e}")
     
@@ -534,119 +882,19 @@ class AssetScanner:
     def _process_iff_data(self, data: bytes, source_file: str, source_archive: str, 
                           is_fam: bool = False, is_user_iff: bool = False):
         """Process IFF data and extract all asset information."""
-        # Extract objects
-        objects = extract_objd_from_iff(data, source_file, source_archive)
-        for obj in objects:
-            self.objects.append(obj)
-            self.progress.objects_found += 1
-        
-        # Extract STR# 200 (Body Strings) for skin info
-        # User IFFs use STR# 51200 instead - extract_str_chunk handles both
-        body_strings = extract_str_chunk(data, 200)
-        
-        # For User IFFs, we need to parse the format differently
-        # The first string often contains combined data
-        if is_user_iff and body_strings:
-            # User IFF format: strings contain embedded mesh refs
-            char = CharacterRecord(
-                name=source_file.replace('.iff', '').replace('.IFF', ''),
-                source_file=source_file
-            )
-            
-            # Parse each string for mesh references
-            import re
-            for s in body_strings:
-                # Look for body mesh patterns
-                body_match = re.search(r'([bc]\d{3}[mfu][ac][a-z_0-9]+),BODY=', s, re.IGNORECASE)
-                if body_match and not char.body_mesh:
-                    mesh_name = body_match.group(1)
-                    char.body_mesh = mesh_name
-                    meta = decode_mesh_name(mesh_name)
-                    self.meshes.append(MeshRecord(
-                        mesh_name=mesh_name,
-                        mesh_type="body",
-                        source_file=source_file,
-                        source_archive=source_archive,
-                        **{k: v for k, v in meta.items() if k != "mesh_type"}
-                    ))
-                    self.progress.meshes_found += 1
-                
-                # Look for head mesh patterns
-                head_match = re.search(r'([c]\d{3}[mfu][ac][a-z_0-9]+),HEAD-HEAD=', s, re.IGNORECASE)
-                if head_match and not char.head_mesh:
-                    mesh_name = head_match.group(1)
-                    char.head_mesh = mesh_name
-                    meta = decode_mesh_name(mesh_name)
-                    self.meshes.append(MeshRecord(
-                        mesh_name=mesh_name,
-                        mesh_type="head",
-                        source_file=source_file,
-                        source_archive=source_archive,
-                        **{k: v for k, v in meta.items() if k != "mesh_type"}
-                    ))
-                    self.progress.meshes_found += 1
-            
-            if char.body_mesh or char.head_mesh:
-                self.characters.append(char)
-                self.progress.characters_found += 1
-                
-        elif body_strings:
-            char = CharacterRecord(
-                name=source_file.replace('.iff', '').replace('.IFF', ''),
-                source_file=source_file
-            )
-            
-            # Parse body strings
-            for i, s in enumerate(body_strings):
-                if i == 0:  # Age
-                    char.age = s.lower() if s else ""
-                elif i == 1 and ',' in s:  # Body mesh
-                    mesh_name = s.split(',')[0]
-                    char.body_mesh = mesh_name
-                    meta = decode_mesh_name(mesh_name)
-                    self.meshes.append(MeshRecord(
-                        mesh_name=mesh_name,
-                        mesh_type="body",
-                        source_file=source_file,
-                        source_archive=source_archive,
-                        **{k: v for k, v in meta.items() if k != "mesh_type"}
-                    ))
-                    self.progress.meshes_found += 1
-                elif i == 2 and ',' in s:  # Head mesh
-                    mesh_name = s.split(',')[0]
-                    char.head_mesh = mesh_name
-                    meta = decode_mesh_name(mesh_name)
-                    self.meshes.append(MeshRecord(
-                        mesh_name=mesh_name,
-                        mesh_type="head",
-                        source_file=source_file,
-                        source_archive=source_archive,
-                        **{k: v for k, v in meta.items() if k != "mesh_type"}
-                    ))
-                    self.progress.meshes_found += 1
-                elif i == 12:  # Gender
-                    char.gender = s.lower() if s else ""
-                elif i == 14:  # Skin tone
-                    char.skin_tone = s.lower() if s else ""
-            
-            if char.body_mesh or char.head_mesh:
-                self.characters.append(char)
-                self.progress.characters_found += 1
-        
-        # For FAM files, also check uChr chunks
-        if is_fam:
-            skins = extract_uchr_skins(data)
-            for skin in skins:
-                meta = decode_mesh_name(skin)
-                if meta["mesh_type"]:
-                    self.meshes.append(MeshRecord(
-                        mesh_name=skin,
-                        mesh_type=meta["mesh_type"],
-                        source_file=source_file,
-                        source_archive=source_archive,
-                        **{k: v for k, v in meta.items() if k != "mesh_type"}
-                    ))
-                    self.progress.meshes_found += 1
+        self._merge_batch(process_iff_data(data, source_file, source_archive,
+                                           is_fam=is_fam, is_user_iff=is_user_iff))
+    
+    def _merge_batch(self, batch: ScanBatch, count: bool = True):
+        """Add a batch of extracted records to the scanner's results."""
+        self.objects.extend(batch.objects)
+        self.meshes.extend(batch.meshes)
+        self.characters.extend(batch.characters)
+        if count:
+            self.progress.objects_found += len(batch.objects)
+            self.progress.meshes_found += len(batch.meshes)
+            self.progress.characters_found += len(batch.characters)
+        self.progress.errors.extend(batch.errors)
     
     def _update_progress(self):
         """Update progress callback."""
@@ -658,15 +906,9 @@ class AssetScanner:
                   f"Obj:{self.progress.objects_found} Mesh:{self.progress.meshes_found} "
                   f"Char:{self.progress.characters_found}")
     
-    def save_database(self, db_path: Optional[Path] = None):
-        """Save to SQLite database."""
-        db_path = db_path or self.config.database_file
-        db_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        conn = sqlite3.connect(str(db_path))
-        cur = conn.cursor()
-        
-        # Create tables
+    @staticmethod
+    def _create_tables(cur: sqlite3.Cursor):
+        """Create the database tables, upgrading older databases in place."""
         cur.execute('''CREATE TABLE IF NOT EXISTS objects (
             id INTEGER PRIMARY KEY,
             guid INTEGER,
@@ -675,7 +917,8 @@ class AssetScanner:
             source_file TEXT,
             source_archive TEXT,
             catalog_id INTEGER,
-            price INTEGER
+            price INTEGER,
+            source_key TEXT
         )''')
         
         cur.execute('''CREATE TABLE IF NOT EXISTS meshes (
@@ -688,7 +931,8 @@ class AssetScanner:
             age TEXT,
             gender TEXT,
             body_type TEXT,
-            skin_tone TEXT
+            skin_tone TEXT,
+            source_key TEXT
         )''')
         
         cur.execute('''CREATE TABLE IF NOT EXISTS characters (
@@ -700,7 +944,8 @@ class AssetScanner:
             skin_tone TEXT,
             age TEXT,
             gender TEXT,
-            body_type TEXT
+            body_type TEXT,
+            source_key TEXT
         )''')
         
         cur.execute('''CREATE TABLE IF NOT EXISTS scan_info (
@@ -713,45 +958,264 @@ class AssetScanner:
             errors INTEGER
         )''')
         
-        # Clear existing data
-        cur.execute('DELETE FROM objects')
-        cur.execute('DELETE FROM meshes')
-        cur.execute('DELETE FROM characters')
-        
-        # Insert objects
-        for obj in self.objects:
-            cur.execute('INSERT INTO objects (guid, guid_hex, name, source_file, source_archive) VALUES (?, ?, ?, ?, ?)',
-                       (obj.guid, obj.guid_hex, obj.name, obj.source_file, obj.source_archive))
-        
-        # Insert meshes (deduplicated)
-        seen_meshes = set()
-        for mesh in self.meshes:
-            key = (mesh.mesh_name, mesh.mesh_type)
-            if key not in seen_meshes:
-                seen_meshes.add(key)
-                cur.execute('INSERT INTO meshes (mesh_name, mesh_type, source_file, source_archive, texture_name, age, gender, body_type, skin_tone) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
-                           (mesh.mesh_name, mesh.mesh_type, mesh.source_file, mesh.source_archive, 
-                            mesh.texture_name, mesh.age, mesh.gender, mesh.body_type, mesh.skin_tone))
-        
-        # Insert characters
-        for char in self.characters:
-            cur.execute('INSERT INTO characters (name, source_file, body_mesh, head_mesh, skin_tone, age, gender, body_type) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
-                       (char.name, char.source_file, char.body_mesh, char.head_mesh, 
-                        char.skin_tone, char.age, char.gender, char.body_type))
-        
-        # Insert scan info
-        cur.execute('INSERT INTO scan_info (scan_date, total_files, objects_found, meshes_found, characters_found, errors) VALUES (?, ?, ?, ?, ?, ?)',
-                   (datetime.now().isoformat(), self.progress.total_files, 
-                    len(self.objects), len(seen_meshes), len(self.characters), len(self.progress.errors)))
-        
-        conn.commit()
+        # One fingerprint per source (loose file, FAR entry or ZIP member):
+        # size/mtime_ns are the file's or containing archive's, hash is the
+        # content hash (CRC-32 for ZIP members) if known
+        cur.execute('''CREATE TABLE IF NOT EXISTS sources (
+            source_key TEXT PRIMARY KEY,
+            kind TEXT,
+            path TEXT,
+            member TEXT,
+            offset INTEGER,
+            length INTEGER,
+            size INTEGER,
+            mtime_ns INTEGER,
+            hash TEXT
+        )''')
+        
+        # Databases written before source tracking lack source_key
+        for table in ('objects', 'meshes', 'characters'):
+            columns = {row[1] for row in cur.execute(f'PRAGMA table_info({table})')}
+            if 'source_key' not in columns:
+                cur.execute(f'ALTER TABLE {table} ADD COLUMN source_key TEXT')
+            cur.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_source ON {table} (source_key)')
+            cur.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_source_file ON {table} (source_file)')
+        
+        # Lookup indexes used by AssetIndex
+        cur.execute('CREATE INDEX IF NOT EXISTS idx_objects_guid ON objects (guid)')
+        cur.execute('CREATE INDEX IF NOT EXISTS idx_meshes_name ON meshes (mesh_name COLLATE NOCASE)')
+        cur.execute('CREATE INDEX IF NOT EXISTS idx_meshes_skin ON meshes (age, gender, body_type)')
+    
+    def save_database(self, db_path: Optional[Path] = None):
+        """Save to SQLite database."""
+        db_path = db_path or self.config.database_file
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Deduplicate meshes across the whole scan
+        unique_meshes = self._unique_meshes(self.meshes)
+        object_rows, mesh_rows, character_rows = self._record_rows(
+            None, self.objects, unique_meshes, self.characters)
+        
+        conn = self._connect(db_path)
+        with conn:  # One transaction
+            cur = conn.cursor()
+            self._create_tables(cur)
+            
+            # Clear existing data (a snapshot has no per-source fingerprints)
+            cur.execute('DELETE FROM objects')
+            cur.execute('DELETE FROM meshes')
+            cur.execute('DELETE FROM characters')
+            cur.execute('DELETE FROM sources')
+            
+            self._insert_rows(cur, object_rows, mesh_rows, character_rows)
+            
+            # Insert scan info
+            cur.execute('INSERT INTO scan_info (scan_date, total_files, objects_found, meshes_found, characters_found, errors) VALUES (?, ?, ?, ?, ?, ?)',
+                       (datetime.now().isoformat(), self.progress.total_files, 
+                        len(self.objects), len(unique_meshes), len(self.characters), len(self.progress.errors)))
         conn.close()
         
         print(f"\nDatabase saved: {db_path}")
         print(f"  Objects: {len(self.objects)}")
-        print(f"  Meshes: {len(seen_meshes)}")
+        print(f"  Meshes: {len(unique_meshes)}")
         print(f"  Characters: {len(self.characters)}")
     
+    def refresh_database(self, db_path: Optional[Path] = None, workers: Optional[int] = 1,
+                         verify_hash: bool = False,
+                         progress_callback: Optional[Callable[[ScanProgress], None]] = None) -> dict:
+        """
+        Incrementally update the database, re-extracting only changed sources.
+        
+        Every loose file, FAR entry and ZIP member is a source with a
+        fingerprint in the sources table:
+          - loose file: path, size and mtime
+          - FAR entry: archive path, entry offset and length, plus the
+            archive's size and mtime
+          - ZIP member: archive path and member name, size and CRC-32
+        Unchanged sources are skipped, new and changed ones are re-extracted
+        and rows of removed ones are deleted. With verify_hash, sources are
+        content-hashed when scanned; a later mtime-only change (a touched or
+        re-copied file) is then confirmed by hash and skipped.
+        
+        A database without fingerprints (e.g. written by save_database) is
+        rebuilt on the first refresh. Meshes are stored once per source
+        rather than deduplicated globally, so removing one source never drops
+        a mesh that another source still references. Afterwards
+        self.objects/meshes/characters hold only the re-extracted records.
+        
+        Returns:
+            Number of 'added', 'changed', 'removed' and 'unchanged' sources
+        """
+        db_path = db_path or self.config.database_file
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._progress_callback = progress_callback
+        self.progress = ScanProgress()
+        self.objects, self.meshes, self.characters = [], [], []
+        
+        units = self._enumerate_all()
+        
+        conn = self._connect(db_path)
+        try:
+            # One transaction: a refresh that fails part-way is rolled back
+            with conn:
+                cur = conn.cursor()
+                self._create_tables(cur)
+                
+                stored = {row[0]: row[1:] for row in
+                          cur.execute('SELECT source_key, size, mtime_ns, hash FROM sources')}
+                if not stored:
+                    # Rows from a snapshot can't be attributed to sources
+                    cur.execute('DELETE FROM objects')
+                    cur.execute('DELETE FROM meshes')
+                    cur.execute('DELETE FROM characters')
+                
+                counts = {'added': 0, 'changed': 0, 'removed': 0, 'unchanged': 0}
+                pending: list[WorkUnit] = []
+                fingerprints: dict[str, tuple] = {}
+                stats: dict[str, os.stat_result] = {}
+                files: dict = {}
+                zips: dict = {}
+                try:
+                    for unit in units:
+                        key = unit.source_key
+                        fingerprint = self._fingerprint(unit, stats, zips)
+                        old = stored.pop(key, None)
+                        if old is not None:
+                            if self._same_fingerprint(old, fingerprint):
+                                counts['unchanged'] += 1
+                                continue
+                            if verify_hash and old[2] and unit.kind != 'zip':
+                                digest = fingerprint_hash(_read_work_unit(unit, files, zips))
+                                if digest == old[2]:
+                                    cur.execute('UPDATE sources SET size = ?, mtime_ns = ? WHERE source_key = ?',
+                                                (fingerprint[0], fingerprint[1], key))
+                                    counts['unchanged'] += 1
+                                    continue
+                                fingerprint = (fingerprint[0], fingerprint[1], digest)
+                            counts['changed'] += 1
+                        else:
+                            counts['added'] += 1
+                
+                        if verify_hash and not fingerprint[2]:
+                            digest = fingerprint_hash(_read_work_unit(unit, files, zips))
+                            fingerprint = (fingerprint[0], fingerprint[1], digest)
+                        pending.append(unit)
+                        fingerprints[key] = fingerprint
+                finally:
+                    for f in files.values():
+                        f.close()
+                    for zf in zips.values():
+                        zf.close()
+                counts['removed'] = len(stored)
+                
+                # Drop rows of changed and removed sources
+                stale = [(key,) for key in stored] + [(unit.source_key,) for unit in pending]
+                for table in ('objects', 'meshes', 'characters', 'sources'):
+                    cur.executemany(f'DELETE FROM {table} WHERE source_key = ?', stale)
+                
+                self.progress.total_files = len(pending)
+                self._update_progress()
+                
+                for task, batch in self._run_work_units(pending, workers):
+                    self._merge_batch(batch, count=False)
+                    object_rows, mesh_rows, character_rows, source_rows = [], [], [], []
+                    start = (0, 0, 0)
+                    failed = set(batch.failed)
+                    for position, (unit, end) in enumerate(zip(task, batch.unit_ends)):
+                        key = unit.source_key
+                        # Meshes are deduplicated within each source
+                        meshes = self._unique_meshes(batch.meshes[start[1]:end[1]])
+                        rows = self._record_rows(key, batch.objects[start[0]:end[0]], meshes,
+                                                 batch.characters[start[2]:end[2]])
+                        object_rows += rows[0]
+                        mesh_rows += rows[1]
+                        character_rows += rows[2]
+                        # Failed units get no fingerprint, so the next refresh retries them
+                        if position not in failed:
+                            source_rows.append((key, unit.kind, unit.path, unit.name, unit.offset, unit.size,
+                                                *fingerprints[key]))
+                        start = end
+                    self._insert_rows(cur, object_rows, mesh_rows, character_rows)
+                    cur.executemany('INSERT OR REPLACE INTO sources (source_key, kind, path, member, offset, length, size, mtime_ns, hash) '
+                                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', source_rows)
+                
+                totals = [cur.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+                          for table in ('sources', 'objects', 'meshes', 'characters')]
+                cur.execute('INSERT INTO scan_info (scan_date, total_files, objects_found, meshes_found, characters_found, errors) VALUES (?, ?, ?, ?, ?, ?)',
+                           (datetime.now().isoformat(), *totals, len(self.progress.errors)))
+        finally:
+            conn.close()
+        
+        self._update_progress()
+        print(f"\nDatabase refreshed: {db_path}")
+        print(f"  Sources: {counts['added']} added, {counts['changed']} changed, "
+              f"{counts['removed']} removed, {counts['unchanged']} unchanged")
+        print(f"  Objects: {totals[1]}")
+        print(f"  Meshes: {totals[2]}")
+        print(f"  Characters: {totals[3]}")
+        return counts
+    
+    @staticmethod
+    def _fingerprint(unit: WorkUnit, stats: dict, zips: dict) -> tuple[int, int, str]:
+        """Cheap (size, mtime_ns, hash) fingerprint of a source; hash only for ZIP members."""
+        if unit.kind == 'zip':
+            zf = zips.get(unit.path)
+            if zf is None:
+                zf = zips[unit.path] = zipfile.ZipFile(unit.path, 'r')
+            info = zf.getinfo(unit.name)
+            return info.file_size, 0, f"{info.CRC:08x}"
+        st = stats.get(unit.path)
+        if st is None:
+            st = stats[unit.path] = os.stat(unit.path)
+        return st.st_size, st.st_mtime_ns, ""
+    
+    @staticmethod
+    def _same_fingerprint(stored: tuple, current: tuple[int, int, str]) -> bool:
+        """Compare a stored (size, mtime_ns, hash) row against a fresh fingerprint."""
+        return (stored[0] == current[0] and stored[1] == current[1]
+                and (not current[2] or stored[2] == current[2]))
+    
+    @staticmethod
+    def _connect(db_path: Path) -> sqlite3.Connection:
+        """Open the database in WAL mode (readers are not blocked by a rescan)."""
+        conn = sqlite3.connect(str(db_path))
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+    
+    @staticmethod
+    def _unique_meshes(meshes: list[MeshRecord]) -> list[MeshRecord]:
+        """First record of each (mesh_name, mesh_type), in order."""
+        unique: dict[tuple[str, str], MeshRecord] = {}
+        for mesh in meshes:
+            unique.setdefault((mesh.mesh_name, mesh.mesh_type), mesh)
+        return list(unique.values())
+    
+    @staticmethod
+    def _record_rows(source_key: Optional[str], objects: list[ObjectRecord],
+                     meshes: list[MeshRecord], characters: list[CharacterRecord]) -> tuple[list, list, list]:
+        """Convert records to insert rows for objects, meshes and characters."""
+        return (
+            [(obj.guid, obj.guid_hex, obj.name, obj.source_file, obj.source_archive,
+              obj.catalog_id, obj.price, source_key) for obj in objects],
+            [(mesh.mesh_name, mesh.mesh_type, mesh.source_file, mesh.source_archive,
+              mesh.texture_name, mesh.age, mesh.gender, mesh.body_type, mesh.skin_tone, source_key)
+             for mesh in meshes],
+            [(char.name, char.source_file, char.body_mesh, char.head_mesh,
+              char.skin_tone, char.age, char.gender, char.body_type, source_key)
+             for char in characters],
+        )
+    
+    @staticmethod
+    def _insert_rows(cur: sqlite3.Cursor, object_rows: list, mesh_rows: list, character_rows: list):
+        """Bulk insert rows produced by _record_rows."""
+        cur.executemany('INSERT INTO objects (guid, guid_hex, name, source_file, source_archive, catalog_id, price, source_key) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                        object_rows)
+        cur.executemany('INSERT INTO meshes (mesh_name, mesh_type, source_file, source_archive, texture_name, age, gender, body_type, skin_tone, source_key) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                        mesh_rows)
+        cur.executemany('INSERT INTO characters (name, source_file, body_mesh, head_mesh, skin_tone, age, gender, body_type, source_key) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                        character_rows)
+    
     def export_json(self, output_dir: Optional[Path] = None):
         """Export to JSON files for web viewer."""
         output_dir = output_dir or self.config.output_dir
@@ -789,7 +1253,13 @@ def main():
     parser = argparse.ArgumentParser(description="Scan Sims 1 assets")
     parser.add_argument('--config', help='Config file path')
     parser.add_argument('--output', help='Output directory')
-    parser.add_argument('--json', action='store_true', help='Also export JSON')
+    parser.add_argument('--json', action='store_true', help='Also export JSON (full scans only)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes (0 = one per CPU, 1 = serial)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only re-extract new or changed sources in an existing database')
+    parser.add_argument('--verify-hash', action='store_true',
+                        help='With --incremental, confirm mtime-only changes by content hash')
     args = parser.parse_args()
     
     config = ScannerConfig(args.config)
@@ -798,11 +1268,13 @@ def main():
         config.database_file = config.output_dir / "asset_database.sqlite"
     
     scanner = AssetScanner(config)
-    scanner.scan_all()
-    scanner.save_database()
-    
-    if args.json:
-        scanner.export_json()
+    if args.incremental:
+        scanner.refresh_database(workers=args.workers or None, verify_hash=args.verify_hash)
+    else:
+        scanner.scan_all(workers=args.workers or None)
+        scanner.save_database()
+        if args.json:
+            scanner.export_json()
 
 
 if __name__ == "__main__":
@@ -34,6 +34,11 @@ from enum import Enum
 
 # Import from same package
 from .bhav_opcodes import get_opcode_info, get_category_opcodes, PRIMITIVE_INSTRUCTIONS
+from formats.iff.chunks.bhav_cache import get_cache, instruction_digest
+
+
+# Bump when disassembly output changes to invalidate cached results
+DISASSEMBLER_VERSION = 1
 
 
 class ExitCode(Enum):
@@ -120,9 +125,16 @@ class DisassembledInstruction:
 class BHAVDisassembler:
     """Disassemble BHAV bytecode with semantic annotations."""
     
-    def __init__(self):
-        """Initialize disassembler."""
+    def __init__(self, use_cache: bool = True):
+        """
+        Initialize disassembler.
+        
+        Args:
+            use_cache: Memoize results process-wide by instruction bytes
+                       (formats.iff.chunks.bhav_cache)
+        """
         self.instructions: List[DisassembledInstruction] = []
+        self.use_cache = use_cache
     
     def disassemble(self, bhav_obj) -> List[DisassembledInstruction]:
         """
@@ -134,6 +146,15 @@ class BHAVDisassembler:
         Returns:
             List of DisassembledInstruction objects
         """
+        if self.use_cache:
+            key = (f"disasm/{DISASSEMBLER_VERSION}", instruction_digest(bhav_obj))
+            cached = get_cache().get_or_build(key, lambda: tuple(self._disassemble(bhav_obj)))
+            self.instructions = list(cached)
+            return self.instructions
+        return self._disassemble(bhav_obj)
+    
+    def _disassemble(self, bhav_obj) -> List[DisassembledInstruction]:
+        """Disassemble without the cache."""
         self.instructions = []
         
         for i, bhav_inst in enumerate(bhav_obj.instructions):
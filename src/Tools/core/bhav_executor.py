@@ -1,36 +1,42 @@
 """
 BHAV Executor Simulator - Trace execution paths through SimAntics bytecode
 
-Based on FreeSO's VMThread/VMStackFrame architecture. This provides static
-execution simulation (no actual primitives executed) to trace:
+Based on FreeSO's VMThread/VMStackFrame architecture. Each BHAV is compiled
+once into a flat array of (handler, true_pointer, false_pointer, operands,
+opcode) tuples with its operands decoded up front; the interpreter loop then
+dispatches through that array. It traces:
   - Instruction pointer progression
   - Control flow paths (taken branches)
-  - Variable state (locals, arguments)
-  - Stack object references
+  - Variable state (locals, arguments, temps)
+  - Subroutine calls (opcode >= 256) on a frame stack
   - Reachable instructions
   - Execution loops and dead code
 
-The executor DOES NOT run actual primitive code. It simulates execution by:
-  1. Following instruction pointers from the BHAV bytecode
-  2. Applying branch decisions based on exit codes
-  3. Recording each step in an ExecutionTrace
-  4. Detecting loops and unreachable code
+Semantics:
+  1. Expression (0x02) is evaluated: operands come from literals, locals,
+     temps, parameters or a flat store for the other scopes, assignments
+     write back with 16-bit wrap-around, comparisons choose the branch
+  2. Subroutine calls push a frame when the resolver supplies the callee
+     BHAV and continue on its true/false result; unresolved calls succeed
+  3. Other primitives have no world to act on and take the true branch
+  4. Pointers 0xFD/0xFE/0xFF return error/false/true from the routine
 
-This is a static analysis tool, similar to a debugger without actual execution.
+Locals/args snapshots are only taken when tracing, and one snapshot is
+shared by consecutive steps until the frame writes to its variables.
 """
 
-import struct
-import importlib.util
-import sys
-from pathlib import Path
+import math
+import operator
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Set, Tuple
+from typing import Any, Callable, Optional, List, Dict, Set, Tuple
 from enum import Enum
-from copy import deepcopy
 
 # Import from same package
-from .bhav_disassembler import BHAVDisassembler, ExitCode, DisassembledInstruction
+from .bhav_disassembler import BHAVDisassembler, DisassembledInstruction
 from formats.iff.chunks.bhav import BHAV
+from formats.iff.chunks.bhav_ast import VMExpressionOperator as Op
 
 
 class VMPrimitiveExitCode(Enum):
@@ -48,46 +54,86 @@ class VMPrimitiveExitCode(Enum):
     CONTINUE_FUTURE_TICK = 10   # Continue in future tick
 
 
+GOTO_TRUE = VMPrimitiveExitCode.GOTO_TRUE
+GOTO_FALSE = VMPrimitiveExitCode.GOTO_FALSE
+CONTINUE = VMPrimitiveExitCode.CONTINUE
+ERROR = VMPrimitiveExitCode.ERROR
+
+# Branch targets that leave the routine
+POINTER_ERROR = 0xFD
+POINTER_FALSE = 0xFE
+POINTER_TRUE = 0xFF
+
+EXPRESSION_OPCODE = 0x02
+TEMP_COUNT = 20
+CALL_ARG_COUNT = 4      # Subroutine calls pass four arguments
+MAX_FRAME_SLOTS = 256   # Larger local/arg indices go to the flat store
+
+# Variable scopes (see primitive_reference.VARIABLE_SCOPES)
+SCOPE_LITERAL = 5
+SCOPE_LOCAL = 6
+SCOPE_TEMP = 7
+SCOPE_PARAMETER = 8
+SCOPE_BCON = 9
+
+# Where a compiled operand lives
+_LITERAL, _LOCAL, _TEMP, _ARG, _STORE, _CONSTANT = range(6)
+
+
 @dataclass
 class StackFrame:
     """Execution context for a BHAV routine (mirrors FreeSO VMStackFrame)."""
-    
-    routine: 'DisassembledBHAV'          # Which BHAV is executing
+
+    routine: 'CompiledBHAV'               # Which BHAV is executing
     instruction_pointer: int = 0          # Current instruction index
-    locals: Dict[int, int] = field(default_factory=dict)  # Local variables
-    args: Dict[int, int] = field(default_factory=dict)    # Arguments
+    locals: List[int] = field(default_factory=list)  # Local variables
+    args: List[int] = field(default_factory=list)    # Arguments
     stack_object_id: int = 0              # Stack object reference
-    
+    # (locals, args) as of the last traced step; cleared on write
+    snapshot: Optional[Tuple[Tuple[int, ...], Tuple[int, ...]]] = field(default=None, repr=False)
+
     def get_current_instruction(self) -> Optional[DisassembledInstruction]:
         """Get instruction at current pointer."""
         if 0 <= self.instruction_pointer < len(self.routine.instructions):
             return self.routine.instructions[self.instruction_pointer]
         return None
-    
+
     def __repr__(self) -> str:
         return (f"StackFrame(routine={self.routine.id}, "
                 f"ip={self.instruction_pointer}, "
                 f"locals={len(self.locals)}, args={len(self.args)})")
 
 
+@dataclass
+class VMContext:
+    """Thread-level state shared by every frame of one execution."""
+
+    temps: List[int] = field(default_factory=lambda: [0] * TEMP_COUNT)
+    store: Dict[Tuple[int, int], int] = field(default_factory=dict)  # (scope, data) -> value
+    stack: List[StackFrame] = field(default_factory=list)
+
+
 @dataclass
 class ExecutionStep:
     """Single step in execution trace."""
-    
+
     step_number: int                       # Ordinal step count
     instruction_pointer: int               # IP before execution
     instruction: DisassembledInstruction   # Instruction executed
     exit_code: VMPrimitiveExitCode        # How instruction terminated
     next_pointer: int                      # Where we're going next
-    locals_snapshot: Dict[int, int] = field(default_factory=dict)
-    args_snapshot: Dict[int, int] = field(default_factory=dict)
+    locals_snapshot: Tuple[int, ...] = ()  # Shared between steps, never mutated
+    args_snapshot: Tuple[int, ...] = ()
     stack_object_id: int = 0
-    
+    bhav_id: int = 0                       # Routine the step ran in
+    depth: int = 0                         # Call depth (0 = traced BHAV)
+
     def __str__(self) -> str:
         """Format as single line."""
         op_str = f"0x{self.instruction.opcode:04X}"
         exit_str = self.exit_code.name
-        return (f"Step {self.step_number:3d}: IP={self.instruction_pointer:3d} "
+        indent = "  " * self.depth
+        return (f"Step {self.step_number:3d}: {indent}IP={self.instruction_pointer:3d} "
                 f"[{op_str}] {self.instruction.opcode_name:25s} → "
                 f"{exit_str:20s} → IP={self.next_pointer:3d}")
 
@@ -95,12 +141,12 @@ class ExecutionStep:
 @dataclass
 class DisassembledBHAV:
     """BHAV with disassembled instructions (from BHAVDisassembler)."""
-    
+
     id: int                                 # BHAV ID
     instructions: List[DisassembledInstruction]
     args: int = 0
     locals: int = 0
-    
+
     def get_instruction(self, index: int) -> Optional[DisassembledInstruction]:
         """Get instruction by index."""
         if 0 <= index < len(self.instructions):
@@ -108,9 +154,33 @@ class DisassembledBHAV:
         return None
 
 
+# (handler, true_pointer, false_pointer, operands, opcode)
+CompiledInstruction = Tuple[Callable, int, int, Any, int]
+
+
+@dataclass
+class CompiledBHAV:
+    """BHAV lowered to a flat instruction array (see BHAVExecutor.compile)."""
+
+    id: int
+    code: List[CompiledInstruction]
+    args: int = CALL_ARG_COUNT              # Argument slots, at least CALL_ARG_COUNT
+    locals: int = 0                         # Local slots, covering every index used
+    source: Optional[BHAV] = None
+    _instructions: Optional[List[DisassembledInstruction]] = field(default=None, repr=False)
+
+    @property
+    def instructions(self) -> List[DisassembledInstruction]:
+        """Disassembled instructions, built on first use (traces and reports)."""
+        if self._instructions is None:
+            self._instructions = (BHAVDisassembler().disassemble(self.source)
+                                  if self.source is not None else [])
+        return self._instructions
+
+
 class ExecutionTrace:
     """Complete execution history of a BHAV routine."""
-    
+
     def __init__(self, bhav_id: int):
         self.bhav_id = bhav_id
         self.steps: List[ExecutionStep] = []
@@ -119,63 +189,77 @@ class ExecutionTrace:
         self.visited_instructions: Set[int] = set()
         self.loops_detected: List[Tuple[int, int]] = []  # (from_ip, to_ip)
         self.unreachable_instructions: Set[int] = set()
-    
+        self.step_count: int = 0           # Counted even when steps are not recorded
+        self.elapsed_seconds: float = 0.0
+
+    @property
+    def steps_per_second(self) -> float:
+        """Interpreter throughput for this run."""
+        return self.step_count / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
     def add_step(self, step: ExecutionStep) -> None:
         """Record execution step."""
         self.steps.append(step)
-        self.visited_instructions.add(step.instruction_pointer)
-    
+        self.step_count += 1
+        if step.depth == 0:
+            self.visited_instructions.add(step.instruction_pointer)
+
     def detect_loops(self) -> None:
-        """Find backward jumps (potential loops)."""
-        for i, step in enumerate(self.steps):
-            if step.next_pointer < step.instruction_pointer:
-                # Backward jump detected
-                self.loops_detected.append((step.instruction_pointer, step.next_pointer))
-    
+        """Find backward (or self) jumps - potential loops - in the traced BHAV."""
+        seen = set(self.loops_detected)
+        for step in self.steps:
+            if (step.depth == 0 and step.next_pointer <= step.instruction_pointer
+                    and step.exit_code is not VMPrimitiveExitCode.CONTINUE):
+                edge = (step.instruction_pointer, step.next_pointer)
+                if edge not in seen:
+                    seen.add(edge)
+                    self.loops_detected.append(edge)
+
     def find_unreachable(self, total_instructions: int) -> None:
         """Identify instructions never visited."""
         self.unreachable_instructions = set(range(total_instructions)) - self.visited_instructions
-    
+
     def format_summary(self) -> str:
         """Format execution summary."""
         lines = []
         lines.append(f"Execution Trace: BHAV #{self.bhav_id}")
-        lines.append(f"  Total Steps: {len(self.steps)}")
+        lines.append(f"  Total Steps: {self.step_count}")
         lines.append(f"  Visited Instructions: {len(self.visited_instructions)}")
         lines.append(f"  Loops Detected: {len(self.loops_detected)}")
         lines.append(f"  Unreachable Instructions: {len(self.unreachable_instructions)}")
         lines.append(f"  Exit Code: {self.exit_code.name if self.exit_code else 'N/A'}")
+        lines.append(f"  Steps/sec: {self.steps_per_second:,.0f}")
         return "\n".join(lines)
-    
+
     def format_steps(self, max_steps: Optional[int] = None) -> str:
         """Format execution steps."""
         lines = [f"Execution Steps (BHAV #{self.bhav_id}):"]
         lines.append("")
-        
+
         steps_to_show = self.steps[:max_steps] if max_steps else self.steps
         for step in steps_to_show:
             lines.append(str(step))
-        
+
         if max_steps and len(self.steps) > max_steps:
             lines.append(f"... and {len(self.steps) - max_steps} more steps")
-        
+
         return "\n".join(lines)
-    
+
     def format_loops(self) -> str:
         """Format detected loops."""
         if not self.loops_detected:
             return "No loops detected"
-        
+
         lines = ["Loops Detected:"]
         for from_ip, to_ip in self.loops_detected:
             lines.append(f"  Backward jump: IP {from_ip} → IP {to_ip}")
         return "\n".join(lines)
-    
+
     def format_unreachable(self, instructions: List[DisassembledInstruction]) -> str:
         """Format unreachable instructions."""
         if not self.unreachable_instructions:
             return "All instructions reachable"
-        
+
         lines = ["Unreachable Instructions:"]
         for ip in sorted(self.unreachable_instructions):
             if ip < len(instructions):
@@ -184,155 +268,404 @@ class ExecutionTrace:
         return "\n".join(lines)
 
 
+# ============================================================================
+# Expression semantics
+# ============================================================================
+
+def _short(value: int) -> int:
+    """Wrap to the VM's signed 16-bit range."""
+    return ((value + 0x8000) & 0xFFFF) - 0x8000
+
+
+def _div(lhs: int, rhs: int) -> int:
+    """Integer division truncating toward zero, as in C#."""
+    quotient = abs(lhs) // abs(rhs)
+    return quotient if (lhs < 0) == (rhs < 0) else -quotient
+
+
+def _mod(lhs: int, rhs: int) -> int:
+    """Remainder with the sign of the dividend, as in C#."""
+    remainder = abs(lhs) % abs(rhs)
+    return -remainder if lhs < 0 else remainder
+
+
+# operator -> (update(lhs, rhs) or None, test(lhs, rhs) or None).
+# update writes its result to lhs; test (on the updated lhs) picks the branch.
+_EXPRESSION_OPERATORS: Dict[int, Tuple[Optional[Callable], Optional[Callable]]] = {
+    Op.GREATER_THAN: (None, operator.gt),
+    Op.LESS_THAN: (None, operator.lt),
+    Op.EQUALS: (None, operator.eq),
+    Op.PLUS_EQUALS: (operator.add, None),
+    Op.MINUS_EQUALS: (operator.sub, None),
+    Op.ASSIGN: (lambda lhs, rhs: rhs, None),
+    Op.MUL_EQUALS: (operator.mul, None),
+    Op.DIV_EQUALS: (_div, None),
+    Op.IS_FLAG_SET: (None, lambda lhs, rhs: lhs & (1 << (rhs - 1)) != 0),
+    Op.SET_FLAG: (lambda lhs, rhs: lhs | (1 << (rhs - 1)), None),
+    Op.CLEAR_FLAG: (lambda lhs, rhs: lhs & ~(1 << (rhs - 1)), None),
+    Op.INC_AND_LESS_THAN: (lambda lhs, rhs: lhs + 1, operator.lt),
+    Op.MOD_EQUALS: (_mod, None),
+    Op.AND_EQUALS: (operator.and_, None),
+    Op.GREATER_THAN_OR_EQUAL: (None, operator.ge),
+    Op.LESS_THAN_OR_EQUAL: (None, operator.le),
+    Op.NOT_EQUAL_TO: (None, operator.ne),
+    Op.DEC_AND_GREATER_THAN: (lambda lhs, rhs: lhs - 1, operator.gt),
+    Op.TS1_OR_EQUALS: (operator.or_, None),
+    Op.TS1_XOR_EQUALS: (operator.xor, None),
+    Op.TS1_ASSIGN_SQRT_RHS: (lambda lhs, rhs: math.isqrt(rhs), None),
+}
+
+
+def _operand_slot(scope: int, data: int) -> Tuple[int, Any]:
+    """Resolve a (scope, data) operand to its storage slot and key."""
+    if scope == SCOPE_LITERAL:
+        return _LITERAL, data
+    if 0 <= data < MAX_FRAME_SLOTS:
+        if scope == SCOPE_LOCAL:
+            return _LOCAL, data
+        if scope == SCOPE_PARAMETER:
+            return _ARG, data
+        if scope == SCOPE_TEMP and data < TEMP_COUNT:
+            return _TEMP, data
+    return (_CONSTANT if scope == SCOPE_BCON else _STORE), (scope, data)
+
+
+def _decode_expression(operand: bytes) -> Optional[tuple]:
+    """
+    Decode an Expression operand.
+
+    Layout: lhs_data int16, rhs_data int16, is_signed, operator,
+    lhs_scope, rhs_scope.
+    """
+    lhs_data = int.from_bytes(operand[0:2], 'little', signed=True)
+    rhs_data = int.from_bytes(operand[2:4], 'little', signed=True)
+    semantics = _EXPRESSION_OPERATORS.get(operand[5])
+    if semantics is None:
+        return None
+    return (*_operand_slot(operand[6], lhs_data), *_operand_slot(operand[7], rhs_data), *semantics)
+
+
+def _decode_call(opcode: int, operand: bytes) -> tuple:
+    """Decode a subroutine call: four int16 arguments, all -1 meaning 'pass temps 0-3'."""
+    args = tuple(int.from_bytes(operand[i:i + 2], 'little', signed=True)
+                 for i in range(0, 2 * CALL_ARG_COUNT, 2))
+    return opcode, (None if args == (-1,) * CALL_ARG_COUNT else args)
+
+
+def _read(ctx: VMContext, frame: StackFrame, slot: int, key) -> int:
+    if slot == _LOCAL:
+        return frame.locals[key]
+    if slot == _TEMP:
+        return ctx.temps[key]
+    if slot == _ARG:
+        return frame.args[key]
+    if slot == _LITERAL:
+        return key
+    return ctx.store.get(key, 0)
+
+
+def _write(ctx: VMContext, frame: StackFrame, slot: int, key, value: int) -> bool:
+    """Store value; False if the operand is read-only (literal or BCON)."""
+    if slot == _LOCAL:
+        frame.locals[key] = value
+        frame.snapshot = None
+    elif slot == _TEMP:
+        ctx.temps[key] = value
+    elif slot == _ARG:
+        frame.args[key] = value
+        frame.snapshot = None
+    elif slot == _STORE:
+        ctx.store[key] = value
+    else:
+        return False
+    return True
+
+
+# ============================================================================
+# Primitive handlers: handler(executor, ctx, frame, operands) -> exit code
+# ============================================================================
+
+def _exec_expression(executor: 'BHAVExecutor', ctx: VMContext, frame: StackFrame,
+                     operands: tuple) -> VMPrimitiveExitCode:
+    lhs_slot, lhs_key, rhs_slot, rhs_key, update, test = operands
+    lhs = _read(ctx, frame, lhs_slot, lhs_key)
+    rhs = _read(ctx, frame, rhs_slot, rhs_key)
+    # Bad operands (divide by zero, flag numbers below 1) error out
+    try:
+        if update is not None:
+            lhs = _short(update(lhs, rhs))
+        taken = test is None or test(lhs, rhs)
+    except (ZeroDivisionError, ValueError):
+        return ERROR
+    if update is not None and not _write(ctx, frame, lhs_slot, lhs_key, lhs):
+        return ERROR
+    return GOTO_TRUE if taken else GOTO_FALSE
+
+
+def _exec_call(executor: 'BHAVExecutor', ctx: VMContext, frame: StackFrame,
+               operands: tuple) -> VMPrimitiveExitCode:
+    opcode, call_args = operands
+    callee = executor.resolve(opcode)
+    if callee is None:
+        return GOTO_TRUE
+    if len(ctx.stack) >= executor.MAX_CALL_DEPTH:
+        return ERROR
+    args = list(ctx.temps[:CALL_ARG_COUNT] if call_args is None else call_args)
+    args.extend([0] * (callee.args - CALL_ARG_COUNT))
+    ctx.stack.append(StackFrame(routine=callee, locals=[0] * callee.locals, args=args,
+                                stack_object_id=frame.stack_object_id))
+    return CONTINUE
+
+
+def _exec_succeed(executor: 'BHAVExecutor', ctx: VMContext, frame: StackFrame,
+                  operands) -> VMPrimitiveExitCode:
+    return GOTO_TRUE
+
+
+def _exec_error(executor: 'BHAVExecutor', ctx: VMContext, frame: StackFrame,
+                operands) -> VMPrimitiveExitCode:
+    return ERROR
+
+
+# opcode -> (operand decoder, handler). A decoder returning None compiles
+# the instruction to an error (e.g. an unknown Expression operator).
+PRIMITIVE_HANDLERS: Dict[int, Tuple[Callable[[bytes], Any], Callable]] = {
+    EXPRESSION_OPCODE: (_decode_expression, _exec_expression),
+}
+
+
+def _content_key(bhav: BHAV) -> tuple:
+    """Everything compile() reads from a BHAV; equal keys compile identically."""
+    return (bhav.chunk_id, bhav.args, bhav.locals,
+            tuple((inst.opcode, inst.true_pointer, inst.false_pointer, bytes(inst.operand))
+                  for inst in bhav.instructions))
+
+
 class BHAVExecutor:
-    """Execute BHAV bytecode with tracing (static analysis, no real primitives)."""
-    
+    """
+    Execute BHAV bytecode with tracing.
+
+    Expression and subroutine calls are executed; other primitives succeed.
+    Compiled BHAVs are cached by content (the last MAX_COMPILED), so repeated
+    runs (and every call site of a subroutine) reuse one instruction array,
+    while an edited BHAV is simply compiled again.
+    """
+
     # Settings
     MAX_STEPS = 10000  # Prevent infinite loops
-    
-    def __init__(self):
+    MAX_CALL_DEPTH = 64
+    MAX_COMPILED = 1024  # Compiled BHAVs kept (LRU)
+
+    def __init__(self, resolver: Optional[Callable[[int], Optional[BHAV]]] = None):
+        """
+        Args:
+            resolver: Maps a subroutine opcode (>= 256) to its BHAV, e.g.
+                      ``lambda opcode: iff.get(BHAV, opcode)``. Each opcode
+                      is resolved once per execute(); calls it cannot
+                      resolve succeed.
+        """
         self.disassembler = BHAVDisassembler()
-    
+        self.resolver = resolver
+        self._compiled: 'OrderedDict[tuple, CompiledBHAV]' = OrderedDict()
+        self._callees: Dict[int, Optional[CompiledBHAV]] = {}
+        self.total_steps = 0
+        self.total_seconds = 0.0
+
+    @property
+    def steps_per_second(self) -> float:
+        """Throughput over every execute() call so far."""
+        return self.total_steps / self.total_seconds if self.total_seconds > 0 else 0.0
+
+    def compile(self, bhav: BHAV) -> CompiledBHAV:
+        """Compile a BHAV into an instruction array (cached by content)."""
+        content = _content_key(bhav)
+        compiled = self._compiled.get(content)
+        if compiled is not None:
+            self._compiled.move_to_end(content)
+            if compiled._instructions is None:
+                # Disassemble from a BHAV that still matches the compiled code
+                compiled.source = bhav
+            return compiled
+
+        code: List[CompiledInstruction] = []
+        local_count = bhav.locals
+        arg_count = max(bhav.args, CALL_ARG_COUNT)
+        for inst in bhav.instructions:
+            opcode = inst.opcode
+            operand = bytes(inst.operand).ljust(8, b'\x00')
+            if opcode >= 256:
+                handler, operands = _exec_call, _decode_call(opcode, operand)
+            elif opcode in PRIMITIVE_HANDLERS:
+                decode, handler = PRIMITIVE_HANDLERS[opcode]
+                operands = decode(operand)
+                if operands is None:
+                    handler = _exec_error
+            else:
+                handler, operands = _exec_succeed, operand
+
+            if handler is _exec_expression:
+                # Size the frame to cover every local/arg the code touches
+                for slot, key in (operands[0:2], operands[2:4]):
+                    if slot == _LOCAL:
+                        local_count = max(local_count, key + 1)
+                    elif slot == _ARG:
+                        arg_count = max(arg_count, key + 1)
+            code.append((handler, inst.true_pointer, inst.false_pointer, operands, opcode))
+
+        compiled = CompiledBHAV(id=bhav.chunk_id, code=code, args=arg_count,
+                                locals=local_count, source=bhav)
+        self._compiled[content] = compiled
+        if len(self._compiled) > self.MAX_COMPILED:
+            self._compiled.popitem(last=False)
+        return compiled
+
+    def resolve(self, opcode: int) -> Optional[CompiledBHAV]:
+        """Compiled callee for a subroutine opcode, or None if unknown."""
+        if opcode in self._callees:
+            return self._callees[opcode]
+        bhav = self.resolver(opcode) if self.resolver is not None else None
+        callee = self.compile(bhav) if bhav is not None else None
+        self._callees[opcode] = callee
+        return callee
+
+    def clear_cache(self) -> None:
+        """Drop compiled BHAVs and resolved callees."""
+        self._compiled.clear()
+        self._callees.clear()
+
     def execute(self, bhav: BHAV, entry_point: int = 0,
                 trace: bool = True,
-                max_steps: Optional[int] = None) -> ExecutionTrace:
+                max_steps: Optional[int] = None,
+                args: Optional[List[int]] = None,
+                context: Optional[VMContext] = None) -> ExecutionTrace:
         """
         Execute BHAV with tracing.
-        
+
         Args:
             bhav: BHAV chunk to execute
             entry_point: Starting instruction index (default 0)
-            trace: Record execution trace
+            trace: Record every step (with locals/args snapshots). Without
+                   it only visited instructions, loops and counts are kept.
             max_steps: Limit steps (prevents infinite loops)
-        
+            args: Initial parameter values
+            context: Temps and other variable state; left as execution ends
+
         Returns:
             ExecutionTrace with execution history
         """
-        
         max_steps = max_steps or self.MAX_STEPS
-        
-        # Disassemble BHAV
-        instructions = self.disassembler.disassemble(bhav)
-        
-        # Create wrapper
-        disasm_bhav = DisassembledBHAV(
-            id=bhav.chunk_id,
-            instructions=instructions,
-            args=bhav.args,
-            locals=bhav.locals
-        )
-        
-        # Create trace
+        routine = self.compile(bhav)
+        # Resolve callees afresh each run, so edited subroutines are recompiled
+        self._callees.clear()
+        ctx = context if context is not None else VMContext()
+
         exec_trace = ExecutionTrace(bhav.chunk_id)
         exec_trace.entry_point = entry_point
-        
-        # Create initial stack frame
-        frame = StackFrame(routine=disasm_bhav, instruction_pointer=entry_point)
-        
-        # Execute
+        visited = exec_trace.visited_instructions
+        loops = exec_trace.loops_detected
+        steps = exec_trace.steps if trace else None
+
+        frame_args = list(args or ())[:routine.args]
+        frame_args.extend([0] * (routine.args - len(frame_args)))
+        frame = StackFrame(routine=routine, instruction_pointer=entry_point,
+                           locals=[0] * routine.locals, args=frame_args)
+        stack = ctx.stack = [frame]
+        code = routine.code
+
         step_number = 0
+        start = time.perf_counter()
         while step_number < max_steps:
-            # Get current instruction
-            inst = frame.get_current_instruction()
-            if not inst:
+            ip = frame.instruction_pointer
+            if not 0 <= ip < len(code):
                 # Out of bounds - execution ended
                 break
-            
-            # Simulate execution
-            exit_code, next_pointer = self._execute_instruction(inst)
-            
-            # Record step
-            if trace:
-                step = ExecutionStep(
+
+            handler, true_pointer, false_pointer, operands, _ = code[ip]
+            exit_code = handler(self, ctx, frame, operands)
+            if exit_code is GOTO_TRUE:
+                next_pointer = true_pointer
+            elif exit_code is GOTO_FALSE:
+                next_pointer = false_pointer
+            elif exit_code is CONTINUE:
+                # Subroutine pushed; this frame resumes here on return
+                next_pointer = ip
+            else:
+                next_pointer = POINTER_ERROR
+
+            depth = len(stack) - (2 if exit_code is CONTINUE else 1)
+            if depth == 0:
+                visited.add(ip)
+                if next_pointer <= ip and exit_code is not CONTINUE and (ip, next_pointer) not in loops:
+                    loops.append((ip, next_pointer))
+            if steps is not None:
+                snapshot = frame.snapshot
+                if snapshot is None:
+                    snapshot = frame.snapshot = (tuple(frame.locals), tuple(frame.args))
+                steps.append(ExecutionStep(
                     step_number=step_number,
-                    instruction_pointer=frame.instruction_pointer,
-                    instruction=inst,
+                    instruction_pointer=ip,
+                    instruction=frame.routine.instructions[ip],
                     exit_code=exit_code,
                     next_pointer=next_pointer,
-                    locals_snapshot=deepcopy(frame.locals),
-                    args_snapshot=deepcopy(frame.args),
-                    stack_object_id=frame.stack_object_id
-                )
-                exec_trace.add_step(step)
-            
-            # Handle exit code
-            if exit_code in [VMPrimitiveExitCode.RETURN_TRUE,
-                            VMPrimitiveExitCode.RETURN_FALSE,
-                            VMPrimitiveExitCode.ERROR]:
-                # Execution ends
-                exec_trace.exit_code = exit_code
-                break
-            
-            # Move to next instruction
-            if next_pointer == 255:  # Special return-false pointer
-                exec_trace.exit_code = VMPrimitiveExitCode.RETURN_FALSE
-                break
-            elif next_pointer == 254:  # Special return-true pointer
-                exec_trace.exit_code = VMPrimitiveExitCode.RETURN_TRUE
+                    locals_snapshot=snapshot[0],
+                    args_snapshot=snapshot[1],
+                    stack_object_id=frame.stack_object_id,
+                    bhav_id=frame.routine.id,
+                    depth=depth,
+                ))
+            step_number += 1
+
+            if exit_code is CONTINUE:
+                frame = stack[-1]
+                code = frame.routine.code
+                continue
+
+            # Unwind returns through the callers' true/false pointers
+            while next_pointer >= POINTER_ERROR:
+                stack.pop()
+                if next_pointer == POINTER_ERROR or not stack:
+                    exec_trace.exit_code = (
+                        ERROR if next_pointer == POINTER_ERROR else
+                        VMPrimitiveExitCode.RETURN_TRUE if next_pointer == POINTER_TRUE else
+                        VMPrimitiveExitCode.RETURN_FALSE)
+                    break
+                caller = stack[-1]
+                _, true_pointer, false_pointer, _, _ = caller.routine.code[caller.instruction_pointer]
+                next_pointer = true_pointer if next_pointer == POINTER_TRUE else false_pointer
+                if len(stack) == 1 and next_pointer <= caller.instruction_pointer:
+                    if (caller.instruction_pointer, next_pointer) not in loops:
+                        loops.append((caller.instruction_pointer, next_pointer))
+            if exec_trace.exit_code is not None:
                 break
-            
+
+            frame = stack[-1]
             frame.instruction_pointer = next_pointer
-            step_number += 1
-        
-        # Post-process trace
-        exec_trace.detect_loops()
-        exec_trace.find_unreachable(len(instructions))
-        
+            code = frame.routine.code
+
+        exec_trace.elapsed_seconds = time.perf_counter() - start
+        exec_trace.step_count = step_number
+        self.total_steps += step_number
+        self.total_seconds += exec_trace.elapsed_seconds
+
+        exec_trace.find_unreachable(len(routine.code))
         return exec_trace
-    
-    def _execute_instruction(self, inst: DisassembledInstruction) -> Tuple[VMPrimitiveExitCode, int]:
-        """
-        Simulate instruction execution (without actual primitives).
-        
-        Returns:
-            (exit_code, next_instruction_pointer)
-        """
-        
-        # Simulate based on opcode semantics
-        
-        # Expression operators - simulate as always succeeding
-        if inst.opcode == 0x0002:  # Expression
-            exit_code = VMPrimitiveExitCode.GOTO_TRUE
-            next_pointer = inst.true_pointer
-        
-        # Control flow - follow branches
-        elif inst.opcode in [0x0001]:  # GenericTSOCall / subroutine
-            exit_code = VMPrimitiveExitCode.CONTINUE
-            next_pointer = inst.index + 1
-        
-        # Return instructions
-        elif inst.opcode in [0x00FE]:  # Return
-            exit_code = VMPrimitiveExitCode.RETURN_TRUE
-            next_pointer = inst.true_pointer
-        
-        # Unknown opcodes - treat as continue
-        elif inst.is_unknown:
-            exit_code = VMPrimitiveExitCode.CONTINUE
-            next_pointer = inst.index + 1
-        
-        # Default - continue to next instruction
-        else:
-            exit_code = VMPrimitiveExitCode.CONTINUE
-            next_pointer = inst.index + 1
-        
-        return exit_code, next_pointer
-    
+
     def find_reachable_instructions(self, bhav: BHAV,
                                     entry_point: int = 0) -> Set[int]:
         """Find all instructions reachable from entry point."""
-        trace = self.execute(bhav, entry_point=entry_point, trace=True)
+        trace = self.execute(bhav, entry_point=entry_point, trace=False)
         return trace.visited_instructions
-    
+
     def find_unreachable_instructions(self, bhav: BHAV,
                                       entry_point: int = 0) -> Set[int]:
         """Find all unreachable instructions."""
-        trace = self.execute(bhav, entry_point=entry_point, trace=True)
+        trace = self.execute(bhav, entry_point=entry_point, trace=False)
         return trace.unreachable_instructions
-    
+
     def detect_loops(self, bhav: BHAV,
                      entry_point: int = 0) -> List[Tuple[int, int]]:
         """Find backward jumps (potential infinite loops)."""
-        trace = self.execute(bhav, entry_point=entry_point, trace=True)
+        trace = self.execute(bhav, entry_point=entry_point, trace=False)
         return trace.loops_detected
 
 
@@ -346,7 +679,7 @@ class BHAVExecutionAnalyzer:
         """Run full execution analysis."""
         trace = self.executor.execute(bhav, trace=True)
         
-        instructions = self.executor.disassembler.disassemble(bhav)
+        instructions = self.executor.compile(bhav).instructions
         
         return {
             'bhav_id': bhav.chunk_id,
@@ -0,0 +1,263 @@
+"""
+BHAV Index — content-addressed deduplication and similarity lookup.
+
+Helper routines are copied verbatim into hundreds of object IFFs. BhavIndex
+gives every BHAV a content ID, a hash of its normalized body (argument and
+local counts plus every instruction's opcode, pointers and operand; chunk
+ID, label and file version excluded), so identical copies collapse to one
+entry. Each unique body also gets a MinHash signature over its opcode
+n-grams, banded into LSH buckets:
+
+- duplicates(key):  every copy of the same body, one dict lookup
+- similar(key):     near-duplicate bodies by estimated Jaccard similarity
+                    of their n-gram sets, checking only bucket candidates
+- analyze(fn):      run fn once per unique body, results mapped to every key
+
+Keys are any hashable the caller chooses; add_iff() uses
+(iff filename, chunk ID), matching ResourceNode.owner_iff and the TGI
+instance ID in the resource graph.
+
+Usage:
+    index = BhavIndex()
+    for iff in iffs:
+        index.add_iff(iff)
+    index.statistics()                     # unique bodies vs copies
+    index.similar((path, 0x1000), threshold=0.6)
+    results = index.analyze(disassembler.disassemble)
+"""
+
+import hashlib
+import struct
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+
+def content_id(bhav) -> str:
+    """Hex content ID of a BHAV's normalized body."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(struct.pack('<HH', bhav.args, bhav.locals))
+    for inst in bhav.instructions:
+        digest.update(struct.pack('<HBB', inst.opcode, inst.true_pointer, inst.false_pointer))
+        digest.update(bytes(inst.operand).ljust(8, b'\0'))
+    return digest.hexdigest()
+
+
+def opcode_shingles(opcodes: Sequence[int], ngram: int = 3) -> set:
+    """Opcode n-grams in instruction order, each packed 16 bits per opcode."""
+    if len(opcodes) < ngram:
+        ngram = len(opcodes)
+    shingles = set()
+    for start in range(len(opcodes) - ngram + 1):
+        key = 0
+        for opcode in opcodes[start:start + ngram]:
+            key = (key << 16) | opcode
+        shingles.add(key)
+    return shingles
+
+
+def _splitmix64(x: int) -> int:
+    x = (x + 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+    return x ^ (x >> 31)
+
+
+class BhavIndex:
+    """Exact (content ID) and near-duplicate (MinHash/LSH) BHAV lookup."""
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, ngram: int = 3):
+        """
+        Args:
+            num_perm: MinHash signature length
+            bands: LSH bands; num_perm / bands rows each. More bands find
+                   less similar candidates (threshold ~ (1/bands)^(1/rows))
+            ngram: Opcode n-gram length for shingles
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.ngram = ngram
+        # Universal hash family (a * x + b) mod p, fixed seeds for stable signatures
+        self._perms = [(_splitmix64(2 * i) % (MERSENNE_PRIME - 1) + 1,
+                        _splitmix64(2 * i + 1) % MERSENNE_PRIME)
+                       for i in range(num_perm)]
+
+        self._key_ids: Dict[Hashable, str] = {}
+        self._copies: Dict[str, List[Hashable]] = {}
+        self._bodies: Dict[str, object] = {}         # Content ID -> first BHAV seen
+        self._signatures: Dict[str, Tuple[int, ...]] = {}
+        self._buckets: List[Dict[Tuple[int, ...], List[str]]] = [{} for _ in range(bands)]
+
+    def __len__(self) -> int:
+        """Number of BHAVs added (copies included)."""
+        return len(self._key_ids)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._key_ids
+
+    @property
+    def unique_count(self) -> int:
+        """Number of distinct bodies."""
+        return len(self._copies)
+
+    # ------------------------------------------------------------------
+    # Input
+    # ------------------------------------------------------------------
+
+    def add(self, bhav, key: Hashable) -> str:
+        """
+        Index one BHAV under key. Returns its content ID.
+
+        Only the first copy of a body is hashed into MinHash/LSH; later copies
+        cost one content hash and a dict insert.
+        """
+        cid = content_id(bhav)
+        old = self._key_ids.get(key)
+        if old == cid:
+            return cid
+        if old is not None:
+            self._discard(key, old)
+        self._key_ids[key] = cid
+        copies = self._copies.get(cid)
+        if copies is None:
+            self._copies[cid] = [key]
+            self._bodies[cid] = bhav
+            signature = self.signature([inst.opcode for inst in bhav.instructions])
+            self._signatures[cid] = signature
+            for band, bucket in zip(self._bands(signature), self._buckets):
+                bucket.setdefault(band, []).append(cid)
+        else:
+            copies.append(key)
+        return cid
+
+    def _discard(self, key: Hashable, cid: str):
+        copies = self._copies[cid]
+        copies.remove(key)
+        if copies:
+            return
+        del self._copies[cid], self._bodies[cid]
+        for band, bucket in zip(self._bands(self._signatures.pop(cid)), self._buckets):
+            members = bucket[band]
+            members.remove(cid)
+            if not members:
+                del bucket[band]
+
+    def add_iff(self, iff, owner: Optional[str] = None) -> int:
+        """Index every BHAV of a parsed IffFile as (owner, chunk_id). Returns BHAVs added."""
+        if owner is None:
+            owner = iff.filename
+        added = 0
+        for bhav in iff.get_by_type_code("BHAV"):
+            self.add(bhav, (owner, bhav.chunk_id))
+            added += 1
+        return added
+
+    # ------------------------------------------------------------------
+    # MinHash / LSH
+    # ------------------------------------------------------------------
+
+    def signature(self, opcodes: Sequence[int]) -> Tuple[int, ...]:
+        """MinHash signature of an opcode stream's n-gram set."""
+        hashes = [_splitmix64(s) & MAX_HASH for s in opcode_shingles(opcodes, self.ngram)]
+        if not hashes:
+            return (MAX_HASH,) * self.num_perm
+        p = MERSENNE_PRIME
+        return tuple(min((a * h + b) % p for h in hashes) for a, b in self._perms)
+
+    def _bands(self, signature: Tuple[int, ...]) -> List[Tuple[int, ...]]:
+        r = self.rows
+        return [signature[i:i + r] for i in range(0, self.num_perm, r)]
+
+    def _estimate(self, a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+        return sum(x == y for x, y in zip(a, b)) / self.num_perm
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def content_id_of(self, key: Hashable) -> Optional[str]:
+        """Content ID a key was indexed under, or None."""
+        return self._key_ids.get(key)
+
+    def body(self, cid: str):
+        """Representative BHAV (first copy added) for a content ID."""
+        return self._bodies.get(cid)
+
+    def copies(self, cid: str) -> List[Hashable]:
+        """Every key sharing a content ID."""
+        return list(self._copies.get(cid, ()))
+
+    def duplicates(self, key: Hashable) -> List[Hashable]:
+        """Other keys with exactly the same body."""
+        cid = self._key_ids.get(key)
+        if cid is None:
+            return []
+        return [k for k in self._copies[cid] if k != key]
+
+    def duplicate_groups(self, min_copies: int = 2) -> Dict[str, List[Hashable]]:
+        """Content ID -> keys, for bodies copied at least min_copies times."""
+        return {cid: list(keys) for cid, keys in self._copies.items() if len(keys) >= min_copies}
+
+    def similar(self, key: Hashable, threshold: float = 0.5,
+                limit: Optional[int] = 10) -> List[Tuple[str, float]]:
+        """
+        Near-duplicate bodies of key's BHAV, most similar first.
+
+        Returns (content ID, estimated Jaccard similarity) for other unique
+        bodies sharing at least one LSH band, at or above threshold. Exact
+        copies of key's own body are left to duplicates().
+        """
+        cid = self._key_ids.get(key)
+        if cid is None:
+            return []
+        signature = self._signatures[cid]
+        candidates = set()
+        for band, bucket in zip(self._bands(signature), self._buckets):
+            candidates.update(bucket.get(band, ()))
+        candidates.discard(cid)
+
+        scored = []
+        for other in candidates:
+            score = self._estimate(signature, self._signatures[other])
+            if score >= threshold:
+                scored.append((other, score))
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored if limit is None else scored[:limit]
+
+    def analyze(self, fn: Callable, keys: Optional[Sequence[Hashable]] = None) -> Dict[Hashable, object]:
+        """
+        Run fn(bhav) once per unique body and map the result to every key.
+
+        Args:
+            fn: Analysis of one BHAV; must not depend on chunk ID or label
+            keys: Restrict to these keys (default: all)
+        """
+        if keys is None:
+            keys = self._key_ids
+        results: Dict[str, object] = {}
+        mapped = {}
+        for key in keys:
+            cid = self._key_ids.get(key)
+            if cid is None:
+                continue
+            if cid not in results:
+                results[cid] = fn(self._bodies[cid])
+            mapped[key] = results[cid]
+        return mapped
+
+    def statistics(self) -> Dict:
+        """BHAV, unique body and duplicated-copy counts."""
+        total = len(self._key_ids)
+        unique = len(self._copies)
+        return {
+            'bhavs': total,
+            'unique_bodies': unique,
+            'duplicate_copies': total - unique,
+            'duplicated_bodies': sum(1 for keys in self._copies.values() if len(keys) > 1),
+            'dedup_ratio': (total - unique) / total if total else 0.0,
+        }
@@ -0,0 +1,416 @@
+"""
+Corpus Call Graph — BHAV call relationships across every IFF in the game.
+
+CallGraphBuilder works one IFF at a time, so calls into Global.iff and the
+semi-global files stay "external". CorpusCallGraphBuilder ingests object
+IFFs together with the global and semi-global files and resolves each call
+(opcode >= 256) by range:
+
+- 0x0100-0x0FFF: global, defined in Global.iff
+- 0x1000-0x1FFF: local, defined in the calling file
+- 0x2000+:       semi-global, defined in the file named by the caller's
+                 GLOB chunk (or in the calling file itself)
+
+A call resolves to every ingested definition (e.g. one Global.iff per
+expansion pack). Calls with no definition point at placeholder nodes in the
+UNRESOLVED_FILE pseudo-file.
+
+Nodes are (file, bhav_id) pairs numbered in (file, bhav_id) order. Edges are
+kept as CSR arrays in both directions, and the whole graph saves to a single
+binary file that loads without reading any IFF again.
+
+Usage:
+    builder = CorpusCallGraphBuilder()
+    builder.add_path("C:/Program Files/Maxis/The Sims")
+    graph = builder.build()
+    graph.save("data/bhav_call_graph.bin")
+
+    graph = CorpusCallGraph.load("data/bhav_call_graph.bin")
+    for ref in graph.callers_of_global(0x0118):
+        print(ref.file, ref.id_hex)
+"""
+
+import json
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from .bhav_call_graph import BHAVScope
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from formats.far.far1 import FAR1Archive
+from formats.iff.iff_file import IffFile
+
+
+UNRESOLVED_FILE = "<unresolved>"
+GLOBAL_FILE_NAME = "global.iff"
+
+_MAGIC = b"BCG1"
+_HEADER = struct.Struct("<4sI")  # magic, metadata length
+# Array name -> typecode, in file order
+_ARRAYS = (
+    ("file_offsets", "I"),
+    ("node_bhav", "H"),
+    ("out_offsets", "I"),
+    ("out_targets", "I"),
+    ("in_offsets", "I"),
+    ("in_sources", "I"),
+)
+
+
+class BHAVRef(NamedTuple):
+    """A BHAV in the corpus: file name, containing archive, chunk ID."""
+    file: str
+    archive: str
+    bhav_id: int
+
+    @property
+    def id_hex(self) -> str:
+        return f"0x{self.bhav_id:04X}"
+
+    @property
+    def scope(self) -> BHAVScope:
+        return BHAVScope.from_id(self.bhav_id)
+
+    @property
+    def is_unresolved(self) -> bool:
+        return self.file == UNRESOLVED_FILE
+
+
+@dataclass
+class _FileCalls:
+    """Calls extracted from one IFF, before resolution."""
+    name: str
+    archive: str
+    glob: str = ""
+    bhavs: Dict[int, List[int]] = field(default_factory=dict)  # bhav_id -> call opcodes
+
+
+class CorpusCallGraph:
+    """
+    Read-only call graph over the whole corpus.
+
+    Node i is the BHAV node_bhav[i] of the file whose range
+    file_offsets[f]:file_offsets[f + 1] contains i. out_targets[
+    out_offsets[i]:out_offsets[i + 1]] are its callees and in_sources[
+    in_offsets[i]:in_offsets[i + 1]] its callers, both sorted.
+    """
+
+    def __init__(self, files: List[str], archives: List[str], globs: List[str],
+                 arrays: Dict[str, array]):
+        self.files = files
+        self.archives = archives
+        self.globs = globs          # GLOB (semi-global) name per file, "" if none
+        self.file_offsets: array = arrays["file_offsets"]
+        self.node_bhav: array = arrays["node_bhav"]
+        self.out_offsets: array = arrays["out_offsets"]
+        self.out_targets: array = arrays["out_targets"]
+        self.in_offsets: array = arrays["in_offsets"]
+        self.in_sources: array = arrays["in_sources"]
+        self._by_name: Optional[Dict[str, List[int]]] = None
+
+    @property
+    def node_count(self) -> int:
+        return len(self.node_bhav)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.out_targets)
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def file_indices(self, name: str) -> List[int]:
+        """Indices of every file with this name (case-insensitive)."""
+        if self._by_name is None:
+            self._by_name = {}
+            for index, file_name in enumerate(self.files):
+                self._by_name.setdefault(file_name.lower(), []).append(index)
+        return self._by_name.get(name.lower(), [])
+
+    def node_index(self, file_index: int, bhav_id: int) -> Optional[int]:
+        """Node of (file, bhav_id), or None if the file has no such BHAV."""
+        lo, hi = self.file_offsets[file_index], self.file_offsets[file_index + 1]
+        i = bisect_left(self.node_bhav, bhav_id, lo, hi)
+        return i if i < hi and self.node_bhav[i] == bhav_id else None
+
+    def file_of(self, node: int) -> int:
+        """File index of a node."""
+        return bisect_left(self.file_offsets, node + 1) - 1
+
+    def ref(self, node: int) -> BHAVRef:
+        f = self.file_of(node)
+        return BHAVRef(self.files[f], self.archives[f], self.node_bhav[node])
+
+    def nodes(self, file: str, bhav_id: int) -> List[int]:
+        """Nodes of bhav_id in every file named file."""
+        found = (self.node_index(f, bhav_id) for f in self.file_indices(file))
+        return [n for n in found if n is not None]
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def callees_of_node(self, node: int) -> array:
+        return self.out_targets[self.out_offsets[node]:self.out_offsets[node + 1]]
+
+    def callers_of_node(self, node: int) -> array:
+        return self.in_sources[self.in_offsets[node]:self.in_offsets[node + 1]]
+
+    def callers(self, file: str, bhav_id: int) -> List[BHAVRef]:
+        """BHAVs anywhere in the corpus that call (file, bhav_id)."""
+        return self._refs(n for node in self.nodes(file, bhav_id)
+                          for n in self.callers_of_node(node))
+
+    def callees(self, file: str, bhav_id: int) -> List[BHAVRef]:
+        """BHAVs called by (file, bhav_id), resolved across files."""
+        return self._refs(n for node in self.nodes(file, bhav_id)
+                          for n in self.callees_of_node(node))
+
+    def callers_of_global(self, bhav_id: int) -> List[BHAVRef]:
+        """
+        Every caller of global bhav_id, whichever Global.iff defines it
+        (or none was ingested).
+        """
+        return self._refs(n for name in (GLOBAL_FILE_NAME, UNRESOLVED_FILE)
+                          for node in self.nodes(name, bhav_id)
+                          for n in self.callers_of_node(node))
+
+    def unresolved_calls(self) -> Dict[int, List[BHAVRef]]:
+        """Call targets with no ingested definition -> their callers."""
+        result = {}
+        for f in self.file_indices(UNRESOLVED_FILE):
+            for node in range(self.file_offsets[f], self.file_offsets[f + 1]):
+                result[self.node_bhav[node]] = self._refs(self.callers_of_node(node))
+        return result
+
+    def _refs(self, nodes: Iterable[int]) -> List[BHAVRef]:
+        return [self.ref(n) for n in sorted(set(nodes))]
+
+    def get_summary(self) -> Dict:
+        """Get summary statistics."""
+        unresolved = self.file_indices(UNRESOLVED_FILE)
+        return {
+            "files": len(self.files) - len(unresolved),
+            "bhavs": self.node_count - sum(self.file_offsets[f + 1] - self.file_offsets[f]
+                                           for f in unresolved),
+            "edges": self.edge_count,
+            "unresolved_targets": len(self.unresolved_calls()),
+        }
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Write the graph to one binary file: header, JSON metadata, then the
+        CSR arrays as raw little-endian data.
+        """
+        meta = {
+            "files": self.files,
+            "archives": self.archives,
+            "globs": self.globs,
+            "lengths": [len(getattr(self, name)) for name, _ in _ARRAYS],
+        }
+        meta_bytes = json.dumps(meta).encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, len(meta_bytes)))
+            f.write(meta_bytes)
+            for name, _ in _ARRAYS:
+                data = getattr(self, name)
+                if sys.byteorder == "big":
+                    data = array(data.typecode, data)
+                    data.byteswap()
+                f.write(data.tobytes())
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'CorpusCallGraph':
+        """
+        Load a graph written by save().
+
+        Raises:
+            ValueError: If the file is not a saved call graph
+        """
+        data = Path(path).read_bytes()
+        if len(data) < _HEADER.size:
+            raise ValueError(f"Not a call graph file: {path}")
+        magic, meta_len = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError(f"Not a call graph file: {path}")
+        pos = _HEADER.size + meta_len
+        meta = json.loads(data[_HEADER.size:pos])
+
+        arrays = {}
+        view = memoryview(data)
+        for (name, typecode), length in zip(_ARRAYS, meta["lengths"]):
+            values = array(typecode)
+            end = pos + length * values.itemsize
+            values.frombytes(view[pos:end])
+            if sys.byteorder == "big":
+                values.byteswap()
+            arrays[name] = values
+            pos = end
+        if pos != len(data):
+            raise ValueError(f"Truncated or corrupt call graph file: {path}")
+        return cls(meta["files"], meta["archives"], meta["globs"], arrays)
+
+
+class CorpusCallGraphBuilder:
+    """
+    Builder for the corpus-wide call graph.
+
+    Usage:
+        builder = CorpusCallGraphBuilder()
+        builder.add_path(game_dir)          # IFFs and FAR archives, recursively
+        builder.add_iff_bytes(data, "Extra.iff")
+        graph = builder.build()
+    """
+
+    def __init__(self):
+        self._files: List[_FileCalls] = []
+        self.errors: List[str] = []
+
+    def add_path(self, path: Union[str, Path]) -> int:
+        """
+        Ingest an IFF, a FAR archive or a directory tree of them.
+
+        Returns:
+            Number of IFFs added
+        """
+        path = Path(path)
+        if path.is_dir():
+            return sum(self.add_path(item) for item in sorted(path.iterdir()))
+        ext = path.suffix.lower()
+        if ext == ".iff":
+            return int(self.add_iff_bytes(path.read_bytes(), path.name))
+        if ext == ".far":
+            added = 0
+            try:
+                with FAR1Archive(str(path)) as far:
+                    for entry, data in far.iter_entries():
+                        if entry.filename.lower().endswith(".iff"):
+                            added += self.add_iff_bytes(data, entry.filename, str(path))
+            except Exception as e:
+                self.errors.append(f"FAR error {path}: {e}")
+            return added
+        return 0
+
+    def add_iff_bytes(self, data: bytes, name: str, archive: str = "") -> bool:
+        """Ingest one IFF's BHAV and GLOB chunks. Returns False if unreadable."""
+        try:
+            iff = IffFile.from_bytes(bytes(data), name, only_types={"BHAV", "GLOB"})
+        except Exception as e:
+            self.errors.append(f"IFF error {archive or name} [{name}]: {e}")
+            return False
+
+        calls = _FileCalls(Path(name).name, archive)
+        for glob in iff.get_by_type_code("GLOB"):
+            calls.glob = glob.name.strip()
+        for bhav in iff.get_by_type_code("BHAV"):
+            targets = calls.bhavs.setdefault(bhav.chunk_id, [])
+            for inst in bhav.instructions:
+                if inst.opcode >= 256 and inst.opcode not in targets:
+                    targets.append(inst.opcode)
+        self._files.append(calls)
+        return True
+
+    def build(self) -> CorpusCallGraph:
+        """Resolve every call and pack the graph into CSR arrays."""
+        files = list(self._files)
+        global_files = [i for i, f in enumerate(files) if f.name.lower() == GLOBAL_FILE_NAME]
+        by_stem: Dict[str, List[int]] = {}
+        for i, f in enumerate(files):
+            by_stem.setdefault(Path(f.name).stem.lower(), []).append(i)
+
+        # Resolve calls to (file index, bhav_id) keys
+        unresolved = _FileCalls(UNRESOLVED_FILE, "")
+        unresolved_index = len(files)
+        resolved: List[Tuple[Tuple[int, int], List[Tuple[int, int]]]] = []
+        for f, calls in enumerate(files):
+            semi_files = by_stem.get(Path(calls.glob).stem.lower(), []) if calls.glob else []
+            for bhav_id, opcodes in calls.bhavs.items():
+                targets = []
+                for opcode in opcodes:
+                    scope = BHAVScope.from_id(opcode)
+                    if scope == BHAVScope.GLOBAL:
+                        candidates = global_files
+                    elif scope == BHAVScope.LOCAL or opcode in calls.bhavs:
+                        candidates = [f]
+                    else:
+                        candidates = semi_files
+                    found = [(c, opcode) for c in candidates if opcode in files[c].bhavs]
+                    if not found:
+                        unresolved.bhavs.setdefault(opcode, [])
+                        found = [(unresolved_index, opcode)]
+                    targets.extend(found)
+                resolved.append(((f, bhav_id), targets))
+        files.append(unresolved)
+
+        # Number nodes in (file, bhav_id) order
+        file_offsets = array("I", [0])
+        node_bhav = array("H")
+        node_of: Dict[Tuple[int, int], int] = {}
+        for f, calls in enumerate(files):
+            for bhav_id in sorted(calls.bhavs):
+                node_of[(f, bhav_id)] = len(node_bhav)
+                node_bhav.append(bhav_id)
+            file_offsets.append(len(node_bhav))
+
+        node_count = len(node_bhav)
+        out_lists: List[List[int]] = [[] for _ in range(node_count)]
+        for caller, targets in resolved:
+            out_lists[node_of[caller]] = sorted({node_of[t] for t in targets})
+        out_offsets, out_targets = _csr(out_lists)
+
+        in_lists: List[List[int]] = [[] for _ in range(node_count)]
+        for caller, callees in enumerate(out_lists):
+            for callee in callees:
+                in_lists[callee].append(caller)
+        in_offsets, in_sources = _csr(in_lists)
+
+        return CorpusCallGraph(
+            files=[f.name for f in files],
+            archives=[f.archive for f in files],
+            globs=[f.glob for f in files],
+            arrays={
+                "file_offsets": file_offsets,
+                "node_bhav": node_bhav,
+                "out_offsets": out_offsets,
+                "out_targets": out_targets,
+                "in_offsets": in_offsets,
+                "in_sources": in_sources,
+            },
+        )
+
+
+def _csr(lists: List[List[int]]) -> Tuple[array, array]:
+    """Pack adjacency lists into (offsets, targets) arrays."""
+    offsets = array("I", [0])
+    targets = array("I")
+    for items in lists:
+        targets.extend(items)
+        offsets.append(len(targets))
+    return offsets, targets
+
+
+def build_corpus_call_graph(paths: Iterable[Union[str, Path]]) -> CorpusCallGraph:
+    """
+    Convenience function to build the corpus call graph.
+
+    Args:
+        paths: Game directories, IFF files or FAR archives
+
+    Returns:
+        CorpusCallGraph over everything found
+    """
+    builder = CorpusCallGraphBuilder()
+    for path in paths:
+        builder.add_path(path)
+    return builder.build()
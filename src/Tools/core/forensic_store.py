@@ -0,0 +1,359 @@
+"""
+Forensic Store — per-instruction BHAV facts for cross-pack opcode analysis.
+
+The forensic tools used to talk through expansion_forensic_*.txt reports and
+regex-parse them back. ForensicStore keeps the underlying facts instead: one
+row per BHAV instruction (pack, object, BHAV, index, opcode, pointers,
+operand bytes) in a single SQLite database, plus a per-object opcode table
+derived from it. Confidence, merge and co-occurrence analyses are SQL
+queries over those tables; ForensicAnalyzer still classifies each opcode's
+object list into HIGH/MEDIUM/LOW.
+
+An object is an IFF inside a pack, named by its file name without ".iff"
+(FAR subdirectories kept), the names ForensicAnalyzer categorizes.
+
+Usage:
+    store = ForensicStore("expansion_forensic.db")
+    store.ingest("Base Game", "GameData/Objects/Objects.far")
+    profiles = store.profiles("Base Game")
+    for opcode, packs in store.opcode_packs("HIGH", min_packs=2).items():
+        print(f"0x{opcode:04X}", packs)
+    store.close()
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .forensic_module import ForensicAnalyzer, OpcodeProfile
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from formats.far.far1 import FAR1Archive
+from formats.iff.iff_file import IffFile
+
+
+DEFAULT_DATABASE = Path("expansion_forensic.db")
+
+
+class ForensicStore:
+    """SQLite-backed instruction table with opcode analysis queries."""
+
+    def __init__(self, db_path: Union[str, Path] = DEFAULT_DATABASE):
+        self.db_path = Path(db_path)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.errors: List[str] = []
+        self._analyzer = ForensicAnalyzer()
+        self._profiles: Dict[str, Dict[int, OpcodeProfile]] = {}
+        with self.conn:
+            self._create_tables(self.conn.cursor())
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self) -> 'ForensicStore':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def _create_tables(cur: sqlite3.Cursor):
+        cur.execute('''CREATE TABLE IF NOT EXISTS packs (
+            id INTEGER PRIMARY KEY,
+            name TEXT UNIQUE,
+            source TEXT,
+            size INTEGER,
+            mtime_ns INTEGER
+        )''')
+        cur.execute('''CREATE TABLE IF NOT EXISTS objects (
+            id INTEGER PRIMARY KEY,
+            pack_id INTEGER,
+            name TEXT
+        )''')
+        cur.execute('''CREATE TABLE IF NOT EXISTS bhavs (
+            id INTEGER PRIMARY KEY,
+            object_id INTEGER,
+            bhav_id INTEGER
+        )''')
+        # Rowid-free so each instruction costs only its columns
+        cur.execute('''CREATE TABLE IF NOT EXISTS instructions (
+            bhav INTEGER,
+            idx INTEGER,
+            opcode INTEGER,
+            true_ptr INTEGER,
+            false_ptr INTEGER,
+            operand BLOB,
+            PRIMARY KEY (bhav, idx)
+        ) WITHOUT ROWID''')
+        # Derived: how often each object uses each opcode
+        cur.execute('''CREATE TABLE IF NOT EXISTS object_opcodes (
+            opcode INTEGER,
+            object_id INTEGER,
+            uses INTEGER,
+            PRIMARY KEY (opcode, object_id)
+        ) WITHOUT ROWID''')
+        cur.execute('CREATE INDEX IF NOT EXISTS idx_objects_pack ON objects (pack_id)')
+        cur.execute('CREATE INDEX IF NOT EXISTS idx_bhavs_object ON bhavs (object_id)')
+        cur.execute('CREATE INDEX IF NOT EXISTS idx_instructions_opcode ON instructions (opcode)')
+        cur.execute('CREATE INDEX IF NOT EXISTS idx_object_opcodes_object ON object_opcodes (object_id, opcode)')
+
+    # ------------------------------------------------------------------
+    # Ingest
+    # ------------------------------------------------------------------
+
+    def ingest(self, pack: str, path: Union[str, Path], force: bool = False) -> bool:
+        """
+        Record every BHAV instruction in a FAR archive, IFF or directory tree.
+
+        Replaces any earlier data for the pack. Unless force is set, a pack
+        whose source path, size and mtime are unchanged is left as is.
+
+        Returns:
+            True if the pack was (re)ingested
+        """
+        path = Path(path)
+        stat = path.stat()
+        size, mtime_ns = (0, 0) if path.is_dir() else (stat.st_size, stat.st_mtime_ns)
+        row = self.conn.execute('SELECT source, size, mtime_ns FROM packs WHERE name = ?',
+                                (pack,)).fetchone()
+        if not force and not path.is_dir() and row == (str(path), size, mtime_ns):
+            return False
+
+        with self.conn:  # One transaction per pack
+            cur = self.conn.cursor()
+            self._delete_pack(cur, pack)
+            cur.execute('INSERT INTO packs (name, source, size, mtime_ns) VALUES (?, ?, ?, ?)',
+                        (pack, str(path), size, mtime_ns))
+            pack_id = cur.lastrowid
+            for name, data in self._iter_iffs(path):
+                self._ingest_iff(cur, pack_id, name, data)
+            cur.execute('''INSERT INTO object_opcodes (opcode, object_id, uses)
+                SELECT i.opcode, b.object_id, COUNT(*)
+                FROM instructions i
+                JOIN bhavs b ON b.id = i.bhav
+                JOIN objects o ON o.id = b.object_id
+                WHERE o.pack_id = ?
+                GROUP BY i.opcode, b.object_id''', (pack_id,))
+        self._profiles.pop(pack, None)
+        return True
+
+    def _iter_iffs(self, path: Path) -> Iterable[Tuple[str, bytes]]:
+        """(object-relative name, bytes) for each IFF under path."""
+        if path.is_dir():
+            for item in sorted(path.rglob('*')):
+                ext = item.suffix.lower()
+                if ext == '.iff':
+                    yield str(item.relative_to(path)), item.read_bytes()
+                elif ext == '.far':
+                    yield from self._iter_iffs(item)
+            return
+        ext = path.suffix.lower()
+        if ext == '.iff':
+            yield path.name, path.read_bytes()
+        elif ext == '.far':
+            try:
+                with FAR1Archive(str(path)) as far:
+                    for entry, data in far.iter_entries():
+                        if entry.filename.lower().endswith('.iff'):
+                            yield entry.filename, data
+            except Exception as e:
+                self.errors.append(f"FAR error {path}: {e}")
+
+    def _ingest_iff(self, cur: sqlite3.Cursor, pack_id: int, name: str, data: bytes):
+        try:
+            iff = IffFile.from_bytes(bytes(data), name, only_types={"BHAV"})
+        except Exception as e:
+            self.errors.append(f"IFF error {name}: {e}")
+            return
+
+        object_name = name[:-4] if name.lower().endswith('.iff') else name
+        cur.execute('INSERT INTO objects (pack_id, name) VALUES (?, ?)', (pack_id, object_name))
+        object_id = cur.lastrowid
+        rows = []
+        for bhav in iff.get_by_type_code("BHAV"):
+            cur.execute('INSERT INTO bhavs (object_id, bhav_id) VALUES (?, ?)',
+                        (object_id, bhav.chunk_id))
+            bhav_row = cur.lastrowid
+            rows.extend((bhav_row, idx, inst.opcode, inst.true_pointer, inst.false_pointer,
+                         bytes(inst.operand))
+                        for idx, inst in enumerate(bhav.instructions))
+        cur.executemany('INSERT INTO instructions VALUES (?, ?, ?, ?, ?, ?)', rows)
+
+    @staticmethod
+    def _delete_pack(cur: sqlite3.Cursor, pack: str):
+        row = cur.execute('SELECT id FROM packs WHERE name = ?', (pack,)).fetchone()
+        if row is None:
+            return
+        objects = 'SELECT id FROM objects WHERE pack_id = ?'
+        bhavs = f'SELECT id FROM bhavs WHERE object_id IN ({objects})'
+        cur.execute(f'DELETE FROM instructions WHERE bhav IN ({bhavs})', row)
+        cur.execute(f'DELETE FROM object_opcodes WHERE object_id IN ({objects})', row)
+        cur.execute(f'DELETE FROM bhavs WHERE object_id IN ({objects})', row)
+        cur.execute('DELETE FROM objects WHERE pack_id = ?', row)
+        cur.execute('DELETE FROM packs WHERE id = ?', row)
+
+    def remove_pack(self, pack: str):
+        with self.conn:
+            self._delete_pack(self.conn.cursor(), pack)
+        self._profiles.pop(pack, None)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def packs(self) -> List[str]:
+        """Pack names in ingest order."""
+        return [name for name, in self.conn.execute('SELECT name FROM packs ORDER BY id')]
+
+    def instruction_count(self, pack: Optional[str] = None) -> int:
+        if pack is None:
+            return self.conn.execute('SELECT COUNT(*) FROM instructions').fetchone()[0]
+        return self.conn.execute('''SELECT COALESCE(SUM(uses), 0) FROM object_opcodes oo
+            JOIN objects o ON o.id = oo.object_id
+            JOIN packs p ON p.id = o.pack_id
+            WHERE p.name = ?''', (pack,)).fetchone()[0]
+
+    def objects_by_opcode(self, pack: str, opcodes: Optional[Iterable[int]] = None,
+                          per_use: bool = False) -> Dict[int, List[str]]:
+        """
+        {opcode: sorted object names} for one pack.
+
+        With per_use, each name is repeated once per instruction using the
+        opcode, the ForensicAnalyzer input form (total_occurrences counts
+        the list, unique_object_count the distinct names).
+        """
+        sql = '''SELECT oo.opcode, o.name, oo.uses FROM object_opcodes oo
+            JOIN objects o ON o.id = oo.object_id
+            JOIN packs p ON p.id = o.pack_id
+            WHERE p.name = ?'''
+        params: list = [pack]
+        if opcodes is not None:
+            opcodes = sorted(set(opcodes))
+            sql += f' AND oo.opcode IN ({",".join("?" * len(opcodes))})'
+            params.extend(opcodes)
+        result: Dict[int, List[str]] = {}
+        for opcode, name, uses in self.conn.execute(sql + ' ORDER BY oo.opcode, o.name', params):
+            names = result.setdefault(opcode, [])
+            if per_use:
+                names.extend([name] * uses)
+            else:
+                names.append(name)
+        return result
+
+    def profiles(self, pack: str) -> Dict[int, OpcodeProfile]:
+        """ForensicAnalyzer profiles of every opcode used in a pack (cached)."""
+        if pack not in self._profiles:
+            self._profiles[pack] = self._analyzer.analyze_opcode_profiles(
+                self.objects_by_opcode(pack, per_use=True))
+        return self._profiles[pack]
+
+    def profiles_at(self, level: str, pack: str) -> Dict[int, OpcodeProfile]:
+        """A pack's profiles with the given confidence level."""
+        return {opcode: profile for opcode, profile in self.profiles(pack).items()
+                if profile.confidence_level == level}
+
+    def opcode_packs(self, level: str = "HIGH", min_packs: int = 1) -> Dict[int, List[str]]:
+        """{opcode: packs rating it at level}, for opcodes rated so in min_packs+ packs."""
+        result: Dict[int, List[str]] = {}
+        for pack in self.packs():
+            for opcode in self.profiles_at(level, pack):
+                result.setdefault(opcode, []).append(pack)
+        return {opcode: packs for opcode, packs in sorted(result.items())
+                if len(packs) >= min_packs}
+
+    def cooccurrence(self, pack: str, opcodes: Optional[Iterable[int]] = None,
+                     min_shared: int = 1) -> List[Tuple[int, int, int]]:
+        """
+        Opcode pairs used by the same objects.
+
+        Returns:
+            (opcode_a, opcode_b, shared object count) with opcode_a < opcode_b,
+            strongest first
+        """
+        cur = self.conn.cursor()
+        pair_filter = ''
+        if opcodes is not None:
+            cur.execute('CREATE TEMP TABLE IF NOT EXISTS opcode_filter (opcode INTEGER PRIMARY KEY)')
+            cur.execute('DELETE FROM opcode_filter')
+            cur.executemany('INSERT OR IGNORE INTO opcode_filter VALUES (?)',
+                            ((opcode,) for opcode in opcodes))
+            pair_filter = ('AND a.opcode IN (SELECT opcode FROM opcode_filter) '
+                           'AND b.opcode IN (SELECT opcode FROM opcode_filter)')
+        return cur.execute(f'''SELECT a.opcode, b.opcode, COUNT(*) AS shared
+            FROM object_opcodes a
+            JOIN object_opcodes b ON b.object_id = a.object_id AND b.opcode > a.opcode
+            JOIN objects o ON o.id = a.object_id
+            JOIN packs p ON p.id = o.pack_id
+            WHERE p.name = ? {pair_filter}
+            GROUP BY a.opcode, b.opcode
+            HAVING shared >= ?
+            ORDER BY shared DESC, a.opcode, b.opcode''', (pack, min_shared)).fetchall()
+
+    def shared_objects(self, pack: str, opcodes: Iterable[int]) -> List[str]:
+        """Objects in a pack that use every one of opcodes."""
+        opcodes = sorted(set(opcodes))
+        if not opcodes:
+            return []
+        return [name for name, in self.conn.execute(f'''SELECT o.name FROM object_opcodes oo
+            JOIN objects o ON o.id = oo.object_id
+            JOIN packs p ON p.id = o.pack_id
+            WHERE p.name = ? AND oo.opcode IN ({",".join("?" * len(opcodes))})
+            GROUP BY o.id
+            HAVING COUNT(*) = ?
+            ORDER BY o.name''', [pack, *opcodes, len(opcodes)])]
+
+    def instructions(self, opcode: int, pack: Optional[str] = None
+                     ) -> List[Tuple[str, str, int, int, int, int, bytes]]:
+        """
+        Every use of an opcode.
+
+        Returns:
+            (pack, object, bhav_id, index, true_ptr, false_ptr, operand) rows
+        """
+        sql = '''SELECT p.name, o.name, b.bhav_id, i.idx, i.true_ptr, i.false_ptr, i.operand
+            FROM instructions i
+            JOIN bhavs b ON b.id = i.bhav
+            JOIN objects o ON o.id = b.object_id
+            JOIN packs p ON p.id = o.pack_id
+            WHERE i.opcode = ?'''
+        params: list = [opcode]
+        if pack is not None:
+            sql += ' AND p.name = ?'
+            params.append(pack)
+        return self.conn.execute(sql + ' ORDER BY p.id, o.name, b.bhav_id, i.idx', params).fetchall()
+
+    def bhav_streams(self, pack: Optional[str] = None
+                     ) -> Iterator[Tuple[int, List[int], List[int], List[int]]]:
+        """
+        Instruction streams for OpcodeMiner, one BHAV at a time.
+
+        Yields:
+            (object row ID, opcodes, true pointers, false pointers)
+        """
+        sql = '''SELECT i.bhav, b.object_id, i.opcode, i.true_ptr, i.false_ptr
+            FROM instructions i
+            JOIN bhavs b ON b.id = i.bhav'''
+        params: list = []
+        if pack is not None:
+            sql += '''
+            JOIN objects o ON o.id = b.object_id
+            JOIN packs p ON p.id = o.pack_id
+            WHERE p.name = ?'''
+            params.append(pack)
+        current = None
+        for bhav, object_id, opcode, true_ptr, false_ptr in self.conn.execute(
+                sql + ' ORDER BY i.bhav, i.idx', params):
+            if bhav != current:
+                if current is not None:
+                    yield stream
+                current = bhav
+                stream = (object_id, [], [], [])
+            stream[1].append(opcode)
+            stream[2].append(true_ptr)
+            stream[3].append(false_ptr)
+        if current is not None:
+            yield stream
@@ -175,6 +175,9 @@ class IDConflictScanner:
         print(result.to_report())
     """
     
+    # Only these chunk types carry IDs the scanner tracks
+    SCAN_TYPES = frozenset({'OBJD', 'BHAV'})
+    
     def __init__(self):
         self._reset()
     
@@ -221,6 +224,23 @@ class IDConflictScanner:
         
         return objects_found
     
+    def scan_file(self, filepath: str) -> int:
+        """
+        Read an IFF from disk and add it to the scan.
+        
+        Only SCAN_TYPES chunks are loaded; sprites, strings and other
+        payloads are skipped without being read.
+        
+        Returns:
+            Number of objects found in file
+        """
+        from .iff_reader import read_iff_file
+        
+        reader = read_iff_file(filepath, only_types=self.SCAN_TYPES)
+        if reader is None:
+            return 0
+        return self.add_file(reader, Path(filepath).name)
+    
     def _parse_objd(self, chunk, filename: str) -> Optional[ObjectInfo]:
         """Parse OBJD chunk into ObjectInfo."""
         from .chunk_parsers import parse_objd
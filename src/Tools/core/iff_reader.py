@@ -2,7 +2,7 @@
 
 import struct
 from pathlib import Path
-from typing import List, Optional
+from typing import BinaryIO, Callable, Iterable, List, Optional, Union
 from io import BytesIO
 
 
@@ -17,69 +17,97 @@ class IFFChunk:
 
 
 class IFFReader:
-    """Minimal IFF file reader."""
+    """
+    Minimal IFF file reader.
+    
+    only_types limits which chunks are kept: a set of 4-char type codes
+    (e.g. {'OBJD', 'BHAV'}) or a predicate on the type code. Payloads of
+    other chunks are seeked past and never read.
+    """
     
     IFF_SIGNATURE = b"IFF FILE 2.5:TYPE FOLLOWED BY SIZE\0JAMIE DOORNBOS & MAXIS 1"
     
-    def __init__(self, filepath: str):
+    def __init__(self, filepath: str,
+                 only_types: Optional[Union[Iterable[str], Callable[[str], bool]]] = None):
         self.filepath = filepath
         self.chunks: List[IFFChunk] = []
+        if only_types is None or callable(only_types):
+            self._keep = only_types
+        else:
+            self._keep = frozenset(only_types).__contains__
     
     def read(self) -> bool:
         """Read IFF file."""
         try:
             with open(self.filepath, "rb") as f:
-                # Read header (64 bytes)
-                header = f.read(64)
-                if len(header) < 64:
-                    return False
-                
-                # Validate signature (60 bytes)
-                signature = header[0:60]
-                if signature != self.IFF_SIGNATURE:
-                    # Try to continue anyway, signature validation isn't critical
-                    pass
-                
-                # Get rsmp offset (bytes 60-64, big-endian)
-                rsmp_offset = struct.unpack(">I", header[60:64])[0]
-                
-                # Read chunks sequentially
-                while True:
-                    # Read chunk header (76 bytes)
-                    chunk_header = f.read(76)
-                    if len(chunk_header) < 76:
-                        break
-                    
-                    # Parse header (big-endian for IFF)
-                    type_code = chunk_header[0:4].decode("ascii", errors="replace")
-                    chunk_size = struct.unpack(">I", chunk_header[4:8])[0]
-                    chunk_id = struct.unpack(">H", chunk_header[8:10])[0]
-                    chunk_flags = struct.unpack(">H", chunk_header[10:12])[0]
-                    chunk_label = chunk_header[12:76].decode("ascii", errors="replace").rstrip('\0')
-                    
-                    # Create chunk
-                    chunk = IFFChunk()
-                    chunk.type_code = type_code
-                    chunk.chunk_id = chunk_id
-                    chunk.chunk_size = chunk_size
-                    chunk.chunk_label = chunk_label
-                    
-                    # Read chunk data (content after 76-byte header)
-                    content_size = chunk_size - 76
-                    if content_size > 0:
-                        chunk.chunk_data = f.read(content_size)
-                    
-                    self.chunks.append(chunk)
-                
-                return True
+                return self._read_stream(f)
+        except Exception as e:
+            print(f"Error reading IFF: {e}")
+            return False
+    
+    def read_bytes(self, data: bytes) -> bool:
+        """Read IFF from an in-memory buffer (e.g. a FAR entry)."""
+        try:
+            return self._read_stream(BytesIO(data))
         except Exception as e:
             print(f"Error reading IFF: {e}")
             return False
+    
+    def _read_stream(self, f: BinaryIO) -> bool:
+        """Read header and chunks from an open binary stream."""
+        # Read header (64 bytes)
+        header = f.read(64)
+        if len(header) < 64:
+            return False
+        
+        # Validate signature (60 bytes)
+        signature = header[0:60]
+        if signature != self.IFF_SIGNATURE:
+            # Try to continue anyway, signature validation isn't critical
+            pass
+        
+        # Get rsmp offset (bytes 60-64, big-endian)
+        rsmp_offset = struct.unpack(">I", header[60:64])[0]
+        
+        # Read chunks sequentially
+        while True:
+            # Read chunk header (76 bytes)
+            chunk_header = f.read(76)
+            if len(chunk_header) < 76:
+                break
+            
+            # Parse header (big-endian for IFF)
+            type_code = chunk_header[0:4].decode("ascii", errors="replace")
+            chunk_size, chunk_id, chunk_flags = struct.unpack(">IHH", chunk_header[4:12])
+            content_size = chunk_size - 76
+            
+            if self._keep is not None and not self._keep(type_code):
+                # Not wanted: skip the payload without reading it
+                if content_size > 0:
+                    f.seek(content_size, 1)
+                continue
+            
+            # Create chunk
+            chunk = IFFChunk()
+            chunk.type_code = type_code
+            chunk.chunk_id = chunk_id
+            chunk.chunk_size = chunk_size
+            chunk.chunk_label = chunk_header[12:76].decode("ascii", errors="replace").rstrip('\0')
+            
+            # Read chunk data (content after 76-byte header)
+            if content_size > 0:
+                chunk.chunk_data = f.read(content_size)
+            
+            self.chunks.append(chunk)
+        
+        return True
 
 
-def read_iff_file(filepath: str) -> Optional[IFFReader]:
-    """Read IFF file and return reader with chunks."""
-    reader = IFFReader(filepath)
+def read_iff_file(filepath: str,
+                  only_types: Optional[Union[Iterable[str], Callable[[str], bool]]] = None
+                  ) -> Optional[IFFReader]:
+    """Read IFF file and return reader with chunks (optionally only_types)."""
+    reader = IFFReader(filepath, only_types)
     if reader.read():
         return reader
     return None
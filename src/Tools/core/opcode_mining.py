@@ -0,0 +1,416 @@
+"""
+Opcode Mining — co-occurrence and control-flow n-grams over BHAV instructions.
+
+OpcodeMiner reads decoded instruction streams (from a ForensicStore, from
+IFFs, or as raw opcode/pointer lists) and answers "which opcodes appear
+together" at two levels:
+
+- "bhav":   opcodes used in the same BHAV
+- "object": opcodes used anywhere in the same object (IFF)
+
+Each level is an incidence matrix (BHAVs or objects x opcodes) kept as CSR
+arrays. Pair counts are its Gram matrix M^T M, computed with scipy.sparse
+when installed and by counting each container's pairs otherwise; both give
+a symmetric sparse PairCounts (CSR arrays, no diagonal) plus the support of
+each opcode (how many containers use it).
+
+Successor n-grams follow true and false pointers: every path of n
+instructions through a BHAV counts once, keyed by its opcode sequence.
+Pointers 0xFD-0xFF (error/false/true exits) end a path.
+
+Usage:
+    miner = OpcodeMiner()
+    miner.add_store(store, "BASE_GAME")
+    miner.always_together("bhav", min_support=5)
+    miner.top_ngrams(3, limit=20)
+"""
+
+import heapq
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from itertools import repeat
+from typing import Dict, Hashable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # Optional: Gram-matrix pair counting
+    np = sparse = None
+
+
+LEVELS = ("bhav", "object")
+EXIT_POINTER = 0xFD  # 0xFD error, 0xFE false, 0xFF true
+
+
+class PairCounts:
+    """Symmetric sparse opcode pair counts for one level."""
+
+    def __init__(self, opcodes: List[int], support: array,
+                 indptr: array, indices: array, counts: array):
+        self.opcodes = opcodes    # Dense ID -> opcode, ascending
+        self.support = support    # Containers using each opcode
+        self.indptr = indptr
+        self.indices = indices
+        self.counts = counts
+        self._ids = {opcode: i for i, opcode in enumerate(opcodes)}
+
+    def __len__(self) -> int:
+        """Number of distinct co-occurring pairs."""
+        return len(self.indices) // 2
+
+    def count(self, a: int, b: int) -> int:
+        """Containers using both a and b (support of a if a == b)."""
+        i, j = self._ids.get(a), self._ids.get(b)
+        if i is None or j is None:
+            return 0
+        if i == j:
+            return self.support[i]
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        k = bisect_left(self.indices, j, lo, hi)
+        return self.counts[k] if k < hi and self.indices[k] == j else 0
+
+    def row(self, opcode: int) -> List[Tuple[int, int]]:
+        """(other opcode, shared containers) for every opcode seen with opcode."""
+        i = self._ids.get(opcode)
+        if i is None:
+            return []
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        return [(self.opcodes[j], c) for j, c in zip(self.indices[lo:hi], self.counts[lo:hi])]
+
+    def pairs(self) -> Iterator[Tuple[int, int, int]]:
+        """(a, b, shared containers) for every pair, a < b."""
+        opcodes, indices, counts = self.opcodes, self.indices, self.counts
+        for i in range(len(opcodes)):
+            hi = self.indptr[i + 1]
+            k = bisect_left(indices, i + 1, self.indptr[i], hi)
+            for k in range(k, hi):
+                yield opcodes[i], opcodes[indices[k]], counts[k]
+
+    def to_scipy(self):
+        """The pair matrix as scipy.sparse.csr_matrix (requires scipy)."""
+        if sparse is None:
+            raise ImportError("scipy is required for to_scipy()")
+        size = len(self.opcodes)
+        return sparse.csr_matrix(
+            (np.asarray(self.counts), np.asarray(self.indices), np.asarray(self.indptr)),
+            shape=(size, size))
+
+
+def _symmetric_csr(pairs: Dict[int, int], size: int):
+    """CSR arrays for both halves of {a * size + b: count} (a < b)."""
+    offsets = array('I', bytes(4 * (size + 1)))
+    for key in pairs:
+        a, b = divmod(key, size)
+        offsets[a + 1] += 1
+        offsets[b + 1] += 1
+    for i in range(size):
+        offsets[i + 1] += offsets[i]
+    fill = array('I', offsets)
+    columns = array('I', bytes(4 * offsets[size]))
+    counts = array('I', bytes(4 * offsets[size]))
+    # Keys in ascending order leave every row sorted
+    for key in sorted(pairs):
+        a, b = divmod(key, size)
+        count = pairs[key]
+        columns[fill[a]] = b
+        counts[fill[a]] = count
+        fill[a] += 1
+        columns[fill[b]] = a
+        counts[fill[b]] = count
+        fill[b] += 1
+    return offsets, columns, counts
+
+
+def _gram_counting(indptr: array, indices: array, size: int):
+    """
+    Pair counts without scipy.
+
+    Pairs involving a rare opcode are counted by scanning the few
+    containers that use it; pairs of frequent opcodes (used by 1/64 of the
+    containers or more) by intersecting per-opcode container bitsets.
+    """
+    rows = len(indptr) - 1
+    members: List[List[int]] = [[] for _ in range(size)]
+    for r in range(rows):
+        for i in indices[indptr[r]:indptr[r + 1]]:
+            members[i].append(r)
+    support = array('I', map(len, members))
+    threshold = max(1, rows // 64)
+    frequent = [i for i in range(size) if support[i] >= threshold]
+    is_frequent = bytearray(size)
+    for i in frequent:
+        is_frequent[i] = 1
+
+    keys = []
+    for a in range(size):
+        if not is_frequent[a]:
+            base = a * size
+            for r in members[a]:
+                keys.extend(map(base.__add__, indices[indptr[r]:indptr[r + 1]]))
+    pairs: Dict[int, int] = {}
+    for key, count in Counter(keys).items():
+        a, b = divmod(key, size)
+        # Skip the diagonal, and rare pairs already counted from the lower opcode
+        if a < b:
+            pairs[key] = count
+        elif b < a and is_frequent[b]:
+            pairs[b * size + a] = count
+
+    bitsets = []
+    for a in frequent:
+        bitmap = bytearray((rows + 7) // 8)
+        for r in members[a]:
+            bitmap[r >> 3] |= 1 << (r & 7)
+        bitsets.append(int.from_bytes(bitmap, 'little'))
+    for x, a in enumerate(frequent):
+        shared = map(int.bit_count, map(bitsets[x].__and__, bitsets[x + 1:]))
+        for b, count in zip(frequent[x + 1:], shared):
+            if count:
+                pairs[a * size + b] = count
+    return (support, *_symmetric_csr(pairs, size))
+
+
+def _gram_scipy(indptr: array, indices: array, size: int):
+    """Pair counts as the sparse product M^T M of the incidence matrix."""
+    incidence = sparse.csr_matrix(
+        (np.ones(len(indices), dtype=np.int32), np.asarray(indices, dtype=np.int32),
+         np.asarray(indptr, dtype=np.int64)),
+        shape=(len(indptr) - 1, size))
+    gram = (incidence.T @ incidence).tocsr()
+    diagonal = gram.diagonal()
+    gram = (gram - sparse.diags(diagonal)).tocsr()
+    gram.eliminate_zeros()
+    gram.sort_indices()
+    return (array('I', diagonal.tolist()), array('I', gram.indptr.tolist()),
+            array('I', gram.indices.tolist()), array('I', gram.data.tolist()))
+
+
+class OpcodeMiner:
+    """Opcode co-occurrence and successor n-gram counts over many BHAVs."""
+
+    def __init__(self, ngram_sizes: Sequence[int] = (2, 3)):
+        """
+        Args:
+            ngram_sizes: Path lengths (2 or more instructions) to count
+        """
+        self.ngram_sizes = tuple(sorted(set(ngram_sizes)))
+        if self.ngram_sizes and self.ngram_sizes[0] < 2:
+            raise ValueError("n-gram sizes must be 2 or more")
+        self.bhav_count = 0
+        self.instruction_count = 0
+
+        self._opcode_ids: Dict[int, int] = {}
+        self._opcodes: List[int] = []
+        # BHAV x opcode incidence: distinct opcode IDs per BHAV
+        self._bhav_indptr = array('I', [0])
+        self._bhav_indices = array('H')
+        self._object_opcodes: Dict[Hashable, set] = {}
+        # Every instruction in add order; pointers are relative to the BHAV
+        # starting at _base, which has _limit in-range targets
+        self._stream = array('H')
+        self._true = array('B')
+        self._false = array('B')
+        self._base = array('I')
+        self._limit = array('B')
+        # Built on first query after the last add
+        self._ngrams: Optional[Dict[int, Counter]] = None
+        self._pairs: Dict[str, PairCounts] = {}
+
+    @property
+    def opcodes(self) -> List[int]:
+        """Every opcode seen, ascending."""
+        return sorted(self._opcodes)
+
+    # ------------------------------------------------------------------
+    # Input
+    # ------------------------------------------------------------------
+
+    def add_bhav(self, opcodes: Sequence[int],
+                 true_pointers: Optional[Sequence[int]] = None,
+                 false_pointers: Optional[Sequence[int]] = None,
+                 object_key: Optional[Hashable] = None) -> None:
+        """
+        Add one BHAV's instruction stream.
+
+        Without pointers the BHAV counts for co-occurrence only; without an
+        object key it counts at the "bhav" level only.
+        """
+        ids = self._opcode_ids
+        row = []
+        for opcode in set(opcodes):
+            i = ids.get(opcode)
+            if i is None:
+                i = ids[opcode] = len(self._opcodes)
+                self._opcodes.append(opcode)
+            row.append(i)
+        self._bhav_indices.extend(row)
+        self._bhav_indptr.append(len(self._bhav_indices))
+        if object_key is not None:
+            self._object_opcodes.setdefault(object_key, set()).update(row)
+        count = len(opcodes)
+        self._stream.extend(opcodes)
+        if true_pointers is None:
+            true_pointers = false_pointers = repeat(EXIT_POINTER, count)
+        self._true.extend(true_pointers)
+        self._false.extend(true_pointers if false_pointers is None else false_pointers)
+        self._base.extend(repeat(len(self._base), count))
+        self._limit.extend(repeat(min(count, EXIT_POINTER), count))
+
+        self.bhav_count += 1
+        self.instruction_count += count
+        self._ngrams = None
+        self._pairs.clear()
+
+    def add_iff(self, iff, object_key: Optional[Hashable] = None) -> int:
+        """Add every BHAV of a parsed IffFile as one object. Returns BHAVs added."""
+        if object_key is None:
+            object_key = iff.filename
+        added = 0
+        for bhav in iff.get_by_type_code("BHAV"):
+            instructions = bhav.instructions
+            self.add_bhav([inst.opcode for inst in instructions],
+                          [inst.true_pointer for inst in instructions],
+                          [inst.false_pointer for inst in instructions],
+                          object_key)
+            added += 1
+        return added
+
+    def add_store(self, store, pack: Optional[str] = None) -> int:
+        """Add the BHAVs recorded in a ForensicStore (one pack or all). Returns BHAVs added."""
+        added = 0
+        for object_id, opcodes, true_pointers, false_pointers in store.bhav_streams(pack):
+            self.add_bhav(opcodes, true_pointers, false_pointers, ("store", object_id))
+            added += 1
+        return added
+
+    # ------------------------------------------------------------------
+    # Co-occurrence
+    # ------------------------------------------------------------------
+
+    def pairs(self, level: str = "bhav") -> PairCounts:
+        """Pair counts for a level, built on first use after the last add."""
+        if level not in LEVELS:
+            raise ValueError(f"Unknown level {level!r}; expected one of {LEVELS}")
+        if level not in self._pairs:
+            if level == "bhav":
+                indptr, indices = self._bhav_indptr, self._bhav_indices
+            else:
+                indptr, indices = array('I', [0]), array('H')
+                for row in self._object_opcodes.values():
+                    indices.extend(row)
+                    indptr.append(len(indices))
+
+            # Renumber opcodes in ascending order
+            order = sorted(range(len(self._opcodes)), key=self._opcodes.__getitem__)
+            remap = array('H', bytes(2 * len(order)))
+            for new, old in enumerate(order):
+                remap[old] = new
+            indices = array('H', [remap[i] for i in indices])
+
+            gram = _gram_scipy if sparse is not None else _gram_counting
+            self._pairs[level] = PairCounts([self._opcodes[i] for i in order],
+                                            *gram(indptr, indices, len(order)))
+        return self._pairs[level]
+
+    def matrix(self, level: str = "bhav"):
+        """Pair counts as a scipy.sparse.csr_matrix (requires scipy)."""
+        return self.pairs(level).to_scipy()
+
+    def support(self, opcode: int, level: str = "bhav") -> int:
+        """Number of BHAVs (or objects) using opcode."""
+        return self.pairs(level).count(opcode, opcode)
+
+    def pair_count(self, a: int, b: int, level: str = "bhav") -> int:
+        """Number of BHAVs (or objects) using both a and b."""
+        return self.pairs(level).count(a, b)
+
+    def companions(self, opcode: int, level: str = "bhav",
+                   min_count: int = 1) -> List[Tuple[int, int]]:
+        """(opcode, shared count) seen with opcode, most shared first."""
+        row = [(other, count) for other, count in self.pairs(level).row(opcode) if count >= min_count]
+        row.sort(key=lambda item: (-item[1], item[0]))
+        return row
+
+    def implied_by(self, opcode: int, level: str = "bhav") -> List[int]:
+        """Opcodes present in every BHAV (or object) that uses opcode."""
+        support = self.support(opcode, level)
+        return [other for other, count in self.pairs(level).row(opcode) if count == support]
+
+    def top_pairs(self, level: str = "bhav", limit: int = 20,
+                  min_count: int = 1) -> List[Tuple[int, int, int]]:
+        """(a, b, shared count) for the most frequent pairs."""
+        pairs = (pair for pair in self.pairs(level).pairs() if pair[2] >= min_count)
+        return heapq.nlargest(limit, pairs, key=lambda pair: (pair[2], -pair[0], -pair[1]))
+
+    def always_together(self, level: str = "bhav",
+                        min_support: int = 2) -> List[Tuple[int, int, int]]:
+        """
+        Pairs that never appear apart: every BHAV (or object) using either
+        uses both, in at least min_support of them.
+
+        Returns:
+            (a, b, support) with a < b, most supported first
+        """
+        counts = self.pairs(level)
+        together = [(a, b, count) for a, b, count in counts.pairs()
+                    if count >= min_support and counts.count(a, a) == count == counts.count(b, b)]
+        together.sort(key=lambda pair: (-pair[2], pair[0], pair[1]))
+        return together
+
+    # ------------------------------------------------------------------
+    # Successor n-grams
+    # ------------------------------------------------------------------
+
+    def _ngram_counter(self, n: int) -> Counter:
+        if n not in self.ngram_sizes:
+            raise ValueError(f"{n}-grams not counted; ngram_sizes={self.ngram_sizes}")
+        if self._ngrams is None:
+            self._ngrams = self._count_ngrams()
+        return self._ngrams[n]
+
+    def _count_ngrams(self) -> Dict[int, Counter]:
+        """Count every n-instruction path in one pass over all BHAVs per n."""
+        opcodes = self._stream.tolist()
+        # Successors of each instruction as absolute indices; a false
+        # branch equal to the true one is one edge
+        successors = [
+            ((base + t,) if f == t or f >= limit else (base + t, base + f)) if t < limit
+            else (base + f,) if f < limit else ()
+            for t, f, base, limit in zip(self._true, self._false, self._base, self._limit)
+        ]
+
+        # Every path so far as a packed opcode sequence and its last instruction
+        ngrams = {}
+        keys, ends = opcodes, range(len(opcodes))
+        for n in range(2, self.ngram_sizes[-1] + 1):
+            keys = [(key << 16) | opcodes[j] for key, end in zip(keys, ends) for j in successors[end]]
+            if n in self.ngram_sizes:
+                ngrams[n] = Counter(keys)
+            if n < self.ngram_sizes[-1]:
+                ends = [j for end in ends for j in successors[end]]
+        return ngrams
+
+    @staticmethod
+    def _unpack(key: int, n: int) -> Tuple[int, ...]:
+        return tuple((key >> (16 * (n - 1 - k))) & 0xFFFF for k in range(n))
+
+    def ngram_count(self, ngram: Sequence[int]) -> int:
+        """Number of control-flow paths with this opcode sequence."""
+        key = 0
+        for opcode in ngram:
+            key = (key << 16) | opcode
+        return self._ngram_counter(len(ngram)).get(key, 0)
+
+    def top_ngrams(self, n: int, limit: int = 20,
+                   min_count: int = 1) -> List[Tuple[Tuple[int, ...], int]]:
+        """(opcode sequence, paths) for the most frequent n-instruction paths."""
+        top = heapq.nlargest(limit, self._ngram_counter(n).items(), key=lambda item: item[1])
+        return [(self._unpack(key, n), count) for key, count in top if count >= min_count]
+
+    def successors(self, opcode: int, limit: int = 20) -> List[Tuple[int, int]]:
+        """(next opcode, transitions) most often reached directly from opcode."""
+        counter = self._ngram_counter(2)
+        items = [(key & 0xFFFF, count) for key, count in counter.items() if key >> 16 == opcode]
+        items.sort(key=lambda item: (-item[1], item[0]))
+        return items[:limit]
@@ -1,73 +1,62 @@
 #!/usr/bin/env python3
 """
 Extract and merge HIGH confidence opcodes from all 8 expansion pack forensic analyses.
+
+Reads the forensic store written by run_expansion_analysis.py.
+
+Usage:
+    python extract_high_confidence.py [--db expansion_forensic.db]
 """
 
-import re
+import sys
 from pathlib import Path
-from collections import defaultdict
 
-def extract_high_confidence_opcodes(filepath):
-    """Extract HIGH confidence opcodes from a forensic file."""
-    
-    content = Path(filepath).read_text(errors='ignore')
-    opcodes = {}
-    
-    # Find HIGH confidence section (avoid unicode issues)
-    if 'HIGH CONFIDENCE' not in content:
-        return opcodes
-    
-    # Extract section from HIGH CONFIDENCE to MEDIUM/LOW
-    section_start = content.index('HIGH CONFIDENCE')
-    section_end = content.find('MEDIUM CONFIDENCE', section_start)
-    if section_end == -1:
-        section_end = content.find('LOW CONFIDENCE', section_start)
-    
-    section = content[section_start:section_end]
-    
-    # Find all "Opcode 0x" patterns with their purpose
-    # Format: "  Opcode 0x0157:\n    Purpose: Trash-specific operation"
-    for match in re.finditer(r'Opcode\s+(0x[0-9A-Fa-f]{4}):\n\s+Purpose:\s*(.+?)(?:\n|$)', section):
-        opcode = match.group(1).upper()
-        purpose = match.group(2).strip()
-        opcodes[opcode] = {'description': purpose}
-    
-    return opcodes
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from core.forensic_store import ForensicStore, DEFAULT_DATABASE
+
+def extract_high_confidence_opcodes(store, pack_name):
+    """HIGH confidence opcodes of one pack: {'0x0157': {'description': ...}}."""
+    return {
+        profile.hex_str: {'description': profile.inferred_purpose}
+        for opcode, profile in sorted(store.profiles_at('HIGH', pack_name).items())
+    }
 
 def main():
-    forensic_files = sorted(Path('.').glob('expansion_forensic_*.txt'))
+    db_path = DEFAULT_DATABASE
+    if '--db' in sys.argv:
+        idx = sys.argv.index('--db')
+        if idx + 1 < len(sys.argv):
+            db_path = Path(sys.argv[idx + 1])
+    if not db_path.exists():
+        print(f"No forensic store at {db_path}. Run 'python run_expansion_analysis.py' first.")
+        sys.exit(1)
+
+    store = ForensicStore(db_path)
     
     print("\n" + "="*140)
     print("HIGH CONFIDENCE OPCODE CROSS-PACK VALIDATION")
     print("="*140 + "\n")
     
-    # Extract from all files
+    # Extract from all packs
     pack_opcodes = {}
-    pack_order = []
+    pack_order = store.packs()
     
-    for filepath in forensic_files:
-        pack_name = filepath.stem.replace('expansion_forensic_', '').upper()
-        pack_order.append(pack_name)
-        pack_opcodes[pack_name] = extract_high_confidence_opcodes(filepath)
+    for pack_name in pack_order:
+        pack_opcodes[pack_name] = extract_high_confidence_opcodes(store, pack_name)
         
         high_count = len(pack_opcodes[pack_name])
         print(f"  {pack_name:20s}: {high_count:3d} HIGH confidence opcodes")
     
-    # Find opcodes that appear across multiple packs
-    opcode_appearances = defaultdict(list)
+    # Opcodes rated HIGH in 2+ packs
+    validated = {f"0x{opcode:04X}": packs
+                 for opcode, packs in store.opcode_packs('HIGH', min_packs=2).items()}
     opcode_descriptions = {}
-    
     for pack_name in pack_order:
         for opcode, data in pack_opcodes[pack_name].items():
-            opcode_appearances[opcode].append(pack_name)
             opcode_descriptions[opcode] = data['description']
     
-    # Filter for multi-pack appearances
-    validated = {}
-    for opcode in sorted(opcode_appearances.keys()):
-        if len(opcode_appearances[opcode]) >= 2:
-            validated[opcode] = opcode_appearances[opcode]
-    
     print(f"\n{'='*140}")
     print(f"OPCODES VALIDATED ACROSS 2+ PACKS (VERY HIGH CONFIDENCE)")
     print(f"{'='*140}\n")
@@ -101,5 +90,7 @@ def main():
             print(f"{pack_name}: (no HIGH confidence opcodes)")
         print()
 
+    store.close()
+
 if __name__ == '__main__':
     main()
@@ -11,50 +11,32 @@ This reveals which opcodes are related and what suites/clusters exist.
 """
 
 import sys
-import json
 from pathlib import Path
 from collections import defaultdict
-import re
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-def extract_all_high_confidence_opcodes(content):
-    """Extract ALL high confidence opcodes from forensic file."""
+from core.forensic_store import ForensicStore, DEFAULT_DATABASE
+from core.opcode_mining import OpcodeMiner
+
+
+def extract_all_high_confidence_opcodes(store, pack_name):
+    """ALL high confidence opcodes of one pack, keyed by hex string."""
     
     opcodes = {}
-    
-    if 'HIGH CONFIDENCE' not in content:
-        return opcodes
-    
-    section_start = content.index('HIGH CONFIDENCE')
-    section_end = content.find('MEDIUM CONFIDENCE', section_start)
-    if section_end == -1:
-        section_end = content.find('LOW CONFIDENCE', section_start)
-    
-    high_section = content[section_start:section_end]
-    
-    for match in re.finditer(
-        r'Opcode\s+(0x[0-9A-Fa-f]{4}):\n'
-        r'\s+Purpose:\s*(.+?)\n'
-        r'\s+Evidence:\s*(.+?)\n'
-        r'\s+Objects using:\s*(\d+)\n'
-        r'\s+Uses:\s*(.+?)(?:\n|$)',
-        high_section
-    ):
-        opcode = match.group(1).upper()
-        purpose = match.group(2).strip()
-        obj_list = match.group(5).strip()
-        objects = [o.strip() for o in obj_list.split(',')]
-        
-        opcodes[opcode] = {
-            'purpose': purpose,
-            'objects': objects,
-            'count': len(objects)
+    for opcode, profile in store.profiles_at('HIGH', pack_name).items():
+        opcodes[profile.hex_str] = {
+            'opcode': opcode,
+            'purpose': profile.inferred_purpose,
+            'objects': profile.object_list,
+            'count': profile.unique_object_count,
         }
     
     return opcodes
 
 
-def find_opcode_cooccurrence(content):
+def find_opcode_cooccurrence(store, pack_name):
     """
     Find which opcodes appear together in the same objects.
     Build matrix: opcode_A appears with opcode_B in X objects
@@ -63,55 +45,59 @@ def find_opcode_cooccurrence(content):
     cooccurrence = defaultdict(lambda: defaultdict(int))
     
     # Extract all HIGH confidence opcodes
-    opcodes = extract_all_high_confidence_opcodes(content)
-    
-    # For each pair of opcodes, check if they share objects
-    opcode_list = list(opcodes.keys())
+    opcodes = extract_all_high_confidence_opcodes(store, pack_name)
     
-    for i, opcode_a in enumerate(opcode_list):
-        objects_a = set(opcodes[opcode_a]['objects'])
-        
-        for opcode_b in opcode_list[i+1:]:
-            objects_b = set(opcodes[opcode_b]['objects'])
-            
-            # Count shared objects
-            shared = len(objects_a & objects_b)
-            
-            if shared > 0:
-                cooccurrence[opcode_a][opcode_b] = shared
-                cooccurrence[opcode_b][opcode_a] = shared  # Symmetric
+    # Shared object counts for every pair, from one self-join in the store
+    high = [data['opcode'] for data in opcodes.values()]
+    for a, b, shared in store.cooccurrence(pack_name, high):
+        opcode_a, opcode_b = f"0x{a:04X}", f"0x{b:04X}"
+        cooccurrence[opcode_a][opcode_b] = shared
+        cooccurrence[opcode_b][opcode_a] = shared  # Symmetric
     
     return cooccurrence, opcodes
 
 
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python forensic_cooccurrence.py <forensic_file> [--min-shared N]")
-        print("Example: python forensic_cooccurrence.py expansion_forensic_base_game.txt --min-shared 2")
+        print("Usage: python forensic_cooccurrence.py <pack> [--db expansion_forensic.db] [--min-shared N]")
+        print("Example: python forensic_cooccurrence.py BASE_GAME --min-shared 2")
         sys.exit(1)
     
-    filepath = Path(sys.argv[1])
+    pack_name = sys.argv[1]
+    db_path = DEFAULT_DATABASE
     min_shared = 1
     
+    if '--db' in sys.argv:
+        idx = sys.argv.index('--db')
+        if idx + 1 < len(sys.argv):
+            db_path = Path(sys.argv[idx + 1])
+    
     if '--min-shared' in sys.argv:
         idx = sys.argv.index('--min-shared')
         if idx + 1 < len(sys.argv):
             min_shared = int(sys.argv[idx + 1])
     
-    content = filepath.read_text(errors='ignore')
+    if not db_path.exists():
+        print(f"No forensic store at {db_path}. Run 'python run_expansion_analysis.py' first.")
+        sys.exit(1)
+    
+    store = ForensicStore(db_path)
+    if pack_name not in store.packs():
+        print(f"Pack {pack_name} not in {db_path}. Known packs: {', '.join(store.packs())}")
+        sys.exit(1)
     
     print("\n" + "="*140)
-    print(f"OPCODE CO-OCCURRENCE ANALYSIS: {filepath.name}")
+    print(f"OPCODE CO-OCCURRENCE ANALYSIS: {pack_name}")
     print(f"(Finding opcodes that appear together in {min_shared}+ objects)")
     print("="*140 + "\n")
     
-    cooccurrence, opcodes = find_opcode_cooccurrence(content)
+    cooccurrence, opcodes = find_opcode_cooccurrence(store, pack_name)
     
     # Find strongest associations
     associations = []
     for opcode_a in cooccurrence:
         for opcode_b, shared_count in cooccurrence[opcode_a].items():
-            if opcode_a < opcode_b:  # Avoid duplicates
+            if opcode_a < opcode_b and shared_count >= min_shared:  # Avoid duplicates
                 # Score: higher shared count = stronger association
                 score = shared_count
                 associations.append({
@@ -170,16 +156,10 @@ def main():
             print("-" * 140)
             
             # Show shared objects
-            all_objects = None
-            for opcode in suite:
-                obj_set = set(opcodes[opcode]['objects'])
-                if all_objects is None:
-                    all_objects = obj_set
-                else:
-                    all_objects = all_objects & obj_set
+            all_objects = store.shared_objects(pack_name, [opcodes[op]['opcode'] for op in suite])
             
             if all_objects:
-                print(f"Shared across: {', '.join(sorted(all_objects))}")
+                print(f"Shared across: {', '.join(all_objects)}")
                 print(f"Purposes: {' + '.join([opcodes[op]['purpose'] for op in suite])}")
     else:
         print("[No clear behavioral suites found]")
@@ -198,9 +178,33 @@ def main():
         print(f"     • {opcode_b}: {assoc['purpose_b']} ({assoc['objects_b']} objects)")
         print()
     
+    # Same-BHAV patterns and control flow, mined from the instruction streams
+    miner = OpcodeMiner(ngram_sizes=(3,))
+    miner.add_store(store, pack_name)
+    
+    print("\n" + "▪"*140)
+    print(f"OPCODES ALWAYS USED TOGETHER (same BHAVs, {max(2, min_shared)}+ BHAVs)")
+    print("▪"*140 + "\n")
+    
+    together = miner.always_together('bhav', min_support=max(2, min_shared))
+    for a, b, bhavs in together[:20]:
+        print(f"  0x{a:04X} + 0x{b:04X}: never apart, {bhavs} BHAVs")
+    if not together:
+        print("[No opcode pairs always used together]")
+    
+    print("\n" + "▪"*140)
+    print("MOST COMMON 3-INSTRUCTION CHAINS (following true/false pointers)")
+    print("▪"*140 + "\n")
+    
+    for ngram, paths in miner.top_ngrams(3, limit=20):
+        print(f"  {' -> '.join(f'0x{op:04X}' for op in ngram)}: {paths} paths")
+    print()
+    
     print("="*140)
     print(f"Analysis complete: Found {len(associations)} opcode associations")
     print("="*140 + "\n")
+    
+    store.close()
 
 
 if __name__ == '__main__':
@@ -14,41 +14,24 @@ This is where we unlock the serious discoveries.
 import sys
 from pathlib import Path
 from collections import defaultdict
-import re
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-def extract_opcodes_from_forensic(filepath):
-    """Extract HIGH confidence opcodes from forensic file."""
-    
-    opcodes = {}
-    content = filepath.read_text(errors='ignore')
-    
-    if 'HIGH CONFIDENCE' not in content:
-        return opcodes
-    
-    section_start = content.index('HIGH CONFIDENCE')
-    section_end = content.find('MEDIUM CONFIDENCE', section_start)
-    if section_end == -1:
-        section_end = content.find('LOW CONFIDENCE', section_start)
-    
-    high_section = content[section_start:section_end]
-    
-    for match in re.finditer(
-        r'Opcode\s+(0x[0-9A-Fa-f]{4}):\n'
-        r'\s+Purpose:\s*(.+?)\n'
-        r'\s+Evidence:\s*(.+?)\n'
-        r'\s+Objects using:\s*(\d+)\n'
-        r'\s+Uses:\s*(.+?)(?:\n|$)',
-        high_section
-    ):
-        opcode = match.group(1).upper()
-        opcodes[opcode] = {
-            'purpose': match.group(2).strip(),
-            'evidence': match.group(3).strip(),
-            'objects': [o.strip() for o in match.group(5).split(',')],
+from core.forensic_store import ForensicStore, DEFAULT_DATABASE
+
+
+def extract_opcodes_from_forensic(store, pack_name):
+    """HIGH confidence opcodes of one pack from the forensic store."""
+    
+    return {
+        profile.hex_str: {
+            'purpose': profile.inferred_purpose,
+            'evidence': ' | '.join(profile.evidence_summary),
+            'objects': profile.object_list,
         }
-    
-    return opcodes
+        for opcode, profile in sorted(store.profiles_at('HIGH', pack_name).items())
+    }
 
 
 def infer_functional_category(opcode_data):
@@ -75,12 +58,18 @@ def infer_functional_category(opcode_data):
 
 
 def main():
-    forensic_files = sorted(Path('.').glob('expansion_forensic_*.txt'))
-    
-    if not forensic_files:
-        print("No forensic files found. Run 'python run_expansion_analysis.py' first.")
+    db_path = DEFAULT_DATABASE
+    if '--db' in sys.argv:
+        idx = sys.argv.index('--db')
+        if idx + 1 < len(sys.argv):
+            db_path = Path(sys.argv[idx + 1])
+    
+    if not db_path.exists():
+        print(f"No forensic store at {db_path}. Run 'python run_expansion_analysis.py' first.")
         sys.exit(1)
     
+    store = ForensicStore(db_path)
+    
     print("\n" + "="*140)
     print("MASTER FORENSIC ANALYZER - Cross-Pack Opcode Discovery")
     print("="*140 + "\n")
@@ -90,9 +79,8 @@ def main():
     opcode_func_categories = defaultdict(list)  # opcode -> [(pack, category), ...]
     opcode_evidence = {}  # opcode -> (most common evidence description)
     
-    for filepath in forensic_files:
-        pack_name = filepath.stem.replace('expansion_forensic_', '').upper()
-        opcodes = extract_opcodes_from_forensic(filepath)
+    for pack_name in store.packs():
+        opcodes = extract_opcodes_from_forensic(store, pack_name)
         all_pack_opcodes[pack_name] = opcodes
         
         print(f"  {pack_name:20s}: {len(opcodes):3d} HIGH confidence opcodes")
@@ -158,8 +146,9 @@ def main():
     print(f"  ⭐⭐  (2 packs):       {two_star:3d} opcodes - HIGH confidence deductions")
     print(f"  ⭐   (single pack):   Remaining opcodes - MEDIUM confidence (needs expansion data)\n")
     
-    print(f"  Total HIGH confidence opcodes across all packs: {len(opcodes)}")
-    print(f"  Validated across multiple packs: {len(consistent_opcodes)} ({(len(consistent_opcodes)*100//len(opcodes)):.0f}%)")
+    total_high = len(opcode_func_categories)
+    print(f"  Total HIGH confidence opcodes across all packs: {total_high}")
+    print(f"  Validated across multiple packs: {len(consistent_opcodes)} ({len(consistent_opcodes)*100//max(1, total_high)}%)")
     
     print(f"\n{'='*140}")
     print("NEXT STEPS")
@@ -168,6 +157,8 @@ def main():
     print("2. Use forensic_cooccurrence.py to understand OPCODE SUITES")
     print("3. Manually verify high-confidence deductions against FSO source code")
     print("4. Build OPCODE REFERENCE GUIDE with discovered patterns\n")
+    
+    store.close()
 
 
 if __name__ == '__main__':
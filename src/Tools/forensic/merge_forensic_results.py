@@ -2,78 +2,56 @@
 """
 Merge forensic analyses from all expansion packs into a single comprehensive report.
 
-Extracts HIGH/MEDIUM/LOW confidence opcodes from each pack and shows:
+Reads HIGH/MEDIUM/LOW confidence opcodes of each pack from the forensic store
+(written by run_expansion_analysis.py) and shows:
 - Which opcodes are consistently HIGH confidence across multiple packs
 - Pattern stability metrics
 - Opcode frequency across packs
+
+Usage:
+    python merge_forensic_results.py [--db expansion_forensic.db]
 """
 
-import re
+import sys
 from pathlib import Path
 from collections import defaultdict
-import json
 
-def parse_forensic_file(filepath):
-    """Extract opcode confidences from forensic analysis file."""
-    
-    opcodes = {
-        'HIGH': defaultdict(list),
-        'MEDIUM': defaultdict(list),
-        'LOW': defaultdict(list),
-    }
-    
-    content = Path(filepath).read_text(errors='ignore')
-    
-    # Find all opcode sections
-    for confidence in ['HIGH', 'MEDIUM', 'LOW']:
-        # Match pattern like: "0x1234 - Description (CONFIDENCE: HIGH)"
-        pattern = rf'(0x[0-9A-F]{{4}}).*?\(CONFIDENCE:\s*{confidence}\)'
-        matches = re.finditer(pattern, content, re.IGNORECASE)
-        
-        for match in matches:
-            opcode = match.group(1).upper()
-            # Try to extract the descriptive text
-            line_start = max(0, match.start() - 200)
-            context = content[line_start:match.end()]
-            
-            # Extract last sentence that might have description
-            desc_match = re.search(r'([\w\s,]+)\s*\(CONFIDENCE', context)
-            if desc_match:
-                desc = desc_match.group(1).strip()
-                opcodes[confidence][opcode].append(desc)
-    
-    return opcodes
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from core.forensic_store import ForensicStore, DEFAULT_DATABASE
 
 def main():
-    forensic_files = sorted(Path('.').glob('expansion_forensic_*.txt'))
+    db_path = DEFAULT_DATABASE
+    if '--db' in sys.argv:
+        idx = sys.argv.index('--db')
+        if idx + 1 < len(sys.argv):
+            db_path = Path(sys.argv[idx + 1])
+    if not db_path.exists():
+        print(f"No forensic store at {db_path}. Run 'python run_expansion_analysis.py' first.")
+        sys.exit(1)
+
+    store = ForensicStore(db_path)
     
     print("\n" + "="*140)
     print("CROSS-PACK FORENSIC ANALYSIS MERGER")
     print("="*140 + "\n")
     
-    # Parse all files
-    pack_data = {}
-    pack_order = []
-    
-    for filepath in forensic_files:
-        pack_name = filepath.stem.replace('expansion_forensic_', '').upper()
-        pack_order.append(pack_name)
-        pack_data[pack_name] = parse_forensic_file(filepath)
-        print(f"Parsed: {pack_name}")
+    for pack_name in store.packs():
+        levels = defaultdict(int)
+        for profile in store.profiles(pack_name).values():
+            levels[profile.confidence_level] += 1
+        print(f"Loaded: {pack_name:20s} HIGH {levels['HIGH']:4d} | "
+              f"MEDIUM {levels['MEDIUM']:4d} | LOW {levels['LOW']:4d}")
     
-    # Aggregate HIGH confidence opcodes across packs
+    # Aggregate HIGH confidence opcodes across packs; MEDIUM-only opcodes
+    # are listed with the packs rating them MEDIUM
     opcode_packs = defaultdict(set)
-    opcode_confidence = {}
-    
-    for pack_name in pack_order:
-        for opcode in pack_data[pack_name]['HIGH']:
-            opcode_packs[opcode].add(pack_name)
-            opcode_confidence[opcode] = (opcode_confidence.get(opcode, 0) + 1, 'HIGH')
-    
-    for pack_name in pack_order:
-        for opcode in pack_data[pack_name]['MEDIUM']:
-            if opcode not in opcode_packs:
-                opcode_packs[opcode].add(pack_name)
+    for opcode, packs in store.opcode_packs('HIGH').items():
+        opcode_packs[opcode].update(packs)
+    for opcode, packs in store.opcode_packs('MEDIUM').items():
+        if opcode not in opcode_packs:
+            opcode_packs[opcode].update(packs)
     
     # Generate report
     print(f"\n{'='*140}")
@@ -83,7 +61,7 @@ def main():
     validated = []
     for opcode in sorted(opcode_packs.keys()):
         packs = opcode_packs[opcode]
-        validated.append((opcode, len(packs), packs))
+        validated.append((f"0x{opcode:04X}", len(packs), packs))
     
     validated.sort(key=lambda x: -x[1])
     
@@ -95,5 +73,7 @@ def main():
     print(f"         {len([v for v in validated if v[1] == 1])} opcodes HIGH confidence in single pack")
     print(f"{'='*140}\n")
 
+    store.close()
+
 if __name__ == '__main__':
     main()
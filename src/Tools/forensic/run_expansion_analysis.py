@@ -1,15 +1,26 @@
 #!/usr/bin/env python3
 """
-Batch analyze all expansion packs and merge forensic results.
+Batch analyze all expansion packs into one forensic store.
+
+Every BHAV instruction of each FAR is recorded in-process in a SQLite
+ForensicStore; the other forensic tools query that store. Packs whose FAR
+is unchanged since the last run are skipped.
 
 Usage:
-    python run_expansion_analysis.py
+    python run_expansion_analysis.py [--db expansion_forensic.db] [--force] [--reports]
+
+    --reports also writes the human-readable expansion_forensic_<pack>.txt
 """
 
 import sys
-import subprocess
+import time
 from pathlib import Path
-from collections import defaultdict
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from core.forensic_module import ForensicAnalyzer
+from core.forensic_store import ForensicStore, DEFAULT_DATABASE
 
 base_path = Path("G:\\SteamLibrary\\steamapps\\common\\The Sims Legacy Collection")
 
@@ -25,52 +36,67 @@ expansions = [
     ("Expansion 7", base_path / "ExpansionPack7/ExpansionPack7.far"),
 ]
 
-def run_analysis(label, far_path):
-    """Run pipeline analysis on a FAR file."""
+def pack_name(label):
+    return label.upper().replace(' ', '_')
+
+def run_analysis(store, label, far_path, force=False):
+    """Record a FAR file's instructions in the store."""
     if not far_path.exists():
         print(f"[SKIP] {label}: File not found")
         return None
     
-    output_file = f"expansion_forensic_{label.lower().replace(' ', '_')}.txt"
-    cmd = [
-        sys.executable,
-        "Program/test_pipeline.py",
-        "--mode", "quick",
-        "--limit", "0",
-        "--far-file", str(far_path),
-        "--output", output_file,
-    ]
-    
     print(f"[RUNNING] {label} ({far_path.name})...", end=" ", flush=True)
+    start = time.perf_counter()
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
-        print("OK")
-        return output_file
-    except subprocess.TimeoutExpired:
-        print("TIMEOUT")
-        return None
+        if store.ingest(pack_name(label), far_path, force=force):
+            print(f"OK ({time.perf_counter() - start:.1f}s)")
+        else:
+            print("UNCHANGED")
+        return pack_name(label)
     except Exception as e:
         print(f"ERROR: {e}")
         return None
 
+def write_report(store, pack):
+    """Write the text report for one pack (for reading, not for the tools)."""
+    output_file = f"expansion_forensic_{pack.lower()}.txt"
+    report = ForensicAnalyzer().generate_forensic_report(store.profiles(pack))
+    Path(output_file).write_text(report, encoding='utf-8')
+    return output_file
+
 def main():
+    db_path = DEFAULT_DATABASE
+    if '--db' in sys.argv:
+        idx = sys.argv.index('--db')
+        if idx + 1 < len(sys.argv):
+            db_path = Path(sys.argv[idx + 1])
+    force = '--force' in sys.argv
+    
     print("\n" + "="*120)
     print(" BATCH EXPANSION PACK FORENSIC ANALYSIS")
     print("="*120 + "\n")
     
-    results = []
-    for label, far_path in expansions:
-        output = run_analysis(label, far_path)
-        if output:
-            results.append((label, output))
-    
-    print(f"\n[COMPLETE] Analyzed {len(results)} archives")
-    print("\nGenerated output files:")
-    for label, output in results:
-        print(f"  - {output}")
+    with ForensicStore(db_path) as store:
+        results = []
+        for label, far_path in expansions:
+            pack = run_analysis(store, label, far_path, force)
+            if pack:
+                results.append(pack)
+        
+        for error in store.errors[:20]:
+            print(f"  [WARN] {error}")
+        
+        print(f"\n[COMPLETE] Analyzed {len(results)} archives into {db_path}")
+        for pack in results:
+            print(f"  - {pack:20s} {store.instruction_count(pack):,} instructions")
+        
+        if '--reports' in sys.argv:
+            print("\nGenerated report files:")
+            for pack in results:
+                print(f"  - {write_report(store, pack)}")
     
     print("\n" + "="*120)
-    print("Next: Review forensic reports for high-confidence opcode patterns")
+    print("Next: python extract_high_confidence.py / master_forensic_analyzer.py")
     print("="*120 + "\n")
 
 if __name__ == '__main__':
@@ -7,6 +7,7 @@ from .core import (
     ResourceGraph,
     ChunkScope,
 )
+from .compact import CompactResourceGraph
 from .loader import GraphLoader
 
 __all__ = [
@@ -14,6 +15,7 @@ __all__ = [
     'Reference',
     'ReferenceKind',
     'ResourceGraph',
+    'CompactResourceGraph',
     'ChunkScope',
     'GraphLoader',
 ]
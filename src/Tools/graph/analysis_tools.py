@@ -377,8 +377,17 @@ class OrphanExplainer:
       - Specific suggestions for fixing
     """
     
-    def __init__(self, graph: ResourceGraph):
+    def __init__(self, graph: ResourceGraph, bhav_index=None):
+        """
+        Args:
+            graph: Resource graph to explain
+            bhav_index: Optional core.bhav_index.BhavIndex built from the same
+                        IFFs; similar BHAVs are then exact or near-duplicate
+                        bodies instead of neighbours in the same file
+        """
         self.graph = graph
+        self.bhav_index = bhav_index
+        self._bhav_nodes: Optional[Dict[Tuple[str, int], TGI]] = None
     
     def explain(self, orphan_tgi: TGI) -> Optional[OrphanExplanation]:
         """Generate detailed explanation for an orphaned node."""
@@ -480,12 +489,36 @@ class OrphanExplainer:
     
     def _find_similar_bhavs(self, node: ResourceNode) -> List[TGI]:
         """Find similar BHAVs that ARE referenced (as examples)."""
+        key = (node.owner_iff, node.tgi.instance_id)
+        if self.bhav_index is not None and key in self.bhav_index:
+            return self._find_indexed_bhavs(key)
+        
         bhav_nodes = [n for n in self.graph.nodes.values() 
                      if n.chunk_type == "BHAV" and n.owner_iff == node.owner_iff]
         
         referenced = [n.tgi for n in bhav_nodes if self.graph.who_references(n.tgi)]
         return referenced[:3]
     
+    def _find_indexed_bhavs(self, key: Tuple[str, int], limit: int = 3) -> List[TGI]:
+        """Referenced copies of the same body first, then near-duplicates."""
+        if self._bhav_nodes is None:
+            self._bhav_nodes = {(n.owner_iff, n.tgi.instance_id): n.tgi
+                                for n in self.graph.nodes.values() if n.chunk_type == "BHAV"}
+        
+        index = self.bhav_index
+        candidates = list(index.duplicates(key))
+        for cid, _score in index.similar(key, limit=None):
+            candidates.extend(index.copies(cid))
+        
+        similar = []
+        for candidate in candidates:
+            tgi = self._bhav_nodes.get(candidate)
+            if tgi is not None and self.graph.who_references(tgi):
+                similar.append(tgi)
+                if len(similar) == limit:
+                    break
+        return similar
+    
     def explain_all_orphans(self) -> List[OrphanExplanation]:
         """Explain all orphans in the graph."""
         orphans = self.graph.find_orphans()
@@ -0,0 +1,360 @@
+"""Compact array-backed resource graph storage."""
+
+import copy
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence, Set
+
+from .core import GraphAnalysisMixin, Reference, ReferenceKind, ResourceNode, TGI
+
+
+_KINDS = list(ReferenceKind)
+_KIND_INDEX = {kind: i for i, kind in enumerate(_KINDS)}
+
+# Edges added since the last CSR build are indexed per node in small tail
+# lists; the CSR arrays are rebuilt once the tail outgrows this fraction
+_TAIL_FRACTION = 4
+_MIN_TAIL = 4096
+
+
+def _build_csr(keys: array, node_count: int):
+    """Counting sort of edge IDs by key node: returns (offsets, edge_ids)."""
+    offsets = array('I', bytes(4 * (node_count + 1)))
+    for key in keys:
+        offsets[key + 1] += 1
+    for i in range(node_count):
+        offsets[i + 1] += offsets[i]
+    fill = array('I', offsets)
+    edge_ids = array('I', bytes(4 * len(keys)))
+    for edge_id, key in enumerate(keys):
+        edge_ids[fill[key]] = edge_id
+        fill[key] += 1
+    return offsets, edge_ids
+
+
+class _EdgeView(Sequence):
+    """Read-only list-like view of a CompactResourceGraph's edges."""
+
+    def __init__(self, graph: 'CompactResourceGraph'):
+        self._graph = graph
+
+    def __len__(self) -> int:
+        return len(self._graph._edge_source)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._graph._reference(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("edge index out of range")
+        return self._graph._reference(index)
+
+    def __iter__(self) -> Iterator[Reference]:
+        for i in range(len(self)):
+            yield self._graph._reference(i)
+
+
+class CompactResourceGraph(GraphAnalysisMixin):
+    """
+    ResourceGraph with the same query API, storing edges in typed arrays.
+
+    TGIs are interned to integer node IDs. The node objects an edge was
+    added with (which may carry a call-site scope or owner differing from
+    the graph's node) are interned by value as stubs, each mapped to its
+    node ID. Each edge is a row across parallel arrays (source and target
+    stub, kind, interned field/description/edge-kind strings, interned
+    confidence), about 20 bytes instead of a Reference object plus two
+    list slots. Inbound and outbound lookups use CSR offsets over edge
+    IDs, plus a per-node tail for edges added since the last rebuild.
+    In/out degrees and the orphan count are kept as edges are added, so
+    statistics() does not rescan.
+
+    Reference objects are built on demand by the query methods; they are
+    equal in content, not identity, across calls.
+    """
+
+    def __init__(self):
+        self.nodes: Dict[TGI, ResourceNode] = {}
+        self._nodes_by_file: Dict[str, Set[TGI]] = {}
+
+        # Interning
+        self._node_ids: Dict[TGI, int] = {}
+        self._tgis: List[TGI] = []
+        self._stubs: List[ResourceNode] = []
+        self._stub_ids: Dict[tuple, int] = {}
+        self._stub_node = array('I')
+        self._strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+        self._confidences: List[float] = []
+        self._confidence_ids: Dict[float, int] = {}
+
+        # Edge columns
+        self._edge_source = array('I')
+        self._edge_target = array('I')
+        self._edge_kind = array('B')
+        self._edge_field = array('I')
+        self._edge_description = array('I')
+        self._edge_confidence = array('H')
+        self._edge_semantic = array('I')
+
+        # Per-node counters
+        self._in_degree = array('I')
+        self._out_degree = array('I')
+        self._orphan_count = 0
+
+        # CSR index over the first _indexed_edges edges, tails for the rest
+        self._indexed_edges = 0
+        self._out_offsets = array('I', [0])
+        self._out_edges = array('I')
+        self._in_offsets = array('I', [0])
+        self._in_edges = array('I')
+        self._out_tail: Dict[int, List[int]] = {}
+        self._in_tail: Dict[int, List[int]] = {}
+
+    @property
+    def edges(self) -> _EdgeView:
+        """All references, in insertion order."""
+        return _EdgeView(self)
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    def add_node(self, node: ResourceNode) -> None:
+        """Add a resource node to the graph (a real node replaces a phantom)."""
+        if node.tgi in self.nodes:
+            self._replace_phantom(node)
+            return  # Already exists
+
+        self.nodes[node.tgi] = node
+        self._node_ids[node.tgi] = len(self._tgis)
+        self._tgis.append(node.tgi)
+        self._in_degree.append(0)
+        self._out_degree.append(0)
+        self._orphan_count += 1
+
+        self._nodes_by_file.setdefault(node.owner_iff, set()).add(node.tgi)
+
+    def add_reference(self, reference: Reference) -> None:
+        """Add an edge (reference) between two nodes."""
+        # Ensure source node exists
+        if reference.source.tgi not in self.nodes:
+            self.add_node(reference.source)
+
+        # If target doesn't exist, create as phantom node
+        if reference.target.tgi not in self.nodes:
+            reference.target.is_phantom = True
+            self.add_node(reference.target)
+
+        source_stub = self._intern_stub(reference.source)
+        target_stub = self._intern_stub(reference.target)
+        source = self._stub_node[source_stub]
+        target = self._stub_node[target_stub]
+        edge_id = len(self._edge_source)
+
+        self._edge_source.append(source_stub)
+        self._edge_target.append(target_stub)
+        self._edge_kind.append(_KIND_INDEX[reference.kind])
+        self._edge_field.append(self._intern(reference.source_field))
+        self._edge_description.append(self._intern(reference.description))
+        self._edge_confidence.append(self._intern_confidence(reference.confidence))
+        self._edge_semantic.append(self._intern(reference.edge_kind))
+
+        self._out_degree[source] += 1
+        if self._in_degree[target] == 0:
+            self._orphan_count -= 1
+        self._in_degree[target] += 1
+
+        self._out_tail.setdefault(source, []).append(edge_id)
+        self._in_tail.setdefault(target, []).append(edge_id)
+        if edge_id + 1 - self._indexed_edges > max(_MIN_TAIL, self._indexed_edges // _TAIL_FRACTION):
+            self._reindex()
+
+    def remove_file(self, filepath: str) -> Set[TGI]:
+        """
+        Remove a file's nodes and the references they make.
+
+        Same result as ResourceGraph.remove_file: nodes still referenced
+        from other files stay as phantoms, and phantom targets left without
+        inbound references are dropped. The arrays are append-only, so the
+        remaining nodes and edges are re-added (a pass over all edges, as
+        the list-based graph also makes).
+
+        Returns:
+            TGIs whose node or edges changed, for CycleDetector.update and
+            ScopeValidator.update
+        """
+        tgis = set(self._nodes_by_file.get(filepath, ()))
+        changed = set(tgis)
+        removed_ids = {self._node_ids[tgi] for tgi in tgis}
+        stub_node = self._stub_node
+        kept = []
+        in_degree = array('I', bytes(4 * len(self._tgis)))
+        out_degree = array('I', bytes(4 * len(self._tgis)))
+        for edge_id, (source_stub, target_stub) in enumerate(zip(self._edge_source, self._edge_target)):
+            source, target = stub_node[source_stub], stub_node[target_stub]
+            if source in removed_ids:
+                changed.add(self._tgis[target])
+            else:
+                kept.append(edge_id)
+                out_degree[source] += 1
+                in_degree[target] += 1
+        if not tgis and len(kept) == len(self._edge_source):
+            return changed
+
+        dropped, phantoms = set(), []
+        for tgi in changed:
+            node = self.nodes.get(tgi)
+            if node is None or (tgi not in tgis and not node.is_phantom):
+                continue
+            node_id = self._node_ids[tgi]
+            if in_degree[node_id]:
+                phantoms.append(node)
+            elif not out_degree[node_id]:
+                dropped.add(tgi)
+
+        # An edge stub may be the graph's node itself (stubs are interned by
+        # value); edges keep the node as added, only the graph's turns phantom
+        marked = {id(node) for node in phantoms}
+        snapshots: Dict[int, ResourceNode] = {}
+
+        def as_added(stub: ResourceNode) -> ResourceNode:
+            if id(stub) not in marked:
+                return stub
+            return snapshots.setdefault(id(stub), copy.copy(stub))
+
+        references = []
+        for edge_id in kept:
+            reference = self._reference(edge_id)
+            reference.source, reference.target = as_added(reference.source), as_added(reference.target)
+            references.append(reference)
+        for node in phantoms:
+            node.is_phantom = True
+        nodes = [self.nodes[tgi] for tgi in self._tgis if tgi not in dropped]
+        self.__init__()
+        for node in nodes:
+            self.add_node(node)
+        for reference in references:
+            self.add_reference(reference)
+        self._reindex()
+        return changed
+
+    def _intern_stub(self, node: ResourceNode) -> int:
+        key = (node.tgi, node.chunk_type, node.owner_iff, node.scope,
+               node.label, node.size, node.is_phantom)
+        stub_id = self._stub_ids.get(key)
+        if stub_id is None:
+            stub_id = self._stub_ids[key] = len(self._stubs)
+            self._stubs.append(node)
+            self._stub_node.append(self._node_ids[node.tgi])
+        return stub_id
+
+    def _intern(self, text: str) -> int:
+        string_id = self._string_ids.get(text)
+        if string_id is None:
+            string_id = self._string_ids[text] = len(self._strings)
+            self._strings.append(text)
+        return string_id
+
+    def _intern_confidence(self, value: float) -> int:
+        value_id = self._confidence_ids.get(value)
+        if value_id is None:
+            value_id = self._confidence_ids[value] = len(self._confidences)
+            self._confidences.append(value)
+        return value_id
+
+    def _reindex(self) -> None:
+        """Rebuild the CSR arrays over all edges and clear the tails."""
+        node_count = len(self._tgis)
+        stub_node = self._stub_node
+        self._out_offsets, self._out_edges = _build_csr(
+            array('I', [stub_node[s] for s in self._edge_source]), node_count)
+        self._in_offsets, self._in_edges = _build_csr(
+            array('I', [stub_node[s] for s in self._edge_target]), node_count)
+        self._indexed_edges = len(self._edge_source)
+        self._out_tail.clear()
+        self._in_tail.clear()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _reference(self, edge_id: int) -> Reference:
+        return Reference(
+            source=self._stubs[self._edge_source[edge_id]],
+            target=self._stubs[self._edge_target[edge_id]],
+            kind=_KINDS[self._edge_kind[edge_id]],
+            source_field=self._strings[self._edge_field[edge_id]],
+            description=self._strings[self._edge_description[edge_id]],
+            confidence=self._confidences[self._edge_confidence[edge_id]],
+            edge_kind=self._strings[self._edge_semantic[edge_id]],
+        )
+
+    def _edge_ids(self, node_id: int, offsets: array, edges: array,
+                  tail: Dict[int, List[int]]) -> List[int]:
+        """Edge IDs for a node: indexed CSR slice, then the unindexed tail."""
+        ids = []
+        if node_id + 1 < len(offsets):
+            ids = edges[offsets[node_id]:offsets[node_id + 1]].tolist()
+        ids.extend(tail.get(node_id, ()))
+        return ids
+
+    def get_node(self, tgi: TGI) -> Optional[ResourceNode]:
+        """Retrieve a node by TGI."""
+        return self.nodes.get(tgi)
+
+    def who_references(self, tgi: TGI) -> List[Reference]:
+        """Find all references TO this chunk (inbound)."""
+        node_id = self._node_ids.get(tgi)
+        if node_id is None:
+            return []
+        return [self._reference(e) for e in
+                self._edge_ids(node_id, self._in_offsets, self._in_edges, self._in_tail)]
+
+    def what_references(self, tgi: TGI) -> List[Reference]:
+        """Find all references FROM this chunk (outbound)."""
+        node_id = self._node_ids.get(tgi)
+        if node_id is None:
+            return []
+        return [self._reference(e) for e in
+                self._edge_ids(node_id, self._out_offsets, self._out_edges, self._out_tail)]
+
+    def successors(self, tgi: TGI) -> List[TGI]:
+        """Target TGIs of outbound references, without building Reference objects."""
+        node_id = self._node_ids.get(tgi)
+        if node_id is None:
+            return []
+        return [self._stubs[self._edge_target[e]].tgi for e in
+                self._edge_ids(node_id, self._out_offsets, self._out_edges, self._out_tail)]
+
+    def in_degree(self, tgi: TGI) -> int:
+        node_id = self._node_ids.get(tgi)
+        return 0 if node_id is None else self._in_degree[node_id]
+
+    def out_degree(self, tgi: TGI) -> int:
+        node_id = self._node_ids.get(tgi)
+        return 0 if node_id is None else self._out_degree[node_id]
+
+    def find_orphans(self) -> List[ResourceNode]:
+        """Find nodes with no inbound references."""
+        return [self.nodes[tgi] for tgi, degree in zip(self._tgis, self._in_degree) if degree == 0]
+
+    def get_nodes_in_file(self, filepath: str) -> List[ResourceNode]:
+        """Get all nodes from a specific IFF file."""
+        tgis = self._nodes_by_file.get(filepath, set())
+        return [self.nodes[tgi] for tgi in tgis]
+
+    def statistics(self) -> Dict:
+        """Generate basic graph statistics (from maintained counters)."""
+        node_count = len(self.nodes)
+        edge_count = len(self._edge_source)
+        avg_refs = edge_count / node_count if node_count else 0
+
+        return {
+            'total_nodes': node_count,
+            'total_edges': edge_count,
+            'orphan_count': self._orphan_count,
+            'avg_inbound_refs': avg_refs,
+            'avg_outbound_refs': avg_refs,
+            'files_represented': len(self._nodes_by_file),
+        }
@@ -70,8 +70,64 @@ class Reference:
         return f"{self.source} -{self.kind.value}-> {self.target}"
 
 
+class GraphAnalysisMixin:
+    """Diagnostics shared by the ResourceGraph storage backends."""
+    
+    def detect_cycles(self):
+        """
+        Detect cycles in the graph (Phase 3.2).
+        
+        Returns:
+            CycleDetector instance with detected cycles
+        
+        Note: Cycles are NOT errors - this is diagnostic tooling.
+        """
+        from .cycle_detector import CycleDetector
+        detector = CycleDetector(self)
+        detector.detect_all_cycles()
+        return detector
+    
+    def validate_scope(self):
+        """
+        Validate scope consistency and reference integrity (Phase 3.3).
+        
+        Returns:
+            ScopeValidator instance with detected issues
+        
+        Checks:
+            - BHAV scope consistency (GLOB imports)
+            - Missing reference targets
+            - Orphaned critical resources
+            - Tuning constant validity
+            - Interaction integrity
+        """
+        from .scope_validator import ScopeValidator
+        validator = ScopeValidator(self)
+        validator.validate_all()
+        return validator
+    
+    def _replace_phantom(self, node: ResourceNode) -> None:
+        """Swap a phantom for the real node once its file is loaded."""
+        existing = self.nodes[node.tgi]
+        if not existing.is_phantom or node.is_phantom:
+            return
+        self.nodes[node.tgi] = node
+        self._nodes_by_file.get(existing.owner_iff, set()).discard(node.tgi)
+        self._nodes_by_file.setdefault(node.owner_iff, set()).add(node.tgi)
+    
+    def __str__(self) -> str:
+        stats = self.statistics()
+        return (
+            f"ResourceGraph:\n"
+            f"  Nodes: {stats['total_nodes']}\n"
+            f"  Edges: {stats['total_edges']}\n"
+            f"  Orphans: {stats['orphan_count']}\n"
+            f"  Files: {stats['files_represented']}\n"
+        )
+
+
 @dataclass
-class ResourceGraph:
+class ResourceGraph(GraphAnalysisMixin):
     """Dependency graph for The Sims resources."""
     
     # Nodes and edges
@@ -84,8 +140,9 @@ class ResourceGraph:
     _outbound_refs: Dict[TGI, List[Reference]] = field(default_factory=dict)
     
     def add_node(self, node: ResourceNode) -> None:
-        """Add a resource node to the graph."""
+        """Add a resource node to the graph (a real node replaces a phantom)."""
         if node.tgi in self.nodes:
+            self._replace_phantom(node)
             return  # Already exists
         
         self.nodes[node.tgi] = node
@@ -112,6 +169,49 @@ class ResourceGraph:
         self._outbound_refs[reference.source.tgi].append(reference)
         self._inbound_refs[reference.target.tgi].append(reference)
     
+    def remove_file(self, filepath: str) -> Set[TGI]:
+        """
+        Remove a file's nodes and the references they make.
+        
+        Nodes still referenced from other files stay as phantoms; phantom
+        targets left without inbound references are dropped.
+        
+        Returns:
+            TGIs whose node or edges changed, for CycleDetector.update and
+            ScopeValidator.update
+        """
+        tgis = set(self._nodes_by_file.get(filepath, ()))
+        changed = set(tgis)
+        removed = set()
+        for tgi in tgis:
+            for ref in self._outbound_refs.get(tgi, []):
+                removed.add(id(ref))
+                changed.add(ref.target.tgi)
+            self._outbound_refs[tgi] = []
+        if not removed and not tgis:
+            return changed
+        
+        self.edges = [ref for ref in self.edges if id(ref) not in removed]
+        for tgi in changed:
+            inbound = self._inbound_refs.get(tgi)
+            if inbound:
+                self._inbound_refs[tgi] = [ref for ref in inbound if id(ref) not in removed]
+        
+        for tgi in changed:
+            node = self.nodes.get(tgi)
+            if node is None or (tgi not in tgis and not node.is_phantom):
+                continue
+            if self._inbound_refs[tgi]:
+                node.is_phantom = True
+            elif not self._outbound_refs[tgi]:
+                del self.nodes[tgi]
+                del self._inbound_refs[tgi]
+                del self._outbound_refs[tgi]
+                self._nodes_by_file.get(node.owner_iff, set()).discard(tgi)
+        if not self._nodes_by_file.get(filepath, True):
+            del self._nodes_by_file[filepath]
+        return changed
+    
     def get_node(self, tgi: TGI) -> Optional[ResourceNode]:
         """Retrieve a node by TGI."""
         return self.nodes.get(tgi)
@@ -124,6 +224,16 @@ class ResourceGraph:
         """Find all references FROM this chunk (outbound)."""
         return self._outbound_refs.get(tgi, [])
     
+    def successors(self, tgi: TGI) -> List[TGI]:
+        """Target TGIs of outbound references."""
+        return [ref.target.tgi for ref in self._outbound_refs.get(tgi, [])]
+    
+    def in_degree(self, tgi: TGI) -> int:
+        return len(self._inbound_refs.get(tgi, []))
+    
+    def out_degree(self, tgi: TGI) -> int:
+        return len(self._outbound_refs.get(tgi, []))
+    
     def find_orphans(self) -> List[ResourceNode]:
         """Find nodes with no inbound references."""
         orphans = []
@@ -137,39 +247,6 @@ class ResourceGraph:
         tgis = self._nodes_by_file.get(filepath, set())
         return [self.nodes[tgi] for tgi in tgis]
     
-    def detect_cycles(self):
-        """
-        Detect cycles in the graph (Phase 3.2).
-        
-        Returns:
-            CycleDetector instance with detected cycles
-        
-        Note: Cycles are NOT errors - this is diagnostic tooling.
-        """
-        from .cycle_detector import CycleDetector
-        detector = CycleDetector(self)
-        detector.detect_all_cycles()
-        return detector
-    
-    def validate_scope(self):
-        """
-        Validate scope consistency and reference integrity (Phase 3.3).
-        
-        Returns:
-            ScopeValidator instance with detected issues
-        
-        Checks:
-            - BHAV scope consistency (GLOB imports)
-            - Missing reference targets
-            - Orphaned critical resources
-            - Tuning constant validity
-            - Interaction integrity
-        """
-        from .scope_validator import ScopeValidator
-        validator = ScopeValidator(self)
-        validator.validate_all()
-        return validator
-    
     def statistics(self) -> Dict:
         """Generate basic graph statistics."""
         orphans = self.find_orphans()
@@ -185,13 +262,3 @@ class ResourceGraph:
             'avg_outbound_refs': avg_outbound,
             'files_represented': len(self._nodes_by_file),
         }
-    
-    def __str__(self) -> str:
-        stats = self.statistics()
-        return (
-            f"ResourceGraph:\n"
-            f"  Nodes: {stats['total_nodes']}\n"
-            f"  Edges: {stats['total_edges']}\n"
-            f"  Orphans: {stats['orphan_count']}\n"
-            f"  Files: {stats['files_represented']}\n"
-        )
@@ -16,7 +16,7 @@ What this enables:
 """
 
 from dataclasses import dataclass, field
-from typing import List, Set, Dict, Optional, Tuple
+from typing import Iterable, List, Set, Dict, Optional, Tuple
 from enum import Enum
 
 from .core import ResourceGraph, ResourceNode, Reference, TGI
@@ -58,6 +58,13 @@ class Cycle:
         return f"Cycle({self.cycle_type.value}, {node_str})"
 
 
+@dataclass
+class CycleDiff:
+    """Cycles created and broken by an edit (CycleDetector.update)."""
+    added: List[Cycle] = field(default_factory=list)
+    removed: List[Cycle] = field(default_factory=list)
+
+
 class CycleDetector:
     """
     Detects and classifies cycles in resource graphs.
@@ -81,6 +88,9 @@ class CycleDetector:
         self._indices: Dict[TGI, int] = {}
         self._lowlinks: Dict[TGI, int] = {}
         self._on_stack: Set[TGI] = set()
+        
+        # Node -> the cycle containing it, for incremental updates
+        self._cycle_of: Dict[TGI, Cycle] = {}
     
     def detect_all_cycles(self) -> List[Cycle]:
         """
@@ -90,79 +100,157 @@ class CycleDetector:
             List of Cycle objects (may be empty if no cycles)
         """
         self.cycles = []
-        self._index = 0
-        self._stack = []
-        self._indices = {}
-        self._lowlinks = {}
-        self._on_stack = set()
+        self._cycle_of = {}
+        self._reset_tarjan()
         
         # Run Tarjan's algorithm on all nodes
         for tgi in self.graph.nodes:
             if tgi not in self._indices:
-                self._strongconnect(tgi)
+                for component in self._strongconnect(tgi):
+                    self._add_component(component)
         
         return self.cycles
     
-    def _strongconnect(self, v: TGI):
-        """Tarjan's strongly connected components algorithm."""
-        # Set the depth index for v
-        self._indices[v] = self._index
-        self._lowlinks[v] = self._index
-        self._index += 1
-        self._stack.append(v)
-        self._on_stack.add(v)
+    def update(self, changed: Iterable[TGI]) -> CycleDiff:
+        """
+        Recompute only the cycles affected by an edit.
         
-        # Consider successors of v
-        if v in self.graph._outbound_refs:
-            for ref in self.graph._outbound_refs[v]:
-                w = ref.target.tgi
-                
+        Args:
+            changed: TGIs whose node or edges were added or removed (e.g.
+                     from ResourceGraph.remove_file / GraphLoader.reload_file)
+        
+        An SCC can only change if it contains an endpoint of a changed
+        edge, so cycles through changed nodes are dropped and Tarjan is
+        re-run from the changed nodes and the members of those cycles.
+        
+        Returns:
+            CycleDiff of added and removed cycles
+        """
+        roots = set(changed)
+        removed: List[Cycle] = []
+        for tgi in list(roots):
+            if tgi in self._cycle_of:
+                roots.update(self._drop_cycle(self._cycle_of[tgi], removed))
+        
+        added = []
+        self._reset_tarjan()
+        for tgi in roots:
+            if tgi in self.graph.nodes and tgi not in self._indices:
+                for component in self._strongconnect(tgi):
+                    # Components without a root are unchanged and already known
+                    if roots.isdisjoint(component):
+                        continue
+                    # A new cycle may absorb an existing one
+                    for member in component:
+                        if member in self._cycle_of:
+                            self._drop_cycle(self._cycle_of[member], removed)
+                    cycle = self._add_component(component)
+                    if cycle is not None:
+                        added.append(cycle)
+        
+        # Report only cycles whose members or edge kinds actually changed
+        def key(cycle: Cycle):
+            return frozenset(cycle.nodes), frozenset(cycle.edge_kinds)
+        
+        before = {key(c) for c in removed}
+        after = {key(c) for c in added}
+        return CycleDiff(added=[c for c in added if key(c) not in before],
+                         removed=[c for c in removed if key(c) not in after])
+    
+    def _drop_cycle(self, cycle: Cycle, removed: List[Cycle]) -> List[TGI]:
+        """Forget a cycle; returns its members."""
+        for tgi in cycle.nodes:
+            del self._cycle_of[tgi]
+        self.cycles = [c for c in self.cycles if c is not cycle]
+        removed.append(cycle)
+        return cycle.nodes
+    
+    def _reset_tarjan(self):
+        self._index = 0
+        self._stack = []
+        self._indices = {}
+        self._lowlinks = {}
+        self._on_stack = set()
+    
+    def _strongconnect(self, root: TGI) -> List[List[TGI]]:
+        """
+        Tarjan's strongly connected components algorithm, iteratively.
+        
+        Visits nodes in the same order as the recursive formulation (so
+        components and their member order are unchanged) without being
+        bounded by the interpreter recursion limit on deep call chains.
+        
+        Returns:
+            Components completed from root, in completion order
+        """
+        components: List[List[TGI]] = []
+        work = [(root, iter(self._visit(root)))]
+        
+        while work:
+            v, successors = work[-1]
+            for w in successors:
                 if w not in self._indices:
-                    # Successor w has not yet been visited; recurse on it
-                    self._strongconnect(w)
-                    self._lowlinks[v] = min(self._lowlinks[v], self._lowlinks[w])
+                    # Successor w has not yet been visited; descend into it
+                    work.append((w, iter(self._visit(w))))
+                    break
                 elif w in self._on_stack:
                     # Successor w is in stack and hence in the current SCC
                     self._lowlinks[v] = min(self._lowlinks[v], self._indices[w])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    self._lowlinks[parent] = min(self._lowlinks[parent], self._lowlinks[v])
+                
+                # If v is a root node, pop the stack to form its SCC
+                if self._lowlinks[v] == self._indices[v]:
+                    component: List[TGI] = []
+                    while True:
+                        w = self._stack.pop()
+                        self._on_stack.remove(w)
+                        component.append(w)
+                        if w == v:
+                            break
+                    components.append(component)
         
-        # If v is a root node, pop the stack and process SCC
-        if self._lowlinks[v] == self._indices[v]:
-            # Pop nodes off stack to form strongly connected component
-            component: List[TGI] = []
-            while True:
-                w = self._stack.pop()
-                self._on_stack.remove(w)
-                component.append(w)
-                if w == v:
-                    break
-            
-            # Only process if it's a real cycle (size > 1 or self-loop)
-            if len(component) > 1 or self._has_self_loop(component[0]):
-                self._process_cycle(component)
+        return components
+    
+    def _visit(self, v: TGI) -> List[TGI]:
+        """Assign v its depth index and push it; returns its successors."""
+        self._indices[v] = self._index
+        self._lowlinks[v] = self._index
+        self._index += 1
+        self._stack.append(v)
+        self._on_stack.add(v)
+        return self.graph.successors(v)
+    
+    def _add_component(self, component: List[TGI]) -> Optional[Cycle]:
+        """Record a component if it's a real cycle (size > 1 or self-loop)."""
+        if len(component) > 1 or self._has_self_loop(component[0]):
+            self._process_cycle(component)
+            cycle = self.cycles[-1]
+            for tgi in component:
+                self._cycle_of[tgi] = cycle
+            return cycle
+        return None
     
     def _has_self_loop(self, tgi: TGI) -> bool:
         """Check if a node has a self-referential edge."""
-        if tgi not in self.graph._outbound_refs:
-            return False
-        
-        for ref in self.graph._outbound_refs[tgi]:
-            if ref.target.tgi == tgi:
-                return True
-        return False
+        return tgi in self.graph.successors(tgi)
     
     def _process_cycle(self, component: List[TGI]):
         """Process a strongly connected component into a Cycle object."""
         # Get all edges within the component
         cycle_edges = []
         edge_kinds = set()
+        members = set(component)
         
         for tgi in component:
-            if tgi in self.graph._outbound_refs:
-                for ref in self.graph._outbound_refs[tgi]:
-                    if ref.target.tgi in component:
-                        cycle_edges.append(ref)
-                        if ref.edge_kind:
-                            edge_kinds.add(ref.edge_kind)
+            for ref in self.graph.what_references(tgi):
+                if ref.target.tgi in members:
+                    cycle_edges.append(ref)
+                    if ref.edge_kind:
+                        edge_kinds.add(ref.edge_kind)
         
         # Classify cycle type
         if len(component) == 1:
@@ -1,7 +1,11 @@
 """Graph loader - builds resource graph from IFF files."""
 
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import Iterable, List, Optional, Dict, Set, Tuple
+import os
 import sys
 
 # Ensure formats package is importable
@@ -19,32 +23,179 @@ from core.iff_reader import read_iff_file, IFFChunk
 from core.chunk_parsers import parse_objd, parse_spr2, parse_bhav, parse_ttab, parse_bcon, parse_dgrp
 from core.chunk_parsers_objf import parse_objf
 
-from .core import ResourceGraph, TGI, ResourceNode, ChunkScope
+from .core import ResourceGraph, TGI, ResourceNode, ChunkScope, Reference
 from .extractors.registry import ExtractorRegistry
 
 # Import extractors to register them
 from . import extractors
 
 
+# Minimal parser for each chunk type that has an extractor
+CHUNK_PARSERS = {
+    "OBJD": parse_objd,
+    "OBJf": parse_objf,
+    "SPR2": parse_spr2,
+    "BHAV": parse_bhav,
+    "TTAB": parse_ttab,
+    "BCON": parse_bcon,
+    "DGRP": parse_dgrp,
+}
+
+# Files in flight per worker when streaming
+FILES_IN_FLIGHT_PER_WORKER = 4
+
+
+@dataclass
+class FileExtraction:
+    """
+    Nodes and references extracted from one IFF file (no chunk bytes).
+    
+    Stored as plain tuples, which pickle far smaller and faster than the
+    dataclasses when sent back from pool workers; unpack() rebuilds them.
+    """
+    filepath: str
+    nodes: List[tuple] = field(default_factory=list)
+    references: List[tuple] = field(default_factory=list)
+    
+    def add(self, node: ResourceNode, refs: List[Reference]) -> None:
+        """Pack a chunk's node and the references it makes."""
+        index = len(self.nodes)
+        self.nodes.append((node.chunk_type, node.tgi.instance_id, node.label, node.size))
+        for ref in refs:
+            target = ref.target
+            self.references.append((
+                index, None if ref.source is node else _pack_node(ref.source),
+                _pack_node(target), ref.kind, ref.source_field, ref.description,
+                ref.confidence, ref.edge_kind,
+            ))
+    
+    def unpack_nodes(self) -> List[ResourceNode]:
+        """Rebuild the ResourceNodes, in chunk order."""
+        return [
+            ResourceNode(tgi=TGI(chunk_type, 0x00000001, chunk_id), chunk_type=chunk_type,
+                         owner_iff=self.filepath, scope=ChunkScope.OBJECT, label=label, size=size)
+            for chunk_type, chunk_id, label, size in self.nodes
+        ]
+    
+    def unpack_references(self, nodes: List[ResourceNode]) -> List[Tuple[int, Reference]]:
+        """
+        Rebuild the References, with sources taken from unpack_nodes().
+        
+        Returns (index of the extracted node, reference) pairs.
+        """
+        return [
+            (index, Reference(
+                source=nodes[index] if source is None else _unpack_node(source),
+                target=_unpack_node(target), kind=kind, source_field=source_field,
+                description=description, confidence=confidence, edge_kind=edge_kind,
+            ))
+            for index, source, target, kind, source_field, description, confidence, edge_kind
+            in self.references
+        ]
+
+
+def _pack_node(node: ResourceNode) -> tuple:
+    tgi = node.tgi
+    return (tgi.type_code, tgi.group_id, tgi.instance_id, node.chunk_type,
+            node.owner_iff, node.scope, node.label, node.size, node.is_phantom)
+
+
+def _unpack_node(packed: tuple) -> ResourceNode:
+    type_code, group_id, instance_id, chunk_type, owner_iff, scope, label, size, is_phantom = packed
+    return ResourceNode(tgi=TGI(type_code, group_id, instance_id), chunk_type=chunk_type,
+                        owner_iff=owner_iff, scope=scope, label=label, size=size,
+                        is_phantom=is_phantom)
+
+
+def chunk_node(chunk: IFFChunk, filepath: str) -> ResourceNode:
+    """Build the graph node for a chunk read from filepath."""
+    chunk_id = getattr(chunk, "chunk_id", 0)
+    return ResourceNode(
+        tgi=TGI(chunk.type_code, 0x00000001, chunk_id),
+        chunk_type=chunk.type_code,
+        owner_iff=filepath,
+        scope=ChunkScope.OBJECT,
+        label=getattr(chunk, "chunk_label", ""),
+        size=len(getattr(chunk, "chunk_data", b"")),
+    )
+
+
+def extract_chunk_references(node: ResourceNode, chunk_data: bytes) -> List[Reference]:
+    """Parse a chunk's bytes and run its registered extractor."""
+    extractor_class = ExtractorRegistry.get(node.chunk_type)
+    parser = CHUNK_PARSERS.get(node.chunk_type)
+    if extractor_class is None or parser is None:
+        return []
+    
+    chunk_id = node.tgi.instance_id
+    parsed_chunk = parser(chunk_data, chunk_id)
+    if parsed_chunk is None:
+        return []
+    
+    try:
+        return list(extractor_class().extract(parsed_chunk, node))
+    except Exception as e:
+        print(f"Error extracting from {node.chunk_type}#{chunk_id}: {e}")
+        return []
+
+
+def extract_file(filepath: str, only_types=None) -> Optional[FileExtraction]:
+    """
+    Read one IFF file and extract its nodes and references.
+    
+    Runs in pool workers; chunk bytes never leave this function. only_types
+    must be picklable (a set, or a module-level function such as
+    ExtractorRegistry.has) when used with a process pool.
+    """
+    try:
+        iff_file = read_iff_file(filepath, only_types)
+        if not iff_file:
+            print(f"ERROR: Could not parse IFF file: {filepath}")
+            return None
+        
+        result = FileExtraction(filepath)
+        for chunk in iff_file.chunks:
+            if not hasattr(chunk, "type_code"):
+                continue
+            node = chunk_node(chunk, filepath)
+            result.add(node, extract_chunk_references(node, chunk.chunk_data))
+        return result
+    except Exception as e:
+        print(f"ERROR loading {filepath}: {e}")
+        return None
+
+
 class GraphLoader:
     """
     Loads IFF files and builds the complete resource graph.
     Uses minimal IFF reader to avoid import cascades.
     """
     
-    def __init__(self):
-        self.graph = ResourceGraph()
+    def __init__(self, graph: Optional[ResourceGraph] = None):
+        """
+        Args:
+            graph: Graph to build into; defaults to a new ResourceGraph.
+                   Pass a CompactResourceGraph for large corpora; both
+                   support unload_file() and reload_file().
+        """
+        self.graph = graph if graph is not None else ResourceGraph()
         self.loaded_files: Dict[str, object] = {}
     
-    def load_iff(self, filepath: str) -> Optional[object]:
-        """Load a single IFF file and add its chunks to the graph."""
+    def load_iff(self, filepath: str, only_types=None) -> Optional[object]:
+        """
+        Load a single IFF file and add its chunks to the graph.
+        
+        only_types (a set of type codes or a predicate) restricts the graph
+        to matching chunks; others are skipped without reading their data.
+        Pass ExtractorRegistry.has to keep only chunks with references.
+        """
         try:
             path = Path(filepath)
             if not path.exists():
                 print(f"ERROR: File not found: {filepath}")
                 return None
             
-            iff_file = read_iff_file(filepath)
+            iff_file = read_iff_file(filepath, only_types)
             
             if not iff_file:
                 print(f"ERROR: Could not parse IFF file: {filepath}")
@@ -70,18 +221,7 @@ class GraphLoader:
             if not hasattr(chunk, "type_code"):
                 continue
             
-            chunk_type = chunk.type_code
-            chunk_id = getattr(chunk, "chunk_id", 0)
-            
-            tgi = TGI(chunk_type, 0x00000001, chunk_id)
-            node = ResourceNode(
-                tgi=tgi,
-                chunk_type=chunk_type,
-                owner_iff=filepath,
-                scope=ChunkScope.OBJECT,
-                label=getattr(chunk, "chunk_label", ""),
-                size=len(getattr(chunk, "chunk_data", b"")),
-            )
+            node = chunk_node(chunk, filepath)
             
             # Store chunk data for later extraction
             if hasattr(chunk, "chunk_data"):
@@ -101,57 +241,18 @@ class GraphLoader:
         nodes_to_process = list(self.graph.nodes.values())
         
         for node in nodes_to_process:
-            chunk_type = node.chunk_type
-            
-            # Check if we have an extractor for this chunk type
-            extractor_class = ExtractorRegistry.get(chunk_type)
-            
-            if extractor_class is None:
-                # No extractor available for this type
-                continue
-            
             # Get the raw chunk data
             if not hasattr(node, "_chunk_data"):
                 continue
             
-            chunk_data = node._chunk_data
-            chunk_id = node.tgi.instance_id
-            
-            # Parse chunk based on type
-            parsed_chunk = None
-            if chunk_type == "OBJD":
-                parsed_chunk = parse_objd(chunk_data, chunk_id)
-            elif chunk_type == "OBJf":
-                parsed_chunk = parse_objf(chunk_data, chunk_id)
-            elif chunk_type == "SPR2":
-                parsed_chunk = parse_spr2(chunk_data, chunk_id)
-            elif chunk_type == "BHAV":
-                parsed_chunk = parse_bhav(chunk_data, chunk_id)
-            elif chunk_type == "TTAB":
-                parsed_chunk = parse_ttab(chunk_data, chunk_id)
-            elif chunk_type == "BCON":
-                parsed_chunk = parse_bcon(chunk_data, chunk_id)
-            elif chunk_type == "DGRP":
-                parsed_chunk = parse_dgrp(chunk_data, chunk_id)
-            
-            if parsed_chunk is None:
-                continue
-            
-            # Extract references using the extractor
-            try:
-                extractor = extractor_class()
-                refs = extractor.extract(parsed_chunk, node)
-                
-                for ref in refs:
-                    self.graph.add_reference(ref)
-                    reference_count += 1
-                    
-            except Exception as e:
-                print(f"Error extracting from {chunk_type}#{chunk_id}: {e}")
+            for ref in extract_chunk_references(node, node._chunk_data):
+                self.graph.add_reference(ref)
+                reference_count += 1
         
         return reference_count
     
-    def load_iff_directory(self, directory: str, pattern: str = "*.iff") -> List[str]:
+    def load_iff_directory(self, directory: str, pattern: str = "*.iff",
+                           only_types=None) -> List[str]:
         """
         Load all IFF files from a directory.
         Returns list of successfully loaded files.
@@ -160,11 +261,119 @@ class GraphLoader:
         loaded = []
         
         for iff_path in path.glob(pattern):
-            if self.load_iff(str(iff_path)):
+            if self.load_iff(str(iff_path), only_types):
                 loaded.append(str(iff_path))
         
         return loaded
     
+    def load_files_streaming(self, filepaths: Iterable[str], only_types=None,
+                             workers: Optional[int] = None) -> List[str]:
+        """
+        Load and extract references from many IFF files in one pass.
+        
+        Each file is read, parsed and run through its extractors in a pool
+        worker (or in-process when workers is 1); only nodes and references
+        come back, so chunk bytes are dropped as soon as a file is done and
+        nothing is kept in loaded_files beyond the path. At most
+        FILES_IN_FLIGHT_PER_WORKER files per worker are pending at once.
+        
+        Nodes are added as each file completes, in file order. Edges are
+        added once every file's nodes are in, so a reference never claims
+        a TGI (as a phantom) before the file defining it arrives - the
+        result matches load_iff + extract_references.
+        
+        Returns list of successfully loaded files.
+        """
+        loaded = []
+        # Packed references, with which of the file's nodes were added
+        pending = deque()
+        
+        def add_file(result: Optional[FileExtraction]) -> None:
+            if result is None:
+                return
+            loaded.append(result.filepath)
+            nodes, owned = self._add_extracted_nodes(result)
+            pending.append((result, nodes, owned))
+        
+        if workers == 1:
+            for filepath in filepaths:
+                add_file(extract_file(str(filepath), only_types))
+        else:
+            workers = workers or os.cpu_count() or 1
+            window = workers * FILES_IN_FLIGHT_PER_WORKER
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                in_flight = deque()
+                for filepath in filepaths:
+                    in_flight.append(pool.submit(extract_file, str(filepath), only_types))
+                    if len(in_flight) >= window:
+                        add_file(in_flight.popleft().result())
+                while in_flight:
+                    add_file(in_flight.popleft().result())
+        
+        while pending:
+            result, nodes, owned = pending.popleft()
+            for index, ref in result.unpack_references(nodes):
+                if owned[index]:
+                    self.graph.add_reference(ref)
+        return loaded
+    
+    def _add_extracted_nodes(self, result: FileExtraction) -> Tuple[List[ResourceNode], List[bool]]:
+        """
+        Add a file's nodes; returns them with whether each one was added.
+        
+        Like extract_references, only the node that owns a TGI is a
+        reference source; a real node takes over from a phantom.
+        """
+        self.loaded_files[result.filepath] = None
+        nodes = result.unpack_nodes()
+        owned = []
+        for node in nodes:
+            existing = self.graph.nodes.get(node.tgi)
+            owned.append(existing is None or existing.is_phantom)
+            if owned[-1]:
+                self.graph.add_node(node)
+        result.nodes = []
+        return nodes, owned
+    
+    def unload_file(self, filepath: str) -> Set[TGI]:
+        """
+        Remove a file's nodes and references from the graph.
+        
+        Returns:
+            Changed TGIs, for CycleDetector.update / ScopeValidator.update
+        """
+        self.loaded_files.pop(filepath, None)
+        return self.graph.remove_file(filepath)
+    
+    def reload_file(self, filepath: str, only_types=None) -> Set[TGI]:
+        """
+        Re-read one file (e.g. after it was saved) and replace its nodes
+        and references in the graph.
+        
+        Returns:
+            Changed TGIs, for CycleDetector.update / ScopeValidator.update
+        """
+        changed = self.unload_file(filepath)
+        result = extract_file(filepath, only_types)
+        if result is None:
+            return changed
+        
+        nodes, owned = self._add_extracted_nodes(result)
+        changed.update(node.tgi for node, added in zip(nodes, owned) if added)
+        for index, ref in result.unpack_references(nodes):
+            if owned[index]:
+                self.graph.add_reference(ref)
+                changed.add(ref.target.tgi)
+        return changed
+    
+    def load_directory_streaming(self, directory: str, pattern: str = "*.iff",
+                                 only_types=None, workers: Optional[int] = None) -> List[str]:
+        """
+        Load and extract references from all IFF files in a directory.
+        See load_files_streaming.
+        """
+        return self.load_files_streaming(Path(directory).glob(pattern), only_types, workers)
+    
     def get_graph(self) -> ResourceGraph:
         """Get the built resource graph."""
         return self.graph
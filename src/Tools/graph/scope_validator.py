@@ -9,8 +9,8 @@ This is where trust is built. Powerful validations that catch real issues:
 These warnings make modders say: "Oh wow, this tool actually understands Sims 1."
 """
 
-from dataclasses import dataclass
-from typing import List, Set, Dict, Optional
+from dataclasses import dataclass, field
+from typing import Iterable, List, Set, Dict, Optional
 from enum import Enum
 
 from .core import ResourceGraph, ResourceNode, Reference, TGI, ChunkScope, ReferenceKind
@@ -49,6 +49,13 @@ class ValidationIssue:
         return msg
 
 
+@dataclass
+class ValidationDiff:
+    """Issues introduced and fixed by an edit (ScopeValidator.update)."""
+    added: List[ValidationIssue] = field(default_factory=list)
+    resolved: List[ValidationIssue] = field(default_factory=list)
+
+
 class ScopeValidator:
     """
     Validates scope consistency and reference integrity.
@@ -67,22 +74,78 @@ class ScopeValidator:
     def __init__(self, graph: ResourceGraph):
         self.graph = graph
         self.issues: List[ValidationIssue] = []
+        
+        # Node whose neighbourhood produced each issue, for incremental updates
+        self._issues_by_node: Dict[TGI, List[ValidationIssue]] = {}
     
     def validate_all(self) -> List[ValidationIssue]:
         """Run all validation rules and return issues found."""
         self.issues = []
+        self._issues_by_node = {}
+        self._run_rules(None)
+        return self.issues
+    
+    def update(self, changed: Iterable[TGI]) -> ValidationDiff:
+        """
+        Re-validate only the nodes affected by an edit.
         
-        # Run each validation rule
-        self._validate_bhav_scope_consistency()
-        self._validate_missing_references()
-        self._validate_orphaned_critical_resources()
-        self._validate_tuning_constants()
-        self._validate_interaction_integrity()
-        self._validate_cross_scope_references()
+        Args:
+            changed: TGIs whose node or edges were added or removed (e.g.
+                     from ResourceGraph.remove_file / GraphLoader.reload_file)
         
-        return self.issues
+        Every issue is a function of one node's own edges, its inbound
+        edges, the inbound edges of its TTAB targets and whether its file
+        has a GLOB. So besides the changed nodes, TTABs pointing into them
+        and all nodes of a file whose GLOB changed are re-checked.
+        
+        Returns:
+            ValidationDiff of new and resolved issues
+        """
+        anchors = set(changed)
+        for tgi in list(anchors):
+            for ref in self.graph.who_references(tgi):
+                if ref.source.chunk_type == "TTAB":
+                    anchors.add(ref.source.tgi)
+            node = self.graph.get_node(tgi)
+            if node is not None and node.chunk_type == "GLOB":
+                anchors.update(n.tgi for n in self.graph.get_nodes_in_file(node.owner_iff))
+        
+        old = [issue for tgi in anchors for issue in self._issues_by_node.pop(tgi, [])]
+        stale = set(map(id, old))
+        self.issues = [issue for issue in self.issues if id(issue) not in stale]
+        
+        first_new = len(self.issues)
+        nodes = [self.graph.nodes[tgi] for tgi in
+                 sorted(anchors, key=lambda t: (t.type_code, t.group_id, t.instance_id))
+                 if tgi in self.graph.nodes]
+        self._run_rules(nodes)
+        new = self.issues[first_new:]
+        
+        def key(issue: ValidationIssue):
+            return (issue.severity, issue.category, issue.source_node, issue.target_node, issue.message)
+        
+        before = {key(i) for i in old}
+        after = {key(i) for i in new}
+        return ValidationDiff(added=[i for i in new if key(i) not in before],
+                              resolved=[i for i in old if key(i) not in after])
+    
+    def _run_rules(self, nodes: Optional[List[ResourceNode]]):
+        """Run each validation rule over nodes (None = whole graph)."""
+        self._validate_bhav_scope_consistency(nodes)
+        self._validate_missing_references(nodes)
+        self._validate_orphaned_critical_resources(nodes)
+        self._validate_tuning_constants(nodes)
+        self._validate_interaction_integrity(nodes)
+        self._validate_cross_scope_references(nodes)
+    
+    def _nodes(self, nodes: Optional[List[ResourceNode]]) -> Iterable[ResourceNode]:
+        return self.graph.nodes.values() if nodes is None else nodes
+    
+    def _report(self, anchor: TGI, issue: ValidationIssue):
+        self.issues.append(issue)
+        self._issues_by_node.setdefault(anchor, []).append(issue)
     
-    def _validate_bhav_scope_consistency(self):
+    def _validate_bhav_scope_consistency(self, nodes: Optional[List[ResourceNode]] = None):
         """
         Validate BHAV scope rules.
         
@@ -90,14 +153,11 @@ class ScopeValidator:
         a GLOB chunk or the BHAVs should exist in the same file.
         """
         # Find all BHAVs
-        bhav_nodes = [n for n in self.graph.nodes.values() if n.chunk_type == "BHAV"]
+        bhav_nodes = [n for n in self._nodes(nodes) if n.chunk_type == "BHAV"]
         
         for bhav_node in bhav_nodes:
-            if bhav_node.tgi not in self.graph._outbound_refs:
-                continue
-            
             # Check outbound BHAV references
-            for ref in self.graph._outbound_refs[bhav_node.tgi]:
+            for ref in self.graph.what_references(bhav_node.tgi):
                 if ref.target.chunk_type != "BHAV":
                     continue
                 
@@ -107,7 +167,7 @@ class ScopeValidator:
                     has_glob = self._has_glob_chunk(bhav_node.owner_iff)
                     
                     if not has_glob and ref.target.scope == ChunkScope.SEMI_GLOBAL:
-                        self.issues.append(ValidationIssue(
+                        self._report(bhav_node.tgi, ValidationIssue(
                             severity=ValidationSeverity.WARNING,
                             category="scope",
                             source_node=bhav_node.tgi,
@@ -116,24 +176,25 @@ class ScopeValidator:
                             suggestion="Add GLOB chunk to import semi-global library, or make BHAV call local function",
                         ))
     
-    def _validate_missing_references(self):
+    def _validate_missing_references(self, nodes: Optional[List[ResourceNode]] = None):
         """
         Detect references to non-existent resources.
         
         Rule: All references should point to nodes that exist in the graph.
         Phantom nodes (created from references but never parsed) indicate missing resources.
         """
-        for tgi, node in self.graph.nodes.items():
+        for node in self._nodes(nodes):
+            tgi = node.tgi
             if node.is_phantom:
                 # This node was referenced but never actually loaded
                 # Find what references it
-                inbound = self.graph._inbound_refs.get(tgi, [])
+                inbound = self.graph.who_references(tgi)
                 
                 if inbound:
                     ref = inbound[0]  # Show first reference
                     severity = self._get_missing_ref_severity(ref)
                     
-                    self.issues.append(ValidationIssue(
+                    self._report(tgi, ValidationIssue(
                         severity=severity,
                         category="missing_ref",
                         source_node=ref.source.tgi,
@@ -142,7 +203,7 @@ class ScopeValidator:
                         suggestion=f"Add missing {node.chunk_type} chunk or fix reference to point to existing resource",
                     ))
     
-    def _validate_orphaned_critical_resources(self):
+    def _validate_orphaned_critical_resources(self, nodes: Optional[List[ResourceNode]] = None):
         """
         Detect critical resources with no inbound references.
         
@@ -150,7 +211,10 @@ class ScopeValidator:
         If they're orphaned, they're effectively dead code.
         """
         # Find orphans
-        orphans = self.graph.find_orphans()
+        if nodes is None:
+            orphans = self.graph.find_orphans()
+        else:
+            orphans = [n for n in nodes if self.graph.in_degree(n.tgi) == 0]
         
         for orphan in orphans:
             # Check if this is a critical resource type
@@ -159,14 +223,13 @@ class ScopeValidator:
             
             if orphan.chunk_type == "BHAV":
                 # Check if this BHAV has outbound behavioral refs (it does something)
-                if orphan.tgi in self.graph._outbound_refs:
-                    behavioral_refs = [
-                        ref for ref in self.graph._outbound_refs[orphan.tgi]
-                        if ref.edge_kind == "behavioral"
-                    ]
-                    if behavioral_refs:
-                        is_critical = True
-                        reason = "BHAV contains code but is never called"
+                behavioral_refs = [
+                    ref for ref in self.graph.what_references(orphan.tgi)
+                    if ref.edge_kind == "behavioral"
+                ]
+                if behavioral_refs:
+                    is_critical = True
+                    reason = "BHAV contains code but is never called"
             
             elif orphan.chunk_type == "TTAB":
                 is_critical = True
@@ -177,7 +240,7 @@ class ScopeValidator:
                 reason = "DGRP (draw group) is never referenced - invisible graphics"
             
             if is_critical:
-                self.issues.append(ValidationIssue(
+                self._report(orphan.tgi, ValidationIssue(
                     severity=ValidationSeverity.WARNING,
                     category="orphan",
                     source_node=None,
@@ -186,21 +249,22 @@ class ScopeValidator:
                     suggestion="Either add reference from OBJD/OBJf or remove unused resource",
                 ))
     
-    def _validate_tuning_constants(self):
+    def _validate_tuning_constants(self, nodes: Optional[List[ResourceNode]] = None):
         """
         Validate BCON/tuning references.
         
         Rule: Tuning references (BHAV → BCON) should point to existing constants.
         """
         # Check all BCON nodes - if phantom, it's a missing tuning constant
-        for tgi, node in self.graph.nodes.items():
+        for node in self._nodes(nodes):
+            tgi = node.tgi
             if node.chunk_type == "BCON" and node.is_phantom:
                 # Find what references it
-                inbound = self.graph._inbound_refs.get(tgi, [])
+                inbound = self.graph.who_references(tgi)
                 
                 for ref in inbound:
                     if ref.edge_kind == "tuning":
-                        self.issues.append(ValidationIssue(
+                        self._report(tgi, ValidationIssue(
                             severity=ValidationSeverity.ERROR,
                             category="missing_tuning",
                             source_node=ref.source.tgi,
@@ -209,20 +273,17 @@ class ScopeValidator:
                             suggestion="Add missing BCON table or fix expression operand to use existing constant",
                         ))
     
-    def _validate_interaction_integrity(self):
+    def _validate_interaction_integrity(self, nodes: Optional[List[ResourceNode]] = None):
         """
         Validate TTAB (interaction table) integrity.
         
         Rule: TTAB action/guard functions should exist and not be orphaned.
         """
-        ttab_nodes = [n for n in self.graph.nodes.values() if n.chunk_type == "TTAB"]
+        ttab_nodes = [n for n in self._nodes(nodes) if n.chunk_type == "TTAB"]
         
         for ttab_node in ttab_nodes:
-            if ttab_node.tgi not in self.graph._outbound_refs:
-                continue
-            
             # Check TTAB → BHAV references
-            for ref in self.graph._outbound_refs[ttab_node.tgi]:
+            for ref in self.graph.what_references(ttab_node.tgi):
                 if ref.target.chunk_type != "BHAV":
                     continue
                 
@@ -234,7 +295,7 @@ class ScopeValidator:
                 
                 else:
                     # Check if BHAV is orphaned (only referenced by this TTAB)
-                    inbound_refs = self.graph._inbound_refs.get(ref.target.tgi, [])
+                    inbound_refs = self.graph.who_references(ref.target.tgi)
                     
                     # If BHAV is ONLY referenced by TTAB, it's a dedicated handler (OK)
                     # But if orphaned otherwise, warn
@@ -250,7 +311,7 @@ class ScopeValidator:
                         msg = f"TTAB {ttab_node.tgi} references orphaned BHAV {ref.target.tgi}"
                         suggestion = "Verify BHAV is correct interaction handler"
                         
-                        self.issues.append(ValidationIssue(
+                        self._report(ttab_node.tgi, ValidationIssue(
                             severity=severity,
                             category="interaction",
                             source_node=ttab_node.tgi,
@@ -259,13 +320,18 @@ class ScopeValidator:
                             suggestion=suggestion,
                         ))
     
-    def _validate_cross_scope_references(self):
+    def _validate_cross_scope_references(self, nodes: Optional[List[ResourceNode]] = None):
         """
         Validate cross-scope reference rules.
         
         Rule: OBJECT scope shouldn't reference GLOBAL/SEMI_GLOBAL without imports.
         """
-        for ref in self.graph.edges:
+        if nodes is None:
+            refs = self.graph.edges
+        else:
+            refs = [ref for n in nodes for ref in self.graph.what_references(n.tgi)]
+        
+        for ref in refs:
             # OBJECT → GLOBAL/SEMI_GLOBAL without proper import
             if ref.source.scope == ChunkScope.OBJECT:
                 if ref.target.scope in [ChunkScope.GLOBAL, ChunkScope.SEMI_GLOBAL]:
@@ -273,7 +339,7 @@ class ScopeValidator:
                     has_glob = self._has_glob_chunk(ref.source.owner_iff)
                     
                     if not has_glob and ref.target.scope == ChunkScope.SEMI_GLOBAL:
-                        self.issues.append(ValidationIssue(
+                        self._report(ref.source.tgi, ValidationIssue(
                             severity=ValidationSeverity.INFO,
                             category="scope",
                             source_node=ref.source.tgi,
@@ -0,0 +1,378 @@
+"""
+Asset Name Index - Startup-time name lookup for meshes, textures and skeletons.
+
+The export server used to stat candidate paths, glob() loose directories and
+walk every FAR manifest on each lookup. AssetNameIndex scans each container
+(loose directory or FAR archive) once and keeps its mesh, texture and
+skeleton files as (container, name, offset, length) under normalized keys:
+
+- meshes:    lowercase stem without "xskin-" and "-PELVIS-BODY"/"-HEAD-HEAD"
+- textures:  lowercase stem
+- skeletons: files named "*skeleton*.bcf"
+
+Lookups try containers in the configured search order with one dict probe
+each. Containers are fingerprinted (mtime and size) and persisted to a JSON
+file, so a restart or configure() rescans only what changed.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from formats.far.far1 import FAR1Archive
+
+
+INDEX_VERSION = 1
+
+MESH_EXTENSIONS = ('.bmf', '.skn')
+TEXTURE_EXTENSIONS = ('.bmp', '.tga', '.png')
+SKELETON_EXTENSION = '.bcf'
+SKELETON_NAMES = (
+    "skeleton.cmx.bcf",
+    "adult-skeleton.cmx.bcf",
+    "skeleton.bcf",
+    "skeleton-adult.bcf",
+)
+INDEXED_EXTENSIONS = MESH_EXTENSIONS + TEXTURE_EXTENSIONS + (SKELETON_EXTENSION,)
+
+# (file name, offset, length); offset is 0 for loose files
+Entry = Tuple[str, int, int]
+
+
+def mesh_key(name: str) -> str:
+    """Normalized mesh stem: 'xskin-B001FAFit_01-PELVIS-BODY.skn' -> 'b001fafit_01'."""
+    stem = Path(name).stem.lower()
+    if stem.startswith('xskin-'):
+        stem = stem[6:]
+    for suffix in ('-pelvis-body', '-head-head'):
+        if stem.endswith(suffix):
+            stem = stem[:-len(suffix)]
+    return stem
+
+
+@dataclass
+class AssetLocation:
+    """Where an asset lives: a loose file, or a byte range inside a FAR archive."""
+    container: Path
+    name: str
+    offset: int
+    length: int
+    in_far: bool
+
+    @property
+    def path(self) -> Path:
+        """Path of a loose file (the archive path for FAR entries)."""
+        return self.container if self.in_far else self.container / self.name
+
+    @property
+    def suffix(self) -> str:
+        return Path(self.name).suffix.lower()
+
+    @property
+    def source(self) -> str:
+        """Short description, e.g. 'FAR: Skins.far' or 'Loose: Skins'."""
+        return f"{'FAR' if self.in_far else 'Loose'}: {self.container.name}"
+
+
+class _Container:
+    """Indexed files of one directory or FAR archive."""
+
+    def __init__(self, path: Path, in_far: bool, fingerprint: Tuple[int, int],
+                 entries: List[Entry]):
+        self.path = path
+        self.in_far = in_far
+        self.fingerprint = fingerprint
+        self.entries = entries
+        self.meshes: Dict[str, List[Entry]] = {}
+        self.mesh_entries: List[Entry] = []
+        self.textures: Dict[str, List[Entry]] = {}
+        self.skeletons: List[Entry] = []
+        self.by_lower_name: Dict[str, Entry] = {}
+        for entry in entries:
+            name = entry[0]
+            lower = name.lower()
+            suffix = Path(lower).suffix
+            self.by_lower_name.setdefault(lower, entry)
+            if suffix in MESH_EXTENSIONS:
+                self.meshes.setdefault(mesh_key(name), []).append(entry)
+                self.mesh_entries.append(entry)
+            elif suffix in TEXTURE_EXTENSIONS:
+                self.textures.setdefault(Path(lower).stem, []).append(entry)
+            elif suffix == SKELETON_EXTENSION and 'skeleton' in lower:
+                self.skeletons.append(entry)
+
+    def location(self, entry: Entry) -> AssetLocation:
+        return AssetLocation(self.path, entry[0], entry[1], entry[2], self.in_far)
+
+
+def _fingerprint(path: Path) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of a directory or archive, or None if missing."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class AssetNameIndex:
+    """
+    Name index over loose asset directories and FAR archives.
+
+    Usage:
+        index = AssetNameIndex(cache_path="asset_name_index.json")
+        index.configure(mesh_dirs, far_archives,
+                        skeleton_dirs=[skins_dir], skeleton_fars=[animation_far])
+        location = index.find_mesh("xskin-B001FAFit_01-PELVIS-BODY")
+    """
+
+    def __init__(self, cache_path: Optional[Union[str, Path]] = None):
+        self.cache_path = Path(cache_path) if cache_path is not None else None
+        self.mesh_dirs: List[Path] = []
+        self.far_archives: List[Path] = []
+        self.skeleton_dirs: List[Path] = []
+        self.skeleton_fars: List[Path] = []
+        self._containers: Dict[str, _Container] = {}
+        self._lock = threading.RLock()
+        self.scans = 0
+        self.errors: List[str] = []
+        self._loaded: Optional[Tuple[int, int]] = None  # cache_path fingerprint last read or written
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    def configure(self, mesh_dirs: Sequence[Path], far_archives: Sequence[Path],
+                  skeleton_dirs: Sequence[Path] = (), skeleton_fars: Sequence[Path] = (),
+                  scan: bool = True) -> int:
+        """
+        Set the search order and bring every container up to date.
+
+        With scan=False the index is reloaded from cache_path instead, as
+        saved by the process that scanned (export workers use this); any
+        container missing from it is scanned on first lookup.
+
+        Returns:
+            Number of containers (re)scanned
+        """
+        with self._lock:
+            self.mesh_dirs = [Path(p) for p in mesh_dirs]
+            self.far_archives = [Path(p) for p in far_archives]
+            self.skeleton_dirs = [Path(p) for p in skeleton_dirs]
+            self.skeleton_fars = [Path(p) for p in skeleton_fars]
+            if not scan:
+                self.reload()
+                return 0
+            return self.refresh()
+
+    def refresh(self) -> int:
+        """Rescan configured containers whose fingerprint changed. Returns rescans."""
+        with self._lock:
+            wanted = ([(p, False) for p in self.mesh_dirs + self.skeleton_dirs] +
+                      [(p, True) for p in self.far_archives + self.skeleton_fars])
+            scanned = 0
+            for path, in_far in wanted:
+                container = self._containers.get(str(path))
+                if container is None or container.fingerprint != _fingerprint(path):
+                    self._scan(path, in_far)
+                    scanned += 1
+            if scanned:
+                self.save()
+            return scanned
+
+    def _container(self, path: Path, in_far: bool) -> Optional[_Container]:
+        """Indexed container for path, scanning it on first use."""
+        container = self._containers.get(str(path))
+        if container is None:
+            with self._lock:
+                container = self._containers.get(str(path)) or self._scan(path, in_far)
+        return container
+
+    def _scan(self, path: Path, in_far: bool) -> Optional[_Container]:
+        self.scans += 1
+        fingerprint = _fingerprint(path)
+        entries: List[Entry] = []
+        if fingerprint is not None:
+            try:
+                if in_far:
+                    with FAR1Archive(str(path)) as far:
+                        entries = [(e.filename, e.data_offset, e.data_length) for e in far.entries
+                                   if e.filename.lower().endswith(INDEXED_EXTENSIONS)]
+                else:
+                    with os.scandir(path) as it:
+                        entries = [(e.name, 0, e.stat().st_size) for e in it
+                                   if e.name.lower().endswith(INDEXED_EXTENSIONS) and e.is_file()]
+                    entries.sort()
+            except Exception as e:
+                self.errors.append(f"Index error {path}: {e}")
+        container = _Container(path, in_far, fingerprint, entries)
+        self._containers[str(path)] = container
+        return container
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        if self.cache_path is None or not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != INDEX_VERSION:
+            return
+        self._loaded = _fingerprint(self.cache_path)
+        for path, c in data.get('containers', {}).items():
+            fingerprint = tuple(c['fingerprint']) if c.get('fingerprint') else None
+            self._containers[path] = _Container(Path(path), c['far'], fingerprint,
+                                                [tuple(e) for e in c['entries']])
+
+    def reload(self) -> bool:
+        """Reload from cache_path if another process saved it since. Returns whether it did."""
+        if self.cache_path is None:
+            return False
+        with self._lock:
+            if _fingerprint(self.cache_path) == self._loaded:
+                return False
+            self._load()
+            return True
+
+    def save(self):
+        """Write the index to cache_path (if set)."""
+        if self.cache_path is None:
+            return
+        with self._lock:
+            data = {
+                'version': INDEX_VERSION,
+                'containers': {
+                    path: {'far': c.in_far, 'fingerprint': c.fingerprint, 'entries': c.entries}
+                    for path, c in self._containers.items()
+                },
+            }
+        # A temp file per writer: several processes may save at once
+        tmp = None
+        try:
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=self.cache_path.parent,
+                                             prefix=self.cache_path.name + '.', suffix='.tmp',
+                                             delete=False) as f:
+                tmp = f.name
+                json.dump(data, f)
+            os.replace(tmp, self.cache_path)
+            self._loaded = _fingerprint(self.cache_path)
+        except OSError as e:
+            self.errors.append(f"Index save error {self.cache_path}: {e}")
+            if tmp is not None and os.path.exists(tmp):
+                os.unlink(tmp)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def _containers_in(self, paths: Iterable[Path], in_far: bool) -> Iterable[_Container]:
+        for path in paths:
+            container = self._container(Path(path), in_far)
+            if container is not None and container.entries:
+                yield container
+
+    def find_mesh(self, mesh_name: str) -> Optional[AssetLocation]:
+        """
+        Find a BMF/SKN mesh by name, with or without extension and the
+        'xskin-...-PELVIS-BODY' / '-HEAD-HEAD' decoration.
+
+        Loose directories come before FAR archives. Within a container an
+        exact stem beats the body mesh, which beats the head mesh; names
+        merely containing the stem are the fallback.
+        """
+        base = Path(mesh_name).stem.lower()
+        key = mesh_key(base)
+        preference = {base: 0,
+                      f"xskin-{base}-pelvis-body": 1, f"xskin-{key}-pelvis-body": 1,
+                      f"xskin-{base}-head-head": 2, f"xskin-{key}-head-head": 2}
+
+        def best(candidates: List[Entry]) -> Entry:
+            return min(candidates, key=lambda e: preference.get(Path(e[0]).stem.lower(), 3))
+
+        def containing(container: _Container) -> Optional[Entry]:
+            for entry in container.mesh_entries:
+                lower = entry[0].lower()
+                if base in lower or key in lower:
+                    return entry
+            return None
+
+        # Loose: exact names then substring matches, directory by directory
+        for container in self._containers_in(self.mesh_dirs, False):
+            candidates = container.meshes.get(key)
+            entry = best(candidates) if candidates else containing(container)
+            if entry is not None:
+                return container.location(entry)
+
+        # FAR: exact names in any archive, then substring matches
+        fars = list(self._containers_in(self.far_archives, True))
+        for container in fars:
+            candidates = container.meshes.get(key)
+            if candidates:
+                return container.location(best(candidates))
+        for container in fars:
+            entry = containing(container)
+            if entry is not None:
+                return container.location(entry)
+        return None
+
+    def find_skeleton(self) -> Optional[AssetLocation]:
+        """Find the skeleton BCF: well-known names, then any '*skeleton*.bcf'."""
+        for container in self._containers_in(self.skeleton_dirs, False):
+            for name in SKELETON_NAMES:
+                entry = container.by_lower_name.get(name)
+                if entry is not None:
+                    return container.location(entry)
+        for container in self._containers_in(self.mesh_dirs, False):
+            if container.skeletons:
+                return container.location(container.skeletons[0])
+        for container in self._containers_in(self.skeleton_fars + self.far_archives, True):
+            if container.skeletons:
+                return container.location(container.skeletons[0])
+        return None
+
+    def find_texture(self, texture_name: str,
+                     search_dirs: Optional[Sequence[Path]] = None) -> Optional[AssetLocation]:
+        """
+        Find a BMP/TGA/PNG texture by stem (case-insensitive).
+
+        Args:
+            texture_name: Texture name without extension
+            search_dirs: Loose directories to try first (default: mesh_dirs)
+        """
+        stem = texture_name.lower()
+        dirs = self.mesh_dirs if search_dirs is None else search_dirs
+
+        def best(candidates: List[Entry]) -> Entry:
+            return min(candidates, key=lambda e: TEXTURE_EXTENSIONS.index(Path(e[0]).suffix.lower()))
+
+        for container in self._containers_in(dirs, False):
+            candidates = container.textures.get(stem)
+            if candidates:
+                return container.location(best(candidates))
+        for container in self._containers_in(self.far_archives, True):
+            candidates = container.textures.get(stem)
+            if candidates:
+                return container.location(candidates[0])
+        return None
+
+    def stats(self) -> dict:
+        """Container and entry counts."""
+        with self._lock:
+            containers = list(self._containers.values())
+        return {
+            'containers': len(containers),
+            'entries': sum(len(c.entries) for c in containers),
+            'meshes': sum(len(v) for c in containers for v in c.meshes.values()),
+            'textures': sum(len(v) for c in containers for v in c.textures.values()),
+            'skeletons': sum(len(c.skeletons) for c in containers),
+            'scans': self.scans,
+        }
@@ -0,0 +1,214 @@
+"""
+Export Cache - Content-addressed on-disk cache of glTF/GLB exports.
+
+An export is keyed by a hash of everything that determines its output: the
+mesh, skeleton and texture bytes, the exporter options and the exporter
+version. Repeated exports of the same assets are served from
+<root>/<key[:2]>/<key><ext> (plus a small JSON sidecar with response
+metadata) instead of being rebuilt. The key doubles as the HTTP ETag.
+
+The cache is capped in bytes; least recently used entries (by file mtime,
+refreshed on every hit) are removed once the cap is exceeded, or on demand:
+
+    python export_cache.py [CACHE_DIR] [--max-mb 1024]
+"""
+
+import hashlib
+import json
+import os
+import struct
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024  # The server's cap and the CLI's gc target
+META_SUFFIX = '.json'
+STALE_TEMP_SECONDS = 3600  # Temp files older than this are abandoned exports
+
+
+def export_key(mesh: bytes, skeleton: bytes = b'', texture: bytes = b'',
+               options: Optional[dict] = None, version: int = 0) -> str:
+    """Content key of one export (hex BLAKE2b over length-prefixed inputs)."""
+    digest = hashlib.blake2b(digest_size=20)
+    encoded_options = json.dumps(options or {}, sort_keys=True).encode('utf-8')
+    for part in (struct.pack('<I', version), mesh, skeleton, texture, encoded_options):
+        digest.update(struct.pack('<Q', len(part)))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+@dataclass
+class CachedExport:
+    """A cached export file and the metadata stored with it."""
+    key: str
+    path: Path
+    meta: dict
+
+    @property
+    def etag(self) -> str:
+        return self.key
+
+
+class ExportCache:
+    """
+    Size-capped, content-addressed export store shared by server processes.
+
+    Usage:
+        cache = ExportCache(EXPORT_DIR / "cache", max_bytes=256 * 1024 * 1024)
+        key = export_key(mesh_bytes, skeleton_bytes, texture_bytes, options, EXPORTER_VERSION)
+        entry = cache.get(key, '.gltf')
+        if entry is None:
+            tmp = cache.temp_path('.gltf')
+            exporter.export(mesh, skeleton, str(tmp))
+            entry = cache.put(key, tmp, {'has_skeleton': True})
+    """
+
+    def __init__(self, root: Union[str, Path], max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None  # Counted on first put
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _entry_path(self, key: str, suffix: str) -> Path:
+        return self.root / key[:2] / f"{key}{suffix}"
+
+    def get(self, key: str, suffix: str = '.gltf') -> Optional[CachedExport]:
+        """Cached export for key, marking it most recently used."""
+        path = self._entry_path(key, suffix)
+        try:
+            os.utime(path)
+            meta_path = path.with_suffix(META_SUFFIX)
+            meta = json.loads(meta_path.read_text(encoding='utf-8')) if meta_path.exists() else {}
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return CachedExport(key, path, meta)
+
+    def temp_path(self, suffix: str = '.gltf') -> Path:
+        """Fresh temporary file in the cache directory (same filesystem, for put())."""
+        fd, name = tempfile.mkstemp(suffix=suffix + '.tmp', dir=self.root)
+        os.close(fd)
+        return Path(name)
+
+    def put(self, key: str, source: Union[str, Path], meta: Optional[dict] = None) -> CachedExport:
+        """Move a finished export file into the cache under key."""
+        source = Path(source)
+        suffix = Path(source.name[:-4] if source.name.endswith('.tmp') else source.name).suffix
+        path = self._entry_path(key, suffix)
+        path.parent.mkdir(exist_ok=True)
+        meta = meta or {}
+        meta_tmp = source.with_name(source.name + META_SUFFIX)
+        meta_tmp.write_text(json.dumps(meta), encoding='utf-8')
+        os.replace(meta_tmp, path.with_suffix(META_SUFFIX))
+        size = source.stat().st_size
+        os.replace(source, path)
+
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += size
+            over = self._total_bytes is None or self._total_bytes > self.max_bytes
+        if over:
+            self.gc()
+        return CachedExport(key, path, meta)
+
+    def _files(self) -> List[Tuple[Path, os.stat_result]]:
+        entries = []
+        for folder in self.root.iterdir():
+            if not folder.is_dir():
+                continue
+            for path in folder.iterdir():
+                if path.suffix == META_SUFFIX:
+                    continue
+                try:
+                    entries.append((path, path.stat()))
+                except OSError:
+                    pass
+        return entries
+
+    def gc(self, max_bytes: Optional[int] = None) -> Dict[str, int]:
+        """
+        Remove least recently used entries until the cache fits max_bytes
+        (default: the cache's cap). Also drops abandoned temporary files.
+
+        Returns:
+            {'removed': entries removed, 'freed': bytes, 'remaining': bytes}
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        with self._lock:
+            files = self._files()
+            total = sum(st.st_size for _, st in files)
+            removed = freed = 0
+            for path, st in sorted(files, key=lambda item: item[1].st_mtime_ns):
+                if total <= limit:
+                    break
+                for victim in (path, path.with_suffix(META_SUFFIX)):
+                    try:
+                        victim.unlink()
+                    except OSError:
+                        pass
+                total -= st.st_size
+                freed += st.st_size
+                removed += 1
+            stale = time.time() - STALE_TEMP_SECONDS
+            for tmp in self.root.glob('*.tmp'):
+                try:
+                    if tmp.stat().st_mtime < stale:
+                        tmp.unlink()
+                except OSError:
+                    pass
+            self.evictions += removed
+            self._total_bytes = total
+        return {'removed': removed, 'freed': freed, 'remaining': total}
+
+    def counts(self) -> Tuple[int, int, int]:
+        """(hits, misses, evictions) so far."""
+        with self._lock:
+            return self.hits, self.misses, self.evictions
+
+    def add_counts(self, hits: int, misses: int, evictions: int):
+        """Add counts taken by another process sharing this cache (an export worker)."""
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+            self.evictions += evictions
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'root': str(self.root),
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Garbage-collect the export cache")
+    parser.add_argument('cache_dir', nargs='?', default=str(Path(__file__).parent / "exports" / "cache"))
+    parser.add_argument('--max-mb', type=float, default=DEFAULT_MAX_BYTES / (1024 * 1024),
+                        help="Size to shrink the cache to (default: %(default)s)")
+    args = parser.parse_args()
+    cache = ExportCache(args.cache_dir)
+    result = cache.gc(int(args.max_mb * 1024 * 1024))
+    print(f"Removed {result['removed']} exports ({result['freed'] / (1024 * 1024):.1f} MB); "
+          f"{result['remaining'] / (1024 * 1024):.1f} MB remain in {cache.root}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+"""
+Export Jobs - Bounded worker pool with request coalescing, and latency metrics.
+
+CPU-heavy exports (glTF meshes and characters) run in an
+ExportJobPool instead of the request thread, so one export no longer blocks
+every other request. Jobs are keyed by what they compute; while a job is in
+flight, submitting the same key again returns the same future (two tabs
+asking for one character share one export).
+
+EndpointLatencies keeps a fixed-bucket latency histogram per endpoint for
+/api/metrics.
+"""
+
+import multiprocessing
+import os
+import threading
+from bisect import bisect_left
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, Optional
+
+
+DEFAULT_MAX_PENDING = 64
+
+# Histogram bucket upper bounds in milliseconds (last bucket is open-ended)
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000)
+
+
+class PoolBusy(Exception):
+    """Raised when the pool already has max_pending distinct jobs in flight."""
+
+
+class ExportJobPool:
+    """
+    Bounded process (or thread) pool that coalesces identical in-flight jobs.
+
+    Usage:
+        pool = ExportJobPool(max_workers=4)
+        future = pool.submit(("mesh", name), export_mesh_job, name)
+        body, status = future.result(timeout=120)
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, processes: bool = True,
+                 max_pending: int = DEFAULT_MAX_PENDING):
+        """
+        Args:
+            max_workers: Worker count (default: CPUs - 1, at least 1)
+            processes: Run jobs in worker processes; False uses threads
+                       (jobs then share the server's in-memory caches)
+            max_pending: Distinct jobs allowed in flight before PoolBusy
+        """
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+        self.processes = processes
+        self.max_pending = max_pending
+        self._executor: Optional[Executor] = None
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.coalesced = 0
+        self.rejected = 0
+
+    def start(self, warm_up: Callable = os.getpid, *args) -> 'ExportJobPool':
+        """
+        Start every worker now, before the server starts taking requests.
+
+        Executors only launch a worker when a job needs one, so this runs
+        warm_up(*args) once per worker and waits for all of them; pass a
+        function from the jobs' module to have workers import it up front.
+        """
+        with self._lock:
+            executor = self._get_executor()
+        for future in [executor.submit(warm_up, *args) for _ in range(self.max_workers)]:
+            future.result()
+        return self
+
+    def _get_executor(self) -> Executor:
+        # Created by start() or on first use, so importing the server
+        # (including in the worker processes themselves) never starts a pool.
+        # Workers are spawned, not forked: a pool first created from a
+        # request thread would fork while other threads hold locks.
+        if self._executor is None:
+            if self.processes:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                     mp_context=multiprocessing.get_context("spawn"))
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix="export")
+        return self._executor
+
+    def submit(self, key: Hashable, fn: Callable, *args,
+               on_done: Optional[Callable[[Future], None]] = None) -> Future:
+        """
+        Run fn(*args) in the pool, or join the in-flight job with the same key.
+
+        fn and args must be picklable in process mode. on_done(future) is
+        called once when a new job finishes (not for requests joining one).
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future
+            if len(self._in_flight) >= self.max_pending:
+                self.rejected += 1
+                raise PoolBusy(f"{len(self._in_flight)} export jobs already in flight")
+            future = self._get_executor().submit(fn, *args)
+            self._in_flight[key] = future
+            self.submitted += 1
+        future.add_done_callback(lambda f: self._finished(key, f))
+        if on_done is not None:
+            future.add_done_callback(on_done)
+        return future
+
+    def _finished(self, key: Hashable, future: Future):
+        with self._lock:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    def stats(self) -> dict:
+        """Pool configuration and job counters."""
+        with self._lock:
+            return {
+                'mode': 'process' if self.processes else 'thread',
+                'workers': self.max_workers,
+                'in_flight': len(self._in_flight),
+                'max_pending': self.max_pending,
+                'submitted': self.submitted,
+                'coalesced': self.coalesced,
+                'rejected': self.rejected,
+            }
+
+    def shutdown(self, wait: bool = True):
+        """Stop the workers (a later submit starts a new pool)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with approximate percentiles."""
+
+    def __init__(self, bounds_ms=LATENCY_BUCKETS_MS):
+        self.bounds_ms = tuple(bounds_ms)
+        self.counts = [0] * (len(self.bounds_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, seconds: float):
+        ms = seconds * 1000.0
+        self.counts[bisect_left(self.bounds_ms, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, q: float) -> float:
+        """Upper bound (ms) of the bucket holding the q-th quantile (max_ms for the last)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return float(self.bounds_ms[i]) if i < len(self.bounds_ms) else self.max_ms
+        return self.max_ms
+
+    def snapshot(self) -> dict:
+        buckets = {f"<={b}ms": n for b, n in zip(self.bounds_ms, self.counts)}
+        buckets[f">{self.bounds_ms[-1]}ms"] = self.counts[-1]
+        return {
+            'count': self.count,
+            'mean_ms': self.total_ms / self.count if self.count else 0.0,
+            'max_ms': self.max_ms,
+            'p50_ms': self.percentile(0.50),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'buckets': buckets,
+        }
+
+
+class EndpointLatencies:
+    """Thread-safe LatencyHistogram per endpoint name."""
+
+    def __init__(self):
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, endpoint: str, seconds: float):
+        with self._lock:
+            histogram = self._histograms.get(endpoint)
+            if histogram is None:
+                histogram = self._histograms[endpoint] = LatencyHistogram()
+            histogram.observe(seconds)
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            return {name: h.snapshot() for name, h in sorted(self._histograms.items())}
@@ -8,10 +8,17 @@ Then access the library browser at http://localhost:5000/library_browser.html
 import sys
 import os
 import json
+import multiprocessing
+import threading
+import time
 import traceback
 import base64
+import re
+import shutil
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import asdict
 from pathlib import Path
-from flask import Flask, request, jsonify, send_from_directory, send_file
+from flask import Flask, request, jsonify, send_from_directory, send_file, g
 from flask_cors import CORS
 
 # Add paths for imports
@@ -22,8 +29,13 @@ from formats.mesh.bmf import BMFReader
 from formats.mesh.skn import SKNReader
 from formats.mesh.bcf import BCFReader
 from formats.mesh.cmx import CMXReader, CharacterAssembler
-from formats.mesh.gltf_export import GLTFExporter, export_character_gltf
-from formats.far.far1 import FAR1Archive
+from formats.mesh.gltf_export import GLTFExporter, export_character_gltf, EXPORTER_VERSION
+from formats.far.far1 import FAR1Archive, FarEntry
+from webviewer.sprite_cache import SpriteCache, content_hash
+from webviewer.asset_name_index import AssetNameIndex, AssetLocation
+from webviewer.export_jobs import ExportJobPool, EndpointLatencies, PoolBusy
+from webviewer.export_cache import ExportCache, CachedExport, export_key, DEFAULT_MAX_BYTES
+from core.asset_index import AssetIndex
 
 app = Flask(__name__, static_folder='.')
 CORS(app)
@@ -62,6 +74,27 @@ FAR_ARCHIVE_PATHS = list(DEFAULT_FAR_ARCHIVE_PATHS)
 # Path: webviewer -> Tools -> src -> (project root) -> data
 DATA_DIR = Path(__file__).parent.parent.parent.parent / "data"
 
+# Indexed asset database from core/asset_scanner.py; preferred over the JSON
+# dumps when present (first existing path wins)
+ASSET_DB_PATHS = [
+    DATA_DIR / "asset_database.sqlite",
+    Path(__file__).parent.parent / "data" / "asset_database.sqlite",
+]
+_asset_index: AssetIndex | None = None
+_asset_index_lock = threading.Lock()
+
+def get_asset_index() -> AssetIndex | None:
+    """Get the asset database index, or None if no database has been built."""
+    global _asset_index
+    if _asset_index is None:
+        with _asset_index_lock:
+            if _asset_index is None:
+                for db_path in ASSET_DB_PATHS:
+                    if db_path.exists():
+                        _asset_index = AssetIndex(db_path)
+                        break
+    return _asset_index
+
 # Routes to serve pre-extracted data files
 @app.route('/objects.json')
 def serve_objects_json():
@@ -82,42 +115,180 @@ def serve_meshes_json():
 @app.route('/api/config', methods=['POST'])
 def set_config():
     """Set search paths for mesh and FAR archive scanning."""
-    global MESH_SEARCH_PATHS, FAR_ARCHIVE_PATHS
     data = request.json or {}
     mesh_dirs = data.get('mesh_dirs')
     far_archives = data.get('far_archives')
     # Accept both string and list
-    if mesh_dirs:
-        if isinstance(mesh_dirs, str):
-            mesh_dirs = [mesh_dirs]
+    if isinstance(mesh_dirs, str):
+        mesh_dirs = [mesh_dirs]
+    if isinstance(far_archives, str):
+        far_archives = [far_archives]
+    apply_search_config((mesh_dirs or [str(p) for p in MESH_SEARCH_PATHS],
+                         far_archives or [str(p) for p in FAR_ARCHIVE_PATHS]), refresh=True)
+    return jsonify({'success': True, 'mesh_dirs': [str(p) for p in MESH_SEARCH_PATHS], 'far_archives': [str(p) for p in FAR_ARCHIVE_PATHS]})
+
+def search_config() -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """Current (mesh dirs, FAR archives), passed along with export jobs."""
+    return tuple(str(p) for p in MESH_SEARCH_PATHS), tuple(str(p) for p in FAR_ARCHIVE_PATHS)
+
+def apply_search_config(config, refresh: bool = False, scan: bool = True) -> None:
+    """
+    Set the search paths (in this process) and update the name index if they
+    changed, or if refresh is set (rescans containers whose files changed).
+    With scan=False the index is reloaded from the file the server saved.
+    """
+    global MESH_SEARCH_PATHS, FAR_ARCHIVE_PATHS, _name_index_configured
+    mesh_dirs, far_archives = config
+    with _config_lock:
+        if (_name_index_configured and not refresh
+                and search_config() == (tuple(mesh_dirs), tuple(far_archives))):
+            return
         MESH_SEARCH_PATHS = [Path(p) for p in mesh_dirs]
-    if far_archives:
-        if isinstance(far_archives, str):
-            far_archives = [far_archives]
         FAR_ARCHIVE_PATHS = [Path(p) for p in far_archives]
-    return jsonify({'success': True, 'mesh_dirs': [str(p) for p in MESH_SEARCH_PATHS], 'far_archives': [str(p) for p in FAR_ARCHIVE_PATHS]})
+        _name_index.configure(MESH_SEARCH_PATHS, FAR_ARCHIVE_PATHS,
+                              skeleton_dirs=[SKELETON_PATH], skeleton_fars=[ANIMATION_FAR],
+                              scan=scan)
+        _name_index_configured = True
 
 # Cache loaded FAR archives
 _far_cache: dict[str, FAR1Archive] = {}
+_far_lock = threading.Lock()
 
 def get_far_archive(path: Path) -> FAR1Archive | None:
     """Get a cached FAR archive or load it."""
     path_str = str(path)
-    if path_str not in _far_cache:
-        if path.exists():
-            try:
-                _far_cache[path_str] = FAR1Archive(path_str)
-            except Exception as e:
-                print(f"Failed to load FAR archive {path}: {e}")
+    far = _far_cache.get(path_str)
+    if far is not None:
+        return far
+    with _far_lock:
+        if path_str not in _far_cache:
+            if path.exists():
+                try:
+                    _far_cache[path_str] = FAR1Archive(path_str)
+                except Exception as e:
+                    print(f"Failed to load FAR archive {path}: {e}")
+                    return None
+            else:
                 return None
-        else:
-            return None
-    return _far_cache.get(path_str)
+        return _far_cache.get(path_str)
+
+# Cache decoded sprite frames and their PNGs across requests
+_sprite_cache = SpriteCache()
+
+# glTF exports keyed by their input bytes, options and EXPORTER_VERSION;
+# shared on disk by all export workers. Trim with `python export_cache.py`.
+EXPORT_CACHE_MAX_BYTES = DEFAULT_MAX_BYTES
+_export_cache = ExportCache(EXPORT_DIR / "cache", max_bytes=EXPORT_CACHE_MAX_BYTES)
 
 # Skeleton paths
 SKELETON_PATH = GAME_ROOT / "GameData" / "Skins"
 ANIMATION_FAR = GAME_ROOT / "GameData" / "Animation" / "Animation.far"
 
+# Mesh/texture/skeleton names across the search paths, persisted between runs
+# and rebuilt for changed containers when /api/config changes the paths
+_name_index = AssetNameIndex(Path(__file__).parent / "asset_name_index.json")
+_name_index_configured = False
+_config_lock = threading.Lock()
+
+
+def get_name_index() -> AssetNameIndex:
+    """Get the asset name index, building it from the current search paths on first use."""
+    if not _name_index_configured:
+        apply_search_config(search_config())
+    return _name_index
+
+
+def apply_job_config(config) -> None:
+    """
+    Switch an export worker process to the search paths a job was submitted with.
+
+    Workers load the name index the server saved (and reload it after the
+    server rescans) instead of scanning containers themselves. Thread
+    workers share the server's globals, which /api/config keeps current, so
+    this does nothing there: a job queued before a config change must not
+    put the old paths back.
+    """
+    if multiprocessing.parent_process() is not None:
+        apply_search_config(config, scan=False)
+        _name_index.reload()
+
+
+def warm_up_worker(config) -> int:
+    """Export pool warm-up job: import this module and set up the name index."""
+    apply_job_config(config)
+    return os.getpid()
+
+
+# CPU-heavy exports run in a bounded worker pool; identical in-flight
+# requests share one job. Sized from the command line in __main__.
+EXPORT_TIMEOUT = 300  # Seconds a request waits for its job
+_export_jobs = ExportJobPool()
+_latencies = EndpointLatencies()
+
+
+@app.before_request
+def _start_request_timer():
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+def _record_request_latency(response):
+    start = g.pop('request_start', None)
+    if start is not None and request.endpoint:
+        _latencies.observe(request.endpoint, time.perf_counter() - start)
+    return response
+
+
+def run_export_job(endpoint: str, job, data: dict):
+    """
+    Run job(data, search_config()) in the export pool and build the response.
+
+    Jobs return (body, status). Requests with the same endpoint, body and
+    search paths while one is running wait for that job instead of starting
+    another.
+    """
+    config = search_config()
+    key = (endpoint, json.dumps(data, sort_keys=True, default=str), config)
+    try:
+        future = _export_jobs.submit(key, run_counted, job, data, config, on_done=_add_cache_counts)
+        body, status, _ = future.result(timeout=EXPORT_TIMEOUT)
+    except PoolBusy as e:
+        return jsonify({'success': False, 'error': str(e)}), 503
+    except FutureTimeoutError:
+        return jsonify({'success': False, 'error': f'Export still running after {EXPORT_TIMEOUT}s'}), 504
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({'error': str(e), 'traceback': traceback.format_exc()}), 500
+    return jsonify(body), status
+
+
+def run_counted(job, data: dict, config) -> tuple[dict, int, tuple[int, int, int]]:
+    """
+    Run job(data, config), also returning the export cache (hits, misses,
+    evictions) it caused in a worker process, for the server's stats.
+    """
+    before = _export_cache.counts()
+    body, status = job(data, config)
+    if multiprocessing.parent_process() is None:
+        return body, status, (0, 0, 0)  # Thread worker: counted on the server's cache already
+    return body, status, tuple(after - b for after, b in zip(_export_cache.counts(), before))
+
+
+def _add_cache_counts(future):
+    if not future.cancelled() and future.exception() is None:
+        _export_cache.add_counts(*future.result()[2])
+
+
+def read_asset(location: AssetLocation) -> Path | bytes | None:
+    """Path for loose files, bytes for FAR entries (read straight from the indexed range)."""
+    if not location.in_far:
+        return location.path
+    far = get_far_archive(location.container)
+    if not far:
+        return None
+    entry = FarEntry(location.name, location.length, location.length, location.offset)
+    return far.get_entry_view(entry).tobytes()
+
 
 def find_mesh_file(mesh_name: str) -> tuple[Path | bytes, bool, str] | None:
     """
@@ -127,128 +298,23 @@ def find_mesh_file(mesh_name: str) -> tuple[Path | bytes, bool, str] | None:
     - is_skn: True if SKN format, False if BMF
     - source: Description of where the file was found
     """
-    # Remove any file extension from mesh_name
-    base_name = Path(mesh_name).stem
-    
-    # Clean up mesh name - remove common prefixes/suffixes
-    clean_name = base_name.replace('xskin-', '').replace('-PELVIS-BODY', '').replace('-HEAD-HEAD', '')
-    
-    # 1. First search loose files in directories
-    for search_path in MESH_SEARCH_PATHS:
-        if not search_path.exists():
-            continue
-        
-        # Try exact match first
-        for ext in ['.bmf', '.skn']:
-            exact_path = search_path / f"{base_name}{ext}"
-            if exact_path.exists():
-                return (exact_path, ext == '.skn', f"Loose: {search_path.name}")
-        
-        # Try with xskin- prefix for SKN files (The Sims naming convention)
-        skn_path = search_path / f"xskin-{base_name}-PELVIS-BODY.skn"
-        if skn_path.exists():
-            return (skn_path, True, f"Loose: {search_path.name}")
-        
-        skn_path = search_path / f"xskin-{clean_name}-PELVIS-BODY.skn"
-        if skn_path.exists():
-            return (skn_path, True, f"Loose: {search_path.name}")
-        
-        # Try head mesh pattern
-        head_path = search_path / f"xskin-{base_name}-HEAD-HEAD.skn"
-        if head_path.exists():
-            return (head_path, True, f"Loose: {search_path.name}")
-        
-        head_path = search_path / f"xskin-{clean_name}-HEAD-HEAD.skn"
-        if head_path.exists():
-            return (head_path, True, f"Loose: {search_path.name}")
-        
-        # Case-insensitive pattern search
-        search_patterns = [f"*{base_name}*.*", f"*{clean_name}*.*"]
-        for pattern in search_patterns:
-            for file in search_path.glob(pattern):
-                if file.suffix.lower() in ['.bmf', '.skn']:
-                    return (file, file.suffix.lower() == '.skn', f"Loose: {search_path.name}")
-    
-    # 2. Search FAR archives
-    search_names = [
-        base_name,
-        clean_name,
-        f"xskin-{base_name}-PELVIS-BODY",
-        f"xskin-{clean_name}-PELVIS-BODY",
-        f"xskin-{base_name}-HEAD-HEAD",
-        f"xskin-{clean_name}-HEAD-HEAD",
-    ]
-    
-    for far_path in FAR_ARCHIVE_PATHS:
-        far = get_far_archive(far_path)
-        if not far:
-            continue
-        
-        for entry in far.entries:
-            entry_name = entry.filename.lower()
-            entry_stem = Path(entry.filename).stem.lower()
-            
-            # Check if this entry matches any of our search names
-            for search_name in search_names:
-                if search_name.lower() in entry_name or entry_stem == search_name.lower():
-                    if entry.filename.lower().endswith('.skn') or entry.filename.lower().endswith('.bmf'):
-                        # Extract the file data
-                        data = far.get_entry(entry.filename)
-                        if data:
-                            is_skn = entry.filename.lower().endswith('.skn')
-                            return (data, is_skn, f"FAR: {far_path.name}")
-    
-    return None
+    location = get_name_index().find_mesh(mesh_name)
+    if location is None:
+        return None
+    data = read_asset(location)
+    if not data:
+        return None
+    return (data, location.suffix == '.skn', location.source)
 
 
 def find_skeleton(gender: str = 'adult') -> Path | bytes | None:
     """Find the skeleton BCF file. Returns Path for loose files, bytes for FAR-extracted."""
-    skeleton_names = [
-        "skeleton.cmx.bcf",
-        "adult-skeleton.cmx.bcf", 
-        "skeleton.bcf",
-        "skeleton-adult.bcf",
-    ]
-    
-    # 1. Search loose files first
-    for skel_name in skeleton_names:
-        skel_path = SKELETON_PATH / skel_name
-        if skel_path.exists():
-            return skel_path
-    
-    # Search more broadly in directories
-    for search_path in MESH_SEARCH_PATHS:
-        if search_path.exists():
-            for bcf in search_path.glob("*skeleton*.bcf"):
-                return bcf
-    
-    # 2. Search Animation.far first (this is where skeletons are)
-    if ANIMATION_FAR.exists():
-        far = get_far_archive(ANIMATION_FAR)
-        if far:
-            for entry in far.entries:
-                entry_lower = entry.filename.lower()
-                if 'skeleton' in entry_lower and entry_lower.endswith('.bcf'):
-                    data = far.get_entry(entry.filename)
-                    if data:
-                        print(f"Found skeleton in Animation.far: {entry.filename}")
-                        return data
-    
-    # 3. Search other FAR archives
-    for far_path in FAR_ARCHIVE_PATHS:
-        far = get_far_archive(far_path)
-        if not far:
-            continue
-        
-        for entry in far.entries:
-            entry_lower = entry.filename.lower()
-            if 'skeleton' in entry_lower and entry_lower.endswith('.bcf'):
-                data = far.get_entry(entry.filename)
-                if data:
-                    print(f"Found skeleton in FAR: {far_path.name}/{entry.filename}")
-                    return data
-    
-    return None
+    location = get_name_index().find_skeleton()
+    if location is None:
+        return None
+    if location.in_far:
+        print(f"Found skeleton in FAR: {location.container.name}/{location.name}")
+    return read_asset(location)
 
 
 def find_texture(mesh, search_paths: list[Path]) -> Path | bytes | None:
@@ -256,41 +322,86 @@ def find_texture(mesh, search_paths: list[Path]) -> Path | bytes | None:
     if not hasattr(mesh, 'texture_name') or not mesh.texture_name:
         return None
     
-    tex_name = mesh.texture_name
-    extensions = ['.bmp', '.tga', '.png', '.BMP', '.TGA', '.PNG']
-    
-    # 1. Search loose files first
-    for search_dir in search_paths:
-        if not search_dir.exists():
-            continue
-        for ext in extensions:
-            for name in [tex_name, tex_name.lower(), tex_name.upper()]:
-                tex_path = search_dir / f"{name}{ext}"
-                if tex_path.exists():
-                    return tex_path
-    
-    # 2. Search FAR archives
-    tex_name_lower = tex_name.lower()
-    for far_path in FAR_ARCHIVE_PATHS:
-        far = get_far_archive(far_path)
-        if not far:
-            continue
-        
-        for entry in far.entries:
-            entry_lower = entry.filename.lower()
-            entry_stem = Path(entry.filename).stem.lower()
-            
-            # Check if this is a texture file with matching name
-            if entry_stem == tex_name_lower:
-                if any(entry_lower.endswith(ext.lower()) for ext in extensions):
-                    data = far.get_entry(entry.filename)
-                    if data:
-                        print(f"Found texture in FAR: {far_path.name}/{entry.filename}")
-                        return data
-    
+    location = get_name_index().find_texture(mesh.texture_name, search_paths)
+    if location is None:
+        return None
+    if location.in_far:
+        print(f"Found texture in FAR: {location.container.name}/{location.name}")
+    return read_asset(location)
+
+
+def asset_bytes(path_or_data: Path | bytes | None) -> bytes:
+    """Contents of a found asset (b'' if none), for export cache keys."""
+    if path_or_data is None:
+        return b''
+    if isinstance(path_or_data, bytes):
+        return path_or_data
+    return Path(path_or_data).read_bytes()
+
+
+def load_skeleton(skel_result: Path | bytes | None):
+    """First skeleton of a found BCF, or None."""
+    if not skel_result:
+        return None
+    try:
+        bcf_reader = BCFReader()
+        if isinstance(skel_result, bytes):
+            bcf = bcf_reader.read_bytes(skel_result)
+        else:
+            bcf = bcf_reader.read_file(str(skel_result))
+        if bcf and bcf.skeletons:
+            return bcf.skeletons[0]
+    except Exception as e:
+        print(f"Warning: Could not load skeleton: {e}")
     return None
 
 
+def export_gltf_cached(mesh, mesh_data: Path | bytes, skel_result: Path | bytes | None,
+                       texture_path: Path | bytes | None, options: dict,
+                       binary: bool = False) -> tuple[CachedExport, bool]:
+    """
+    Export a parsed mesh to glTF (or GLB if binary) through the export cache.
+
+    The key covers the mesh, skeleton and texture bytes, the texture file
+    name (written into the glTF image), options, output format and
+    EXPORTER_VERSION; on a hit the skeleton is not parsed and the glTF is
+    not rebuilt. Returns (cache entry, was_cached).
+    """
+    suffix = '.glb' if binary else '.gltf'
+    texture_name = Path(texture_path).name if isinstance(texture_path, (str, Path)) else None
+    key = export_key(asset_bytes(mesh_data), asset_bytes(skel_result), asset_bytes(texture_path),
+                     {**options, 'binary': binary, 'texture': texture_name}, EXPORTER_VERSION)
+    entry = _export_cache.get(key, suffix)
+    if entry is not None:
+        return entry, True
+
+    skeleton = load_skeleton(skel_result)
+    tmp_path = _export_cache.temp_path(suffix)
+    try:
+        GLTFExporter().export(
+            mesh=mesh,
+            skeleton=skeleton,
+            filepath=str(tmp_path),
+            texture_path=str(texture_path) if texture_path else None,
+            binary=binary
+        )
+        entry = _export_cache.put(key, tmp_path, {'has_skeleton': skeleton is not None})
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return entry, False
+
+
+def publish_export(entry: CachedExport, output_name: str):
+    """Expose a cached export as EXPORT_DIR/output_name (hard link, else copy)."""
+    output_path = EXPORT_DIR / output_name
+    tmp_path = output_path.with_name(f".{output_name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        os.link(entry.path, tmp_path)
+    except OSError:
+        shutil.copyfile(entry.path, tmp_path)
+    os.replace(tmp_path, output_path)
+
+
 # === API Endpoints ===
 
 @app.route('/')
@@ -308,25 +419,50 @@ def serve_export(filename):
     return send_from_directory(str(EXPORT_DIR), filename)
 
 
+EXPORT_MIMETYPES = {'gltf': 'model/gltf+json', 'glb': 'model/gltf-binary'}
+
+
+@app.route('/exports/cache/<key>.<ext>')
+def serve_cached_export(key, ext):
+    """Serve a cached export by content key; the key is its (immutable) ETag."""
+    valid = ext in EXPORT_MIMETYPES and re.fullmatch(r'[0-9a-f]{40}', key)
+    entry = _export_cache.get(key, f'.{ext}') if valid else None
+    if entry is None:
+        return jsonify({'error': f'Export not cached: {key}.{ext}'}), 404
+    if request.if_none_match.contains(entry.etag):
+        response = app.response_class(status=304)
+    else:
+        response = send_file(str(entry.path), mimetype=EXPORT_MIMETYPES[ext], conditional=False)
+    response.set_etag(entry.etag)
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
+
 @app.route('/api/export/mesh', methods=['POST'])
 def export_mesh():
     """Export a mesh to glTF format."""
+    return run_export_job('export_mesh', export_mesh_job, request.json or {})
+
+
+def export_mesh_job(data: dict, config) -> tuple[dict, int]:
+    """Export job for /api/export/mesh (runs in the export pool). Returns (body, status)."""
     try:
-        data = request.json
+        apply_job_config(config)
         mesh_name = data.get('mesh_name')
         include_skeleton = data.get('include_skeleton', True)
+        binary = bool(data.get('binary', False))  # Single-file GLB instead of glTF
         
         if not mesh_name:
-            return jsonify({'error': 'mesh_name required'}), 400
+            return {'error': 'mesh_name required'}, 400
         
         # Find the mesh file
         result = find_mesh_file(mesh_name)
         if not result:
-            return jsonify({
+            return {
                 'error': f'Mesh file not found: {mesh_name}',
                 'searched': [str(p) for p in MESH_SEARCH_PATHS if p.exists()],
                 'far_archives': [str(p) for p in FAR_ARCHIVE_PATHS if p.exists()]
-            }), 404
+            }, 404
         
         path_or_data, is_skn, source = result
         
@@ -340,7 +476,7 @@ def export_mesh():
             else:
                 mesh = reader.read_file(str(path_or_data))
             if not mesh:
-                return jsonify({'error': f'Failed to read SKN from {source}'}), 500
+                return {'error': f'Failed to read SKN from {source}'}, 500
         else:
             reader = BMFReader()
             if isinstance(path_or_data, bytes):
@@ -349,68 +485,55 @@ def export_mesh():
             else:
                 mesh = reader.read_file(str(path_or_data))
             if not mesh:
-                return jsonify({'error': f'Failed to read BMF from {source}'}), 500
-        
-        # Find and load skeleton
-        skeleton = None
-        if include_skeleton:
-            skel_result = find_skeleton()
-            if skel_result:
-                try:
-                    bcf_reader = BCFReader()
-                    if isinstance(skel_result, bytes):
-                        bcf = bcf_reader.read_bytes(skel_result)
-                    else:
-                        bcf = bcf_reader.read_file(str(skel_result))
-                    if bcf and bcf.skeletons:
-                        skeleton = bcf.skeletons[0]
-                except Exception as e:
-                    print(f"Warning: Could not load skeleton: {e}")
+                return {'error': f'Failed to read BMF from {source}'}, 500
         
-        # Find texture
+        # Find skeleton and texture (the skeleton is only parsed on a cache miss)
+        skel_result = find_skeleton() if include_skeleton else None
         texture_path = find_texture(mesh, MESH_SEARCH_PATHS)
-        
-        # Export to glTF
-        output_name = f"{mesh_name}.gltf"
-        output_path = EXPORT_DIR / output_name
-        
-        exporter = GLTFExporter()
-        exporter.export(
-            mesh=mesh,
-            skeleton=skeleton,
-            filepath=str(output_path),
-            texture_path=str(texture_path) if texture_path else None
-        )
-        
-        return jsonify({
+
+        # Export to glTF, or reuse an identical earlier export
+        entry, cached = export_gltf_cached(mesh, path_or_data, skel_result, texture_path,
+                                           {'format': 'skn' if is_skn else 'bmf'}, binary)
+        output_name = f"{mesh_name}{entry.path.suffix}"
+        publish_export(entry, output_name)
+
+        return {
             'success': True,
             'mesh_name': mesh_name,
             'output_file': output_name,
-            'output_url': f'/exports/{output_name}',
+            'output_url': f'/exports/cache/{entry.key}{entry.path.suffix}',
+            'cache_key': entry.key,
+            'cached': cached,
             'source': source,
-            'has_skeleton': skeleton is not None,
+            'has_skeleton': entry.meta.get('has_skeleton', False),
             'has_texture': texture_path is not None,
             'format': 'skn' if is_skn else 'bmf',
             'vertices': mesh.vertex_count if hasattr(mesh, 'vertex_count') else 0,
             'faces': mesh.face_count if hasattr(mesh, 'face_count') else 0
-        })
+        }, 200
         
     except Exception as e:
         traceback.print_exc()
-        return jsonify({'error': str(e), 'traceback': traceback.format_exc()}), 500
+        return {'error': str(e), 'traceback': traceback.format_exc()}, 500
 
 
 @app.route('/api/export/character', methods=['POST'])
 def export_character():
     """Export a character (body + head) to glTF format."""
+    return run_export_job('export_character', export_character_job, request.json or {})
+
+
+def export_character_job(data: dict, config) -> tuple[dict, int]:
+    """Export job for /api/export/character (runs in the export pool). Returns (body, status)."""
     try:
-        data = request.json
+        apply_job_config(config)
         char_name = data.get('name')
         body_mesh = data.get('body_mesh')
         head_mesh = data.get('head_mesh')
+        binary = bool(data.get('binary', False))  # Single-file GLB instead of glTF
         
         if not char_name:
-            return jsonify({'error': 'name required'}), 400
+            return {'error': 'name required'}, 400
         
         exported_parts = []
         
@@ -429,7 +552,24 @@ def export_character():
                     return reader.read_bytes(path_or_data), source
                 else:
                     return reader.read_file(str(path_or_data)), source
-        
+
+        # Helper function to export one part through the export cache
+        def export_part(result, mesh, part: str, skel_result) -> dict:
+            path_or_data, is_skn, source = result
+            texture_path = find_texture(mesh, MESH_SEARCH_PATHS)
+            entry, cached = export_gltf_cached(mesh, path_or_data, skel_result, texture_path,
+                                               {'format': 'skn' if is_skn else 'bmf'}, binary)
+            output_name = f"{char_name}_{part}{entry.path.suffix}"
+            publish_export(entry, output_name)
+            return {
+                'type': part,
+                'file': output_name,
+                'url': f'/exports/cache/{entry.key}{entry.path.suffix}',
+                'cache_key': entry.key,
+                'cached': cached,
+                'source': source
+            }
+
         # Export body mesh
         if body_mesh:
             result = find_mesh_file(body_mesh)
@@ -437,40 +577,9 @@ def export_character():
                 mesh, source = read_mesh_from_result(result)
                 
                 if mesh:
-                    output_name = f"{char_name}_body.gltf"
-                    output_path = EXPORT_DIR / output_name
-                    
-                    # Load skeleton for body
-                    skeleton = None
-                    skel_result = find_skeleton()
-                    if skel_result:
-                        try:
-                            bcf_reader = BCFReader()
-                            if isinstance(skel_result, bytes):
-                                bcf = bcf_reader.read_bytes(skel_result)
-                            else:
-                                bcf = bcf_reader.read_file(str(skel_result))
-                            if bcf and bcf.skeletons:
-                                skeleton = bcf.skeletons[0]
-                        except:
-                            pass
-                    
-                    texture_path = find_texture(mesh, MESH_SEARCH_PATHS)
-                    
-                    exporter = GLTFExporter()
-                    exporter.export(
-                        mesh=mesh,
-                        skeleton=skeleton,
-                        filepath=str(output_path),
-                        texture_path=str(texture_path) if texture_path else None
-                    )
-                    exported_parts.append({
-                        'type': 'body',
-                        'file': output_name,
-                        'url': f'/exports/{output_name}',
-                        'source': source
-                    })
-        
+                    # Body uses the skeleton
+                    exported_parts.append(export_part(result, mesh, 'body', find_skeleton()))
+
         # Export head mesh  
         if head_mesh:
             result = find_mesh_file(head_mesh)
@@ -478,48 +587,32 @@ def export_character():
                 mesh, source = read_mesh_from_result(result)
                 
                 if mesh:
-                    output_name = f"{char_name}_head.gltf"
-                    output_path = EXPORT_DIR / output_name
-                    
-                    texture_path = find_texture(mesh, MESH_SEARCH_PATHS)
-                    
-                    exporter = GLTFExporter()
-                    exporter.export(
-                        mesh=mesh,
-                        skeleton=None,  # Heads typically don't have full skeletons
-                        filepath=str(output_path),
-                        texture_path=str(texture_path) if texture_path else None
-                    )
-                    exported_parts.append({
-                        'type': 'head',
-                        'file': output_name,
-                        'url': f'/exports/{output_name}',
-                        'source': source
-                    })
-        
+                    # Heads typically don't have full skeletons
+                    exported_parts.append(export_part(result, mesh, 'head', None))
+
         if not exported_parts:
-            return jsonify({
+            return {
                 'error': 'No meshes could be exported',
                 'body_mesh': body_mesh,
                 'head_mesh': head_mesh
-            }), 404
+            }, 404
         
-        return jsonify({
+        return {
             'success': True,
             'character': char_name,
             'exports': exported_parts
-        })
+        }, 200
         
     except Exception as e:
         traceback.print_exc()
-        return jsonify({'error': str(e), 'traceback': traceback.format_exc()}), 500
+        return {'error': str(e), 'traceback': traceback.format_exc()}, 500
 
 
 @app.route('/api/list/exports')
 def list_exports():
-    """List all exported glTF files."""
+    """List all exported glTF and GLB files."""
     exports = []
-    for f in EXPORT_DIR.glob("*.gltf"):
+    for f in sorted([*EXPORT_DIR.glob("*.gltf"), *EXPORT_DIR.glob("*.glb")]):
         exports.append({
             'name': f.stem,
             'file': f.name,
@@ -559,37 +652,76 @@ def status():
         'export_dir': str(EXPORT_DIR),
         'search_paths': [{'path': str(p), 'exists': p.exists()} for p in MESH_SEARCH_PATHS],
         'far_archives': far_info,
-        'cached_archives': len(_far_cache)
+        'cached_archives': len(_far_cache),
+        'sprite_cache': _sprite_cache.stats(),
+        'asset_name_index': _name_index.stats(),
+        'export_jobs': _export_jobs.stats(),
+        'export_cache': _export_cache.stats()
     })
 
 
+@app.route('/api/metrics')
+def metrics():
+    """Per-endpoint latency histograms and export pool counters."""
+    return jsonify({
+        'latency': _latencies.snapshot(),
+        'export_jobs': _export_jobs.stats(),
+        'export_cache': _export_cache.stats()
+    })
+
+
+@app.route('/api/export/cache/gc', methods=['POST'])
+def export_cache_gc():
+    """Trim the export cache to max_mb (default: EXPORT_CACHE_MAX_BYTES)."""
+    data = request.json or {}
+    max_mb = data.get('max_mb')
+    max_bytes = int(float(max_mb) * 1024 * 1024) if max_mb is not None else None
+    return jsonify({'success': True, **_export_cache.gc(max_bytes)})
+
+
 # ============================================================
 # Object/Sprite API Endpoints
 # ============================================================
 
-def load_iff_file(source_file: str, source_archive: str) -> 'IffFile':
-    """Load an IFF file from disk or FAR archive."""
+def load_iff_source(source_file: str, source_archive: str) -> tuple['IffFile | None', str]:
+    """
+    Load an IFF file from disk or FAR archive.
+    
+    Returns (iff_file, content_hash); iff_file is None if it could not be
+    found. The hash identifies the file contents for the sprite cache.
+    """
     from formats.iff.iff_file import IffFile
     
+    data = None
     if source_archive:
         # Load from FAR archive
         far_path = Path(source_archive)
         far = get_far_archive(far_path)
         if far:
             data = far.get_entry(source_file)
-            if data:
-                return IffFile.from_bytes(data, source_file)
     else:
         # Load from disk
         iff_path = GAME_ROOT / source_file
         if iff_path.exists():
-            return IffFile(str(iff_path))
+            data = iff_path.read_bytes()
     
-    return None
+    if not data:
+        return None, ''
+    return IffFile.from_bytes(data, source_file, lazy=True), content_hash(data)
+
 
+def load_iff_file(source_file: str, source_archive: str) -> 'IffFile':
+    """Load an IFF file from disk or FAR archive."""
+    return load_iff_source(source_file, source_archive)[0]
 
-def extract_object_sprites(iff_file, guid: int) -> dict:
-    """Extract all sprites for an object from an IFF file."""
+
+def extract_object_sprites(iff_file, guid: int, source_hash: str = '') -> dict:
+    """
+    Extract all sprites for an object from an IFF file.
+    
+    If source_hash (the IFF content hash) is given, decoded frames and their
+    PNGs are served from and stored in the shared sprite cache.
+    """
     from formats.iff.chunks.sprite_export import SPR2Decoder, export_sprite_png
     from formats.iff.chunks.spr import SPR2
     from formats.iff.chunks.palt import PALT
@@ -601,20 +733,20 @@ def extract_object_sprites(iff_file, guid: int) -> dict:
     sprites = {}
     
     # Find the OBJD for this GUID
+    # (lookups by type code so a lazily loaded IFF only parses what it needs)
     objd = None
-    for chunk in iff_file.chunks:
-        if getattr(chunk, 'chunk_type', '') == 'OBJD':
-            if hasattr(chunk, 'guid') and chunk.guid == guid:
-                objd = chunk
-                break
+    for chunk in iff_file.get_by_type_code('OBJD'):
+        if hasattr(chunk, 'guid') and chunk.guid == guid:
+            objd = chunk
+            break
     
     if not objd:
         return sprites
     
     # Get the DGRP for this object (base_graphic_id)
     dgrp = None
-    for chunk in iff_file.chunks:
-        if getattr(chunk, 'chunk_type', '') == 'DGRP' and chunk.chunk_id == objd.base_graphic_id:
+    for chunk in iff_file.get_by_type_code('DGRP'):
+        if chunk.chunk_id == objd.base_graphic_id:
             dgrp = chunk
             break
     
@@ -622,17 +754,13 @@ def extract_object_sprites(iff_file, guid: int) -> dict:
         return sprites
     
     # Find palette
-    palt = None
-    for chunk in iff_file.chunks:
-        if getattr(chunk, 'chunk_type', '') == 'PALT':
-            palt = chunk
-            break
+    palettes = iff_file.get_by_type_code('PALT')
+    palt = palettes[0] if palettes else None
+    
+    palt_id = palt.chunk_id if palt else -1
     
-    # Find SPR2 chunks
-    spr2_map = {}
-    for chunk in iff_file.chunks:
-        if getattr(chunk, 'chunk_type', '') == 'SPR2':
-            spr2_map[chunk.chunk_id] = chunk
+    # Find SPR2 chunks (only parsed on a cache miss)
+    spr2_map = None
     
     # Decode each DGRP image
     # Direction flags to names: 0x01=RightBack(SW), 0x04=RightFront(SE), 0x10=LeftFront(NE), 0x40=LeftBack(NW)
@@ -652,14 +780,23 @@ def extract_object_sprites(iff_file, guid: int) -> dict:
         # Get sprite from DGRP image
         if img.sprites:
             sprite_ref = img.sprites[0]  # Primary sprite
-            spr2 = spr2_map.get(sprite_ref.sprite_id)
-            if spr2 and sprite_ref.sprite_frame_index < len(spr2.frames):
-                frame = spr2.frames[sprite_ref.sprite_frame_index]
-                decoded = decoder.decode_frame(frame, palt)
-                if decoded:
-                    # Convert to base64 PNG
-                    png_data = sprite_to_png_bytes(decoded)
-                    sprites[key] = f"data:image/png;base64,{base64.b64encode(png_data).decode('ascii')}"
+            cache_key = (source_hash, sprite_ref.sprite_id, sprite_ref.sprite_frame_index, palt_id)
+            cached = _sprite_cache.get(cache_key) if source_hash else None
+            
+            if cached is None:
+                if spr2_map is None:
+                    spr2_map = {chunk.chunk_id: chunk for chunk in iff_file.get_by_type_code('SPR2')}
+                spr2 = spr2_map.get(sprite_ref.sprite_id)
+                if spr2 and sprite_ref.sprite_frame_index < len(spr2.frames):
+                    frame = spr2.frames[sprite_ref.sprite_frame_index]
+                    decoded = decoder.decode_frame(frame, palt)
+                    if decoded:
+                        png_data = sprite_to_png_bytes(decoded)
+                        if source_hash:
+                            _sprite_cache.put(cache_key, decoded, png_data)
+                        sprites[key] = f"data:image/png;base64,{base64.b64encode(png_data).decode('ascii')}"
+            else:
+                sprites[key] = f"data:image/png;base64,{base64.b64encode(cached.png).decode('ascii')}"
     
     return sprites
 
@@ -739,13 +876,13 @@ def get_object_sprites():
             return jsonify({'success': False, 'error': 'Invalid GUID format', 'debug': debug_log}), 400
         
         # Load IFF file
-        iff_file = load_iff_file(source_file, source_archive)
+        iff_file, source_hash = load_iff_source(source_file, source_archive)
         if not iff_file:
             debug_log.append(f"Could not load IFF: {source_file}")
             return jsonify({'success': False, 'error': f'Could not load IFF: {source_file}', 'debug': debug_log}), 404
         
         # Extract sprites (primary lookup)
-        sprites = extract_object_sprites(iff_file, guid)
+        sprites = extract_object_sprites(iff_file, guid, source_hash)
         debug_log.append(f"Tried extract_object_sprites with GUID {guid}: {len(sprites)} sprites found")
         
         if sprites:
@@ -759,26 +896,40 @@ def get_object_sprites():
             })
         
         # Fallback: try to find object by name or partial match
-        # Load objects.json for suggestions
         suggestions = []
-        try:
-            objects_file = DATA_DIR / 'objects.json'
-            if not objects_file.exists():
-                objects_file = Path(__file__).parent / 'objects.json'
-            if objects_file.exists():
-                with open(objects_file, 'r') as f:
-                    objects = json.load(f)
-                # Try to find by name or partial match
-                for obj in objects:
-                    if str(obj.get('guid', '')).lower() == str(guid_raw).lower() or str(obj.get('guid_hex', '')).lower() == str(guid_raw).lower():
-                        suggestions.append(obj)
-                    elif source_file and obj.get('source_file', '') == source_file:
-                        suggestions.append(obj)
-                    elif guid_raw.lower() in (obj.get('name', '') or '').lower():
-                        suggestions.append(obj)
+        index = get_asset_index()
+        if index:
+            # Indexed lookups in the asset database
+            try:
+                matches = index.find_by_guid(guid)
+                if source_file:
+                    matches += index.find_objects(source_file=source_file, limit=5)
+                if isinstance(guid_raw, str):
+                    matches += index.find_objects(name_contains=guid_raw, limit=5)
+                suggestions = [asdict(obj) for obj in matches]
                 debug_log.append(f"Suggestions found: {len(suggestions)}")
-        except Exception as e:
-            debug_log.append(f"Failed to load objects.json for suggestions: {e}")
+            except Exception as e:
+                debug_log.append(f"Failed to query asset database for suggestions: {e}")
+        else:
+            # Load objects.json for suggestions
+            try:
+                objects_file = DATA_DIR / 'objects.json'
+                if not objects_file.exists():
+                    objects_file = Path(__file__).parent / 'objects.json'
+                if objects_file.exists():
+                    with open(objects_file, 'r') as f:
+                        objects = json.load(f)
+                    # Try to find by name or partial match
+                    for obj in objects:
+                        if str(obj.get('guid', '')).lower() == str(guid_raw).lower() or str(obj.get('guid_hex', '')).lower() == str(guid_raw).lower():
+                            suggestions.append(obj)
+                        elif source_file and obj.get('source_file', '') == source_file:
+                            suggestions.append(obj)
+                        elif guid_raw.lower() in (obj.get('name', '') or '').lower():
+                            suggestions.append(obj)
+                    debug_log.append(f"Suggestions found: {len(suggestions)}")
+            except Exception as e:
+                debug_log.append(f"Failed to load objects.json for suggestions: {e}")
         
         return jsonify({
             'success': False,
@@ -807,11 +958,11 @@ def export_sprites_zip():
             return jsonify({'success': False, 'error': 'No GUID provided'}), 400
         
         # Load and extract sprites
-        iff_file = load_iff_file(source_file, source_archive)
+        iff_file, source_hash = load_iff_source(source_file, source_archive)
         if not iff_file:
             return jsonify({'success': False, 'error': f'Could not load IFF'}), 404
         
-        sprites = extract_object_sprites(iff_file, guid)
+        sprites = extract_object_sprites(iff_file, guid, source_hash)
         
         # Create ZIP in memory
         zip_buffer = io.BytesIO()
@@ -842,41 +993,86 @@ def export_sprites_zip():
 @app.route('/api/export/sprites/sheet', methods=['POST'])
 def export_sprite_sheet():
     """Export object sprites as a sprite sheet."""
+    data = request.get_json() or {}
+    if not data.get('guid'):
+        return jsonify({'success': False, 'error': 'No GUID provided'}), 400
+    
+    # Not implemented yet, so answer before loading anything in the pool
+    # TODO: Implement proper sprite sheet with PIL
+    return jsonify({
+        'success': False, 
+        'error': 'Sprite sheet export requires PIL. Use ZIP export instead.'
+    }), 501
+
+
+@app.route('/api/objects/<guid_str>', methods=['GET'])
+def get_objects_by_guid(guid_str):
+    """Look up objects by GUID (hex with 0x prefix, or decimal) in the asset database."""
+    index = get_asset_index()
+    if not index:
+        return jsonify({'success': False, 'error': 'Asset database not built'}), 404
     try:
-        data = request.get_json()
-        guid = data.get('guid')
-        source_file = data.get('source_file', '')
-        source_archive = data.get('source_archive', '')
-        
-        if not guid:
-            return jsonify({'success': False, 'error': 'No GUID provided'}), 400
-        
-        # Load and extract sprites
-        iff_file = load_iff_file(source_file, source_archive)
-        if not iff_file:
-            return jsonify({'success': False, 'error': f'Could not load IFF'}), 404
-        
-        sprites = extract_object_sprites(iff_file, guid)
-        
-        if not sprites:
-            return jsonify({'success': False, 'error': 'No sprites found'}), 404
-        
-        # For now, just return the ZIP (sprite sheet requires PIL)
-        # TODO: Implement proper sprite sheet with PIL
-        return jsonify({
-            'success': False, 
-            'error': 'Sprite sheet export requires PIL. Use ZIP export instead.'
-        }), 501
-        
-    except Exception as e:
-        traceback.print_exc()
-        return jsonify({'success': False, 'error': str(e)}), 500
+        guid = int(guid_str, 16) if guid_str.lower().startswith('0x') else int(guid_str)
+    except ValueError:
+        return jsonify({'success': False, 'error': f'Invalid GUID: {guid_str}'}), 400
+    objects = index.find_by_guid(guid)
+    return jsonify({
+        'success': bool(objects),
+        'guid': guid,
+        'objects': [asdict(obj) for obj in objects],
+        'count': len(objects)
+    }), 200 if objects else 404
+
+
+@app.route('/api/meshes', methods=['GET'])
+def find_meshes():
+    """
+    Query meshes in the asset database.
+    
+    Query args: prefix, type, age, gender, body_type, source_file, limit, offset
+    """
+    index = get_asset_index()
+    if not index:
+        return jsonify({'success': False, 'error': 'Asset database not built'}), 404
+    args = request.args
+    meshes = index.find_meshes(
+        prefix=args.get('prefix'),
+        mesh_type=args.get('type'),
+        age=args.get('age'),
+        gender=args.get('gender'),
+        body_type=args.get('body_type'),
+        source_file=args.get('source_file'),
+        limit=args.get('limit', type=int),
+        offset=args.get('offset', 0, type=int),
+    )
+    return jsonify({
+        'success': True,
+        'meshes': [asdict(mesh) for mesh in meshes],
+        'count': len(meshes)
+    })
 
 
 @app.route('/api/list/objects', methods=['GET'])
 def list_objects():
-    """List all scanned objects from objects.json."""
+    """
+    List scanned objects, from the asset database if built, else objects.json.
+    
+    With the database, ?limit=N&offset=M pages through the objects.
+    """
     try:
+        index = get_asset_index()
+        if index:
+            limit = request.args.get('limit', type=int)
+            offset = request.args.get('offset', 0, type=int)
+            objects = index.find_objects(limit=limit, offset=offset)
+            return jsonify({
+                'success': True,
+                'objects': [asdict(obj) for obj in objects],
+                'count': len(objects),
+                'total': index.count_objects(),
+                'source': 'database'
+            })
+        
         objects_file = DATA_DIR / 'objects.json'
         if not objects_file.exists():
             # Try webviewer directory
@@ -902,6 +1098,14 @@ def list_objects():
 
 
 if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description="SimObliterator export server")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Export worker count (default: CPUs - 1)")
+    parser.add_argument('--threads', action='store_true',
+                        help="Run exports in threads instead of worker processes")
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("SimObliterator Export Server")
     print("=" * 60)
@@ -916,8 +1120,16 @@ if __name__ == '__main__':
         exists = "✓" if p.exists() else "✗"
         print(f"  [{exists}] {p}")
     print()
+    stats = get_name_index().stats()
+    print(f"Asset name index: {stats['meshes']:,} meshes, {stats['textures']:,} textures, "
+          f"{stats['skeletons']:,} skeletons ({stats['scans']} containers scanned)")
+    # Workers start after the index is saved, so they load it instead of scanning
+    _export_jobs = ExportJobPool(max_workers=args.workers, processes=not args.threads)
+    _export_jobs.start(warm_up_worker, search_config())
+    jobs = _export_jobs.stats()
+    print(f"Export pool: {jobs['workers']} {jobs['mode']} workers")
     print("Server starting at http://localhost:5000")
     print("Open http://localhost:5000/library_browser.html")
     print("=" * 60)
     
-    app.run(host='0.0.0.0', port=5000, debug=True, use_reloader=False)
+    app.run(host='0.0.0.0', port=5000, debug=True, use_reloader=False, threaded=True)
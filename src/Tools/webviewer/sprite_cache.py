@@ -0,0 +1,137 @@
+"""
+Sprite Cache - Bounded LRU cache of decoded SPR2 frames and their PNG bytes.
+
+Entries are keyed by (content hash of the source IFF, SPR2 chunk ID, frame
+index, palette ID), so a frame is decoded and encoded once no matter which
+request, archive or copy of the IFF asks for it. The cache is accounted in
+bytes (RGBA + z-buffer + PNG) and evicts least recently used entries once
+the budget is exceeded.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Optional, Tuple
+
+if TYPE_CHECKING:
+    from formats.iff.chunks.sprite_export import DecodedSprite
+
+
+# (source content hash, SPR2 chunk ID, frame index, PALT chunk ID or -1)
+SpriteKey = Tuple[str, int, int, int]
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def content_hash(data: bytes) -> str:
+    """Hash IFF file contents for use in a SpriteKey."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+@dataclass
+class CachedSprite:
+    """A decoded sprite together with its encoded PNG."""
+    sprite: 'DecodedSprite'
+    png: bytes
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by this entry."""
+        zbuf = self.sprite.zbuffer_data
+        return len(self.sprite.rgba_data) + (len(zbuf) if zbuf else 0) + len(self.png)
+
+
+class SpriteCache:
+    """
+    Thread-safe LRU cache of CachedSprite entries with a byte budget.
+
+    Usage:
+        cache = SpriteCache(max_bytes=32 * 1024 * 1024)
+        entry = cache.get_or_decode(key, lambda: decoder.decode_frame(frame, palt),
+                                    sprite_to_png_bytes)
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[SpriteKey, CachedSprite]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: SpriteKey) -> Optional[CachedSprite]:
+        """Look up an entry, marking it most recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: SpriteKey, sprite: 'DecodedSprite', png: bytes) -> CachedSprite:
+        """
+        Store an entry and evict old ones until the cache fits its budget.
+
+        Entries larger than the whole budget are returned but not stored.
+        """
+        entry = CachedSprite(sprite, png)
+        size = entry.nbytes
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old.nbytes
+            if size > self.max_bytes:
+                return entry
+            self._entries[key] = entry
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.total_bytes -= evicted.nbytes
+                self.evictions += 1
+        return entry
+
+    def get_or_decode(self, key: SpriteKey,
+                      decode: Callable[[], Optional['DecodedSprite']],
+                      encode: Callable[['DecodedSprite'], bytes]) -> Optional[CachedSprite]:
+        """
+        Return the cached entry for key, decoding and encoding it on a miss.
+
+        Frames that fail to decode (decode returns None) are not cached.
+        """
+        entry = self.get(key)
+        if entry is not None:
+            return entry
+        sprite = decode()
+        if sprite is None:
+            return None
+        return self.put(key, sprite, encode(sprite))
+
+    def clear(self):
+        """Drop all entries (statistics are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self) -> dict:
+        """Hit/miss and size statistics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: SpriteKey) -> bool:
+        return key in self._entries
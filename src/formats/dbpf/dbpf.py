@@ -21,15 +21,17 @@ Structure:
 """
 
 from dataclasses import dataclass
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Set, Tuple
 from enum import IntEnum
 from io import BytesIO, IOBase
 
 try:
     from utils.binary import IoBuffer, ByteOrder
+    from utils import refpack
 except ImportError:
     # Fallback for relative imports
     from utils.binary import IoBuffer, ByteOrder
+    from utils import refpack
 
 
 class DBPFTypeID(IntEnum):
@@ -69,6 +71,9 @@ class DBPFTypeID(IntEnum):
     # Other
     GLOB = 0xC0C0C028  # Global reference
     TREE = 0xC0C0C029  # Tree structure
+    
+    # Archive metadata
+    DIR = 0xE86B1EEF   # Compression directory (which resources are compressed)
 
 
 class DBPFGroupID(IntEnum):
@@ -118,6 +123,7 @@ class DBPFFile:
         self._entries_list: List[DBPFEntry] = []
         self._entries_by_id: Dict[int, DBPFEntry] = {}
         self._entries_by_type: Dict[int, List[DBPFEntry]] = {}
+        self._compressed: Set[Tuple[int, int, int]] = set()  # (type, group, instance) listed in DIR
         self._io_buffer: Optional[IoBuffer] = None
         
         if path:
@@ -135,6 +141,7 @@ class DBPFFile:
         self._entries_by_id = {}
         self._entries_list = []
         self._entries_by_type = {}
+        self._compressed = set()
         
         # Create IO buffer
         io = IoBuffer.from_stream(stream, ByteOrder.LITTLE_ENDIAN)
@@ -189,13 +196,10 @@ class DBPFFile:
         # Seek to index and read entries
         io.seek(index_offset)
         
-        for _ in range(self._num_entries):
-            entry = DBPFEntry()
-            entry.type_id = io.read_uint32()
-            entry.group_id = io.read_uint32()
-            entry.instance_id = io.read_uint32()
-            entry.file_offset = io.read_uint32()
-            entry.file_size = io.read_uint32()
+        # Index is a flat table of 20-byte records, unpacked in one pass
+        for type_id, group_id, instance_id, file_offset, file_size in \
+                io.iter_records('<IIIII', self._num_entries):
+            entry = DBPFEntry(type_id, group_id, instance_id, file_offset, file_size)
             
             self._entries_list.append(entry)
             
@@ -208,22 +212,46 @@ class DBPFFile:
                 self._entries_by_type[entry.type_id] = []
             
             self._entries_by_type[entry.type_id].append(entry)
+        
+        # Compression directory: (type, group, instance, uncompressed size)
+        for directory in self._entries_by_type.get(DBPFTypeID.DIR, []):
+            view = io.view_at(directory.file_offset, directory.file_size)
+            for type_id, group_id, instance_id, _ in IoBuffer(view).iter_records('<IIII', len(view) // 16):
+                self._compressed.add((type_id, group_id, instance_id))
+    
+    def is_compressed(self, entry: DBPFEntry) -> bool:
+        """Whether the archive's compression directory (DIR) lists this entry."""
+        return (entry.type_id, entry.group_id, entry.instance_id) in self._compressed
     
-    def get_entry(self, entry: DBPFEntry) -> bytes:
+    def get_entry(self, entry: DBPFEntry, decompress: bool = False) -> bytes:
         """
         Get data for a DBPF entry
         
+        With decompress, entries the compression directory lists as
+        compressed (a 4-byte compressed size equal to the entry size,
+        followed by a RefPack stream) are decompressed.
+        
         Args:
             entry: DBPFEntry to retrieve
+            decompress: Decompress entries listed in the DIR resource
             
         Returns:
-            Raw data bytes
+            Data bytes (raw as stored unless decompressed)
         """
         if not self._io_buffer:
             raise RuntimeError("No file loaded")
         
-        self._io_buffer.seek(entry.file_offset)
-        return self._io_buffer.read_bytes(entry.file_size)
+        data = self._io_buffer.view_at(entry.file_offset, entry.file_size)
+        if (decompress and self.is_compressed(entry) and len(data) >= 4
+                and int.from_bytes(data[:4], 'little') == entry.file_size):
+            return refpack.decompress(data[4:])
+        return data.tobytes()
+    
+    @staticmethod
+    def compress_entry(data: bytes) -> bytes:
+        """Encode entry data as a compressed DBPF resource (size + RefPack)."""
+        stream = refpack.compress(data)
+        return (len(stream) + 4).to_bytes(4, 'little') + stream
     
     def get_entry_by_id(self, entry_id: int) -> bytes:
         """
@@ -272,6 +300,7 @@ class DBPFFile:
     def close(self) -> None:
         """Close the DBPF file"""
         if self._io_buffer:
+            self._io_buffer.close()
             self._io_buffer = None
 
 
@@ -34,6 +34,10 @@ class FAR1Archive:
     - Manifest at offset:
       - Num files (4 bytes)
       - Entries...
+    
+    The archive is memory-mapped once and kept open; entry lookups go through
+    a filename dict and reads slice only the entry's bytes. Call close() (or
+    use the archive as a context manager) to release the mapping.
     """
     
     MAGIC = b"FAR!byAZ"
@@ -50,44 +54,64 @@ class FAR1Archive:
         self.path = path
         self.v1b = v1b
         self._entries: list[FarEntry] = []
+        self._by_name: dict[str, FarEntry] = {}
+        self._by_lower_name: dict[str, FarEntry] = {}
         self._manifest_offset: int = 0
+        self._io: Optional[IoBuffer] = None
         
         self._read_manifest()
     
     def _read_manifest(self):
-        """Read the archive manifest."""
-        with open(self.path, 'rb') as f:
-            data = f.read()
-        
-        io = IoBuffer.from_bytes(data, ByteOrder.LITTLE_ENDIAN)
-        
-        # Read header
-        magic = io.read_bytes(8)
-        if magic != self.MAGIC:
-            raise ValueError(f"Invalid FAR header: {magic}")
-        
-        version = io.read_uint32()
-        if version != 1:
-            raise ValueError(f"Unsupported FAR version: {version}")
-        
-        # Read manifest offset and seek to it
-        self._manifest_offset = io.read_uint32()
-        io.seek(self._manifest_offset)
-        
-        # Read entries
-        num_files = io.read_uint32()
-        
-        for _ in range(num_files):
-            entry = FarEntry()
-            entry.data_length = io.read_int32()
-            entry.data_length2 = io.read_int32()
-            entry.data_offset = io.read_int32()
+        """Read the archive manifest and build the filename index."""
+        io = IoBuffer.from_file(self.path, ByteOrder.LITTLE_ENDIAN)
+        try:
+            # Read header
+            magic = io.read_bytes(8)
+            if magic != self.MAGIC:
+                raise ValueError(f"Invalid FAR header: {magic}")
+            
+            version = io.read_uint32()
+            if version != 1:
+                raise ValueError(f"Unsupported FAR version: {version}")
+            
+            # Read manifest offset and seek to it
+            self._manifest_offset = io.read_uint32()
+            io.seek(self._manifest_offset)
+            
+            # Read entries
+            num_files = io.read_uint32()
             
             # Filename length differs between v1a and v1b
-            filename_length = io.read_int16() if self.v1b else io.read_int32()
-            entry.filename = io.read_cstring(filename_length, trim_null=False)
+            record_fmt = '<iiih' if self.v1b else '<iiii'
             
-            self._entries.append(entry)
+            for _ in range(num_files):
+                entry = FarEntry()
+                (entry.data_length, entry.data_length2,
+                 entry.data_offset, filename_length) = io.unpack(record_fmt)
+                entry.filename = io.read_cstring(filename_length, trim_null=False)
+                
+                self._entries.append(entry)
+                # First entry wins on duplicate names, as with the old linear scan
+                self._by_name.setdefault(entry.filename, entry)
+                self._by_lower_name.setdefault(entry.filename.lower(), entry)
+        except Exception:
+            io.close()
+            raise
+        
+        # Keep the mapping open for entry reads
+        self._io = io
+    
+    def close(self):
+        """Release the archive's file mapping."""
+        if self._io is not None:
+            self._io.close()
+            self._io = None
+    
+    def __enter__(self) -> 'FAR1Archive':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
     
     @property
     def entries(self) -> list[FarEntry]:
@@ -104,12 +128,18 @@ class FAR1Archive:
         """Offset to the manifest in the archive."""
         return self._manifest_offset
     
-    def get_entry(self, filename: str) -> Optional[bytes]:
+    def find_entry(self, filename: str, ignore_case: bool = False) -> Optional[FarEntry]:
+        """Look up an entry by filename in O(1)."""
+        if ignore_case:
+            return self._by_lower_name.get(filename.lower())
+        return self._by_name.get(filename)
+    
+    def get_entry(self, filename: str, ignore_case: bool = False) -> Optional[bytes]:
         """Get file data by filename."""
-        for entry in self._entries:
-            if entry.filename == filename:
-                return self._read_entry_data(entry)
-        return None
+        entry = self.find_entry(filename, ignore_case)
+        if entry is None:
+            return None
+        return self._read_entry_data(entry)
     
     def get_entry_by_index(self, index: int) -> Optional[bytes]:
         """Get file data by index."""
@@ -117,14 +147,21 @@ class FAR1Archive:
             return self._read_entry_data(self._entries[index])
         return None
     
+    def get_entry_view(self, entry: FarEntry) -> memoryview:
+        """Zero-copy view of an entry's data (valid until close())."""
+        if self._io is None:
+            # Reopen after close(); the index is still valid
+            self._io = IoBuffer.from_file(self.path, ByteOrder.LITTLE_ENDIAN)
+        return self._io.view_at(entry.data_offset, entry.data_length)
+    
     def _read_entry_data(self, entry: FarEntry) -> bytes:
-        """Read raw data for an entry."""
-        with open(self.path, 'rb') as f:
-            data = f.read()
-        
-        io = IoBuffer.from_bytes(data, ByteOrder.LITTLE_ENDIAN)
-        io.seek(entry.data_offset)
-        return io.read_bytes(entry.data_length)
+        """Read raw data for an entry (copies only that entry's bytes)."""
+        return self.get_entry_view(entry).tobytes()
+    
+    def iter_entries(self) -> Iterator[tuple[FarEntry, memoryview]]:
+        """Stream (entry, data view) pairs in manifest order without copying."""
+        for entry in self._entries:
+            yield entry, self.get_entry_view(entry)
     
     def extract(self, filename: str, output_path: str) -> bool:
         """Extract a single file to disk."""
@@ -142,8 +179,7 @@ class FAR1Archive:
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
         
-        for entry in self._entries:
-            data = self._read_entry_data(entry)
+        for entry, data in self.iter_entries():
             file_path = output_path / entry.filename
             file_path.parent.mkdir(parents=True, exist_ok=True)
             with open(file_path, 'wb') as f:
@@ -160,7 +196,7 @@ class FAR1Archive:
         return len(self._entries)
     
     def __contains__(self, filename: str) -> bool:
-        return any(e.filename == filename for e in self._entries)
+        return filename in self._by_name
     
     def summary(self) -> str:
         """Get a summary of the archive."""
@@ -20,9 +20,9 @@ Structure:
 
 from dataclasses import dataclass
 from typing import Optional, Dict, List
-from io import BytesIO
 
 from utils.binary import IoBuffer, ByteOrder
+from utils import refpack
 
 
 @dataclass
@@ -54,17 +54,16 @@ class FAR3Decompresser:
     Based on: RefPack specification (wiki.niotso.org/RefPack)
     Original: DBPF4J (sc4dbpf4j.cvs.sourceforge.net)
     
-    Compression format: Alternating literal and copy tokens
-    - Literal: Uncompressed bytes (0-3 at a time)
-    - Copy: Reference to previous data (LZ77-style)
+    Thin wrapper over utils.refpack, which holds the codec shared with DBPF.
+    Set decompressed_size when the caller has already read the RefPack
+    header; otherwise decompress() expects the header at the start of data.
     """
     
-    def __init__(self):
-        self.compressed_size: int = 0
-        self.decompressed_size: int = 0
+    def __init__(self, compressed_size: int = 0, decompressed_size: int = 0):
+        self.compressed_size: int = compressed_size
+        self.decompressed_size: int = decompressed_size
     
-    @staticmethod
-    def decompress(data: bytes) -> bytes:
+    def decompress(self, data: bytes) -> bytes:
         """
         Decompress RefPack compressed data
         
@@ -77,75 +76,12 @@ class FAR3Decompresser:
         Raises:
             ValueError: If decompression fails or data is malformed
         """
-        if len(data) < 9:
-            raise ValueError("Compressed data too small")
-        
-        # RefPack header format:
-        # Bytes 0-3: Compression header (0xFB10 followed by size info)
-        # Bytes 4-8: Decompressed size (24-bit big-endian in specific format)
-        
-        output = bytearray()
-        io = IoBuffer(BytesIO(data))
-        
-        # Skip first 9 bytes (header info already read by caller)
-        io.seek(9)
-        
-        decompressed_size = 0
-        while io.position < len(data) and len(output) < decompressed_size or decompressed_size == 0:
-            cc = io.read_byte()  # Control code
-            
-            # Upper 2 bits determine operation type
-            op_type = (cc & 0xC0) >> 6
-            
-            if op_type == 0x00:
-                # 0b00: Literal block (1-4 bytes)
-                num_literals = (cc & 0x03) + 1
-                for _ in range(num_literals):
-                    if io.position < len(data):
-                        output.append(io.read_byte())
-            
-            elif op_type == 0x01:
-                # 0b01: 2-byte copy (copy from earlier in output)
-                next_byte = io.read_byte()
-                copy_length = (cc & 0x03) + 3
-                copy_offset = ((cc & 0x0C) << 6) | next_byte
-                copy_offset = copy_offset + 1
-                
-                # Copy bytes from earlier position
-                src_pos = len(output) - copy_offset
-                for _ in range(copy_length):
-                    if 0 <= src_pos < len(output):
-                        output.append(output[src_pos])
-                        src_pos += 1
-            
-            elif op_type == 0x02:
-                # 0b10: 3-byte copy with longer range
-                byte2 = io.read_byte()
-                byte3 = io.read_byte()
-                
-                copy_length = (cc & 0x03) + 3
-                copy_offset = ((cc & 0x3C) << 8) | (byte2 << 8) | byte3
-                copy_offset = copy_offset + 1
-                
-                # Copy bytes from earlier position
-                src_pos = len(output) - copy_offset
-                for _ in range(copy_length):
-                    if 0 <= src_pos < len(output):
-                        output.append(output[src_pos])
-                        src_pos += 1
-            
-            elif op_type == 0x03:
-                # 0b11: End of block or special handling
-                if cc == 0xFF:
-                    break  # End of compressed data
-                else:
-                    # Extended literal block
-                    num_literals = (cc & 0x3F) + 4
-                    for _ in range(num_literals):
-                        if io.position < len(data):
-                            output.append(io.read_byte())
-        
-        return bytes(output)
+        return refpack.decompress(data, self.decompressed_size or None)
+    
+    @staticmethod
+    def compress(data: bytes) -> bytes:
+        """Compress data to a RefPack stream (with header)."""
+        return refpack.compress(data)
 
 
 class FAR3Archive:
@@ -165,6 +101,9 @@ class FAR3Archive:
     VERSION = 3
     COMPRESSION_ID = 0xFB10
     
+    # Manifest entry: sizes, type, offset, flags, name length, TypeID, FileID
+    _ENTRY_RECORD = '<IHBBIBBHII'
+    
     def __init__(self, path: Optional[str] = None):
         """
         Open a FAR3 archive
@@ -210,42 +149,8 @@ class FAR3Archive:
         # Seek to manifest
         io.seek(manifest_offset)
         
-        # Read number of files
-        num_files = io.read_uint32()
-        
-        # Read each entry
-        for _ in range(num_files):
-            entry = Far3Entry()
-            
-            # Read entry structure (aligned to specific offsets)
-            entry.decompressed_file_size = io.read_uint32()
-            
-            # Compressed size is stored as 3 bytes (24-bit)
-            byte0 = io.read_byte()
-            byte1 = io.read_byte()
-            byte2 = io.read_byte()
-            entry.compressed_file_size = (byte0 << 0) | (byte1 << 8) | (byte2 << 16)
-            
-            entry.data_type = io.read_byte()
-            entry.data_offset = io.read_uint32()
-            entry.is_compressed = io.read_byte()
-            entry.access_number = io.read_byte()
-            entry.filename_length = io.read_uint16()
-            entry.type_id = io.read_uint32()
-            entry.file_id = io.read_uint32()
-            
-            # Read filename
-            if entry.filename_length > 0:
-                entry.filename = io.read_cstring(entry.filename_length, trim_null=False)
-            else:
-                entry.filename = ""
-            
-            # Store in lookup tables
-            if entry.filename and entry.filename not in self._entries_by_filename:
-                self._entries_by_filename[entry.filename] = entry
-            
-            self._entries_list.append(entry)
-            self._entries_by_id[entry.file_id] = entry
+        # Read entries
+        self._read_entries(io)
         
         # Keep io_buffer for later data retrieval
         self._io_buffer = io
@@ -268,42 +173,36 @@ class FAR3Archive:
             # Seek to manifest
             io.seek(self._manifest_offset)
             
-            # Read number of files
-            num_files = io.read_uint32()
+            # Read entries
+            self._read_entries(io)
+    
+    def _read_entries(self, io: IoBuffer) -> None:
+        """Read the manifest entry table at the current position."""
+        num_files = io.read_uint32()
+        
+        for _ in range(num_files):
+            entry = Far3Entry()
             
-            # Read each entry
-            for _ in range(num_files):
-                entry = Far3Entry()
-                
-                # Read entry structure (aligned to specific offsets)
-                entry.decompressed_file_size = io.read_uint32()
-                
-                # Compressed size is stored as 3 bytes (24-bit)
-                byte0 = io.read_byte()
-                byte1 = io.read_byte()
-                byte2 = io.read_byte()
-                entry.compressed_file_size = (byte0 << 0) | (byte1 << 8) | (byte2 << 16)
-                
-                entry.data_type = io.read_byte()
-                entry.data_offset = io.read_uint32()
-                entry.is_compressed = io.read_byte()
-                entry.access_number = io.read_byte()
-                entry.filename_length = io.read_uint16()
-                entry.type_id = io.read_uint32()
-                entry.file_id = io.read_uint32()
-                
-                # Read filename
-                if entry.filename_length > 0:
-                    entry.filename = io.read_cstring(entry.filename_length, trim_null=False)
-                else:
-                    entry.filename = ""
-                
-                # Store in lookup tables
-                if entry.filename and entry.filename not in self._entries_by_filename:
-                    self._entries_by_filename[entry.filename] = entry
-                
-                self._entries_list.append(entry)
-                self._entries_by_id[entry.file_id] = entry
+            # Fixed 24-byte record; compressed size is a 24-bit value split
+            # into its low 16 bits and high 8 bits
+            (entry.decompressed_file_size, size_lo, size_hi,
+             entry.data_type, entry.data_offset, entry.is_compressed,
+             entry.access_number, entry.filename_length,
+             entry.type_id, entry.file_id) = io.unpack(self._ENTRY_RECORD)
+            entry.compressed_file_size = size_lo | (size_hi << 16)
+            
+            # Read filename
+            if entry.filename_length > 0:
+                entry.filename = io.read_cstring(entry.filename_length, trim_null=False)
+            else:
+                entry.filename = ""
+            
+            # Store in lookup tables
+            if entry.filename and entry.filename not in self._entries_by_filename:
+                self._entries_by_filename[entry.filename] = entry
+            
+            self._entries_list.append(entry)
+            self._entries_by_id[entry.file_id] = entry
     
     def get_entry(self, entry: Far3Entry) -> bytes:
         """
@@ -329,17 +228,13 @@ class FAR3Archive:
                 
                 if compression_id == self.COMPRESSION_ID:
                     # RefPack compression
-                    # Read 3-byte decompressed size indicator
-                    byte0 = io.read_byte()
-                    byte1 = io.read_byte()
-                    byte2 = io.read_byte()
+                    # Read 3-byte decompressed size indicator (big-endian)
+                    byte0, byte1, byte2 = io.read_array('B', 3)
                     decompressed_size = (byte0 << 0x10) | (byte1 << 0x08) | byte2
                     
-                    # Read compressed data
-                    compressed_data = io.read_bytes(int(file_size))
-                    
-                    # Decompress
-                    decompressor = FAR3Decompresser()
+                    # Decompress straight from the mapped file
+                    compressed_data = io.read_view(int(file_size))
+                    decompressor = FAR3Decompresser(file_size, decompressed_size)
                     return decompressor.decompress(compressed_data)
                 else:
                     # Unknown compression format, try uncompressed fallback
@@ -83,7 +83,7 @@ class UnknownChunk(IffChunk):
     
     def read(self, iff: 'IffFile', stream: 'IoBuffer'):
         # Just store raw data
-        self.raw_data = stream.read_bytes(stream.stream.read())
+        self.raw_data = stream.read_bytes(stream.remaining())
     
     def write(self, iff: 'IffFile', stream) -> bool:
         stream.write_bytes(self.raw_data)
@@ -66,6 +66,7 @@ from .pers import pers
 
 # Phase 15-18: BHAV Decompiler - Full decompiler/editor for behavior scripts
 from .bhav_decompiler import BHAVDecompiler, BHAVValidator, decompile_bhav
+from .bhav_cache import DecompilationCache, get_cache, set_cache
 from .bhav_formatter import BHAVFormatter, CodeStyle, format_bhav
 from .bhav_graph import analyze_bhav_flow, visualize_bhav_ascii
 from .bhav_analysis import lint_bhav, analyze_bhav
@@ -131,6 +132,7 @@ __all__ = [
     'XXXX', 'TMPL', 'CATS', 'pers',
     # BHAV Decompiler (Phase 15-18)
     'BHAVDecompiler', 'BHAVValidator', 'decompile_bhav',
+    'DecompilationCache', 'get_cache', 'set_cache',
     'BHAVFormatter', 'CodeStyle', 'format_bhav',
     'analyze_bhav_flow', 'visualize_bhav_ascii',
     'lint_bhav', 'analyze_bhav',
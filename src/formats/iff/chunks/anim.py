@@ -408,10 +408,10 @@ class ANIM:
 # Register chunk
 @register_chunk('ANIM')
 class ANIMChunk(ANIM):
-    \"\"\"ANIM chunk registered with IFF parser.\"\"\"
+    """ANIM chunk registered with IFF parser."""
     
     def write(self, iff=None, io=None) -> bool:
-        \"\"\"Write ANIM chunk through IFF interface.\"\"\"
+        """Write ANIM chunk through IFF interface."""
         if io is None:
             # Call parent bytes-returning write
             return super().write()
@@ -0,0 +1,201 @@
+"""
+BHAV Decompilation Cache - Process-wide memo of decompiled/disassembled BHAVs
+
+Panels, validators, analyzers and call-graph builders all ask for the same
+BHAVs. Results are keyed by (kind, hash of the BHAV's bytes): the raw chunk
+bytes for BHAVDecompiler, the encoded instruction stream for
+BHAVDisassembler. The kind carries the producer's version, so bumping
+DECOMPILER_VERSION or DISASSEMBLER_VERSION invalidates old entries.
+
+The cache holds pickled results: an LRU in memory bounded by entry count,
+optionally backed by a SQLite file so a later run starts warm. Every lookup
+unpickles a fresh copy, so callers may modify what they get back.
+
+Usage:
+    set_cache(DecompilationCache(max_entries=8192, path="bhav_cache.db"))
+    ast = BHAVDecompiler().decompile(data)     # Hits the cache on repeat
+    get_cache().stats()
+"""
+
+import hashlib
+import pickle
+import sqlite3
+import struct
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Optional, Tuple, Union
+
+
+# (kind including producer version, BHAV byte hash)
+CacheKey = Tuple[str, bytes]
+
+DEFAULT_MAX_ENTRIES = 4096
+WRITE_BATCH = 256
+
+_MISSING = object()
+
+
+def bhav_digest(data: bytes) -> bytes:
+    """Hash BHAV bytes for use in a CacheKey."""
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def instruction_digest(bhav) -> bytes:
+    """Hash a parsed BHAV's instruction stream (opcode, pointers, operand)."""
+    digest = hashlib.blake2b(digest_size=16)
+    for inst in bhav.instructions:
+        digest.update(struct.pack('<HBB', inst.opcode, inst.true_pointer, inst.false_pointer))
+        digest.update(bytes(inst.operand).ljust(8, b'\0'))
+    return digest.digest()
+
+
+class DecompilationCache:
+    """
+    Thread-safe LRU cache of pickled decompilation results, optionally persisted.
+
+    A cached None is a real result (e.g. undecodable data) and is returned
+    as such; get() distinguishes it from a miss with its default argument.
+    Results that cannot be pickled are not cached.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 path: Optional[Union[str, Path]] = None):
+        """
+        Args:
+            max_entries: In-memory entry limit
+            path: Optional SQLite file backing the cache across runs
+        """
+        self.max_entries = max_entries
+        self.path = Path(path) if path is not None else None
+        self._entries: 'OrderedDict[CacheKey, bytes]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._pending = []
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._conn = None
+        if self.path is not None:
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('''CREATE TABLE IF NOT EXISTS decompiled (
+                kind TEXT NOT NULL,
+                digest BLOB NOT NULL,
+                data BLOB NOT NULL,
+                PRIMARY KEY (kind, digest)
+            ) WITHOUT ROWID''')
+            self._conn.commit()
+
+    def get(self, key: CacheKey, default: Any = None) -> Any:
+        """Look up an entry (memory, then disk), marking it most recently used."""
+        with self._lock:
+            blob = self._entries.get(key)
+            if blob is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return pickle.loads(blob)
+            if self._conn is not None:
+                row = self._conn.execute('SELECT data FROM decompiled WHERE kind = ? AND digest = ?',
+                                         key).fetchone()
+                if row is not None:
+                    try:
+                        value = pickle.loads(row[0])
+                    except Exception:
+                        value = _MISSING  # Stale class layout; rebuild
+                    if value is not _MISSING:
+                        self._store(key, bytes(row[0]))
+                        self.disk_hits += 1
+                        return value
+            self.misses += 1
+            return default
+
+    def put(self, key: CacheKey, value: Any) -> Any:
+        """Store an entry, evicting the least recently used beyond max_entries."""
+        try:
+            blob = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return value  # Unpicklable results are not cached
+        with self._lock:
+            self._store(key, blob)
+            if self._conn is not None:
+                self._pending.append((key[0], key[1], blob))
+                if len(self._pending) >= WRITE_BATCH:
+                    self._flush()
+        return value
+
+    def _store(self, key: CacheKey, blob: bytes):
+        self._entries[key] = blob
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_build(self, key: CacheKey, build: Callable[[], Any]) -> Any:
+        """Return the cached entry for key, building and storing it on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = self.put(key, build())
+        return value
+
+    def _flush(self):
+        if self._pending:
+            with self._conn:
+                self._conn.executemany('INSERT OR REPLACE INTO decompiled VALUES (?, ?, ?)',
+                                       self._pending)
+            self._pending = []
+
+    def flush(self):
+        """Write pending entries to disk."""
+        with self._lock:
+            if self._conn is not None:
+                self._flush()
+
+    def close(self):
+        """Flush and close the backing file (the memory cache stays usable)."""
+        with self._lock:
+            if self._conn is not None:
+                self._flush()
+                self._conn.close()
+                self._conn = None
+
+    def clear(self):
+        """Drop all in-memory entries (statistics and the disk cache are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss statistics."""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: CacheKey) -> bool:
+        return key in self._entries
+
+
+_cache = DecompilationCache()
+
+
+def get_cache() -> DecompilationCache:
+    """The process-wide cache used by BHAVDecompiler and BHAVDisassembler."""
+    return _cache
+
+
+def set_cache(cache: DecompilationCache) -> DecompilationCache:
+    """Replace the process-wide cache (e.g. with a persistent one). Returns the old one."""
+    global _cache
+    old, _cache = _cache, cache
+    return old
@@ -11,9 +11,10 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Set, Optional, Tuple
 from enum import Enum
 import logging
-from collections import defaultdict
+from collections import defaultdict, deque
 
 from simobliterator.formats.iff.chunks.bhav_package_decompiler import PackageAST, BHAVCall, CallType
+from simobliterator.formats.iff.chunks.bhav_reachability import ReachabilityIndex
 
 logger = logging.getLogger(__name__)
 
@@ -71,33 +72,49 @@ class BHAVCrossReference:
         # Populate caller/callee relationships
         for caller_id, calls in self.package.call_graph.items():
             for call in calls:
-                callee_id = call.callee_id
-                
-                # Add to cross-ref index
-                if caller_id in self.xref:
-                    if callee_id not in self.xref[caller_id].callees:
-                        self.xref[caller_id].callees[callee_id] = []
-                    
-                    site = CallSite(
-                        instruction_index=call.instruction_indices[0] if call.instruction_indices else -1,
-                        operand_data=call.operand_data,
-                        call_type=call.call_type
-                    )
-                    self.xref[caller_id].callees[callee_id].append(site)
-                
-                if callee_id in self.xref:
-                    if caller_id not in self.xref[callee_id].callers:
-                        self.xref[callee_id].callers[caller_id] = []
-                    
-                    site = CallSite(
-                        instruction_index=call.instruction_indices[0] if call.instruction_indices else -1,
-                        operand_data=call.operand_data,
-                        call_type=call.call_type
-                    )
-                    self.xref[callee_id].callers[caller_id].append(site)
-                
-                # Add to call matrix
-                self.call_matrix[(caller_id, callee_id)] = [site]
+                self._add_call(caller_id, call)
+        
+        self.reachability = ReachabilityIndex(
+            {bhav_id: entry.callees.keys() for bhav_id, entry in self.xref.items()})
+    
+    def _add_call(self, caller_id: int, call: BHAVCall) -> None:
+        """Record one call in the cross-ref index and call matrix."""
+        callee_id = call.callee_id
+        site = CallSite(
+            instruction_index=call.instruction_indices[0] if call.instruction_indices else -1,
+            operand_data=call.operand_data,
+            call_type=call.call_type
+        )
+        
+        if caller_id in self.xref:
+            self.xref[caller_id].callees.setdefault(callee_id, []).append(site)
+        if callee_id in self.xref:
+            self.xref[callee_id].callers.setdefault(caller_id, []).append(site)
+        
+        self.call_matrix[(caller_id, callee_id)] = [site]
+    
+    def update_calls(self, bhav_id: int, calls: List[BHAVCall]) -> None:
+        """
+        Replace the calls made by one BHAV (e.g. after it is edited).
+        
+        Only this BHAV's entries are touched; the reachability index is
+        updated incrementally where possible.
+        
+        Args:
+            bhav_id: Edited BHAV ID
+            calls: Its new outgoing calls
+        """
+        entry = self.xref.setdefault(bhav_id, CrossRefEntry(bhav_id))
+        for callee_id in entry.callees:
+            if callee_id in self.xref:
+                self.xref[callee_id].callers.pop(bhav_id, None)
+            self.call_matrix.pop((bhav_id, callee_id), None)
+        entry.callees = {}
+        
+        self.package.call_graph[bhav_id] = list(calls)
+        for call in calls:
+            self._add_call(bhav_id, call)
+        self.reachability.set_callees(bhav_id, entry.callees.keys())
     
     # Query Methods
     
@@ -150,17 +167,20 @@ class BHAVCrossReference:
         """
         if caller_id == callee_id:
             return 0
+        if not self.reachability.has_path(caller_id, callee_id):
+            return None
         
+        # A path exists; only expand BHAVs that can still reach the target
         visited = {caller_id}
-        queue = [(caller_id, 0)]
+        queue = deque([(caller_id, 0)])
         
         while queue:
-            current_id, depth = queue.pop(0)
+            current_id, depth = queue.popleft()
             
             for next_id in self.direct_callees_of(current_id):
                 if next_id == callee_id:
                     return depth + 1
-                if next_id not in visited:
+                if next_id not in visited and self.reachability.has_path(next_id, callee_id):
                     visited.add(next_id)
                     queue.append((next_id, depth + 1))
         
@@ -168,11 +188,11 @@ class BHAVCrossReference:
     
     def has_path(self, caller_id: int, callee_id: int) -> bool:
         """Check if there is a call path from caller to callee."""
-        return self.call_depth(caller_id, callee_id) is not None
+        return caller_id == callee_id or self.reachability.has_path(caller_id, callee_id)
     
     def is_recursive(self, bhav_id: int) -> bool:
         """Check if BHAV can eventually call itself."""
-        return self.has_path(bhav_id, bhav_id)
+        return self.reachability.is_recursive(bhav_id)
     
     def get_all_descendants(self, bhav_id: int) -> Set[int]:
         """
@@ -184,20 +204,7 @@ class BHAVCrossReference:
         Returns:
             Set of all reachable BHAV IDs
         """
-        descendants = set()
-        visited = {bhav_id}
-        queue = [bhav_id]
-        
-        while queue:
-            current_id = queue.pop(0)
-            
-            for callee_id in self.direct_callees_of(current_id):
-                if callee_id not in visited:
-                    descendants.add(callee_id)
-                    visited.add(callee_id)
-                    queue.append(callee_id)
-        
-        return descendants
+        return self.reachability.descendants(bhav_id)
     
     def get_all_ancestors(self, bhav_id: int) -> Set[int]:
         """
@@ -209,20 +216,7 @@ class BHAVCrossReference:
         Returns:
             Set of all reaching BHAV IDs
         """
-        ancestors = set()
-        visited = {bhav_id}
-        queue = [bhav_id]
-        
-        while queue:
-            current_id = queue.pop(0)
-            
-            for caller_id in self.direct_callers_of(current_id):
-                if caller_id not in visited:
-                    ancestors.add(caller_id)
-                    visited.add(caller_id)
-                    queue.append(caller_id)
-        
-        return ancestors
+        return self.reachability.ancestors(bhav_id)
     
     # Analysis Methods
     
@@ -13,6 +13,9 @@ The decompiler handles:
 - Operand decoding for all primitive types
 - Branch pointer resolution
 - CFG construction for analysis
+
+Results are memoized process-wide by a hash of the BHAV bytes (see
+bhav_cache), so decompiling the same BHAV again is a lookup.
 """
 
 from typing import Dict, List, Optional, Tuple
@@ -24,19 +27,25 @@ from .bhav_ast import (
     VariableRef, BasicBlock, ControlFlowGraph
 )
 from .bhav_operands import decode_operand
+from .bhav_cache import bhav_digest, get_cache
 from .primitive_registry import (
     PRIMITIVE_REGISTRY, get_primitive_info, is_routine_call
 )
 
 
+# Bump when decompiler output changes to invalidate cached ASTs
+DECOMPILER_VERSION = 1
+
+
 class BHAVDecompiler:
     """Main BHAV decompilation engine"""
     
-    def __init__(self):
+    def __init__(self, use_cache: bool = True):
         self.instructions: List[Instruction] = []
         self.arg_count = 0
         self.local_count = 0
         self.source_bhav = None
+        self.use_cache = use_cache
         
     def decompile(self, bhav_data: bytes, group_id: int = 0, 
                   bhav_id: int = 0) -> Optional[BehaviorAST]:
@@ -51,6 +60,23 @@ class BHAVDecompiler:
         Returns:
             BehaviorAST if successful, None on error
         """
+        if not self.use_cache or not isinstance(bhav_data, (bytes, bytearray, memoryview)):
+            return self._decompile(bhav_data, group_id, bhav_id)
+        
+        key = (f"ast/{DECOMPILER_VERSION}", bhav_digest(bhav_data))
+        ast = get_cache().get_or_build(key, lambda: self._decompile(bhav_data, group_id, bhav_id))
+        if ast is None:
+            return None
+        
+        self.arg_count, self.local_count = ast.args, ast.locals
+        self.instructions = ast.instructions
+        ast.source_bhav = f"{group_id:04X}:{bhav_id:04X}"
+        return ast
+    
+    def _decompile(self, bhav_data: bytes, group_id: int,
+                   bhav_id: int) -> Optional[BehaviorAST]:
+        """Decompile without the cache."""
+        self.instructions = []
         try:
             # Parse BHAV header
             if not self._parse_header(bhav_data):
@@ -0,0 +1,236 @@
+"""BHAV Reachability Index - Precomputed transitive closure of a call graph.
+
+Strongly connected components are computed once (iterative Tarjan) and the
+condensed DAG stores, per component, a bitset (Python int) of every
+component it reaches. Path, recursion, ancestor and descendant queries then
+need no graph traversal:
+
+- has_path / is_recursive: one bit test
+- descendants / ancestors: O(output)
+
+Edits to a single BHAV's calls are applied incrementally when they only add
+edges that create no new cycle; other edits (removed calls, new cycles)
+mark the index stale and it is rebuilt on the next query.
+
+Author: SimObliterator
+License: MIT
+"""
+
+from typing import Dict, Iterable, List, Set
+
+
+class ReachabilityIndex:
+    """Reachability over a directed call graph (caller -> callees)."""
+
+    def __init__(self, graph: Dict[int, Iterable[int]]):
+        """
+        Args:
+            graph: Mapping of BHAV ID to the IDs it calls. Callees that are
+                   not keys are included as nodes without outgoing calls.
+        """
+        self._graph: Dict[int, Set[int]] = {node: set(callees) for node, callees in graph.items()}
+        for callees in list(self._graph.values()):
+            for callee in callees:
+                self._graph.setdefault(callee, set())
+        self._stale = True
+        self._rebuild()
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    def _rebuild(self) -> None:
+        self.component_of: Dict[int, int] = {}
+        self.members: List[List[int]] = []
+        self._tarjan()
+
+        count = len(self.members)
+        self._succ: List[Set[int]] = [set() for _ in range(count)]
+        self._pred: List[Set[int]] = [set() for _ in range(count)]
+        self._cyclic = [len(members) > 1 for members in self.members]
+        for node, callees in self._graph.items():
+            c = self.component_of[node]
+            for callee in callees:
+                d = self.component_of[callee]
+                if c == d:
+                    self._cyclic[c] = True
+                else:
+                    self._succ[c].add(d)
+                    self._pred[d].add(c)
+
+        # Tarjan emits components callees-first, so every successor of
+        # component c has a lower number and is already complete.
+        self._reach = [0] * count
+        for c in range(count):
+            bits = 0
+            for d in self._succ[c]:
+                bits |= self._reach[d] | (1 << d)
+            self._reach[c] = bits
+        self._reached_by = [0] * count
+        for c in range(count - 1, -1, -1):
+            bits = 0
+            for d in self._pred[c]:
+                bits |= self._reached_by[d] | (1 << d)
+            self._reached_by[c] = bits
+        self._stale = False
+
+    def _tarjan(self) -> None:
+        """Iterative Tarjan SCC; numbers components in reverse topological order."""
+        index: Dict[int, int] = {}
+        low: Dict[int, int] = {}
+        on_stack: Set[int] = set()
+        stack: List[int] = []
+        counter = 0
+
+        for root in self._graph:
+            if root in index:
+                continue
+            work = [(root, iter(self._graph[root]))]
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+
+            while work:
+                node, callees = work[-1]
+                descended = False
+                for callee in callees:
+                    if callee not in index:
+                        index[callee] = low[callee] = counter
+                        counter += 1
+                        stack.append(callee)
+                        on_stack.add(callee)
+                        work.append((callee, iter(self._graph[callee])))
+                        descended = True
+                        break
+                    if callee in on_stack:
+                        low[node] = min(low[node], index[callee])
+                if descended:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = len(self.members)
+                    members = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        self.component_of[member] = component
+                        members.append(member)
+                        if member == node:
+                            break
+                    self.members.append(members)
+
+    def _ensure_current(self) -> None:
+        if self._stale:
+            self._rebuild()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def __contains__(self, node: int) -> bool:
+        return node in self._graph
+
+    def callees(self, node: int) -> Set[int]:
+        """Direct callees of node."""
+        return self._graph.get(node, set())
+
+    def has_path(self, source: int, target: int) -> bool:
+        """True if source reaches target through one or more calls."""
+        self._ensure_current()
+        if source not in self.component_of or target not in self.component_of:
+            return False
+        c, d = self.component_of[source], self.component_of[target]
+        if c == d:
+            return self._cyclic[c]
+        return (self._reach[c] >> d) & 1 == 1
+
+    def is_recursive(self, node: int) -> bool:
+        """True if node can eventually call itself."""
+        self._ensure_current()
+        c = self.component_of.get(node)
+        return c is not None and self._cyclic[c]
+
+    def descendants(self, node: int) -> Set[int]:
+        """Every node reachable from node (node itself excluded)."""
+        self._ensure_current()
+        c = self.component_of.get(node)
+        if c is None:
+            return set()
+        return self._expand(self._reach[c], c, node)
+
+    def ancestors(self, node: int) -> Set[int]:
+        """Every node that reaches node (node itself excluded)."""
+        self._ensure_current()
+        c = self.component_of.get(node)
+        if c is None:
+            return set()
+        return self._expand(self._reached_by[c], c, node)
+
+    def _expand(self, bits: int, own: int, node: int) -> Set[int]:
+        """Members of the components in bits, plus node's own cycle mates."""
+        result = set(self.members[own]) if self._cyclic[own] else set()
+        while bits:
+            low_bit = bits & -bits
+            result.update(self.members[low_bit.bit_length() - 1])
+            bits ^= low_bit
+        result.discard(node)
+        return result
+
+    def components(self) -> List[List[int]]:
+        """Strongly connected components with more than one member or a self-call."""
+        self._ensure_current()
+        return [members for c, members in enumerate(self.members) if self._cyclic[c]]
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def set_callees(self, node: int, callees: Iterable[int]) -> None:
+        """
+        Replace node's calls (e.g. after editing one BHAV).
+
+        Added calls that create no new cycle are merged into the existing
+        bitsets; anything else triggers a rebuild on the next query.
+        """
+        new = set(callees)
+        old = self._graph.get(node, set())
+        added, removed = new - old, old - new
+        self._graph[node] = new
+        for callee in added:
+            self._graph.setdefault(callee, set())
+        if self._stale or not added and not removed:
+            return
+        if removed or node not in self.component_of or any(
+                callee not in self.component_of or self.has_path(callee, node)
+                or callee == node for callee in added):
+            self._stale = True
+            return
+
+        c = self.component_of[node]
+        reach = 0
+        for callee in added:
+            d = self.component_of[callee]
+            reach |= self._reach[d] | (1 << d)
+            self._succ[c].add(d)
+            self._pred[d].add(c)
+        # c and everything that reaches c gain the new descendants...
+        for a in [c] + self._bits(self._reached_by[c]):
+            self._reach[a] |= reach
+        # ...and the new descendants gain c and its ancestors
+        reached_by = self._reached_by[c] | (1 << c)
+        for d in self._bits(reach):
+            self._reached_by[d] |= reached_by
+
+    @staticmethod
+    def _bits(bits: int) -> List[int]:
+        out = []
+        while bits:
+            low_bit = bits & -bits
+            out.append(low_bit.bit_length() - 1)
+            bits ^= low_bit
+        return out
@@ -11,7 +11,9 @@ Handles:
 Based on FreeSO's SPR2.cs DecodeStandard/Detailed methods.
 """
 
+import re
 import struct
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Optional, List, Tuple
 
@@ -21,6 +23,16 @@ if TYPE_CHECKING:
     from formats.iff.chunks.dgrp import DGRP
 
 
+# Per-channel palette lookup tables: (red, green, blue, alpha), 256 bytes each
+PaletteTables = Tuple[bytes, bytes, bytes, bytes]
+
+# Palettes whose channel tables each SPR2Decoder keeps (LRU)
+PALETTE_CACHE_SIZE = 64
+
+# Runs of non-zero alpha in a row's alpha channel
+_OPAQUE_RUN = re.compile(rb'[^\x00]+')
+
+
 @dataclass
 class DecodedSprite:
     """Decoded sprite with RGBA pixels and optional z-buffer."""
@@ -56,12 +68,48 @@ class SPR2Decoder:
     def __init__(self, palette: Optional['PALT'] = None):
         self.palette = palette
         self.default_color = (128, 128, 128)  # Gray for missing palette
+        # (palette colors, transparent_index) -> channel tables, least recent first
+        self._tables: 'OrderedDict[Tuple[tuple, int], PaletteTables]' = OrderedDict()
+    
+    def palette_tables(self, palette: Optional['PALT'],
+                       transparent_index: int) -> PaletteTables:
+        """
+        Get the RGBA lookup tables for a palette.
+        
+        Returns four 256-byte tables (R, G, B, A) mapping a palette index to
+        one channel, so a run of indices expands with bytes.translate().
+        Alpha is 0 for the transparent index and 255 otherwise. Tables are
+        keyed on the palette's colors, so an edited palette gets new tables;
+        the last PALETTE_CACHE_SIZE palettes are kept.
+        """
+        key = (tuple(palette.colors[:256]) if palette else (), transparent_index)
+        cached = self._tables.get(key)
+        if cached is not None:
+            self._tables.move_to_end(key)
+            return cached
+        
+        colors = [self._get_color(palette, i, transparent_index) for i in range(256)]
+        tables = (
+            bytes(c[0] for c in colors),
+            bytes(c[1] for c in colors),
+            bytes(c[2] for c in colors),
+            bytes(0 if i == transparent_index else 255 for i in range(256)),
+        )
+        self._tables[key] = tables
+        if len(self._tables) > PALETTE_CACHE_SIZE:
+            self._tables.popitem(last=False)
+        return tables
     
     def decode_frame(self, frame: 'SPR2Frame', 
                      palette: Optional['PALT'] = None) -> Optional[DecodedSprite]:
         """
         Decode an SPR2 frame to RGBA pixels.
         
+        Each pixel run is expanded with slice operations: palette indices go
+        through the channel tables from palette_tables() and are written to
+        the RGBA buffer with strided slice assignment; z values are copied
+        into the z-buffer the same way.
+        
         Args:
             frame: SPR2Frame with raw_data
             palette: PALT chunk for color lookup (uses self.palette if None)
@@ -73,31 +121,26 @@ class SPR2Decoder:
             return None
         
         pal = palette or self.palette
-        has_pixels = bool(frame.flags & 0x01)
         has_zbuffer = bool(frame.flags & 0x02)
-        has_alpha = bool(frame.flags & 0x04)
+        red, green, blue, alpha = self.palette_tables(pal, frame.transparent_index)
         
         width = frame.width
         height = frame.height
         
-        # Initialize output buffers
-        rgba = bytearray(width * height * 4)  # RGBA
-        zbuf = bytearray(width * height) if has_zbuffer else None
-        
-        # Initialize to transparent
-        for i in range(width * height):
-            rgba[i*4 + 3] = 0  # Alpha = 0
-            if zbuf:
-                zbuf[i] = 255  # Z = far
+        # Transparent black, z = far
+        rgba = bytearray(width * height * 4)
+        zbuf = bytearray(b'\xff' * (width * height)) if has_zbuffer else None
         
-        # Parse RLE data
         data = frame.raw_data
+        if not isinstance(data, bytes):
+            data = bytes(data)
+        end = len(data)
         pos = 0
         y = 0
         
-        while pos + 2 <= len(data) and y < height:
+        while pos + 2 <= end and y < height:
             # Read row marker
-            marker = struct.unpack_from('<H', data, pos)[0]
+            marker = data[pos] | (data[pos + 1] << 8)
             pos += 2
             
             command = (marker >> 13) & 0x7
@@ -107,90 +150,56 @@ class SPR2Decoder:
                 # Fill row with pixel data
                 # count = total bytes in this row's data (including the 2-byte marker we just read)
                 bytes_remaining = count - 2
+                row = y * width
                 x = 0
                 
                 while bytes_remaining > 0 and x < width:
-                    if pos + 2 > len(data):
+                    if pos + 2 > end:
                         break
                     
                     # Read pixel command
-                    px_marker = struct.unpack_from('<H', data, pos)[0]
+                    px_marker = data[pos] | (data[pos + 1] << 8)
                     pos += 2
                     bytes_remaining -= 2
                     
                     px_cmd = (px_marker >> 13) & 0x7
                     px_count = px_marker & 0x1FFF
                     
-                    if px_cmd == 0x01:
-                        # Z + palette (2 bytes per pixel)
-                        for _ in range(px_count):
-                            if pos + 2 > len(data) or x >= width:
-                                break
-                            z_val = data[pos]
-                            pal_idx = data[pos + 1]
-                            pos += 2
-                            bytes_remaining -= 2
-                            
-                            r, g, b = self._get_color(pal, pal_idx, frame.transparent_index)
-                            a = 0 if pal_idx == frame.transparent_index else 255
-                            
-                            offset = (y * width + x) * 4
-                            rgba[offset:offset + 4] = bytes([r, g, b, a])
-                            if zbuf:
-                                zbuf[y * width + x] = z_val
-                            x += 1
-                            
-                    elif px_cmd == 0x02:
-                        # Z + palette + alpha (3 bytes per pixel)
-                        for _ in range(px_count):
-                            if pos + 3 > len(data) or x >= width:
-                                break
-                            z_val = data[pos]
-                            pal_idx = data[pos + 1]
-                            a = data[pos + 2]
-                            pos += 3
-                            bytes_remaining -= 3
-                            
-                            r, g, b = self._get_color(pal, pal_idx, frame.transparent_index)
-                            
-                            offset = (y * width + x) * 4
-                            rgba[offset:offset + 4] = bytes([r, g, b, a])
-                            if zbuf:
-                                zbuf[y * width + x] = z_val
-                            x += 1
-                        
-                        # Padding for odd count
-                        if (px_count * 3) % 2 != 0 and bytes_remaining > 0:
-                            pos += 1
-                            bytes_remaining -= 1
-                            
-                    elif px_cmd == 0x03:
+                    if px_cmd == 0x03:
                         # Skip pixels (transparent)
                         x += px_count
-                        
+                        continue
+                    elif px_cmd == 0x01:
+                        stride = 2  # Z + palette
+                    elif px_cmd == 0x02:
+                        stride = 3  # Z + palette + alpha
                     elif px_cmd == 0x06:
-                        # Palette only (1 byte per pixel)
-                        for _ in range(px_count):
-                            if pos >= len(data) or x >= width:
-                                break
-                            pal_idx = data[pos]
-                            pos += 1
-                            bytes_remaining -= 1
-                            
-                            r, g, b = self._get_color(pal, pal_idx, frame.transparent_index)
-                            a = 0 if pal_idx == frame.transparent_index else 255
-                            
-                            offset = (y * width + x) * 4
-                            rgba[offset:offset + 4] = bytes([r, g, b, a])
-                            x += 1
-                        
-                        # Padding for odd count
-                        if px_count % 2 != 0 and bytes_remaining > 0:
-                            pos += 1
-                            bytes_remaining -= 1
+                        stride = 1  # Palette only
                     else:
                         # Unknown pixel command
                         break
+                    
+                    # Clip the run to the row and to the data actually present
+                    n = min(px_count, width - x, (end - pos) // stride)
+                    run = data[pos:pos + n * stride]
+                    pos += n * stride
+                    bytes_remaining -= n * stride
+                    
+                    indices = run[1::stride] if stride > 1 else run
+                    o = (row + x) * 4
+                    e = o + n * 4
+                    rgba[o:e:4] = indices.translate(red)
+                    rgba[o + 1:e:4] = indices.translate(green)
+                    rgba[o + 2:e:4] = indices.translate(blue)
+                    rgba[o + 3:e:4] = run[2::3] if stride == 3 else indices.translate(alpha)
+                    if zbuf is not None and stride > 1:
+                        zbuf[row + x:row + x + n] = run[0::stride]
+                    x += n
+                    
+                    # Odd-length runs are padded to a 2-byte boundary
+                    if stride != 2 and (px_count * stride) % 2 != 0 and bytes_remaining > 0:
+                        pos += 1
+                        bytes_remaining -= 1
                 
                 y += 1
                 
@@ -388,22 +397,26 @@ class DGRPExporter:
         for decoded, x, y, ref in decoded_sprites:
             offset_x = int(x - min_x)
             offset_y = int(y - min_y)
+            src = decoded.rgba_data
+            stride = decoded.width * 4
             
             for sy in range(decoded.height):
-                for sx in range(decoded.width):
-                    dst_x = offset_x + sx
-                    dst_y = offset_y + sy
-                    
-                    if 0 <= dst_x < width and 0 <= dst_y < height:
-                        src_offset = (sy * decoded.width + sx) * 4
-                        dst_offset = (dst_y * width + dst_x) * 4
-                        
-                        # Simple alpha compositing
-                        src_a = decoded.rgba_data[src_offset + 3]
-                        if src_a > 0:
-                            rgba[dst_offset:dst_offset + 4] = (
-                                decoded.rgba_data[src_offset:src_offset + 4]
-                            )
+                dst_y = offset_y + sy
+                if not 0 <= dst_y < height:
+                    continue
+                
+                # Simple alpha compositing: copy each run of pixels with alpha > 0
+                src_row = sy * stride
+                dst_row = dst_y * width
+                for run in _OPAQUE_RUN.finditer(src[src_row + 3:src_row + stride:4]):
+                    sx0, sx1 = run.span()
+                    dx0 = max(offset_x + sx0, 0)
+                    dx1 = min(offset_x + sx1, width)
+                    if dx0 < dx1:
+                        s0 = src_row + (dx0 - offset_x) * 4
+                        rgba[(dst_row + dx0) * 4:(dst_row + dx1) * 4] = (
+                            src[s0:s0 + (dx1 - dx0) * 4]
+                        )
         
         return DecodedSprite(
             width=width,
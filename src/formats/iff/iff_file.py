@@ -6,9 +6,10 @@ IFF (Interchange File Format) is a chunk-based file format for binary
 resource data used by The Sims.
 """
 
+import threading
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, TypeVar, Type, Iterator
+from typing import Optional, TypeVar, Type, Iterator, Iterable, Callable, Union
 from io import BytesIO
 
 try:
@@ -23,6 +24,17 @@ from .base import IffChunk, get_chunk_class, CHUNK_TYPES
 
 T = TypeVar('T', bound=IffChunk)
 
+# Chunk allow-list: a collection of 4-char type codes or a predicate on the code
+ChunkTypeFilter = Union[Iterable[str], Callable[[str], bool]]
+
+
+def _make_type_filter(only_types: Optional[ChunkTypeFilter]) -> Optional[Callable[[str], bool]]:
+    """Normalize an only_types argument into a predicate (None = keep all)."""
+    if only_types is None or callable(only_types):
+        return only_types
+    allowed = frozenset(only_types)
+    return allowed.__contains__
+
 
 @dataclass
 class IffRuntimeInfo:
@@ -31,14 +43,50 @@ class IffRuntimeInfo:
     use_count: int = 0
 
 
+@dataclass
+class IffChunkIndexEntry:
+    """
+    Header-only record of a chunk in a lazily loaded IFF.
+    The payload is parsed on first access and cached in `chunk`.
+    """
+    type_code: str
+    chunk_id: int
+    chunk_flags: int
+    label: str
+    offset: int  # Payload offset in the source buffer
+    size: int    # Payload size (excludes the 76-byte header)
+    chunk: Optional[IffChunk] = None
+
+
 @dataclass
 class IffFile:
     """
     IFF file container.
     Maps to: FSO.Files.Formats.IFF.IffFile
+    
+    With lazy=True only chunk headers are indexed on load; each chunk is
+    parsed the first time get(), get_all(), get_by_type_code() or iteration
+    reaches it. Touching `chunks` materializes every chunk and turns the
+    file into a regular eager IffFile.
+    
+    only_types restricts loading to matching chunks, e.g. {'OBJD', 'STR#'}
+    or a predicate on the type code. Other chunks are skipped by seeking
+    past their payload: they are never copied, parsed or indexed.
+    
+    A lazy IffFile read from disk keeps its file mapped (and, on Windows,
+    locked) until every chunk is materialized or close() is called; use it
+    as a context manager to release the mapping deterministically:
+    
+        with IffFile.read(path, lazy=True) as iff:
+            bhavs = iff.get_all(BHAV)
+    
+    close() keeps the chunks parsed so far (as an eager file) and drops the
+    rest; touch `chunks` first to keep them all. Lookups, materialization
+    and close() may be called from several threads at once.
     """
     filename: str = ""
     retain_chunk_data: bool = False
+    lazy: bool = False
     runtime_info: IffRuntimeInfo = field(default_factory=IffRuntimeInfo)
     
     # Chunks organized by type and ID
@@ -46,26 +94,45 @@ class IffFile:
     _chunks_by_type: dict[type, list[IffChunk]] = field(default_factory=list)
     _all_chunks: list[IffChunk] = field(default_factory=list)
     
+    # Lazy mode: header index and the buffer the payloads live in
+    _index: list[IffChunkIndexEntry] = field(default_factory=list)
+    _index_by_type: dict[type, list[IffChunkIndexEntry]] = field(default_factory=dict)
+    _index_by_id: dict[type, dict[int, IffChunkIndexEntry]] = field(default_factory=dict)
+    _source: Optional[IoBuffer] = None
+    _materialize_lock: threading.RLock = field(default_factory=threading.RLock, repr=False, compare=False)
+    _type_filter: Optional[Callable[[str], bool]] = None
+    
     # IFF header info
     _is_valid: bool = False
     
+    # Chunk header: type, size, id, flags, label
+    _CHUNK_HEADER = '>4sIHH64s'
+    
     @classmethod
-    def read(cls, path: str) -> 'IffFile':
+    def read(cls, path: str, lazy: bool = False,
+             only_types: Optional[ChunkTypeFilter] = None) -> 'IffFile':
         """Read an IFF file from disk."""
-        iff = cls(filename=path)
+        iff = cls(filename=path, lazy=lazy)
+        iff._type_filter = _make_type_filter(only_types)
         iff._chunks_by_id = {}
         iff._chunks_by_type = {}
         iff._all_chunks = []
         
         io = IoBuffer.from_file(path, ByteOrder.BIG_ENDIAN)
-        iff._read_from_stream(io)
+        try:
+            iff._read_from_stream(io)
+        finally:
+            if iff._source is None:
+                io.close()
         
         return iff
     
     @classmethod
-    def from_bytes(cls, data: bytes, filename: str = "") -> 'IffFile':
+    def from_bytes(cls, data: bytes, filename: str = "", lazy: bool = False,
+                   only_types: Optional[ChunkTypeFilter] = None) -> 'IffFile':
         """Read an IFF from bytes."""
-        iff = cls(filename=filename)
+        iff = cls(filename=filename, lazy=lazy)
+        iff._type_filter = _make_type_filter(only_types)
         iff._chunks_by_id = {}
         iff._chunks_by_type = {}
         iff._all_chunks = []
@@ -90,30 +157,37 @@ class IffFile:
         _rsmp_offset = io.read_uint32()
         
         # Now at byte 64, chunks start here
-        while io.has_more:
+        while io.has_bytes(76):
             try:
-                chunk = self._read_chunk(io)
-                if chunk:
-                    self._add_chunk(chunk)
+                if self.lazy:
+                    self._index_chunk(io)
+                else:
+                    chunk = self._read_chunk(io)
+                    if chunk is not None:
+                        self._add_chunk(chunk)
             except Exception as e:
                 # Hit end of file or corrupt chunk
                 break
+        
+        if self._index:
+            # Payloads are parsed later straight out of this buffer
+            self._source = io
     
-    def _read_chunk(self, io: IoBuffer) -> Optional[IffChunk]:
-        """Read a single chunk from stream."""
-        if not io.has_bytes(12):
+    def _read_chunk_header(self, io: IoBuffer) -> Optional[tuple[str, int, int, str, int]]:
+        """
+        Read a chunk header; returns (type, id, flags, label, data size),
+        or None for a malformed or filtered-out chunk.
+        """
+        if not io.has_bytes(76):
             return None
         
-        start_pos = io.position
-        
-        # Read chunk header (big endian)
-        type_code = io.read_cstring(4, trim_null=False)
-        chunk_size = io.read_uint32()
-        chunk_id = io.read_uint16()
-        chunk_flags = io.read_uint16()
-        
-        # Read label (64 bytes, null-terminated)
-        chunk_label = io.read_cstring(64, trim_null=True)
+        # Read chunk header (big endian): type, size, id, flags, 64-byte label
+        type_raw, chunk_size, chunk_id, chunk_flags, label_raw = io.unpack(self._CHUNK_HEADER)
+        type_code = type_raw.decode('ascii', errors='replace')
+        null_idx = label_raw.find(b'\0')
+        if null_idx != -1:
+            label_raw = label_raw[:null_idx]
+        chunk_label = label_raw.decode('ascii', errors='replace')
         
         # Calculate data size (size includes header)
         header_size = 76  # 4 + 4 + 2 + 2 + 64
@@ -122,6 +196,42 @@ class IffFile:
         if data_size < 0:
             return None
         
+        if self._type_filter is not None and not self._type_filter(type_code):
+            # Filtered out: seek past the payload without touching it
+            io.skip(data_size)
+            return None
+        
+        return type_code, chunk_id, chunk_flags, chunk_label, data_size
+    
+    def _read_chunk(self, io: IoBuffer) -> Optional[IffChunk]:
+        """Read a single chunk from stream."""
+        header = self._read_chunk_header(io)
+        if header is None:
+            return None
+        
+        type_code, chunk_id, chunk_flags, chunk_label, data_size = header
+        return self._parse_chunk(type_code, chunk_id, chunk_flags, chunk_label,
+                                 io.read_view(data_size))
+    
+    def _index_chunk(self, io: IoBuffer):
+        """Record a chunk header and skip its payload (lazy mode)."""
+        header = self._read_chunk_header(io)
+        if header is None:
+            return
+        
+        type_code, chunk_id, chunk_flags, chunk_label, data_size = header
+        entry = IffChunkIndexEntry(type_code, chunk_id, chunk_flags, chunk_label,
+                                   io.position, data_size)
+        io.skip(data_size)
+        
+        chunk_class = get_chunk_class(type_code)
+        self._index.append(entry)
+        self._index_by_type.setdefault(chunk_class, []).append(entry)
+        self._index_by_id.setdefault(chunk_class, {})[chunk_id] = entry
+    
+    def _parse_chunk(self, type_code: str, chunk_id: int, chunk_flags: int,
+                     chunk_label: str, chunk_view: memoryview) -> IffChunk:
+        """Create and parse a chunk from its header fields and payload."""
         # Create appropriate chunk type
         chunk_class = get_chunk_class(type_code)
         chunk = chunk_class()
@@ -131,23 +241,74 @@ class IffFile:
         chunk.chunk_label = chunk_label
         
         # Read chunk data
-        if data_size > 0:
-            chunk_data = io.read_bytes(data_size)
-            
+        if len(chunk_view) > 0:
             if self.retain_chunk_data:
-                chunk.original_data = chunk_data
+                chunk.original_data = chunk_view.tobytes()
             
-            # Parse chunk-specific data
-            chunk_io = IoBuffer.from_bytes(chunk_data, ByteOrder.LITTLE_ENDIAN)
+            # Parse chunk-specific data from a zero-copy view of the payload
+            chunk_io = IoBuffer(chunk_view, ByteOrder.LITTLE_ENDIAN)
             try:
                 chunk.read(self, chunk_io)
                 chunk.chunk_processed = True
             except Exception as e:
                 # Store raw data if parsing fails
-                chunk.chunk_data = chunk_data
+                chunk.chunk_data = chunk.original_data or chunk_view.tobytes()
+            finally:
+                chunk_io.close()
         
         return chunk
     
+    def _materialize(self, entry: IffChunkIndexEntry) -> Optional[IffChunk]:
+        """Parse an indexed chunk on first access and cache it (None if closed first)."""
+        if entry.chunk is None:
+            # view_at() leaves the shared cursor alone; the lock makes sure
+            # each chunk is parsed (and cached) exactly once, and not while
+            # close() releases the source
+            with self._materialize_lock:
+                if entry.chunk is None and self._source is not None:
+                    entry.chunk = self._parse_chunk(entry.type_code, entry.chunk_id,
+                                                    entry.chunk_flags, entry.label,
+                                                    self._source.view_at(entry.offset, entry.size))
+        return entry.chunk
+    
+    def _materialize_entries(self, entries: Iterable[IffChunkIndexEntry]) -> list[IffChunk]:
+        """Materialize entries, skipping any a concurrent close() dropped."""
+        return [c for c in map(self._materialize, entries) if c is not None]
+    
+    def _materialize_all(self):
+        """Parse every pending chunk and switch to eager storage."""
+        with self._materialize_lock:
+            if self._source is None:
+                return
+            for entry in self._index:
+                self._materialize(entry)
+            self.close()
+    
+    def __enter__(self) -> 'IffFile':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def close(self):
+        """
+        Release the underlying file mapping. Chunks parsed so far move to
+        eager storage; unparsed chunks of a lazy file are dropped.
+        """
+        with self._materialize_lock:
+            source = self._source
+            if source is None:
+                return
+            for entry in self._index:
+                if entry.chunk is not None:
+                    self._add_chunk(entry.chunk)
+            # Readers switch to eager storage once _source is None
+            self._source = None
+            self._index = []
+            self._index_by_type = {}
+            self._index_by_id = {}
+            source.close()
+    
     def _add_chunk(self, chunk: IffChunk):
         """Add a chunk to the internal collections."""
         chunk_type = type(chunk)
@@ -167,36 +328,55 @@ class IffFile:
     
     def get(self, chunk_type: Type[T], chunk_id: int) -> Optional[T]:
         """Get a chunk by type and ID."""
+        if self._source is not None:
+            entry = self._index_by_id.get(chunk_type, {}).get(chunk_id)
+            chunk = self._materialize(entry) if entry else None
+            if chunk is not None or self._source is not None:
+                return chunk
+            # Closed meanwhile: a parsed chunk has moved to eager storage
         type_dict = self._chunks_by_id.get(chunk_type, {})
         return type_dict.get(chunk_id)
     
     def get_all(self, chunk_type: Type[T]) -> list[T]:
         """Get all chunks of a type."""
+        if self._source is not None:
+            return self._materialize_entries(self._index_by_type.get(chunk_type, []))
         return self._chunks_by_type.get(chunk_type, [])
     
     def get_by_type_code(self, type_code: str) -> list[IffChunk]:
         """Get all chunks matching a 4-char type code."""
+        if self._source is not None:
+            return self._materialize_entries(e for e in self._index if e.type_code == type_code)
         return [c for c in self._all_chunks if c.chunk_type == type_code]
     
     @property
     def chunks(self) -> list[IffChunk]:
         """All chunks in the file."""
+        self._materialize_all()
         return self._all_chunks
     
     def __iter__(self) -> Iterator[IffChunk]:
+        if self._source is not None:
+            # Parse in file order as the caller advances
+            return (c for c in map(self._materialize, list(self._index)) if c is not None)
         return iter(self._all_chunks)
     
     def __len__(self) -> int:
+        if self._source is not None:
+            return len(self._index)
         return len(self._all_chunks)
     
     def summary(self) -> str:
         """Get a summary of chunks in this file."""
-        lines = [f"IFF: {self.filename}", f"Chunks: {len(self._all_chunks)}"]
+        lines = [f"IFF: {self.filename}", f"Chunks: {len(self)}"]
         
-        # Count by type
+        # Count by type (from the header index when lazy, nothing is parsed)
         type_counts = {}
-        for chunk in self._all_chunks:
-            code = chunk.chunk_type
+        if self._source is not None:
+            codes = [e.type_code for e in self._index]
+        else:
+            codes = [c.chunk_type for c in self._all_chunks]
+        for code in codes:
             type_counts[code] = type_counts.get(code, 0) + 1
         
         for code, count in sorted(type_counts.items()):
@@ -6,6 +6,7 @@ Modules:
   - bcf: BCF skeleton/animation parser (bones, appearances, anim headers)
   - cfp: CFP animation frame decompressor (delta-encoded floats)
   - gltf_export: Export rigged meshes to glTF 2.0 format
+  - mesh_arrays: Struct-of-arrays mesh storage (typed arrays, lazy object views)
 
 Usage:
     from formats.mesh import BMFReader, BCFReader, CFPReader, GLTFExporter
@@ -36,6 +37,7 @@ from .bcf import BCF, BCFReader, Skeleton, Bone, Animation, Binding, Appearance
 from .bcf import Vector3, Quaternion
 from .cfp import CFPReader, CFPData, compress_floats
 from .gltf_export import GLTFExporter, export_character_gltf
+from .mesh_arrays import MeshArrays, LazyList, mesh_arrays
 
 __all__ = [
     # BMF
@@ -46,6 +48,8 @@ __all__ = [
     'CFPReader', 'CFPData', 'compress_floats',
     # GLTF Export
     'GLTFExporter', 'export_character_gltf',
+    # Mesh arrays
+    'MeshArrays', 'LazyList', 'mesh_arrays',
     # Shared
     'Vector3', 'Quaternion',
 ]
@@ -12,12 +12,16 @@ BCF Structure:
 Each BCF typically contains ONE non-zero section.
 """
 
-import struct
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 import math
 
+try:
+    from utils.binary import IoBuffer, ByteOrder
+except ImportError:
+    from ...utils.binary import IoBuffer, ByteOrder
+
 
 @dataclass
 class Quaternion:
@@ -192,8 +196,7 @@ class BCFReader:
     """
     
     def __init__(self):
-        self.pos = 0
-        self.data = b""
+        self.io: Optional[IoBuffer] = None
     
     def read_file(self, filepath: str) -> Optional[BCF]:
         """Read BCF from file."""
@@ -202,8 +205,7 @@ class BCFReader:
     
     def read_bytes(self, data: bytes) -> Optional[BCF]:
         """Read BCF from byte buffer."""
-        self.data = data
-        self.pos = 0
+        self.io = IoBuffer.from_bytes(data, ByteOrder.LITTLE_ENDIAN)
         
         try:
             return self._parse()
@@ -292,24 +294,16 @@ class BCFReader:
                 bone.properties[key] = val
         
         # Transform - read RAW values (transforms happen in CFP, not here)
-        bone.translation = Vector3(
-            self._read_float(),
-            self._read_float(),
-            self._read_float()
-        )
-        
-        # Quaternion (stored as x, y, z, w in file, we store as w, x, y, z)
-        qx = self._read_float()
-        qy = self._read_float()
-        qz = self._read_float()
-        qw = self._read_float()
+        # Quaternion is stored as x, y, z, w in file, we store as w, x, y, z
+        (tx, ty, tz, qx, qy, qz, qw,
+         can_translate, can_rotate, can_blend,
+         bone.wiggle_value, bone.wiggle_power) = self.io.unpack('<7f3i2f')
+        bone.translation = Vector3(tx, ty, tz)
         bone.rotation = Quaternion(qw, qx, qy, qz)
         
-        bone.can_translate = bool(self._read_int32())
-        bone.can_rotate = bool(self._read_int32())
-        bone.can_blend = bool(self._read_int32())
-        bone.wiggle_value = self._read_float()
-        bone.wiggle_power = self._read_float()
+        bone.can_translate = bool(can_translate)
+        bone.can_rotate = bool(can_rotate)
+        bone.can_blend = bool(can_blend)
         
         return bone
     
@@ -419,42 +413,28 @@ class BCFReader:
     # Binary helpers
     def _read_pascal_string(self) -> str:
         """Read length-prefixed string."""
-        length = self._read_byte()
+        length = self.io.read_byte()
         if length == 0:
             return ""
-        s = self.data[self.pos:self.pos + length].decode('latin-1', errors='replace')
-        self.pos += length
-        return s
+        return self.io.read_bytes(length).decode('latin-1', errors='replace')
     
     def _read_byte(self) -> int:
-        val = self.data[self.pos]
-        self.pos += 1
-        return val
+        return self.io.read_byte()
     
     def _read_int16(self) -> int:
-        val = struct.unpack('<h', self.data[self.pos:self.pos + 2])[0]
-        self.pos += 2
-        return val
+        return self.io.read_int16()
     
     def _read_uint16(self) -> int:
-        val = struct.unpack('<H', self.data[self.pos:self.pos + 2])[0]
-        self.pos += 2
-        return val
+        return self.io.read_uint16()
     
     def _read_int32(self) -> int:
-        val = struct.unpack('<i', self.data[self.pos:self.pos + 4])[0]
-        self.pos += 4
-        return val
+        return self.io.read_int32()
     
     def _read_uint32(self) -> int:
-        val = struct.unpack('<I', self.data[self.pos:self.pos + 4])[0]
-        self.pos += 4
-        return val
+        return self.io.read_uint32()
     
     def _read_float(self) -> float:
-        val = struct.unpack('<f', self.data[self.pos:self.pos + 4])[0]
-        self.pos += 4
-        return val
+        return self.io.read_float()
 
 
 # Test
@@ -12,13 +12,24 @@ BMF Structure:
   5. TEXTUREVERTICES - UV coordinates
   6. BLENDDATA - vertex blend weights
   7. VERTICES - positions and normals
+
+Sections are decoded in bulk into a MeshArrays (see mesh_arrays); the
+Vertex/TextureVertex/BlendData/BoneBinding lists are built lazily on first
+use.
 """
 
 import struct
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import List, Tuple, Optional, BinaryIO
-from io import BytesIO
+
+try:
+    from utils.binary import IoBuffer, ByteOrder
+except ImportError:
+    from ...utils.binary import IoBuffer, ByteOrder
+
+from .mesh_arrays import (MeshArrays, LazyList, mesh_arrays, decode_array,
+                          take_columns, column, scaled)
 
 
 @dataclass
@@ -87,6 +98,32 @@ class BMFMesh:
     # Rigging
     bone_bindings: List[BoneBinding] = field(default_factory=list)
     blend_data: List[BlendData] = field(default_factory=list)
+
+    # Typed arrays decoded by BMFReader (the lists above are lazy views of them)
+    arrays: Optional[MeshArrays] = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def from_arrays(cls, arrays: MeshArrays, mesh_name: str = "", texture_name: str = "",
+                    bone_names: Optional[List[str]] = None) -> 'BMFMesh':
+        """Mesh backed by arrays, with object lists built on first use."""
+        return cls(
+            mesh_name=mesh_name,
+            texture_name=texture_name,
+            bone_names=bone_names or [],
+            faces=LazyList(lambda: list(arrays.face_rows()), arrays.face_count),
+            vertices=LazyList(lambda: [Vertex(*r) for r in arrays.vertex_rows()], arrays.vertex_count),
+            blend_vertices=LazyList(lambda: [Vertex(*r) for r in arrays.blend_vertex_rows()],
+                                    arrays.blend_vertex_count),
+            texture_coords=LazyList(lambda: [TextureVertex(*r) for r in arrays.uv_rows()], arrays.uv_count),
+            bone_bindings=LazyList(lambda: [BoneBinding(*r) for r in arrays.binding_rows()],
+                                   arrays.binding_count),
+            blend_data=LazyList(lambda: [BlendData(*r) for r in arrays.blend_rows()], arrays.blend_count),
+            arrays=arrays,
+        )
+
+    def to_arrays(self) -> MeshArrays:
+        """Typed-array form (the decoded arrays unless the object lists were used)."""
+        return mesh_arrays(self)
     
     @property
     def vertex_count(self) -> int:
@@ -113,8 +150,7 @@ class BMFReader:
     """
     
     def __init__(self):
-        self.pos = 0
-        self.data = b""
+        self.io: Optional[IoBuffer] = None
     
     def read_file(self, filepath: str) -> Optional[BMFMesh]:
         """Read BMF from file."""
@@ -123,8 +159,7 @@ class BMFReader:
     
     def read_bytes(self, data: bytes) -> Optional[BMFMesh]:
         """Read BMF from byte buffer."""
-        self.data = data
-        self.pos = 0
+        self.io = IoBuffer.from_bytes(data, ByteOrder.LITTLE_ENDIAN)
         
         try:
             return self._parse()
@@ -134,6 +169,7 @@ class BMFReader:
     
     def _parse(self) -> BMFMesh:
         """Parse complete BMF structure."""
+        io = self.io
         mesh = BMFMesh()
         
         # 1. FILENAMES
@@ -141,112 +177,64 @@ class BMFReader:
         mesh.texture_name = self._read_pascal_string()
         
         # 2. BONES
-        bone_count = self._read_int32()
+        bone_count = io.read_int32()
         mesh.bone_names = [self._read_pascal_string() for _ in range(bone_count)]
         
-        # 3. FACES
-        face_count = self._read_int32()
-        mesh.faces = []
-        for _ in range(face_count):
-            # Counter-clockwise winding
-            i0 = self._read_int32()
-            i1 = self._read_int32()
-            i2 = self._read_int32()
-            mesh.faces.append((i0, i1, i2))
-        
+        # 3. FACES (counter-clockwise winding)
+        face_count = io.read_int32()
+        faces = self._read_array('i', 3, face_count)
+
         # 4. BONE BINDINGS
-        binding_count = self._read_int32()
-        mesh.bone_bindings = []
-        for _ in range(binding_count):
-            bb = BoneBinding()
-            bb.bone_index = self._read_int32()
-            bb.first_real_vertex = self._read_int32()
-            bb.real_vertex_count = self._read_int32()
-            bb.first_blend_vertex = self._read_int32()
-            bb.blend_vertex_count = self._read_int32()
-            mesh.bone_bindings.append(bb)
-        
+        binding_count = io.read_int32()
+        bone_bindings = self._read_array('i', 5, binding_count)
+
         # 5. TEXTURE VERTICES (UVs)
-        uv_count = self._read_int32()
-        mesh.texture_coords = []
-        for _ in range(uv_count):
-            tv = TextureVertex()
-            tv.u = self._read_float()
-            tv.v = self._read_float()
-            mesh.texture_coords.append(tv)
-        
+        uv_count = io.read_int32()
+        uvs = self._read_array('f', 2, uv_count)
+
         # 6. BLEND DATA
-        blend_count = self._read_int32()
-        mesh.blend_data = []
-        for _ in range(blend_count):
-            bd = BlendData()
-            # Weight is fixed-point int32: 0x8000 = 1.0 (per VitaMoo)
-            bd.weight = self._read_int32() / 0x8000
-            bd.other_vertex = self._read_int32()
-            mesh.blend_data.append(bd)
-        
+        blend_count = io.read_int32()
+        blend = self._read_array('i', 2, blend_count)
+        # Weight is fixed-point int32: 0x8000 = 1.0 (per VitaMoo)
+        blend_weights = scaled(column(blend, 2, 0), 1.0 / 0x8000)
+
         # 7. VERTICES (real)
-        real_count = self._read_int32()
-        mesh.vertices = []
-        for _ in range(real_count):
-            v = self._read_vertex()
-            mesh.vertices.append(v)
-        
+        # Per VitaMoo: read raw values, no coordinate transforms in BMF.
+        real_count = io.read_int32()
+        vertices = self._read_array('f', 6, real_count)
+
         # 8. VERTICES (blend)
         # Blend vertex count may not be explicitly stored
-        # Read remaining as blend vertices
-        blend_vert_count = blend_count  # Same as blend data count
-        mesh.blend_vertices = []
-        for _ in range(blend_vert_count):
-            if self.pos + 24 > len(self.data):
-                break
-            v = self._read_vertex()
-            mesh.blend_vertices.append(v)
-        
-        return mesh
-    
-    def _read_vertex(self) -> Vertex:
-        """Read a vertex (position + normal).
-        
-        Per VitaMoo: read raw values, no coordinate transforms in BMF.
-        """
-        v = Vertex()
-        v.x = self._read_float()
-        v.y = self._read_float()
-        v.z = self._read_float()
-        v.nx = self._read_float()
-        v.ny = self._read_float()
-        v.nz = self._read_float()
-        return v
+        # Read remaining as blend vertices (same as blend data count)
+        blend_vert_count = min(blend_count, io.remaining() // 24)
+        blend_vertices = self._read_array('f', 6, blend_vert_count)
+
+        arrays = MeshArrays(
+            positions=take_columns(vertices, 6, 0, 3),
+            normals=take_columns(vertices, 6, 3, 6),
+            faces=faces,
+            uvs=uvs,
+            blend_weights=blend_weights,
+            blend_others=column(blend, 2, 1),
+            bone_bindings=bone_bindings,
+            blend_positions=take_columns(blend_vertices, 6, 0, 3),
+            blend_normals=take_columns(blend_vertices, 6, 3, 6),
+        )
+        return BMFMesh.from_arrays(arrays, mesh.mesh_name, mesh.texture_name, mesh.bone_names)
+
+    def _read_array(self, typecode: str, width: int, count: int):
+        """Decode count records of width 32-bit values in one call."""
+        size = 4 * width * max(count, 0)
+        if size > self.io.remaining():
+            raise struct.error(f"need {size} bytes, {self.io.remaining()} available")
+        return decode_array(self.io.read_view(size), typecode, width)
     
     def _read_pascal_string(self) -> str:
         """Read length-prefixed string."""
-        length = self._read_byte()
+        length = self.io.read_byte()
         if length == 0:
             return ""
-        s = self.data[self.pos:self.pos + length].decode('latin-1', errors='replace')
-        self.pos += length
-        return s
-    
-    def _read_byte(self) -> int:
-        val = self.data[self.pos]
-        self.pos += 1
-        return val
-    
-    def _read_int32(self) -> int:
-        val = struct.unpack('<i', self.data[self.pos:self.pos + 4])[0]
-        self.pos += 4
-        return val
-    
-    def _read_uint32(self) -> int:
-        val = struct.unpack('<I', self.data[self.pos:self.pos + 4])[0]
-        self.pos += 4
-        return val
-    
-    def _read_float(self) -> float:
-        val = struct.unpack('<f', self.data[self.pos:self.pos + 4])[0]
-        self.pos += 4
-        return val
+        return self.io.read_bytes(length).decode('latin-1', errors='replace')
     
     def _reinterpret_as_float(self, val: int) -> float:
         """Reinterpret int bits as float."""
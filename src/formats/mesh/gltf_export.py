@@ -1,8 +1,8 @@
 """
 GLTF Exporter - Export rigged meshes to glTF 2.0 format
 
-Exports BMF meshes with BCF skeleton data to glTF (.gltf + .bin)
-for use in Blender, Unity, Unreal, and other 3D tools.
+Exports BMF meshes with BCF skeleton data to glTF (.gltf, or single-file
+binary .glb) for use in Blender, Unity, Unreal, and other 3D tools.
 
 Features:
   - Mesh geometry (vertices, normals, UVs)
@@ -10,17 +10,100 @@ Features:
   - Bone skinning weights
   - Material references (texture placeholders)
   - Animation export (from CFP data)
+
+Vertex attributes come from the mesh's typed arrays (mesh_arrays) and are
+packed in one call per accessor (NumPy arrays when available, else
+array.array), not value by value.
 """
 
 import json
 import struct
+import sys
 import base64
+from array import array
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Tuple
 import math
 
+try:
+    import numpy as np
+except ImportError:  # Optional: vectorized bounds and packing
+    np = None
+
 from .bmf import BMFMesh, Vertex, TextureVertex, BoneBinding
 from .bcf import BCF, Skeleton, Bone, Animation, Vector3, Quaternion
+from .mesh_arrays import MeshArrays, mesh_arrays
+
+
+# Bump whenever exporter output changes; it is part of export cache keys
+EXPORTER_VERSION = 3
+
+# glTF component type -> (array typecode, little-endian NumPy dtype)
+COMPONENT_FORMATS = {
+    5121: ('B', '<u1'),  # UNSIGNED_BYTE
+    5123: ('H', '<u2'),  # UNSIGNED_SHORT
+    5125: ('I', '<u4'),  # UNSIGNED_INT
+    5126: ('f', '<f4'),  # FLOAT
+}
+
+GLB_MAGIC = b'glTF'
+GLB_CHUNK_JSON = b'JSON'
+GLB_CHUNK_BIN = b'BIN\0'
+
+
+def as_components(values, component_type: int):
+    """Flat values as a typed buffer: a NumPy array if available, else array.array."""
+    typecode, dtype = COMPONENT_FORMATS[component_type]
+    if np is not None:
+        return np.asarray(values, dtype=dtype)
+    if isinstance(values, array) and values.typecode == typecode:
+        return values
+    return array(typecode, values)
+
+
+def joint_component_type(joint_count: int) -> int:
+    """JOINTS_0 component type: UNSIGNED_BYTE up to 256 joints, else UNSIGNED_SHORT."""
+    return 5121 if joint_count <= 0x100 else 5123
+
+
+def pack_components(data, component_type: int) -> bytes:
+    """Little-endian bytes of a flat sequence of glTF components, packed in one call."""
+    typecode, dtype = COMPONENT_FORMATS[component_type]
+    if np is not None and isinstance(data, np.ndarray):
+        return np.ascontiguousarray(data, dtype=dtype).tobytes()
+    if not (isinstance(data, array) and data.typecode == typecode):
+        data = array(typecode, data)
+    if sys.byteorder != 'little':
+        data = array(typecode, data)
+        data.byteswap()
+    return data.tobytes()
+
+
+def affine_components(data, width: int, scale: Tuple[float, ...], offset: Tuple[float, ...]):
+    """float32 copy of width-wide rows with component k mapped to c * scale[k] + offset[k]."""
+    # Offsets are only added where non-zero, so -0.0 survives negation (as -x would)
+    if np is not None and isinstance(data, np.ndarray):
+        out = data.reshape(-1, width) * np.array(scale, dtype=np.float32)
+        for k in range(width):
+            if offset[k]:
+                out[:, k] += np.float32(offset[k])
+        return out
+    out = array('f', data)
+    for k in range(width):
+        if offset[k]:
+            out[k::width] = array('f', [c * scale[k] + offset[k] for c in out[k::width]])
+        elif scale[k] != 1.0:
+            out[k::width] = array('f', [c * scale[k] for c in out[k::width]])
+    return out
+
+
+def component_bounds(data, width: int) -> Tuple[List[float], List[float]]:
+    """Per-component (min, max) of a flat sequence of width-component elements."""
+    if np is not None and isinstance(data, np.ndarray):
+        rows = data.reshape(-1, width)
+        return rows.min(axis=0).tolist(), rows.max(axis=0).tolist()
+    return ([min(data[i::width]) for i in range(width)],
+            [max(data[i::width]) for i in range(width)])
 
 
 @dataclass
@@ -34,6 +117,9 @@ class GLTFExporter:
         
     With textures:
         exporter.export(mesh, skeleton, "character.gltf", texture_path="skin.bmp")
+
+    Binary (single-file GLB, picked from the .glb extension):
+        exporter.export(mesh, skeleton, "character.glb")
     """
     
     def __init__(self):
@@ -51,24 +137,28 @@ class GLTFExporter:
         
         # Bone name to node index mapping
         self.bone_node_map: Dict[str, int] = {}
-    
+        self.binary = False
+
     def export(self, mesh: BMFMesh, skeleton: Optional[Skeleton] = None,
                filepath: str = "mesh.gltf", 
                animations: Optional[List[Animation]] = None,
                embed_buffer: bool = True,
-               texture_path: Optional[str] = None):
+               texture_path: Optional[str] = None,
+               binary: Optional[bool] = None):
         """
         Export mesh and optional skeleton to glTF file.
-        
+
         Args:
             mesh: BMFMesh with geometry data
             skeleton: Optional Skeleton from BCF
-            filepath: Output .gltf file path
+            filepath: Output .gltf or .glb file path
             animations: Optional list of animations to include
-            embed_buffer: If True, embed binary data as base64
+            embed_buffer: If True, embed binary data as base64 (.gltf only)
             texture_path: Optional path to BMP texture file
+            binary: Write GLB (default: when filepath ends in .glb)
         """
         self._reset()
+        self.binary = filepath.lower().endswith('.glb') if binary is None else binary
         
         # Add texture/material if provided
         if texture_path:
@@ -129,6 +219,10 @@ class GLTFExporter:
         if self.samplers:
             gltf["samplers"] = self.samplers
         
+        if self.binary:
+            self._write_glb(gltf, filepath)
+            return
+
         # Write buffer
         if embed_buffer:
             # Embed as base64 data URI
@@ -150,7 +244,29 @@ class GLTFExporter:
         # Write glTF JSON
         with open(filepath, 'w') as f:
             json.dump(gltf, f, indent=2)
-    
+
+    def _write_glb(self, gltf: dict, filepath: str):
+        """Write single-file GLB: header, JSON chunk, BIN chunk (each 4-byte aligned)."""
+        if self.buffer_data:
+            gltf["buffers"] = [{"byteLength": len(self.buffer_data)}]
+
+        json_chunk = json.dumps(gltf, separators=(',', ':')).encode('utf-8')
+        json_chunk += b' ' * (-len(json_chunk) % 4)
+        bin_padding = b'\0' * (-len(self.buffer_data) % 4)
+
+        total_length = 12 + 8 + len(json_chunk)
+        if self.buffer_data:
+            total_length += 8 + len(self.buffer_data) + len(bin_padding)
+
+        with open(filepath, 'wb') as f:
+            f.write(struct.pack('<4sII', GLB_MAGIC, 2, total_length))
+            f.write(struct.pack('<I4s', len(json_chunk), GLB_CHUNK_JSON))
+            f.write(json_chunk)
+            if self.buffer_data:
+                f.write(struct.pack('<I4s', len(self.buffer_data) + len(bin_padding), GLB_CHUNK_BIN))
+                f.write(self.buffer_data)
+                f.write(bin_padding)
+
     def _reset(self):
         """Reset exporter state."""
         self.buffer_data = bytearray()
@@ -169,7 +285,7 @@ class GLTFExporter:
     def _add_texture(self, texture_path: str):
         """Add texture from BMP file.
         
-        Embeds the BMP as a base64 data URI in the glTF.
+        Embeds the BMP as a base64 data URI in glTF, or in the binary chunk in GLB.
         Note: glTF officially supports PNG/JPEG, but many viewers handle BMP.
         For best compatibility, convert BMP to PNG first.
         """
@@ -183,9 +299,6 @@ class GLTFExporter:
         with open(texture_path, 'rb') as f:
             texture_data = f.read()
         
-        # Embed as base64 data URI
-        b64_data = base64.b64encode(texture_data).decode('ascii')
-        
         # Determine mime type
         ext = Path(texture_path).suffix.lower()
         mime_types = {
@@ -196,12 +309,20 @@ class GLTFExporter:
         }
         mime_type = mime_types.get(ext, 'image/bmp')
         
-        # Add image
+        # Add image (binary chunk in GLB, base64 data URI in glTF)
         image_index = len(self.images)
-        self.images.append({
-            "uri": f"data:{mime_type};base64,{b64_data}",
-            "name": Path(texture_path).stem
-        })
+        if self.binary:
+            self.images.append({
+                "bufferView": self._add_buffer_view(texture_data),
+                "mimeType": mime_type,
+                "name": Path(texture_path).stem
+            })
+        else:
+            b64_data = base64.b64encode(texture_data).decode('ascii')
+            self.images.append({
+                "uri": f"data:{mime_type};base64,{b64_data}",
+                "name": Path(texture_path).stem
+            })
         
         # Add sampler (linear filtering)
         sampler_index = len(self.samplers)
@@ -287,28 +408,36 @@ class GLTFExporter:
         
         return skin_index
     
+    def _world_matrices(self, skeleton: Skeleton) -> Dict[int, List[float]]:
+        """
+        World transform of every bone (keyed by id(bone)), parents first.
+
+        Each bone's matrix is its parent's world matrix times its local one,
+        so every bone costs one multiply however deep it sits.
+        """
+        world: Dict[int, List[float]] = {}
+        for bone in skeleton.bones:
+            # Collect unresolved ancestors up to the first resolved one (or root)
+            chain = []
+            current = bone
+            while current is not None and id(current) not in world and current not in chain:
+                chain.append(current)
+                current = skeleton.bone_by_name.get(current.parent_name) if current.parent_name else None
+            parent_mat = world.get(id(current)) if current is not None else None
+
+            for b in reversed(chain):
+                local = self._bone_to_matrix(b)
+                parent_mat = local if parent_mat is None else self._mat4_multiply(parent_mat, local)
+                world[id(b)] = parent_mat
+        return world
+
     def _create_inverse_bind_matrices(self, skeleton: Skeleton) -> int:
         """Create inverse bind matrix accessor for skin."""
+        world = self._world_matrices(skeleton)
         matrices = []
-        
         for bone in skeleton.bones:
-            # Compute world transform
-            mat = self._bone_to_matrix(bone)
-            
-            # Walk up hierarchy
-            current = bone
-            while current.parent_name:
-                parent = skeleton.bone_by_name.get(current.parent_name)
-                if parent:
-                    parent_mat = self._bone_to_matrix(parent)
-                    mat = self._mat4_multiply(parent_mat, mat)
-                    current = parent
-                else:
-                    break
-            
             # Invert for bind matrix
-            inv_mat = self._mat4_invert(mat)
-            matrices.extend(inv_mat)
+            matrices.extend(self._mat4_invert(world[id(bone)]))
         
         # Write to buffer
         return self._add_accessor(
@@ -345,12 +474,9 @@ class GLTFExporter:
     
     def _mat4_multiply(self, a: List[float], b: List[float]) -> List[float]:
         """Multiply two 4x4 matrices (column-major)."""
-        result = [0.0] * 16
-        for col in range(4):
-            for row in range(4):
-                for k in range(4):
-                    result[col * 4 + row] += a[k * 4 + row] * b[col * 4 + k]
-        return result
+        return [a[row] * b[col] + a[4 + row] * b[col + 1] +
+                a[8 + row] * b[col + 2] + a[12 + row] * b[col + 3]
+                for col in (0, 4, 8, 12) for row in range(4)]
     
     def _mat4_invert(self, m: List[float]) -> List[float]:
         """Invert a 4x4 matrix."""
@@ -377,65 +503,41 @@ class GLTFExporter:
     def _add_mesh(self, mesh: BMFMesh, skeleton: Optional[Skeleton] = None) -> int:
         """Add mesh geometry and return mesh index."""
         
-        # Prepare vertex data
-        positions = []
-        normals = []
-        texcoords = []
-        
-        pos_min = [float('inf')] * 3
-        pos_max = [float('-inf')] * 3
-        
-        for v in mesh.vertices:
-            # Negate X per FreeSO convention
-            x, y, z = -v.x, v.y, v.z
-            positions.extend([x, y, z])
-            
-            pos_min[0] = min(pos_min[0], x)
-            pos_min[1] = min(pos_min[1], y)
-            pos_min[2] = min(pos_min[2], z)
-            pos_max[0] = max(pos_max[0], x)
-            pos_max[1] = max(pos_max[1], y)
-            pos_max[2] = max(pos_max[2], z)
-            
-            # Use actual normals (negate X for consistency)
-            nx, ny, nz = -v.nx, v.ny, v.nz
-            normals.extend([nx, ny, nz])
-        
-        for tc in mesh.texture_coords:
-            # Support both tuple (u, v) and object (tc.u, tc.v)
-            if isinstance(tc, tuple):
-                u, v = tc
-            else:
-                u, v = tc.u, tc.v
-            texcoords.extend([u, 1.0 - v])  # Flip V for glTF
-        
+        # Typed arrays straight from the reader (or packed from the object lists)
+        arrays = mesh_arrays(mesh)
+        vertex_count = arrays.vertex_count
+
+        # Negate X per FreeSO convention (normals too, for consistency)
+        positions = affine_components(arrays.positions, 3, (-1.0, 1.0, 1.0), (0.0, 0.0, 0.0))
+        normals = affine_components(arrays.normals, 3, (-1.0, 1.0, 1.0), (0.0, 0.0, 0.0))
+
+        # Flip V for glTF
+        texcoords = affine_components(arrays.uvs, 2, (1.0, -1.0), (0.0, 1.0))
+
+        # Bounds of the float32 values actually written
+        pos_min, pos_max = component_bounds(positions, 3) if vertex_count else (None, None)
+
         # Create accessors
         pos_accessor = self._add_accessor(
-            positions, 'VEC3', 5126, len(mesh.vertices),
+            positions, 'VEC3', 5126, vertex_count,
             min_val=pos_min, max_val=pos_max
         )
-        
+
         norm_accessor = self._add_accessor(
-            normals, 'VEC3', 5126, len(mesh.vertices)
+            normals, 'VEC3', 5126, vertex_count
         )
-        
+
         uv_accessor = None
-        if texcoords:
+        if arrays.uv_count:
             uv_accessor = self._add_accessor(
-                texcoords, 'VEC2', 5126, len(mesh.texture_coords)
+                texcoords, 'VEC2', 5126, arrays.uv_count
             )
-        
-        # Indices
-        indices = []
-        for face in mesh.faces:
-            # Support both tuple (i0, i1, i2) and object (face.a, face.b, face.c)
-            if isinstance(face, tuple):
-                indices.extend(face)
-            else:
-                indices.extend([face.a, face.b, face.c])
-        
+
+        # Indices - UNSIGNED_SHORT unless the mesh needs 0xFFFF (reserved) or more
+        index_type = 5123 if vertex_count < 0xFFFF else 5125
         idx_accessor = self._add_accessor(
-            indices, 'SCALAR', 5123, len(indices), is_indices=True
+            as_components(arrays.faces, index_type), 'SCALAR', index_type, arrays.face_count * 3,
+            is_indices=True
         )
         
         # Build primitive
@@ -451,14 +553,14 @@ class GLTFExporter:
             primitive["attributes"]["TEXCOORD_0"] = uv_accessor
         
         # Add skinning weights if skeleton present
-        if skeleton and mesh.bone_bindings:
-            joints, weights = self._create_skin_data(mesh, skeleton)
-            if joints:
+        if skeleton and arrays.binding_count:
+            joints, weights = self._create_skin_data(mesh, skeleton, arrays)
+            if len(joints):
                 joints_accessor = self._add_accessor(
-                    joints, 'VEC4', 5121, len(mesh.vertices)
+                    joints, 'VEC4', joint_component_type(len(skeleton.bones)), vertex_count
                 )
                 weights_accessor = self._add_accessor(
-                    weights, 'VEC4', 5126, len(mesh.vertices)
+                    weights, 'VEC4', 5126, vertex_count
                 )
                 primitive["attributes"]["JOINTS_0"] = joints_accessor
                 primitive["attributes"]["WEIGHTS_0"] = weights_accessor
@@ -480,7 +582,8 @@ class GLTFExporter:
         
         return mesh_index
     
-    def _create_skin_data(self, mesh: BMFMesh, skeleton: Skeleton) -> Tuple[List, List]:
+    def _create_skin_data(self, mesh: BMFMesh, skeleton: Skeleton,
+                          arrays: Optional[MeshArrays] = None) -> Tuple:
         """Create joint indices and weights for skinning.
         
         The mesh has:
@@ -489,7 +592,11 @@ class GLTFExporter:
         - vertices: Real vertices
         - blend_data: Blend weights for multi-bone influence
         
-        We need to map mesh bones -> skeleton joint indices.
+        We need to map mesh bones -> skeleton joint indices. Bindings and
+        blend data are read from arrays (default: mesh_arrays(mesh)).
+
+        Returns flat typed buffers: 4 joints (UNSIGNED_BYTE, or UNSIGNED_SHORT
+        for skeletons over 256 bones) and 4 weights (FLOAT) per vertex.
         """
         # Build mesh bone name -> skeleton joint index map
         skeleton_joint_map = {}
@@ -502,40 +609,35 @@ class GLTFExporter:
             skel_idx = skeleton_joint_map.get(bone_name.upper(), 0)
             mesh_to_skel[mesh_idx] = skel_idx
         
-        # Initialize per-vertex joint/weight arrays
-        num_verts = len(mesh.vertices)
-        joints = [[0, 0, 0, 0] for _ in range(num_verts)]
-        weights = [[0.0, 0.0, 0.0, 0.0] for _ in range(num_verts)]
-        
-        # Assign joints from bone bindings (real vertices)
-        for binding in mesh.bone_bindings:
-            skel_joint = mesh_to_skel.get(binding.bone_index, 0)
-            start = binding.first_real_vertex
-            count = binding.real_vertex_count
-            
-            for i in range(start, min(start + count, num_verts)):
-                joints[i][0] = skel_joint
-                weights[i][0] = 1.0
-        
+        if arrays is None:
+            arrays = mesh_arrays(mesh)
+
+        # Flat per-vertex joint/weight slots (4 per vertex)
+        num_verts = arrays.vertex_count
+        joints = [0] * (num_verts * 4)
+        weights = [0.0] * (num_verts * 4)
+
+        # Assign joints from bone bindings (real vertices), one slice per binding
+        for bone_index, start, count, _, _ in arrays.binding_rows():
+            skel_joint = mesh_to_skel.get(bone_index, 0)
+            end = min(start + count, num_verts)
+            if start < end:
+                joints[start * 4:end * 4:4] = [skel_joint] * (end - start)
+                weights[start * 4:end * 4:4] = [1.0] * (end - start)
+
         # Apply blend data for smooth skinning
-        if mesh.blend_data:
-            for i, blend in enumerate(mesh.blend_data):
-                if i < num_verts:
-                    # Weight for primary bone
-                    weights[i][0] = blend.weight
-                    # Blend with other vertex's bone
-                    if blend.other_vertex < num_verts:
-                        joints[i][1] = joints[blend.other_vertex][0]
-                        weights[i][1] = 1.0 - blend.weight
-        
-        # Flatten to lists
-        flat_joints = []
-        flat_weights = []
-        for j, w in zip(joints, weights):
-            flat_joints.extend(j)
-            flat_weights.extend(w)
-        
-        return flat_joints, flat_weights
+        for i, (weight, other_vertex) in enumerate(arrays.blend_rows()):
+            if i >= num_verts:
+                break
+            # Weight for primary bone
+            weights[i * 4] = weight
+            # Blend with other vertex's bone
+            if other_vertex < num_verts:
+                joints[i * 4 + 1] = joints[other_vertex * 4]
+                weights[i * 4 + 1] = 1.0 - weight
+
+        return (as_components(joints, joint_component_type(len(skeleton.bones))),
+                as_components(weights, 5126))
     
     def _add_material(self, texture_name: str) -> int:
         """Add a material with texture reference."""
@@ -644,47 +746,33 @@ class GLTFExporter:
                 "channels": channels
             })
     
-    def _add_accessor(self, data: List, accessor_type: str, 
-                      component_type: int, count: int,
-                      min_val: List = None, max_val: List = None,
-                      is_indices: bool = False) -> int:
-        """Add data to buffer and create accessor."""
-        
-        # Align buffer
-        alignment = 4
-        while len(self.buffer_data) % alignment:
-            self.buffer_data.append(0)
-        
-        byte_offset = len(self.buffer_data)
-        
-        # Write data based on type
-        if component_type == 5126:  # FLOAT
-            for val in data:
-                self.buffer_data.extend(struct.pack('<f', float(val)))
-        elif component_type == 5123:  # UNSIGNED_SHORT
-            for val in data:
-                self.buffer_data.extend(struct.pack('<H', int(val)))
-        elif component_type == 5121:  # UNSIGNED_BYTE
-            for val in data:
-                self.buffer_data.append(int(val) & 0xFF)
-        
-        byte_length = len(self.buffer_data) - byte_offset
-        
-        # Create buffer view
+    def _add_buffer_view(self, data: bytes, target: Optional[int] = None) -> int:
+        """Append 4-byte aligned data to the buffer and create a buffer view."""
+        self.buffer_data.extend(b'\0' * (-len(self.buffer_data) % 4))
+
         view = {
             "buffer": 0,
-            "byteOffset": byte_offset,
-            "byteLength": byte_length
+            "byteOffset": len(self.buffer_data),
+            "byteLength": len(data)
         }
-        
-        if is_indices:
-            view["target"] = 34963  # ELEMENT_ARRAY_BUFFER
-        else:
-            view["target"] = 34962  # ARRAY_BUFFER
-        
+        if target is not None:
+            view["target"] = target
+        self.buffer_data.extend(data)
+
         view_index = len(self.buffer_views)
         self.buffer_views.append(view)
-        
+        return view_index
+
+    def _add_accessor(self, data, accessor_type: str,
+                      component_type: int, count: int,
+                      min_val: List = None, max_val: List = None,
+                      is_indices: bool = False) -> int:
+        """Add data (list, array.array or NumPy array) to buffer and create accessor."""
+        view_index = self._add_buffer_view(
+            pack_components(data, component_type),
+            34963 if is_indices else 34962  # ELEMENT_ARRAY_BUFFER / ARRAY_BUFFER
+        )
+
         # Create accessor
         accessor = {
             "bufferView": view_index,
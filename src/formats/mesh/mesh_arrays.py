@@ -0,0 +1,284 @@
+"""
+Mesh Arrays - Struct-of-arrays mesh storage for BMF/SKN meshes
+
+A body mesh holds thousands of vertices. Instead of one Vertex,
+TextureVertex, BlendData and BoneBinding object per element, readers decode
+each section in bulk into typed arrays:
+
+  positions, normals              float32, (n, 3)
+  blend_positions, blend_normals  float32, (b, 3)
+  faces                           int32,   (m, 3)
+  uvs                             float32, (k, 2)
+  blend_weights / blend_others    float32 / int32, (j,)
+  bone_bindings                   int32,   (p, 5)  bone, first real, real count,
+                                                   first blend, blend count
+
+With NumPy these are ndarrays of the shapes above; without it they are flat
+array.array buffers holding the same row-major values.
+
+The old object lists stay available as LazyList views that build their
+objects on first use (len() never does), so existing code keeps working
+while code that only needs the arrays never allocates them.
+
+Usage:
+    mesh = BMFReader().read_file("body.bmf")
+    arrays = mesh_arrays(mesh)        # No Vertex objects created
+    mesh.vertices[0]                  # Builds the Vertex list once
+"""
+
+import sys
+from array import array
+from collections import UserList
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Optional: (n, 3) ndarrays instead of flat array.array
+    np = None
+
+
+# Typecode -> little-endian NumPy dtype
+DTYPES = {'f': '<f4', 'i': '<i4'}
+
+# Mesh attributes that readers fill with LazyList object views
+OBJECT_VIEWS = ('vertices', 'blend_vertices', 'faces', 'texture_coords', 'blend_data', 'bone_bindings')
+
+
+def decode_array(data, typecode: str, width: int = 1):
+    """Decode little-endian 32-bit values from a buffer in one call."""
+    if np is not None:
+        values = np.frombuffer(data, dtype=DTYPES[typecode])
+        return values.reshape(-1, width) if width > 1 else values
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values
+
+
+def from_values(values: Iterable, typecode: str, width: int = 1):
+    """Typed array (rows of width) from a flat iterable of numbers."""
+    if np is not None:
+        values = np.fromiter(values, dtype=DTYPES[typecode])
+        return values.reshape(-1, width) if width > 1 else values
+    return array(typecode, values)
+
+
+def take_columns(data, width: int, start: int, stop: int):
+    """Columns start:stop of a width-wide typed array."""
+    if np is not None and isinstance(data, np.ndarray):
+        return data[:, start:stop]
+    out_width = stop - start
+    out = array(data.typecode, bytes(data.itemsize * out_width * (len(data) // width)))
+    for k in range(out_width):
+        out[k::out_width] = data[start + k::width]
+    return out
+
+
+def row_count(data, width: int = 1) -> int:
+    """Number of width-wide rows in a typed array."""
+    if np is not None and isinstance(data, np.ndarray):
+        return data.shape[0]
+    return len(data) // width
+
+
+def iter_rows(data, width: int) -> Iterator[tuple]:
+    """Rows of a typed array as tuples of Python numbers."""
+    if np is not None and isinstance(data, np.ndarray):
+        return map(tuple, data.tolist())
+    return zip(*(data[k::width] for k in range(width)))
+
+
+def column(data, width: int, index: int):
+    """One column of a width-wide typed array, as a 1-D typed array."""
+    if np is not None and isinstance(data, np.ndarray):
+        return data[:, index]
+    return data[index::width]
+
+
+def scaled(data, factor: float):
+    """float32 copy of a 1-D typed array multiplied by factor."""
+    if np is not None and isinstance(data, np.ndarray):
+        return data.astype(np.float32) * np.float32(factor)
+    return array('f', [v * factor for v in data])
+
+
+def to_list(data) -> list:
+    """Values of a 1-D typed array as Python numbers."""
+    return data.tolist()
+
+
+class LazyList(UserList):
+    """
+    List built by a callback on first use.
+
+    len() and truthiness use the known length without building; any other
+    access builds the list once. Assigning a new list to the attribute
+    holding a LazyList simply replaces it. Operations that make a new list
+    (+, *, slicing, copy) return plain lists, and a LazyList pickles or
+    deep-copies as its built list.
+    """
+
+    def __init__(self, build: Callable[[], list], length: int):
+        self._build = build
+        self._length = length
+        self._data: Optional[list] = None
+
+    @property
+    def data(self) -> list:
+        if self._data is None:
+            self._data = self._build()
+            self._build = None
+        return self._data
+
+    @data.setter
+    def data(self, value: list):
+        self._data = value
+
+    @property
+    def materialized(self) -> bool:
+        return self._data is not None
+
+    def __len__(self) -> int:
+        return len(self._data) if self._data is not None else self._length
+
+    def __getitem__(self, i):
+        return self.data[i]
+
+    def __add__(self, other) -> list:
+        return self.data + list(other)
+
+    def __radd__(self, other) -> list:
+        return list(other) + self.data
+
+    def __mul__(self, n) -> list:
+        return self.data * n
+
+    __rmul__ = __mul__
+
+    def copy(self) -> list:
+        return self.data.copy()
+
+    __copy__ = copy
+
+    def __reduce__(self):
+        # The build callback is usually a lambda, which can't be pickled
+        return (list, (self.data,))
+
+    def __repr__(self) -> str:
+        if self._data is None:
+            return f"<LazyList of {self._length} (not built)>"
+        return repr(self._data)
+
+
+@dataclass
+class MeshArrays:
+    """Typed-array form of a mesh (see module docstring for layouts)."""
+    positions: object
+    normals: object
+    faces: object
+    uvs: object
+    blend_weights: object
+    blend_others: object
+    bone_bindings: object
+    blend_positions: object = None
+    blend_normals: object = None
+
+    def __post_init__(self):
+        if self.blend_positions is None:
+            self.blend_positions = from_values((), 'f', 3)
+        if self.blend_normals is None:
+            self.blend_normals = from_values((), 'f', 3)
+
+    @property
+    def vertex_count(self) -> int:
+        return row_count(self.positions, 3)
+
+    @property
+    def blend_vertex_count(self) -> int:
+        return row_count(self.blend_positions, 3)
+
+    @property
+    def face_count(self) -> int:
+        return row_count(self.faces, 3)
+
+    @property
+    def uv_count(self) -> int:
+        return row_count(self.uvs, 2)
+
+    @property
+    def blend_count(self) -> int:
+        return row_count(self.blend_weights)
+
+    @property
+    def binding_count(self) -> int:
+        return row_count(self.bone_bindings, 5)
+
+    # ------------------------------------------------------------------
+    # Rows for object views
+    # ------------------------------------------------------------------
+
+    def vertex_rows(self) -> Iterator[Tuple[float, ...]]:
+        """(x, y, z, nx, ny, nz) per real vertex."""
+        return (p + n for p, n in zip(iter_rows(self.positions, 3), iter_rows(self.normals, 3)))
+
+    def blend_vertex_rows(self) -> Iterator[Tuple[float, ...]]:
+        """(x, y, z, nx, ny, nz) per blend vertex."""
+        return (p + n for p, n in zip(iter_rows(self.blend_positions, 3),
+                                      iter_rows(self.blend_normals, 3)))
+
+    def face_rows(self) -> Iterator[Tuple[int, int, int]]:
+        return iter_rows(self.faces, 3)
+
+    def uv_rows(self) -> Iterator[Tuple[float, float]]:
+        return iter_rows(self.uvs, 2)
+
+    def blend_rows(self) -> Iterator[Tuple[float, int]]:
+        """(weight, other_vertex) per blend entry."""
+        return zip(to_list(self.blend_weights), to_list(self.blend_others))
+
+    def binding_rows(self) -> Iterator[Tuple[int, ...]]:
+        return iter_rows(self.bone_bindings, 5)
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_objects(cls, mesh) -> 'MeshArrays':
+        """Pack a mesh's object lists (Vertex, BlendData, ... or tuples)."""
+        vertices = list(mesh.vertices)
+        blend_vertices = list(getattr(mesh, 'blend_vertices', None) or ())
+        blend_data = list(mesh.blend_data)
+        return cls(
+            positions=from_values([c for v in vertices for c in (v.x, v.y, v.z)], 'f', 3),
+            normals=from_values([c for v in vertices for c in (v.nx, v.ny, v.nz)], 'f', 3),
+            faces=from_values([i for f in mesh.faces
+                               for i in (f if isinstance(f, (tuple, list)) else (f.a, f.b, f.c))], 'i', 3),
+            uvs=from_values([c for tc in mesh.texture_coords
+                             for c in (tc if isinstance(tc, (tuple, list)) else (tc.u, tc.v))], 'f', 2),
+            blend_weights=from_values([b.weight for b in blend_data], 'f'),
+            blend_others=from_values([b.other_vertex for b in blend_data], 'i'),
+            bone_bindings=from_values([c for b in mesh.bone_bindings
+                                       for c in (b.bone_index, b.first_real_vertex, b.real_vertex_count,
+                                                 b.first_blend_vertex, b.blend_vertex_count)], 'i', 5),
+            blend_positions=from_values([c for v in blend_vertices for c in (v.x, v.y, v.z)], 'f', 3),
+            blend_normals=from_values([c for v in blend_vertices for c in (v.nx, v.ny, v.nz)], 'f', 3),
+        )
+
+
+def mesh_arrays(mesh) -> MeshArrays:
+    """
+    Struct-of-arrays form of a BMF/SKN (or compatible) mesh.
+
+    Returns the arrays the reader decoded while none of the mesh's object
+    views have been built or replaced; otherwise packs the object lists,
+    so edits made through the objects are respected.
+    """
+    arrays = getattr(mesh, 'arrays', None)
+    if arrays is not None:
+        views = [getattr(mesh, name) for name in OBJECT_VIEWS if hasattr(mesh, name)]
+        if all(isinstance(v, LazyList) and not v.materialized for v in views):
+            return arrays
+    return MeshArrays.from_objects(mesh)
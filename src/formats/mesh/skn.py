@@ -19,12 +19,18 @@ SKN Text Format:
   Blends: "weight other_vertex" (one per line)
   Vertex count
   Vertices: "x y z nx ny nz" (one per line)
+
+Numeric sections are parsed straight into a MeshArrays (see mesh_arrays);
+the vertex/blend/binding object lists are built lazily on first use.
 """
 
 from dataclasses import dataclass, field
+from itertools import chain
 from pathlib import Path
 from typing import List, Tuple, Optional
 
+from .mesh_arrays import MeshArrays, LazyList, mesh_arrays, from_values, take_columns
+
 
 @dataclass
 class SKNBoneBinding:
@@ -73,7 +79,31 @@ class SKNMesh:
     texture_coords: List[Tuple[float, float]] = field(default_factory=list)
     blend_data: List[SKNBlendData] = field(default_factory=list)
     vertices: List[SKNVertex] = field(default_factory=list)
-    
+
+    # Typed arrays parsed by SKNReader (the lists above are lazy views of them)
+    arrays: Optional[MeshArrays] = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def from_arrays(cls, arrays: MeshArrays, mesh_name: str = "", texture_name: str = "",
+                    bone_names: Optional[List[str]] = None) -> 'SKNMesh':
+        """Mesh backed by arrays, with object lists built on first use."""
+        return cls(
+            mesh_name=mesh_name,
+            texture_name=texture_name,
+            bone_names=bone_names or [],
+            faces=LazyList(lambda: list(arrays.face_rows()), arrays.face_count),
+            bone_bindings=LazyList(lambda: [SKNBoneBinding(*r) for r in arrays.binding_rows()],
+                                   arrays.binding_count),
+            texture_coords=LazyList(lambda: list(arrays.uv_rows()), arrays.uv_count),
+            blend_data=LazyList(lambda: [SKNBlendData(*r) for r in arrays.blend_rows()], arrays.blend_count),
+            vertices=LazyList(lambda: [SKNVertex(*r) for r in arrays.vertex_rows()], arrays.vertex_count),
+            arrays=arrays,
+        )
+
+    def to_arrays(self) -> MeshArrays:
+        """Typed-array form (the parsed arrays unless the object lists were used)."""
+        return mesh_arrays(self)
+
     @property
     def vertex_count(self) -> int:
         return len(self.vertices)
@@ -125,6 +155,21 @@ class SKNReader:
             if line and not line.startswith('//'):
                 return line
         return ""
+
+    def _next_rows(self, count: int, width: int) -> List[List[str]]:
+        """First width fields of the next count lines (lines with fewer fields are skipped)."""
+        rows = []
+        for _ in range(count):
+            parts = self._next_line().split()
+            if len(parts) >= width:
+                rows.append(parts[:width])
+        return rows
+
+    def _read_section(self, count: int, width: int, typecode: str):
+        """Parse count lines of width numbers into a typed array."""
+        convert = float if typecode == 'f' else int
+        rows = self._next_rows(count, width)
+        return from_values(map(convert, chain.from_iterable(rows)), typecode, width)
     
     def _parse(self) -> SKNMesh:
         """Parse SKN content."""
@@ -145,69 +190,46 @@ class SKNReader:
         
         # Face count
         face_count = int(self._next_line())
-        
+
         # Faces (v0 v1 v2)
-        for _ in range(face_count):
-            parts = self._next_line().split()
-            if len(parts) >= 3:
-                mesh.faces.append((int(parts[0]), int(parts[1]), int(parts[2])))
-        
+        faces = self._read_section(face_count, 3, 'i')
+
         # Bone binding count
         binding_count = int(self._next_line())
-        
-        # Bone bindings
-        for _ in range(binding_count):
-            parts = self._next_line().split()
-            if len(parts) >= 5:
-                binding = SKNBoneBinding(
-                    bone_index=int(parts[0]),
-                    first_real_vertex=int(parts[1]),
-                    real_vertex_count=int(parts[2]),
-                    first_blend_vertex=int(parts[3]),
-                    blend_vertex_count=int(parts[4])
-                )
-                mesh.bone_bindings.append(binding)
-        
+
+        # Bone bindings (bone_idx first_real real_count first_blend blend_count)
+        bone_bindings = self._read_section(binding_count, 5, 'i')
+
         # UV count
         uv_count = int(self._next_line())
-        
+
         # UVs
-        for _ in range(uv_count):
-            parts = self._next_line().split()
-            if len(parts) >= 2:
-                mesh.texture_coords.append((float(parts[0]), float(parts[1])))
-        
+        uvs = self._read_section(uv_count, 2, 'f')
+
         # Blend data count
         blend_count = int(self._next_line())
-        
-        # Blend data
-        for _ in range(blend_count):
-            parts = self._next_line().split()
-            if len(parts) >= 2:
-                blend = SKNBlendData(
-                    weight=float(parts[0]),
-                    other_vertex=int(parts[1])
-                )
-                mesh.blend_data.append(blend)
-        
+
+        # Blend data (weight other_vertex)
+        blend = self._next_rows(blend_count, 2)
+        blend_weights = from_values((float(weight) for weight, _ in blend), 'f')
+        blend_others = from_values((int(other) for _, other in blend), 'i')
+
         # Vertex count
         vertex_count = int(self._next_line())
-        
+
         # Vertices (x y z nx ny nz)
-        for _ in range(vertex_count):
-            parts = self._next_line().split()
-            if len(parts) >= 6:
-                vertex = SKNVertex(
-                    x=float(parts[0]),
-                    y=float(parts[1]),
-                    z=float(parts[2]),
-                    nx=float(parts[3]),
-                    ny=float(parts[4]),
-                    nz=float(parts[5])
-                )
-                mesh.vertices.append(vertex)
-        
-        return mesh
+        vertices = self._read_section(vertex_count, 6, 'f')
+
+        arrays = MeshArrays(
+            positions=take_columns(vertices, 6, 0, 3),
+            normals=take_columns(vertices, 6, 3, 6),
+            faces=faces,
+            uvs=uvs,
+            blend_weights=blend_weights,
+            blend_others=blend_others,
+            bone_bindings=bone_bindings,
+        )
+        return SKNMesh.from_arrays(arrays, mesh.mesh_name, mesh.texture_name, mesh.bone_names)
 
 
 def export_skn_to_obj(mesh: SKNMesh, output_path: str, include_normals: bool = True):
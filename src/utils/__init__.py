@@ -1,5 +1,6 @@
 """Utils package."""
 
 from .binary import ByteOrder, IoBuffer
+from . import refpack
 
-__all__ = ['ByteOrder', 'IoBuffer']
+__all__ = ['ByteOrder', 'IoBuffer', 'refpack']
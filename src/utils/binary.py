@@ -1,9 +1,16 @@
-"""Clean binary I/O utilities for IFF parsing."""
+"""Clean binary I/O utilities for IFF parsing.
 
+IoBuffer is a zero-copy reader over a memoryview. Files are mapped with
+mmap where possible, position is a plain integer, and every scalar read
+goes through a precompiled struct.Struct for the buffer's byte order.
+"""
+
+import mmap
 import struct
 from enum import Enum
-from typing import BinaryIO
-from io import BytesIO
+from functools import lru_cache
+from itertools import chain
+from typing import BinaryIO, Iterator, Optional, Union
 
 
 class ByteOrder(Enum):
@@ -12,135 +19,332 @@ class ByteOrder(Enum):
     LITTLE_ENDIAN = "<"
 
 
+# Precompiled scalar structs, one table per byte order
+_SCALAR_CODES = "bBhHiIqQfd"
+_STRUCTS: dict[ByteOrder, dict[str, struct.Struct]] = {
+    order: {code: struct.Struct(order.value + code) for code in _SCALAR_CODES}
+    for order in ByteOrder
+}
+
+
+@lru_cache(maxsize=256)
+def _compiled(fmt: str) -> struct.Struct:
+    """Cache compiled structs for ad-hoc and bulk formats."""
+    return struct.Struct(fmt)
+
+
+BufferSource = Union[bytes, bytearray, memoryview, mmap.mmap, BinaryIO]
+
+
 class IoBuffer:
     """Binary reader with endian support."""
-    
-    def __init__(self, stream: BinaryIO, byte_order: ByteOrder = ByteOrder.LITTLE_ENDIAN):
-        self.stream = stream
+
+    def __init__(self, source: BufferSource, byte_order: ByteOrder = ByteOrder.LITTLE_ENDIAN):
+        if hasattr(source, 'read') and not isinstance(source, mmap.mmap):
+            # File-like object: consume from its current position
+            source = source.read()
+        self._data = source
+        self._view = memoryview(source).cast('B') if source is not None else memoryview(b'')
+        self._size = len(self._view)
+        self._mmap: Optional[mmap.mmap] = source if isinstance(source, mmap.mmap) else None
+        self.pos = 0
         self.byte_order = byte_order
-    
+
     @classmethod
-    def from_bytes(cls, data: bytes, byte_order: ByteOrder = ByteOrder.LITTLE_ENDIAN) -> 'IoBuffer':
-        """Create from bytes."""
-        return cls(BytesIO(data), byte_order)
-    
+    def from_bytes(cls, data: Union[bytes, bytearray, memoryview],
+                   byte_order: ByteOrder = ByteOrder.LITTLE_ENDIAN) -> 'IoBuffer':
+        """Create from bytes (or any buffer) without copying."""
+        return cls(data, byte_order)
+
     @classmethod
     def from_file(cls, filepath: str, byte_order: ByteOrder = ByteOrder.LITTLE_ENDIAN) -> 'IoBuffer':
-        """Create from file path."""
+        """Create from file path, memory-mapping the file when possible."""
         with open(filepath, 'rb') as f:
-            data = f.read()
-        return cls.from_bytes(data, byte_order)
-    
+            return cls.from_stream(f, byte_order)
+
+    @classmethod
+    def from_stream(cls, stream: BinaryIO, byte_order: ByteOrder = ByteOrder.LITTLE_ENDIAN) -> 'IoBuffer':
+        """Create from an open binary stream (whole contents, mmap if file-backed)."""
+        try:
+            mapped = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+            return cls(mapped, byte_order)
+        except (AttributeError, OSError, ValueError):
+            # Not a real file (BytesIO), empty file, or mmap unavailable
+            if hasattr(stream, 'seek'):
+                stream.seek(0)
+            return cls(stream.read(), byte_order)
+
+    # -- Lifetime --------------------------------------------------------------
+
+    def close(self):
+        """Release the view and unmap the file, if any."""
+        self._view.release()
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Slices handed out by read_view() are still alive; the map
+                # is released when the last of them is garbage collected.
+                pass
+            self._mmap = None
+
+    def __enter__(self) -> 'IoBuffer':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # -- Byte order ------------------------------------------------------------
+
+    @property
+    def byte_order(self) -> ByteOrder:
+        return self._byte_order
+
+    @byte_order.setter
+    def byte_order(self, value: ByteOrder):
+        """Switch byte order, rebinding the precompiled unpackers."""
+        self._byte_order = value
+        table = _STRUCTS[value]
+        self._s16 = table['h']
+        self._u16 = table['H']
+        self._s32 = table['i']
+        self._u32 = table['I']
+        self._f32 = table['f']
+        self._f64 = table['d']
+
+    # -- Position --------------------------------------------------------------
+
     @property
     def position(self) -> int:
-        """Current position in stream."""
-        return self.stream.tell()
-    
+        """Current position in buffer."""
+        return self.pos
+
     @position.setter
     def position(self, value: int):
         """Seek to position."""
-        self.stream.seek(value)
-    
+        self.pos = value
+
+    def tell(self) -> int:
+        return self.pos
+
+    @property
+    def size(self) -> int:
+        """Total buffer length in bytes."""
+        return self._size
+
+    def __len__(self) -> int:
+        return self._size
+
     @property
     def has_more(self) -> bool:
         """Check if there are more bytes to read."""
-        current = self.stream.tell()
-        self.stream.seek(0, 2)  # Seek to end
-        end = self.stream.tell()
-        self.stream.seek(current)  # Seek back
-        return current < end
-    
+        return self.pos < self._size
+
     def has_bytes(self, num_bytes: int) -> bool:
         """Check if there are at least num_bytes remaining."""
-        current = self.stream.tell()
-        self.stream.seek(0, 2)  # Seek to end
-        end = self.stream.tell()
-        self.stream.seek(current)  # Seek back
-        return (end - current) >= num_bytes
-    
+        return self._size - self.pos >= num_bytes
+
+    def remaining(self) -> int:
+        """Number of unread bytes."""
+        return max(0, self._size - self.pos)
+
+    @property
+    def remaining_bytes(self) -> int:
+        """Number of unread bytes (property form)."""
+        return max(0, self._size - self.pos)
+
     def skip(self, num_bytes: int):
         """Skip bytes from current position."""
-        self.stream.seek(num_bytes, 1)
-    
+        self.pos += num_bytes
+
     def seek(self, offset: int, whence: int = 0):
-        """Seek in stream (whence: 0=start, 1=current, 2=end)."""
-        self.stream.seek(offset, whence)
-    
+        """Seek in buffer (whence: 0=start, 1=current, 2=end)."""
+        if whence == 1:
+            self.pos += offset
+        elif whence == 2:
+            self.pos = self._size + offset
+        else:
+            self.pos = offset
+
+    # -- Raw reads -------------------------------------------------------------
+
+    def read_view(self, count: int) -> memoryview:
+        """Read raw bytes as a zero-copy memoryview slice."""
+        start = self.pos
+        end = min(start + count, self._size)
+        self.pos = end
+        return self._view[start:end]
+
+    def view_at(self, offset: int, count: int) -> memoryview:
+        """Zero-copy slice at an absolute offset; position is unchanged (pread-style)."""
+        return self._view[offset:min(offset + count, self._size)]
+
     def read_bytes(self, count: int) -> bytes:
-        """Read raw bytes."""
-        return self.stream.read(count)
-    
+        """Read raw bytes (copies only the requested slice)."""
+        start = self.pos
+        end = min(start + count, self._size)
+        self.pos = end
+        return self._view[start:end].tobytes()
+
+    def sub_buffer(self, count: int, byte_order: Optional[ByteOrder] = None) -> 'IoBuffer':
+        """Return a new IoBuffer over the next count bytes (no copy)."""
+        return IoBuffer(self.read_view(count), byte_order or self._byte_order)
+
     def read_byte(self) -> int:
         """Read single byte (0-255)."""
-        return self.stream.read(1)[0]
-    
+        value = self._view[self.pos]
+        self.pos += 1
+        return value
+
     def read_uint8(self) -> int:
         """Read unsigned 8-bit integer."""
         return self.read_byte()
-    
+
     def read_sbyte(self) -> int:
         """Read signed byte (-128 to 127)."""
-        return struct.unpack('b', self.stream.read(1))[0]
-    
+        value = self._view[self.pos]
+        self.pos += 1
+        return value - 256 if value > 127 else value
+
+    # -- Scalar reads ----------------------------------------------------------
+
     def read_uint16(self) -> int:
         """Read unsigned 16-bit integer."""
-        fmt = f"{self.byte_order.value}H"
-        return struct.unpack(fmt, self.stream.read(2))[0]
-    
+        value = self._u16.unpack_from(self._view, self.pos)[0]
+        self.pos += 2
+        return value
+
     def read_int16(self) -> int:
         """Read signed 16-bit integer."""
-        fmt = f"{self.byte_order.value}h"
-        return struct.unpack(fmt, self.stream.read(2))[0]
-    
+        value = self._s16.unpack_from(self._view, self.pos)[0]
+        self.pos += 2
+        return value
+
     def read_uint32(self) -> int:
         """Read unsigned 32-bit integer."""
-        fmt = f"{self.byte_order.value}I"
-        return struct.unpack(fmt, self.stream.read(4))[0]
-    
+        value = self._u32.unpack_from(self._view, self.pos)[0]
+        self.pos += 4
+        return value
+
     def read_int32(self) -> int:
         """Read signed 32-bit integer."""
-        fmt = f"{self.byte_order.value}i"
-        return struct.unpack(fmt, self.stream.read(4))[0]
-    
+        value = self._s32.unpack_from(self._view, self.pos)[0]
+        self.pos += 4
+        return value
+
     def read_float(self) -> float:
         """Read 32-bit float."""
-        fmt = f"{self.byte_order.value}f"
-        return struct.unpack(fmt, self.stream.read(4))[0]
-    
+        value = self._f32.unpack_from(self._view, self.pos)[0]
+        self.pos += 4
+        return value
+
     def read_double(self) -> float:
         """Read 64-bit double."""
-        fmt = f"{self.byte_order.value}d"
-        return struct.unpack(fmt, self.stream.read(8))[0]
-    
+        value = self._f64.unpack_from(self._view, self.pos)[0]
+        self.pos += 8
+        return value
+
+    # -- Bulk reads ------------------------------------------------------------
+
+    def _resolve(self, fmt: str) -> str:
+        """Prefix fmt with this buffer's byte order unless it carries its own."""
+        if fmt and fmt[0] in '<>!=@':
+            return fmt
+        return self._byte_order.value + fmt
+
+    def unpack(self, fmt: str) -> tuple:
+        """Read one struct record (e.g. '>4sIHH') and advance past it."""
+        compiled = _compiled(self._resolve(fmt))
+        values = compiled.unpack_from(self._view, self.pos)
+        self.pos += compiled.size
+        return values
+
+    def read_array(self, fmt: str, count: int) -> tuple:
+        """
+        Read count consecutive items of fmt as a flat tuple.
+
+        read_array('<H', n) returns n uint16 values in one unpack call.
+        """
+        if count <= 0:
+            return ()
+        fmt = self._resolve(fmt)
+        order, codes = fmt[0], fmt[1:]
+        if len(set(codes)) == 1 and codes.isalpha():
+            # Homogeneous records ('<H', '<fff'): one short '<{n}{code}' format
+            compiled = _compiled(f"{order}{count * len(codes)}{codes[0]}")
+            values = compiled.unpack_from(self._view, self.pos)
+            self.pos += compiled.size
+            return values
+        # Mixed records: unpack record by record rather than cache a huge format
+        return tuple(chain.from_iterable(self.iter_records(fmt, count)))
+
+    def iter_records(self, fmt: str, count: int) -> Iterator[tuple]:
+        """Iterate count fixed-size records of fmt (e.g. '<iii' faces)."""
+        compiled = _compiled(self._resolve(fmt))
+        start = self.pos
+        end = start + compiled.size * max(count, 0)
+        if end > self._size:
+            raise struct.error(f"iter_records needs {end - start} bytes, {self._size - start} available")
+        self.pos = end
+        return compiled.iter_unpack(self._view[start:end])
+
+    # -- Strings ---------------------------------------------------------------
+
     def read_cstring(self, length: int, trim_null: bool = True) -> str:
         """Read fixed-length ASCII string."""
-        data = self.stream.read(length)
-        result = data.decode('ascii', errors='replace')
+        data = self.read_bytes(length)
         if trim_null:
-            null_idx = result.find('\0')
+            null_idx = data.find(b'\0')
             if null_idx != -1:
-                result = result[:null_idx]
-        return result
-    
+                data = data[:null_idx]
+        return data.decode('ascii', errors='replace')
+
     def read_pascal_string(self) -> str:
         """Read length-prefixed string (1 byte length)."""
         length = self.read_byte()
         return self.read_cstring(length, trim_null=True)
-    
+
+    def read_null_terminated_string(self) -> str:
+        """Read ASCII string up to (and consuming) a null byte."""
+        end = self._data.find(b'\0', self.pos, self._size) if hasattr(self._data, 'find') else -1
+        if end == -1:
+            tail = self._view[self.pos:].tobytes()
+            end = tail.find(b'\0')
+            end = self._size if end == -1 else self.pos + end
+        data = self._view[self.pos:end].tobytes()
+        self.pos = min(end + 1, self._size)
+        return data.decode('ascii', errors='replace')
+
+    # -- Writes ----------------------------------------------------------------
+
+    def _write(self, raw: bytes):
+        """Write at the current position, growing the buffer as needed."""
+        if not isinstance(self._data, bytearray):
+            # Copy-on-write: writes never touch mapped files or caller bytes
+            self._data = bytearray(self._view)
+        self._view.release()
+        end = self.pos + len(raw)
+        self._data[self.pos:end] = raw
+        self._view = memoryview(self._data)
+        self._size = len(self._data)
+        self.pos = end
+
+    def getvalue(self) -> bytes:
+        """Return the full buffer contents as bytes."""
+        return self._view.tobytes()
+
     def write_bytes(self, data: bytes):
         """Write raw bytes."""
-        self.stream.write(data)
-    
+        self._write(bytes(data))
+
     def write_byte(self, value: int):
         """Write single byte."""
-        self.stream.write(struct.pack('B', value))
-    
+        self._write(bytes((value & 0xFF,)))
+
     def write_uint16(self, value: int):
         """Write unsigned 16-bit integer."""
-        fmt = f"{self.byte_order.value}H"
-        self.stream.write(struct.pack(fmt, value))
-    
+        self._write(self._u16.pack(value))
+
     def write_uint32(self, value: int):
         """Write unsigned 32-bit integer."""
-        fmt = f"{self.byte_order.value}I"
-        self.stream.write(struct.pack(fmt, value))
+        self._write(self._u32.pack(value))
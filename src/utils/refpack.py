@@ -0,0 +1,238 @@
+"""RefPack (QFS) compression codec used by FAR3 and DBPF.
+
+Reference: wiki.niotso.org/RefPack, FreeSO's tso.files/FAR3/Decompresser.cs
+
+Stream layout:
+  - Header: flags byte (0x10, |0x01 if a compressed size follows, |0x80 for
+    4-byte sizes), magic 0xFB, then big-endian size field(s)
+  - Commands, each an opcode followed by 0-3 literal bytes and/or a
+    back-reference into the output:
+      0x00-0x7F  2 bytes  0-3 literals, copy 3-10 bytes from up to 1 KB back
+      0x80-0xBF  3 bytes  0-3 literals, copy 4-67 bytes from up to 16 KB back
+      0xC0-0xDF  4 bytes  0-3 literals, copy 5-1028 bytes from up to 128 KB back
+      0xE0-0xFB  1 byte   4-112 literals (multiple of 4)
+      0xFC-0xFF  1 byte   0-3 trailing literals, end of stream
+
+The decoder writes into a preallocated buffer with slice copies. Overlapping
+back-references (offset < length) repeat a short pattern; they are copied in
+doubling chunks rather than byte by byte.
+"""
+
+from typing import Optional, Tuple, Union
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+MAGIC = 0xFB
+
+# Back-reference limits per opcode form
+_SHORT_MAX_OFFSET, _SHORT_MAX_LENGTH = 1024, 10
+_MEDIUM_MAX_OFFSET, _MEDIUM_MAX_LENGTH = 16384, 67
+_LONG_MAX_OFFSET, _LONG_MAX_LENGTH = 131072, 1028
+_MAX_LITERAL_RUN = 112
+_MIN_MATCH = 3
+
+# Compressor match search: candidates checked per position
+_MAX_CHAIN = 16
+
+
+def is_refpack(data: Buffer) -> bool:
+    """Check whether data starts with a RefPack header."""
+    return len(data) >= 5 and data[1] == MAGIC and (data[0] & 0x3E) == 0x10
+
+
+def parse_header(data: Buffer) -> Tuple[int, int]:
+    """
+    Parse a RefPack header.
+
+    Returns:
+        (decompressed_size, header_length)
+
+    Raises:
+        ValueError: If the header is malformed
+    """
+    if len(data) < 5 or data[1] != MAGIC:
+        raise ValueError("Not a RefPack stream")
+    flags = data[0]
+    width = 4 if flags & 0x80 else 3
+    pos = 2
+    if flags & 0x01:
+        pos += width  # Compressed size, not needed for decoding
+    if len(data) < pos + width:
+        raise ValueError("Truncated RefPack header")
+    size = int.from_bytes(bytes(data[pos:pos + width]), 'big')
+    return size, pos + width
+
+
+def decompress(data: Buffer, decompressed_size: Optional[int] = None) -> bytes:
+    """
+    Decompress a RefPack stream.
+
+    Args:
+        data: Stream bytes. If decompressed_size is None, data must start
+              with a RefPack header; otherwise it is the bare command stream.
+        decompressed_size: Output size when the caller already parsed it
+
+    Returns:
+        Decompressed data
+
+    Raises:
+        ValueError: If the stream is malformed
+    """
+    src = memoryview(data).cast('B') if not isinstance(data, bytes) else data
+    ip = 0
+    if decompressed_size is None:
+        decompressed_size, ip = parse_header(src)
+
+    out = bytearray(decompressed_size)
+    op = 0
+    end = len(src)
+
+    try:
+        while ip < end:
+            b0 = src[ip]
+            if b0 < 0x80:
+                b1 = src[ip + 1]
+                ip += 2
+                literals = b0 & 0x03
+                length = ((b0 & 0x1C) >> 2) + 3
+                offset = ((b0 & 0x60) << 3) + b1 + 1
+            elif b0 < 0xC0:
+                b1 = src[ip + 1]
+                b2 = src[ip + 2]
+                ip += 3
+                literals = b1 >> 6
+                length = (b0 & 0x3F) + 4
+                offset = ((b1 & 0x3F) << 8) + b2 + 1
+            elif b0 < 0xE0:
+                b1 = src[ip + 1]
+                b2 = src[ip + 2]
+                b3 = src[ip + 3]
+                ip += 4
+                literals = b0 & 0x03
+                length = ((b0 & 0x0C) << 6) + b3 + 5
+                offset = ((b0 & 0x10) << 12) + (b1 << 8) + b2 + 1
+            elif b0 < 0xFC:
+                ip += 1
+                literals = ((b0 & 0x1F) << 2) + 4
+                length = 0
+            else:
+                # Stop command with 0-3 trailing literals
+                literals = b0 & 0x03
+                out[op:op + literals] = src[ip + 1:ip + 1 + literals]
+                op += literals
+                break
+
+            if literals:
+                out[op:op + literals] = src[ip:ip + literals]
+                ip += literals
+                op += literals
+
+            if length:
+                start = op - offset
+                if start < 0:
+                    raise ValueError(f"RefPack back-reference before start of output at {op}")
+                if offset >= length:
+                    out[op:op + length] = out[start:start + length]
+                    op += length
+                else:
+                    # Overlapping copy: the source repeats with period
+                    # `offset`, so each pass can copy everything written so far
+                    while length > 0:
+                        n = min(length, op - start)
+                        out[op:op + n] = out[start:start + n]
+                        op += n
+                        length -= n
+    except IndexError:
+        raise ValueError("Truncated RefPack stream") from None
+
+    if op != decompressed_size:
+        raise ValueError(f"RefPack size mismatch: expected {decompressed_size}, got {op}")
+    return bytes(out)
+
+
+def _emit_literals(out: bytearray, data: Buffer, start: int, end: int) -> int:
+    """Emit literal runs of 4-112 bytes; returns the 0-3 bytes left over."""
+    while end - start >= 4:
+        n = min(end - start, _MAX_LITERAL_RUN) & ~0x03
+        out.append(0xE0 | ((n >> 2) - 1))
+        out += data[start:start + n]
+        start += n
+    return start
+
+
+def compress(data: Buffer) -> bytes:
+    """
+    Compress data into a RefPack stream with header.
+
+    Uses greedy LZ77 matching over a hash chain of 3-byte prefixes.
+    Output round-trips through decompress().
+    """
+    data = bytes(data)
+    size = len(data)
+    width = 4 if size > 0xFFFFFF else 3
+    out = bytearray((0x90 if width == 4 else 0x10, MAGIC))
+    out += size.to_bytes(width, 'big')
+
+    chains: dict[bytes, list[int]] = {}
+    pos = 0
+    literal_start = 0
+    limit = size - _MIN_MATCH
+
+    while pos <= limit:
+        key = data[pos:pos + _MIN_MATCH]
+        candidates = chains.get(key)
+        best_len = 0
+        best_off = 0
+        if candidates:
+            max_len = min(_LONG_MAX_LENGTH, size - pos)
+            for cand in reversed(candidates[-_MAX_CHAIN:]):
+                offset = pos - cand
+                if offset > _LONG_MAX_OFFSET:
+                    break
+                length = _MIN_MATCH
+                while length < max_len and data[cand + length] == data[pos + length]:
+                    length += 1
+                # Longer matches need the wider encodings' minimum lengths
+                if offset > _MEDIUM_MAX_OFFSET and length < 5:
+                    continue
+                if offset > _SHORT_MAX_OFFSET and length < 4:
+                    continue
+                if length > best_len:
+                    best_len, best_off = length, offset
+                    if length == max_len:
+                        break
+            candidates.append(pos)
+        else:
+            chains[key] = [pos]
+
+        if best_len < _MIN_MATCH:
+            pos += 1
+            continue
+
+        # Flush pending literals; 0-3 ride along with the copy command
+        literal_start = _emit_literals(out, data, literal_start, pos)
+        literals = pos - literal_start
+        o = best_off - 1
+        L = best_len
+        if L <= _SHORT_MAX_LENGTH and best_off <= _SHORT_MAX_OFFSET:
+            out += bytes((((o >> 3) & 0x60) | ((L - 3) << 2) | literals, o & 0xFF))
+        elif L <= _MEDIUM_MAX_LENGTH and best_off <= _MEDIUM_MAX_OFFSET:
+            out += bytes((0x80 | (L - 4), (literals << 6) | (o >> 8), o & 0xFF))
+        else:
+            out += bytes((0xC0 | ((o >> 12) & 0x10) | (((L - 5) >> 6) & 0x0C) | literals,
+                          (o >> 8) & 0xFF, o & 0xFF, (L - 5) & 0xFF))
+        out += data[literal_start:pos]
+
+        # Index the skipped positions so later matches can reference them
+        for p in range(pos + 1, min(pos + L, limit + 1)):
+            chains.setdefault(data[p:p + _MIN_MATCH], []).append(p)
+        pos += L
+        literal_start = pos
+
+    literal_start = _emit_literals(out, data, literal_start, size)
+    out.append(0xFC | (size - literal_start))
+    out += data[literal_start:size]
+    return bytes(out)
+
+
+__all__ = ['is_refpack', 'parse_header', 'decompress', 'compress']